@@ -0,0 +1,20 @@
+"""Add indexes backing the ERP monitoring aggregates"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_erp_outbox_monitoring_indexes'
+down_revision = 'add_erp_outbox_pending_index'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # GROUP BY status with MIN/MAX(created_at) for /api/erp/status
+    op.create_index('ix_erp_outbox_status_created_at', 'erp_outbox', ['status', 'created_at'])
+    # created_at window scans for /api/erp/metrics
+    op.create_index('ix_erp_outbox_created_at', 'erp_outbox', ['created_at'])
+
+def downgrade():
+    op.drop_index('ix_erp_outbox_created_at', table_name='erp_outbox')
+    op.drop_index('ix_erp_outbox_status_created_at', table_name='erp_outbox')
@@ -0,0 +1,23 @@
+"""Add partial index on pending ERP outbox rows"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_erp_outbox_pending_index'
+down_revision = None  # Replace with the actual previous revision ID if known
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Only pending rows are ever claimed or used to compute the next wakeup, so the
+    # index stays small even when erp_outbox holds millions of completed sagas.
+    op.create_index(
+        'ix_erp_outbox_pending_next_run_at',
+        'erp_outbox',
+        ['next_run_at', 'created_at'],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+def downgrade():
+    op.drop_index('ix_erp_outbox_pending_next_run_at', table_name='erp_outbox')
@@ -0,0 +1,59 @@
+"""Add LTSD declarations with an active-expiry partial index and statistics counters"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_ltsd_declarations'
+down_revision = 'add_erp_outbox_monitoring_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'ltsd_declarations',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('document_ref', sa.String(64), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('partner_id', sa.String(128), nullable=False),
+        sa.Column('status', sa.String(32), nullable=False),
+        sa.Column('ltsd_type', sa.String(32), nullable=False),
+        sa.Column('verdict', sa.String(32), nullable=True),
+        sa.Column('agreements', postgresql.ARRAY(sa.String(32)), nullable=False),
+        sa.Column('valid_from', sa.Date(), nullable=False),
+        sa.Column('valid_to', sa.Date(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True)),
+        sa.Column('updated_at', sa.DateTime(timezone=True)),
+    )
+    op.create_index('ix_ltsd_declarations_document_ref', 'ltsd_declarations', ['document_ref'])
+    op.create_index(
+        'ix_ltsd_declarations_partner_status',
+        'ltsd_declarations',
+        ['partner_id', 'status', 'created_at'],
+    )
+    # Expired rows drop out of the index, so daily sweeps only touch what is still active
+    op.create_index(
+        'ix_ltsd_declarations_active_valid_to',
+        'ltsd_declarations',
+        ['valid_to', 'id'],
+        postgresql_where=sa.text("status = 'active'"),
+    )
+
+    op.create_table(
+        'ltsd_statistics_counters',
+        sa.Column('partner_id', sa.String(128), primary_key=True),
+        sa.Column('status', sa.String(32), primary_key=True),
+        sa.Column('dimension', sa.String(16), primary_key=True),
+        sa.Column('value', sa.String(32), primary_key=True),
+        sa.Column('declarations', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('validity_days', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+def downgrade():
+    op.drop_table('ltsd_statistics_counters')
+    op.drop_index('ix_ltsd_declarations_active_valid_to', table_name='ltsd_declarations')
+    op.drop_index('ix_ltsd_declarations_partner_status', table_name='ltsd_declarations')
+    op.drop_index('ix_ltsd_declarations_document_ref', table_name='ltsd_declarations')
+    op.drop_table('ltsd_declarations')
@@ -13,13 +13,13 @@ Endpoints:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Sequence
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import Select, func, select
+from sqlalchemy import Select, and_, func, select
 from sqlalchemy.orm import Session
 
 from backend.app.dal.models import ERPOutboxRecord
@@ -65,6 +65,9 @@ class ERPMetrics(BaseModel):
 
     success_rate: float = Field(description="Success rate (0-100%)")
     avg_latency_seconds: float = Field(description="Average processing time in seconds")
+    p50_latency_seconds: float = Field(0.0, description="Median processing time in seconds")
+    p95_latency_seconds: float = Field(0.0, description="95th percentile processing time in seconds")
+    p99_latency_seconds: float = Field(0.0, description="99th percentile processing time in seconds")
     total_processed: int = Field(description="Total processed jobs")
     total_succeeded: int = Field(description="Total successful jobs")
     total_failed: int = Field(description="Total failed jobs (including retries)")
@@ -137,58 +140,39 @@ class ERPMonitoringService:
         """Get current sync queue status."""
         now = datetime.utcnow()
 
-        # Count by status
-        pending_count = self.session.scalar(
-            select(func.count(ERPOutboxRecord.id)).where(
-                ERPOutboxRecord.status == OutboxStatus.PENDING.value
-            )
-        ) or 0
-
-        in_progress_count = self.session.scalar(
-            select(func.count(ERPOutboxRecord.id)).where(
-                ERPOutboxRecord.status == OutboxStatus.IN_PROGRESS.value
-            )
-        ) or 0
-
-        completed_count = self.session.scalar(
-            select(func.count(ERPOutboxRecord.id)).where(
-                ERPOutboxRecord.status == OutboxStatus.COMPLETED.value
-            )
-        ) or 0
-
-        dead_count = self.session.scalar(
-            select(func.count(ERPOutboxRecord.id)).where(
-                ERPOutboxRecord.status == OutboxStatus.DEAD.value
-            )
-        ) or 0
-
-        # Get oldest and newest pending
-        oldest_pending_result = self.session.execute(
-            select(func.min(ERPOutboxRecord.created_at)).where(
-                ERPOutboxRecord.status == OutboxStatus.PENDING.value
-            )
-        ).scalar()
-
-        newest_pending_result = self.session.execute(
-            select(func.max(ERPOutboxRecord.created_at)).where(
-                ERPOutboxRecord.status == OutboxStatus.PENDING.value
-            )
-        ).scalar()
-
-        oldest_pending_at = oldest_pending_result if oldest_pending_result else None
-        newest_pending_at = newest_pending_result if newest_pending_result else None
+        # Single pass over the (status, created_at) index instead of one query per figure
+        stmt = select(
+            ERPOutboxRecord.status,
+            func.count(ERPOutboxRecord.id),
+            func.min(ERPOutboxRecord.created_at),
+            func.max(ERPOutboxRecord.created_at),
+        ).group_by(ERPOutboxRecord.status)
+        by_status = {
+            row_status: (count, oldest, newest)
+            for row_status, count, oldest, newest in self.session.execute(stmt).all()
+        }
+
+        def count_for(outbox_status: OutboxStatus) -> int:
+            return by_status.get(outbox_status.value, (0, None, None))[0]
+
+        pending_count = count_for(OutboxStatus.PENDING)
+        in_progress_count = count_for(OutboxStatus.IN_PROGRESS)
+        _, oldest_pending_at, newest_pending_at = by_status.get(
+            OutboxStatus.PENDING.value, (0, None, None)
+        )
 
         # Calculate backlog hours
         backlog_hours = None
         if oldest_pending_at:
-            delta = now - oldest_pending_at
+            reference = now.replace(tzinfo=timezone.utc) if oldest_pending_at.tzinfo else now
+            delta = reference - oldest_pending_at
             backlog_hours = delta.total_seconds() / 3600
 
         return SyncQueueStatus(
             pending_count=pending_count,
             in_progress_count=in_progress_count,
-            completed_count=completed_count,
-            dead_count=dead_count,
+            completed_count=count_for(OutboxStatus.COMPLETED),
+            dead_count=count_for(OutboxStatus.DEAD),
             oldest_pending_at=oldest_pending_at,
             newest_pending_at=newest_pending_at,
             total_queue_size=pending_count + in_progress_count,
@@ -200,65 +184,77 @@ class ERPMonitoringService:
         period_end = datetime.utcnow()
         period_start = period_end - timedelta(hours=hours)
 
-        # Get records in time period
-        stmt: Select = select(ERPOutboxRecord).where(
-            ERPOutboxRecord.created_at >= period_start
+        completed = ERPOutboxRecord.status == OutboxStatus.COMPLETED.value
+        failed = and_(
+            ERPOutboxRecord.status.in_([OutboxStatus.DEAD.value, OutboxStatus.PENDING.value]),
+            ERPOutboxRecord.attempts > 0,
         )
-        records = self.session.execute(stmt).scalars().all()
-
-        total_processed = len(records)
-        total_succeeded = sum(1 for r in records if r.status == OutboxStatus.COMPLETED.value)
-        total_failed = sum(
-            1
-            for r in records
-            if r.status in [OutboxStatus.DEAD.value, OutboxStatus.PENDING.value] and r.attempts > 0
+        retried = ERPOutboxRecord.attempts > 1
+        in_period = ERPOutboxRecord.created_at >= period_start
+        latency = func.extract("epoch", ERPOutboxRecord.processed_at - ERPOutboxRecord.created_at)
+        has_latency = and_(completed, ERPOutboxRecord.processed_at.is_not(None))
+
+        def latency_percentile(fraction: float):
+            return func.percentile_cont(fraction).within_group(latency).filter(has_latency)
+
+        # Saga with most retries in the window and the (all-time) dead letter size are
+        # folded in as scalar subqueries so the whole endpoint costs one round-trip.
+        max_retry_saga = (
+            select(ERPOutboxRecord.saga_id)
+            .where(in_period)
+            .order_by(ERPOutboxRecord.attempts.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        dead_letter_size = (
+            select(func.count(ERPOutboxRecord.id))
+            .where(ERPOutboxRecord.status == OutboxStatus.DEAD.value)
+            .scalar_subquery()
         )
 
+        stmt = select(
+            func.count(ERPOutboxRecord.id).label("total"),
+            func.count(ERPOutboxRecord.id).filter(completed).label("succeeded"),
+            func.count(ERPOutboxRecord.id).filter(failed).label("failed"),
+            func.avg(latency).filter(has_latency).label("avg_latency"),
+            latency_percentile(0.5).label("p50"),
+            latency_percentile(0.95).label("p95"),
+            latency_percentile(0.99).label("p99"),
+            func.coalesce(func.sum(ERPOutboxRecord.attempts - 1).filter(retried), 0).label("retries"),
+            func.count(ERPOutboxRecord.id).filter(retried).label("sagas_with_retries"),
+            func.coalesce(func.max(ERPOutboxRecord.attempts), 0).label("max_attempts"),
+            max_retry_saga.label("max_retry_saga_id"),
+            dead_letter_size.label("dead_count"),
+        ).where(in_period)
+        row = self.session.execute(stmt).one()
+
+        total_processed = row.total or 0
+        total_succeeded = row.succeeded or 0
+        total_retries = int(row.retries or 0)
+
         # Calculate success rate
         success_rate = (total_succeeded / total_processed * 100) if total_processed > 0 else 0.0
-
-        # Calculate average latency for completed jobs
-        completed_records = [r for r in records if r.status == OutboxStatus.COMPLETED.value and r.processed_at]
-        latencies = [
-            (r.processed_at - r.created_at).total_seconds()
-            for r in completed_records
-            if r.processed_at
-        ]
-        avg_latency = sum(latencies) / len(latencies) if latencies else 0.0
-
-        # Retry metrics
-        total_retries = sum(r.attempts - 1 for r in records if r.attempts > 1)
-        sagas_with_retries = sum(1 for r in records if r.attempts > 1)
         avg_retries = total_retries / total_processed if total_processed > 0 else 0.0
 
-        # Find saga with most retries
-        max_retry_record = max(records, key=lambda r: r.attempts) if records else None
-        max_retries_saga_id = max_retry_record.saga_id if max_retry_record else None
-        max_retries_count = max_retry_record.attempts if max_retry_record else 0
-
-        # Dead letter queue size
-        dead_count = self.session.scalar(
-            select(func.count(ERPOutboxRecord.id)).where(
-                ERPOutboxRecord.status == OutboxStatus.DEAD.value
-            )
-        ) or 0
-
         retry_metrics = RetryMetrics(
             total_retries=total_retries,
             avg_retries_per_saga=avg_retries,
-            max_retries_saga_id=max_retries_saga_id,
-            max_retries_count=max_retries_count,
-            sagas_with_retries=sagas_with_retries,
+            max_retries_saga_id=row.max_retry_saga_id,
+            max_retries_count=row.max_attempts,
+            sagas_with_retries=row.sagas_with_retries or 0,
         )
 
         return ERPMetrics(
             success_rate=success_rate,
-            avg_latency_seconds=avg_latency,
+            avg_latency_seconds=float(row.avg_latency or 0.0),
+            p50_latency_seconds=float(row.p50 or 0.0),
+            p95_latency_seconds=float(row.p95 or 0.0),
+            p99_latency_seconds=float(row.p99 or 0.0),
             total_processed=total_processed,
             total_succeeded=total_succeeded,
-            total_failed=total_failed,
+            total_failed=row.failed or 0,
             retry_metrics=retry_metrics,
-            dead_letter_queue_size=dead_count,
+            dead_letter_queue_size=row.dead_count or 0,
             period_start=period_start,
             period_end=period_end,
         )
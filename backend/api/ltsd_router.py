@@ -20,9 +20,8 @@ from __future__ import annotations
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import StreamingResponse
-import io
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import Response
 
 from backend.models.ltsd_models import (
     LTSDDeclaration,
@@ -38,11 +37,15 @@ from backend.models.ltsd_models import (
     LTSDListResponse,
     LTSDStatistics,
 )
+from backend.services.certificate_store import CertificateStore, serve_certificate
 from backend.services.ltsd_management_service import LTSDManagementService, get_ltsd_service
 
 
 router = APIRouter(prefix="/ltsd", tags=["LTSD Management"])
 
+# Process-wide store so every request reuses previously rendered certificates
+certificate_store = CertificateStore()
+
 
 # Dependency to get partner ID from auth
 async def get_partner_id() -> str:
@@ -58,7 +61,7 @@ def get_service() -> LTSDManagementService:
     # TODO: Inject actual database session
     from sqlalchemy.orm import Session
     db_session = Session()  # Placeholder
-    return get_ltsd_service(db_session)
+    return get_ltsd_service(db_session, certificate_store=certificate_store)
 
 
 @router.post(
@@ -387,28 +390,38 @@ async def revoke_ltsd(
 
 @router.get(
     "/{ltsd_id}/pdf",
-    response_class=StreamingResponse,
+    response_class=Response,
     summary="Download LTSD certificate PDF"
 )
 async def download_pdf(
     ltsd_id: UUID,
+    http_request: Request,
     partner_id: str = Depends(get_partner_id),
     service: LTSDManagementService = Depends(get_service),
 ):
     """
     Download LTSD certificate as PDF.
 
+    Served from the content-addressed certificate store; the PDF is only
+    rendered if it is not stored yet.
+
     **Path Parameters:**
     - ltsd_id: UUID of LTSD
 
+    **Request Headers:**
+    - If-None-Match: ETag from a previous download (returns 304 if unchanged)
+    - Range: Single byte range, e.g. `bytes=0-1023` (returns 206)
+
     **Response:**
     - Content-Type: application/pdf
     - Content-Disposition: attachment; filename=ltsd-{id}.pdf
+    - ETag: SHA-256 hash of PDF
     - X-Notary-Hash: SHA-256 hash of PDF
 
     **Errors:**
     - 404: LTSD not found or PDF not generated
     - 400: LTSD not active
+    - 416: Range not satisfiable
     """
     try:
         declaration = service.get_ltsd(ltsd_id, partner_id)
@@ -425,29 +438,24 @@ async def download_pdf(
                 detail="PDF not generated yet"
             )
 
-        # Generate PDF
-        cert_data = service._convert_to_certificate_data(declaration)
-        pdf_bytes = service.pdf_generator.generate_ltsd_certificate(cert_data)
+        stored = service.get_certificate_pdf(declaration)
 
         # Verify hash matches
-        actual_hash = service.pdf_generator.generate_certificate_hash(pdf_bytes)
-        if actual_hash != declaration.pdf_sha256:
+        if stored.sha256 != declaration.pdf_sha256:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="PDF integrity check failed"
             )
 
-        headers = {
-            "Content-Disposition": f"attachment; filename=ltsd-{ltsd_id}.pdf",
-            "X-Notary-Hash": declaration.pdf_sha256,
-        }
+        headers = {"X-Notary-Hash": declaration.pdf_sha256}
 
         if declaration.ledger_reference:
             headers["X-Ledger-Reference"] = declaration.ledger_reference
 
-        return StreamingResponse(
-            io.BytesIO(pdf_bytes),
-            media_type="application/pdf",
+        return serve_certificate(
+            stored,
+            http_request.headers,
+            filename=f"ltsd-{ltsd_id}.pdf",
             headers=headers,
         )
     except HTTPException:
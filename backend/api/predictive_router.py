@@ -6,6 +6,7 @@ REST API endpoints for predictive analytics and risk scoring.
 Endpoints:
 - POST /api/predictive/risk-score - Calculate risk score for assessment
 - POST /api/predictive/compliance-probability - Predict compliance probability
+- POST /api/predictive/batch-compliance-probability - Predict compliance for many products
 - POST /api/predictive/supply-chain-risk - Analyze supply chain risk
 - GET /api/predictive/health - Health check and model status
 """
@@ -111,8 +112,10 @@ class RiskScoreResponse(BaseModel):
     explanation: str = Field(..., description="Human-readable explanation")
     recommendations: List[str] = Field(..., description="Risk mitigation recommendations")
     calculated_at: datetime
+    model_version: Optional[str] = Field(None, description="Model artefact version (null for rule-based)")
 
     class Config:
+        protected_namespaces = ()
         json_schema_extra = {
             "example": {
                 "score": 0.35,
@@ -145,8 +148,10 @@ class CompliancePredictionResponse(BaseModel):
     trade_agreements: List[str] = Field(..., description="Target trade agreements")
     qualified_agreements: List[str] = Field(..., description="Agreements likely qualified for")
     predicted_at: datetime
+    model_version: Optional[str] = Field(None, description="Model artefact version (null for rule-based)")
 
     class Config:
+        protected_namespaces = ()
         json_schema_extra = {
             "example": {
                 "probability": 0.78,
@@ -188,6 +193,10 @@ class SupplyChainRiskResponse(BaseModel):
     mitigation_strategies: List[str] = Field(..., description="Mitigation strategies")
     explanation: str = Field(..., description="Overall analysis explanation")
     analyzed_at: datetime
+    concentration_metrics: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Origin concentration: HHI, top-1/top-3 country share, country count"
+    )
 
     class Config:
         json_schema_extra = {
@@ -289,6 +298,7 @@ async def calculate_risk_score(request: RiskScoreRequest):
             explanation=risk_score.explanation,
             recommendations=risk_score.recommendations,
             calculated_at=risk_score.calculated_at,
+            model_version=risk_score.model_version,
         )
 
     except Exception as e:
@@ -348,6 +358,7 @@ async def predict_compliance_probability(request: CompliancePredictionRequest):
             trade_agreements=prediction.trade_agreements,
             qualified_agreements=prediction.qualified_agreements,
             predicted_at=prediction.predicted_at,
+            model_version=prediction.model_version,
         )
 
     except Exception as e:
@@ -422,6 +433,7 @@ async def analyze_supply_chain_risk(request: SupplyChainRiskRequest):
             mitigation_strategies=report.mitigation_strategies,
             explanation=report.explanation,
             analyzed_at=report.analyzed_at,
+            concentration_metrics=report.concentration_metrics,
         )
 
     except Exception as e:
@@ -460,6 +472,7 @@ async def health_check():
             "compliance_model": "LogisticRegression" if service.compliance_model else "Rule-based",
             "features": "5 features (material_count, eu_content_percentage, complexity_score, supplier_reliability, documentation_quality)",
             "training_data": "45 samples (42 passed, 3 failed)",
+            "model_version": service.model_version or "Rule-based",
         }
 
         return HealthCheckResponse(
@@ -499,10 +512,9 @@ async def batch_calculate_risk_score(requests: List[RiskScoreRequest]):
     """
     try:
         service = get_predictive_analytics_service()
-        results = []
 
-        for request in requests:
-            assessment_data = {
+        assessments = [
+            {
                 "products": [p.dict() for p in request.products],
                 "materials": [m.dict() for m in request.materials],
                 "supplier_info": request.supplier_info.dict() if request.supplier_info else {},
@@ -510,10 +522,14 @@ async def batch_calculate_risk_score(requests: List[RiskScoreRequest]):
                 "documentation_quality": request.documentation_quality,
                 "assessment_metadata": request.assessment_metadata,
             }
+            for request in requests
+        ]
 
-            risk_score = service.calculate_risk_score(assessment_data)
+        # Score the whole batch with one model pass
+        risk_scores = service.calculate_risk_scores(assessments)
 
-            results.append(RiskScoreResponse(
+        results = [
+            RiskScoreResponse(
                 score=risk_score.score,
                 confidence=risk_score.confidence,
                 risk_level=risk_score.risk_level,
@@ -521,7 +537,10 @@ async def batch_calculate_risk_score(requests: List[RiskScoreRequest]):
                 explanation=risk_score.explanation,
                 recommendations=risk_score.recommendations,
                 calculated_at=risk_score.calculated_at,
-            ))
+                model_version=risk_score.model_version,
+            )
+            for risk_score in risk_scores
+        ]
 
         return results
 
@@ -530,3 +549,58 @@ async def batch_calculate_risk_score(requests: List[RiskScoreRequest]):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error in batch risk score calculation: {str(e)}"
         )
+
+
+@router.post(
+    "/batch-compliance-probability",
+    response_model=List[CompliancePredictionResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Predict compliance probability for multiple products"
+)
+async def batch_predict_compliance_probability(requests: List[CompliancePredictionRequest]):
+    """
+    Predict compliance probability for multiple products in batch.
+
+    **Request Body:**
+    - List of compliance prediction requests
+
+    **Returns:**
+    - List of compliance prediction responses (same order as input)
+    """
+    try:
+        service = get_predictive_analytics_service()
+
+        products = [
+            {
+                **request.product.dict(),
+                "declared_origin": request.declared_origin,
+                "supplier": request.supplier.dict() if request.supplier else {},
+                "trade_agreements": request.trade_agreements,
+            }
+            for request in requests
+        ]
+
+        # Score the whole batch with one model pass
+        predictions = service.predict_compliance_probabilities(products)
+
+        return [
+            CompliancePredictionResponse(
+                probability=prediction.probability,
+                confidence=prediction.confidence,
+                verdict=prediction.verdict,
+                compliance_factors=prediction.compliance_factors,
+                risk_factors=prediction.risk_factors,
+                explanation=prediction.explanation,
+                trade_agreements=prediction.trade_agreements,
+                qualified_agreements=prediction.qualified_agreements,
+                predicted_at=prediction.predicted_at,
+                model_version=prediction.model_version,
+            )
+            for prediction in predictions
+        ]
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error in batch compliance prediction: {str(e)}"
+        )
@@ -1,10 +1,14 @@
 # /home/vncuser/psra-ltsd-enterprise-v2/backend/app/api/endpoints/certificates_list.py
 
+import json
+import re
+from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field, validator
-from sqlalchemy import or_, and_
-from sqlalchemy.orm import Session
+from sqlalchemy import func, literal_column, or_, and_, tuple_
+from sqlalchemy.orm import Session, Query as OrmQuery
+from app.api.pagination import decode_cursor, encode_cursor
 from app.db.session import get_db  # Assuming this is defined elsewhere
 from app.models.certificate import Certificate  # Assuming this SQLAlchemy model exists
 from app.schemas.certificate import Certificate as CertificateSchema  # Assuming this Pydantic schema exists
@@ -29,11 +33,12 @@ class CertificateFilters(BaseModel):
 
 class CertificateQueryParams(BaseModel):
     """Model for query parameters including pagination, sorting, and filters."""
-    page: int = Field(1, ge=1, description="Page number (minimum 1)")
+    cursor: Optional[str] = Field(None, description="next_cursor from the previous page; omit for the first page")
     page_size: int = Field(20, ge=1, le=100, description="Number of items per page (1-100)")
     sort_by: Optional[str] = Field("created_at", description="Field to sort by (e.g., created_at)")
     sort_order: Optional[str] = Field("desc", description="Sort order: asc or desc")
     filters: Optional[CertificateFilters] = Field(None, description="Optional filters for certificates")
+    exact_count: bool = Field(False, description="Return an exact total instead of the planner estimate")
 
     @validator('sort_order')
     def validate_sort_order(cls, v):
@@ -53,11 +58,58 @@ class CertificateListResponse(BaseModel):
     """Response model for the certificates list endpoint."""
     items: List[CertificateSchema]
     total: int
-    page: int
+    total_is_estimate: bool
     page_size: int
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
+
+_LIKE_SPECIALS = re.compile(r"([\\%_])")
+
+# Nullable sort columns; NULL would fail every row-value comparison and drop out of the seek
+_NULLABLE_SORT_FIELDS = {"origin_country", "destination_country"}
+
+def _cursor_type(sort_by: str):
+    return datetime.fromisoformat if sort_by == "created_at" else str
+
+def _sort_expression(sort_by: str):
+    """Sort key for ``sort_by``, with NULL countries ordered as ''."""
+    column = getattr(Certificate, sort_by, Certificate.created_at)
+    if sort_by in _NULLABLE_SORT_FIELDS:
+        # Rendered inline so the expression matches the COALESCE indexes
+        return func.coalesce(column, literal_column("''"))
+    return column
+
+def _decode_certificate_cursor(params: "CertificateQueryParams") -> tuple:
+    """
+    Decode ``params.cursor`` into the (sort value, id) seek key.
+
+    The cursor records the sort it was issued for; a page ordered differently
+    would seek on the wrong column, so a mismatch is a 400.
+    """
+    sort_by, sort_order, value, certificate_id = decode_cursor(
+        params.cursor, str, str, _cursor_type(params.sort_by), lambda value: value
+    )
+    if (sort_by, sort_order) != (params.sort_by, params.sort_order):
+        raise HTTPException(status_code=400, detail="Cursor does not match sort_by/sort_order")
+    return value, certificate_id
+
+def _count(db: Session, query: OrmQuery, exact: bool) -> tuple:
+    """
+    Count matching certificates, using the planner's row estimate unless ``exact``.
+
+    An exact count has to visit every matching row; on tenants with millions of
+    certificates that dominates the request, while the estimate is read from
+    statistics in constant time.
+    """
+    if exact or db.bind.dialect.name != "postgresql":
+        return query.order_by(None).count(), False
+    compiled = query.order_by(None).statement.compile(dialect=db.bind.dialect)
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"]), True
 
 @router.get("/certificates", response_model=CertificateListResponse)
 def get_certificates(
@@ -65,16 +117,22 @@ def get_certificates(
     db: Session = Depends(get_db)
 ) -> CertificateListResponse:
     """
-    Retrieve a paginated list of certificates with optional filters and sorting.
+    Retrieve a keyset-paginated list of certificates with optional filters and sorting.
 
-    - **page**: Page number (default 1, min 1)
+    - **cursor**: Opaque cursor from the previous page (omit for the first page)
     - **page_size**: Items per page (default 20, min 1, max 100)
     - **sort_by**: Field to sort by (default 'created_at')
     - **sort_order**: Sort order ('asc' or 'desc', default 'desc')
     - **filters**: Optional filters (status, countries, dates, search)
+    - **exact_count**: Exact total instead of an estimate (default false)
 
-    Returns a paginated response with certificates.
+    Pages seek on (sort_by, id) rather than skipping OFFSET rows, so every page
+    costs the same regardless of how deep it is. A cursor is only valid for the
+    sort_by/sort_order it was issued with.
     """
+    sort_column = _sort_expression(params.sort_by)
+    after = _decode_certificate_cursor(params) if params.cursor else None
+
     # Build the base query
     query = db.query(Certificate)
 
@@ -95,41 +153,51 @@ def get_certificates(
         if filters.date_to:
             query = query.filter(Certificate.created_at <= filters.date_to)
         if filters.search:
-            search_term = f"%{filters.search}%"
+            # Served by the trigram indexes in migrations/add_certificate_list_indexes.sql
+            search_term = "%" + _LIKE_SPECIALS.sub(r"\\\1", filters.search) + "%"
             query = query.filter(
                 or_(
-                    Certificate.certificate_number.ilike(search_term),
-                    Certificate.exporter.ilike(search_term),
-                    Certificate.importer.ilike(search_term)
+                    Certificate.certificate_number.ilike(search_term, escape="\\"),
+                    Certificate.exporter.ilike(search_term, escape="\\"),
+                    Certificate.importer.ilike(search_term, escape="\\")
                 )
             )
 
-    # Apply sorting
-    sort_column = getattr(Certificate, params.sort_by, Certificate.created_at)
-    if params.sort_order == "desc":
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
-
-    # Get total count before pagination
-    total = query.count()
+    total, total_is_estimate = _count(db, query, params.exact_count)
 
-    # Apply pagination
-    offset = (params.page - 1) * params.page_size
-    items = query.offset(offset).limit(params.page_size).all()
+    # Apply sorting, with id as tie-breaker so the seek key is unique
+    descending = params.sort_order == "desc"
+    key = tuple_(sort_column, Certificate.id)
+    if after:
+        query = query.filter(key < tuple_(*after) if descending else key > tuple_(*after))
+    if descending:
+        query = query.order_by(sort_column.desc(), Certificate.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Certificate.id.asc())
+
+    # One extra row tells us whether there is a next page
+    rows = query.limit(params.page_size + 1).all()
+    items = rows[:params.page_size]
+    has_next = len(rows) > params.page_size
+    next_cursor = None
+    if has_next:
+        last = items[-1]
+        sort_value = getattr(last, params.sort_by)
+        if params.sort_by in _NULLABLE_SORT_FIELDS and sort_value is None:
+            sort_value = ""
+        next_cursor = encode_cursor(params.sort_by, params.sort_order, sort_value, last.id)
 
     # Calculate pagination metadata
     total_pages = (total + params.page_size - 1) // params.page_size
-    has_next = params.page < total_pages
-    has_prev = params.page > 1
 
     # Return response
     return CertificateListResponse(
         items=items,
         total=total,
-        page=params.page,
+        total_is_estimate=total_is_estimate,
         page_size=params.page_size,
         total_pages=total_pages,
         has_next=has_next,
-        has_prev=has_prev
+        has_prev=params.cursor is not None,
+        next_cursor=next_cursor
     )
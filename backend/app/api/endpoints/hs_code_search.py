@@ -1,10 +1,67 @@
 from fastapi import FastAPI, Query, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
-import asyncpg
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+import os
+import re
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+from backend.app.cache.hs_code_index import HSCodePrefixIndex, normalize_code
+from backend.app.database.async_pool import close_pool, get_pool
+
+logger = logging.getLogger(__name__)
+
+MAX_RESULTS = 50
+# Rebuild the in-process code index this often so nomenclature updates show up
+INDEX_REFRESH_SECONDS = int(os.getenv("HS_CODE_INDEX_REFRESH_SECONDS", 3600))
+
+# Requires backend/migrations/add_hs_code_search_vector.sql (search_vector + trigram index)
+SELECT_COLUMNS = "code, description_en, description_fr, description_es, description_de"
+
+ALL_CODES_QUERY = f"SELECT {SELECT_COLUMNS} FROM hs_codes"
+
+CODE_QUERY = f"""
+SELECT {SELECT_COLUMNS}
+FROM hs_codes
+WHERE code ILIKE $1 || '%' OR code % $2
+ORDER BY
+    CASE
+        WHEN code ILIKE $2 THEN 1
+        WHEN code ILIKE $1 || '%' THEN 2
+        ELSE 3
+    END,
+    similarity(code, $2) DESC,
+    code
+LIMIT $3
+"""
+
+DESCRIPTION_QUERY = f"""
+SELECT {SELECT_COLUMNS}
+FROM hs_codes, (SELECT to_tsquery('english', $1) || to_tsquery('simple', $1) AS query) q
+WHERE search_vector @@ q.query
+ORDER BY ts_rank(search_vector, q.query) DESC, code
+LIMIT $2
+"""
+
+_WORDS = re.compile(r"\w+")
+_LIKE_SPECIALS = re.compile(r"([\\%_])")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await get_pool()
+    try:
+        await load_code_index()
+    except Exception as e:
+        # Searches fall back to the database until the next refresh succeeds
+        logger.error(f"Failed to load HS code index: {e}")
+    yield
+    await close_pool()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Enable CORS for frontend
 app.add_middleware(
@@ -25,13 +82,69 @@ class HSCode(BaseModel):
 class SearchResponse(BaseModel):
     results: List[HSCode]
 
-async def get_db_connection():
-    return await asyncpg.connect(
-        user="your_db_user",
-        password="your_db_password",
-        database="your_db_name",
-        host="localhost"
-    )
+
+code_index: Optional[HSCodePrefixIndex[HSCode]] = None
+_refresh_task: Optional[asyncio.Task] = None
+
+
+async def load_code_index() -> HSCodePrefixIndex[HSCode]:
+    """Build the prefix index from every HS code and swap it in."""
+    global code_index
+    pool = await get_pool()
+    rows = await pool.fetch(ALL_CODES_QUERY)
+    code_index = HSCodePrefixIndex(((row["code"], HSCode(**dict(row))) for row in rows), limit=MAX_RESULTS)
+    logger.info(f"Loaded {len(code_index)} HS codes into the prefix index")
+    return code_index
+
+
+def _schedule_refresh() -> None:
+    """Rebuild a stale index in the background; requests keep using the current one."""
+    global _refresh_task
+    if code_index is None or code_index.age() < INDEX_REFRESH_SECONDS:
+        return
+    if _refresh_task is not None and not _refresh_task.done():
+        return
+
+    async def refresh():
+        try:
+            await load_code_index()
+        except Exception as e:
+            logger.error(f"Failed to refresh HS code index: {e}")
+
+    _refresh_task = asyncio.create_task(refresh())
+
+
+def prefix_tsquery(text: str) -> Optional[str]:
+    """Turn free text into an AND of prefix terms ("lithium batt" -> "lithium:* & batt:*")."""
+    words = _WORDS.findall(text)
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+async def search_codes(code: str, limit: int) -> List[HSCode]:
+    """Exact and prefix matches first, then trigram-similar codes."""
+    normalized = normalize_code(code)
+    if normalized.isdigit() and code_index is not None:
+        _schedule_refresh()
+        results = code_index.search(normalized, limit)
+        if results:
+            return results
+
+    # Non-numeric input, no index yet, or no prefix match: let the trigram index suggest near misses
+    pool = await get_pool()
+    rows = await pool.fetch(CODE_QUERY, _LIKE_SPECIALS.sub(r"\\\1", code), code, limit)
+    return [HSCode(**dict(row)) for row in rows]
+
+
+async def search_descriptions(description: str, limit: int) -> List[HSCode]:
+    query = prefix_tsquery(description)
+    if query is None:
+        return []
+    pool = await get_pool()
+    rows = await pool.fetch(DESCRIPTION_QUERY, query, limit)
+    return [HSCode(**dict(row)) for row in rows]
+
 
 @app.get("/hs-codes/search", response_model=SearchResponse)
 async def search_hs_codes(
@@ -41,27 +154,13 @@ async def search_hs_codes(
     if not code and not description:
         raise HTTPException(status_code=400, detail="Either code or description must be provided")
 
-    conn = await get_db_connection()
-    try:
-        query = """
-        SELECT code, description_en, description_fr, description_es, description_de
-        FROM hs_codes
-        WHERE 
-            (code ILIKE $1 OR $1 IS NULL)
-            OR (to_tsvector('english', description_en || ' ' || description_fr || ' ' || description_es || ' ' || description_de) @@ plainto_tsquery('english', $2) OR $2 IS NULL)
-        ORDER BY 
-            CASE 
-                WHEN code = $1 THEN 1
-                WHEN code ILIKE $1 || '%' THEN 2
-                ELSE 3
-            END,
-            ts_rank(to_tsvector('english', description_en || ' ' || description_fr || ' ' || description_es || ' ' || description_de), plainto_tsquery('english', $2)) DESC
-        LIMIT 50
-        """
-        code_param = code if code else None
-        description_param = description if description else None
-        results = await conn.fetch(query, code_param, description_param)
-
-        return SearchResponse(results=[HSCode(**dict(row)) for row in results])
-    finally:
-        await conn.close()
+    results = await search_codes(code, MAX_RESULTS) if code else []
+    if description and len(results) < MAX_RESULTS:
+        seen = {result.code for result in results}
+        for result in await search_descriptions(description, MAX_RESULTS):
+            if result.code not in seen:
+                results.append(result)
+                if len(results) >= MAX_RESULTS:
+                    break
+
+    return SearchResponse(results=results)
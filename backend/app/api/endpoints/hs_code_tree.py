@@ -1,25 +1,32 @@
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
-from typing import Optional, Dict, Any
-import redis
+from fastapi.responses import JSONResponse, Response
+from typing import Optional
 import psycopg2
-import json
-from datetime import timedelta
+import logging
+import os
+import threading
+import time
+
+from backend.app.cache.hs_code_tree_snapshot import HSCodeTreeSnapshot, snapshot_version
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
-# Redis and PostgreSQL configurations
-REDIS_HOST = "localhost"
-REDIS_PORT = 6379
-REDIS_DB = 0
+# PostgreSQL configuration
 POSTGRES_HOST = "localhost"
 POSTGRES_DB = "hs_codes"
 POSTGRES_USER = "postgres"
 POSTGRES_PASSWORD = "password"
 
-# Initialize Redis connection
-redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB)
+MAX_DEPTH = 4
+# How often to look for a new nomenclature version; requests in between are served from memory
+VERSION_CHECK_SECONDS = int(os.getenv("HS_TREE_VERSION_CHECK_SECONDS", 60))
+
+_snapshot: Optional[HSCodeTreeSnapshot] = None
+_checked_at = 0.0
+_snapshot_lock = threading.Lock()
 
 def get_db_connection():
     return psycopg2.connect(
@@ -29,65 +36,65 @@ def get_db_connection():
         password=POSTGRES_PASSWORD
     )
 
-def fetch_hs_tree_from_db(depth: int) -> Dict[str, Any]:
-    """Fetch HS code hierarchy from PostgreSQL."""
+def fetch_hs_rows_from_db(depth: int) -> list:
+    """Fetch the flat HS code hierarchy; the tree is linked in memory."""
     query = """
-    WITH RECURSIVE hs_tree AS (
-        SELECT code, parent_code, description, level
-        FROM hs_codes
-        WHERE level = 1
-        UNION ALL
-        SELECT h.code, h.parent_code, h.description, h.level
-        FROM hs_codes h
-        INNER JOIN hs_tree ht ON h.parent_code = ht.code
-        WHERE h.level <= %s
-    )
-    SELECT * FROM hs_tree ORDER BY level, code;
+    SELECT code, parent_code, description, level
+    FROM hs_codes
+    WHERE level <= %s
+    ORDER BY code;
     """
-    with get_db_connection() as conn:
+    conn = get_db_connection()
+    try:
         with conn.cursor() as cur:
             cur.execute(query, (depth,))
-            rows = cur.fetchall()
-    return rows
+            return cur.fetchall()
+    finally:
+        conn.close()
 
-def build_hierarchy(rows: list, depth: int) -> Dict[str, Any]:
-    """Build hierarchical JSON structure from flat rows."""
-    tree = {}
-    for row in rows:
-        code, parent_code, description, level = row
-        node = {"description": description, "count": 0, "children": {}}
-        if parent_code is None:
-            tree[code] = node
-        else:
-            parent = find_parent(tree, parent_code)
-            if parent:
-                parent["children"][code] = node
-                parent["count"] += 1
-    return tree
+def get_snapshot() -> HSCodeTreeSnapshot:
+    """
+    Return the current tree snapshot, rebuilding it only when the nomenclature changed.
 
-def find_parent(tree: Dict[str, Any], parent_code: str) -> Optional[Dict[str, Any]]:
-    """Recursively find parent node in the tree."""
-    for code, node in tree.items():
-        if code == parent_code:
-            return node
-        found = find_parent(node["children"], parent_code)
-        if found:
-            return found
-    return None
+    While one request re-checks the version, concurrent requests keep getting
+    the previous snapshot instead of queueing behind the database.
+    """
+    global _snapshot, _checked_at
+    if _snapshot is not None and time.monotonic() - _checked_at < VERSION_CHECK_SECONDS:
+        return _snapshot
+    if not _snapshot_lock.acquire(blocking=_snapshot is None):
+        return _snapshot
+    try:
+        if _snapshot is not None and time.monotonic() - _checked_at < VERSION_CHECK_SECONDS:
+            return _snapshot
+        rows = fetch_hs_rows_from_db(MAX_DEPTH)
+        version = snapshot_version(rows)
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = HSCodeTreeSnapshot(rows, max_depth=MAX_DEPTH, version=version)
+            logger.info(f"Built HS tree snapshot {version} from {len(rows)} codes")
+        _checked_at = time.monotonic()
+        return _snapshot
+    finally:
+        _snapshot_lock.release()
 
 @app.get("/hs-codes/tree")
-async def get_hs_tree(request: Request, depth: int = Query(1, ge=1, le=4)) -> JSONResponse:
+def get_hs_tree(
+    request: Request,
+    depth: int = Query(1, ge=1, le=MAX_DEPTH),
+    code: Optional[str] = Query(None, description="Only return the subtree rooted at this code"),
+) -> Response:
     """Get HS code hierarchy with specified depth."""
-    cache_key = f"hs_tree_{depth}"
-    cached_data = redis_client.get(cache_key)
-    if cached_data:
-        return JSONResponse(content=json.loads(cached_data))
+    snapshot = get_snapshot()
+    etag = snapshot.etag(depth, code)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in {tag.strip() for tag in request.headers.get("if-none-match", "").split(",")}:
+        return Response(status_code=304, headers=headers)
 
-    rows = fetch_hs_tree_from_db(depth)
-    tree = build_hierarchy(rows, depth)
-    redis_client.setex(cache_key, timedelta(hours=24), json.dumps(tree))
-    return JSONResponse(content=tree)
+    body = snapshot.render(depth, code)
+    if body is None:
+        raise HTTPException(status_code=404, detail=f"HS code {code} not found at depth {depth}")
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
\ No newline at end of file
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
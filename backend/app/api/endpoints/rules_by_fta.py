@@ -4,10 +4,11 @@ from pydantic import BaseModel
 from datetime import datetime
 from enum import Enum
 import logging
-from sqlalchemy import func, select, and_, or_
+from sqlalchemy import func, select, and_, or_, tuple_
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models import Rule, FTA, HSCode
+from ..pagination import decode_cursor, encode_cursor
 
 router = APIRouter()
 
@@ -39,29 +40,34 @@ class RulesByFTAResponse(BaseModel):
     rules: List[RuleResponse]
     total_count: int
     chapter_stats: List[ChapterStats]
-    current_page: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
 @router.get("/by-fta/{fta_id_or_name}", response_model=RulesByFTAResponse)
 async def get_rules_by_fta(
     fta_id_or_name: str,
     limit: int = Query(20, gt=0, le=100),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     chapter: Optional[str] = Query(None, regex=r"^\d{2}$"),
     db: Session = Depends(get_db)
 ):
     """
-    Get all rules for a specific FTA with pagination, filtering, and statistics.
-    
+    Get all rules for a specific FTA with keyset pagination, filtering, and statistics.
+
+    Rules are ordered by (chapter, hs_code, id). The chapter is the first two
+    digits of the HS code, so the page query seeks on (hs_code, id) and every
+    page costs the same three queries however deep it is.
+
     Args:
         fta_id_or_name: FTA ID or name (case-insensitive)
         limit: Number of items per page (default: 20, max: 100)
-        offset: Pagination offset (default: 0)
+        cursor: Opaque cursor from the previous page; omit for the first page
         chapter: Optional HS chapter filter (2-digit string)
-    
+
     Returns:
-        RulesByFTAResponse with rules, statistics, and pagination info
+        RulesByFTAResponse with rules, statistics, and the next page cursor
     """
+    after = decode_cursor(cursor, str, int) if cursor else None
     try:
         # First try to find FTA by ID if input is numeric
         try:
@@ -92,62 +98,77 @@ async def get_rules_by_fta(
         ).filter(
             Rule.fta_id == fta.id
         ).order_by(
-            Rule.hs_code.asc()
+            Rule.hs_code.asc(), Rule.id.asc()
         )
         
         # Apply chapter filter if provided
         if chapter:
             query = query.filter(Rule.hs_code.startswith(chapter))
+
+        # Seek past the last row of the previous page
+        if after:
+            query = query.filter(tuple_(Rule.hs_code, Rule.id) > tuple_(*after))
         
-        # Get total count for pagination
-        total_count = query.count()
-        
-        # Apply pagination
-        rules = query.offset(offset).limit(limit).all()
+        # One extra row tells us whether there is a next page
+        rows = query.limit(limit + 1).all()
+        rules = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(rules[-1].hs_code, rules[-1].id)
         
-        # Calculate chapter statistics
-        chapter_stats_query = db.query(
-            func.substr(Rule.hs_code, 1, 2).label("chapter"),
+        # Rule and HS code counts per chapter in a single grouped query; rules
+        # are counted whether or not their code has an exact hs_codes row
+        chapter_expr = func.substr(Rule.hs_code, 1, 2)
+        rule_counts = select(
+            chapter_expr.label("chapter"),
             func.count(Rule.id).label("rule_count")
-        ).filter(
+        ).where(
             Rule.fta_id == fta.id
-        ).group_by(
-            "chapter"
-        ).order_by(
-            "chapter"
-        )
-        
+        ).group_by(chapter_expr)
+
+        hs_chapter_expr = func.substr(HSCode.code, 1, 2)
+        hs_counts = select(
+            hs_chapter_expr.label("chapter"),
+            func.count(HSCode.code).label("hs_count")
+        ).group_by(hs_chapter_expr)
+
         if chapter:
-            chapter_stats_query = chapter_stats_query.filter(Rule.hs_code.startswith(chapter))
-        
-        chapter_stats = chapter_stats_query.all()
-        
-        # Get total HS codes in the system for coverage calculation
-        total_hs_codes = db.query(func.count(HSCode.code)).scalar()
+            rule_counts = rule_counts.where(Rule.hs_code.startswith(chapter))
+            hs_counts = hs_counts.where(HSCode.code.startswith(chapter))
+
+        rule_counts = rule_counts.subquery()
+        hs_counts = hs_counts.subquery()
+        chapter_stats = db.execute(
+            select(
+                rule_counts.c.chapter,
+                rule_counts.c.rule_count,
+                func.coalesce(hs_counts.c.hs_count, 0).label("hs_count")
+            ).outerjoin(
+                hs_counts, hs_counts.c.chapter == rule_counts.c.chapter
+            ).order_by(rule_counts.c.chapter)
+        ).all()
         
         # Calculate coverage percentage for each chapter
         stats_response = []
         for stat in chapter_stats:
-            # Count total HS codes in this chapter
-            chapter_hs_count = db.query(func.count(HSCode.code)).filter(
-                HSCode.code.startswith(stat.chapter)
-            ).scalar()
-            
-            coverage = (stat.rule_count / chapter_hs_count * 100) if chapter_hs_count > 0 else 0
+            coverage = (stat.rule_count / stat.hs_count * 100) if stat.hs_count > 0 else 0
             stats_response.append(ChapterStats(
                 chapter=stat.chapter,
                 rule_count=stat.rule_count,
                 coverage_percentage=round(coverage, 2)
             ))
+        total_count = sum(stat.rule_count for stat in chapter_stats)
         
         return RulesByFTAResponse(
             rules=[RuleResponse(**rule._asdict()) for rule in rules],
             total_count=total_count,
             chapter_stats=stats_response,
-            current_page=(offset // limit) + 1,
-            total_pages=(total_count + limit - 1) // limit
+            total_pages=(total_count + limit - 1) // limit,
+            next_cursor=next_cursor
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching rules for FTA {fta_id_or_name}: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
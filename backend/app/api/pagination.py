@@ -0,0 +1,51 @@
+"""Opaque keyset cursors shared by paginated endpoints."""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Tuple
+
+from fastapi import HTTPException
+
+
+def _default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row on a page into a URL-safe token.
+
+    Args:
+        values: Sort key columns in ORDER BY order
+
+    Returns:
+        Opaque cursor string for the next page
+    """
+    raw = json.dumps(values, separators=(",", ":"), default=_default).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: Callable[[Any], Any]) -> Tuple[Any, ...]:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor: Token from a previous page's ``next_cursor``
+        types: One converter per sort key column (e.g. ``str, int, datetime.fromisoformat``)
+
+    Returns:
+        Tuple of converted sort key values
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or has the wrong shape
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("unexpected cursor shape")
+        return tuple(convert(value) for convert, value in zip(types, values))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -14,7 +14,7 @@ from sqlalchemy.orm import selectinload
 from pydantic import BaseModel, EmailStr, validator
 
 from app.core.database import get_db
-from app.core.tenant_context import tenant_context, require_tenant_context
+from app.core.tenant_context import tenant_context, require_tenant_context, notify_tenant_changed
 from app.models.tenant import (
     Tenant, TenantQuota, TenantUsage, TenantBilling, TenantAuditLog,
     TenantStatus, TenantPlan, BillingCycle
@@ -236,6 +236,7 @@ async def create_tenant(
     
     await db.commit()
     await db.refresh(tenant)
+    notify_tenant_changed(tenant.id, tenant.subdomain)
     
     # Schedule onboarding tasks
     background_tasks.add_task(onboard_tenant, tenant.id)
@@ -423,6 +424,7 @@ async def update_tenant(
     
     await db.commit()
     await db.refresh(tenant)
+    notify_tenant_changed(tenant.id, tenant.subdomain)
     
     return tenant
 
@@ -466,6 +468,7 @@ async def activate_tenant(
     db.add(audit_log)
     
     await db.commit()
+    notify_tenant_changed(tenant_id)
     
     return {"message": "Tenant activated successfully"}
 
@@ -511,6 +514,7 @@ async def suspend_tenant(
     db.add(audit_log)
     
     await db.commit()
+    notify_tenant_changed(tenant_id)
     
     return {"message": "Tenant suspended successfully"}
 
@@ -6,15 +6,14 @@ Supports SOC2, GDPR, and other regulatory requirements.
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Optional, Dict, Any, List
-import json
-import hashlib
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Index, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Text, Boolean, Index, ForeignKey
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 import uuid
 
 from app.core.database import Base
+from .chain_verifier import compute_checksum, link_next
 
 class AuditEventType(str, Enum):
     """Audit event types for compliance tracking."""
@@ -145,36 +144,75 @@ class AuditLog(Base):
         Index('idx_audit_resource', 'resource_type', 'resource_id'),
         Index('idx_audit_compliance', 'compliance_frameworks'),
         Index('idx_audit_severity_timestamp', 'severity', 'timestamp'),
+        Index('idx_audit_chain_order', 'timestamp', 'id'),
     )
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        if not self.timestamp:
+            # Set before hashing; the column default would only apply at INSERT
+            self.timestamp = datetime.utcnow()
         if not self.retention_date:
             # Default 7-year retention for compliance
             self.retention_date = datetime.utcnow() + timedelta(days=7*365)
         self._calculate_checksum()
     
+    @classmethod
+    def append(cls, session, **fields) -> "AuditLog":
+        """
+        Add an audit record linked to the latest one in the chain.
+
+        The chain stays locked until ``session`` commits; see ``link_next``.
+        """
+        record = cls(**fields)
+        link_next(session.connection(), record)
+        session.add(record)
+        session.flush()
+        return record
+    
     def _calculate_checksum(self):
         """Calculate tamper-proof checksum."""
-        data = {
-            'timestamp': self.timestamp.isoformat() if self.timestamp else '',
-            'event_type': self.event_type or '',
-            'user_id': str(self.user_id) if self.user_id else '',
-            'action': self.action or '',
-            'description': self.description or '',
-            'success': self.success,
-            'previous_checksum': self.previous_checksum or ''
-        }
-        
-        data_string = json.dumps(data, sort_keys=True)
-        self.checksum = hashlib.sha256(data_string.encode()).hexdigest()
+        self.checksum = compute_checksum(
+            self.timestamp,
+            self.event_type,
+            self.user_id,
+            self.action,
+            self.description,
+            self.success,
+            self.previous_checksum
+        )
     
     def verify_integrity(self) -> bool:
-        """Verify the integrity of this audit record."""
+        """
+        Verify the integrity of this audit record.
+
+        Checks this row only; use ``AuditChainVerifier`` to verify the chain.
+        """
         original_checksum = self.checksum
         self._calculate_checksum()
         return original_checksum == self.checksum
 
+class AuditChainCheckpoint(Base):
+    """
+    Signed record of the last audit log row verified by ``AuditChainVerifier``.
+    Incremental verification resumes after the latest checkpoint.
+    """
+    __tablename__ = "audit_chain_checkpoints"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Last verified row, in (timestamp, id) chain order
+    last_timestamp = Column(DateTime, nullable=False)
+    last_id = Column(UUID(as_uuid=True), nullable=False)
+    last_checksum = Column(String(64), nullable=False)
+    
+    # Rows verified from the start of the chain up to last_id
+    rows_verified = Column(BigInteger, nullable=False)
+    
+    # HMAC-SHA256 over the fields above (AUDIT_CHECKPOINT_KEY)
+    signature = Column(String(64), nullable=False)
+
 class AuditAlert(Base):
     """
     Audit alerts for real-time monitoring.
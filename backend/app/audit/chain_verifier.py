@@ -0,0 +1,424 @@
+"""
+Streaming verification of the audit log hash chain.
+
+Every ``audit_logs`` row stores a SHA-256 ``checksum`` over its content and the
+``previous_checksum`` of the row before it, in ``(timestamp, id)`` order. The
+verifier reads the chain in keyset-paged chunks and checks each chunk in a
+worker process; the last stored checksum of one chunk is handed to the next as
+its expected link, so chunks verify independently and only a few are held in
+memory at a time.
+
+A clean run records an HMAC-signed checkpoint (last row key, its checksum and
+the running row count). Later runs check the signature and that the checkpoint
+row still carries the same checksum, then verify only rows after it. Because
+each checksum covers the previous one, rewriting history before a checkpoint
+changes the checkpoint row's checksum unless the rewrite stops short of
+recomputing the chain, which a periodic full run (``incremental=False``) catches.
+
+Writers link new rows with :func:`link_next`, which serialises appends with a
+transaction-scoped advisory lock so each row's ``previous_checksum`` is the
+checksum of the row before it in chain order.
+
+Rows written before the chain existed were hashed with an empty timestamp and
+never linked. Rows older than the recorded cutover (``audit_chain_cutover``,
+set by the migration) are accepted with that legacy hash and no link check;
+the first row after the cutover links to the last legacy row.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    BigInteger, Boolean, DateTime, Integer, String, Text, column, func, inspect, select, table, tuple_
+)
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+audit_logs = table(
+    "audit_logs",
+    column("id", String),
+    column("timestamp", DateTime),
+    column("event_type", String),
+    column("user_id", String),
+    column("action", String),
+    column("description", Text),
+    column("success", Boolean),
+    column("checksum", String),
+    column("previous_checksum", String),
+)
+
+audit_chain_checkpoints = table(
+    "audit_chain_checkpoints",
+    column("id", Integer),
+    column("created_at", DateTime),
+    column("last_timestamp", DateTime),
+    column("last_id", String),
+    column("last_checksum", String),
+    column("rows_verified", BigInteger),
+    column("signature", String),
+)
+
+audit_chain_cutover = table(
+    "audit_chain_cutover",
+    column("legacy_before", DateTime),
+)
+
+CHAIN_COLUMNS = (
+    audit_logs.c.id,
+    audit_logs.c.timestamp,
+    audit_logs.c.event_type,
+    audit_logs.c.user_id,
+    audit_logs.c.action,
+    audit_logs.c.description,
+    audit_logs.c.success,
+    audit_logs.c.checksum,
+    audit_logs.c.previous_checksum,
+)
+
+# Stop recording individual breaks past this many (they are still counted)
+MAX_RECORDED_BREAKS = 1000
+
+# pg_advisory_xact_lock key serialising audit chain appends
+AUDIT_CHAIN_LOCK_ID = 0x41554449  # "AUDI"
+
+
+def compute_checksum(
+    timestamp: Optional[datetime],
+    event_type: Optional[str],
+    user_id: Any,
+    action: Optional[str],
+    description: Optional[str],
+    success: Optional[bool],
+    previous_checksum: Optional[str],
+) -> str:
+    """SHA-256 over an audit record's tamper-protected fields (see ``AuditLog``)."""
+    return _checksum(
+        timestamp.isoformat() if timestamp else '',
+        event_type,
+        str(user_id) if user_id else '',
+        action,
+        description,
+        success,
+        previous_checksum
+    )
+
+
+def _checksum(timestamp_iso: str, event_type, user_id: str, action, description, success, previous_checksum) -> str:
+    data = {
+        'timestamp': timestamp_iso,
+        'event_type': event_type or '',
+        'user_id': user_id,
+        'action': action or '',
+        'description': description or '',
+        'success': success,
+        'previous_checksum': previous_checksum or ''
+    }
+    data_string = json.dumps(data, sort_keys=True)
+    return hashlib.sha256(data_string.encode()).hexdigest()
+
+
+def link_next(conn: Connection, record: Any) -> None:
+    """
+    Chain ``record`` after the last audit row; call in the transaction that inserts it.
+
+    On PostgreSQL a transaction-scoped advisory lock makes concurrent writers
+    append one at a time (other dialects rely on their own write locking); it
+    is released at commit, so the tail read here sees the previous writer's
+    row under READ COMMITTED. ``record.timestamp`` is moved just past the
+    tail's when needed, so (timestamp, id) order always matches append order,
+    then ``previous_checksum`` and ``checksum`` are set.
+
+    Args:
+        conn: Connection in the inserting transaction (``session.connection()``)
+        record: Object with the ``AuditLog`` chain attributes
+    """
+    if conn.dialect.name == "postgresql":
+        conn.execute(select(func.pg_advisory_xact_lock(AUDIT_CHAIN_LOCK_ID)))
+    tail = conn.execute(
+        select(audit_logs.c.timestamp, audit_logs.c.checksum)
+        .order_by(audit_logs.c.timestamp.desc(), audit_logs.c.id.desc())
+        .limit(1)
+    ).first()
+
+    timestamp = record.timestamp or datetime.utcnow()
+    if tail is not None and timestamp <= tail.timestamp:
+        timestamp = tail.timestamp + timedelta(microseconds=1)
+    record.timestamp = timestamp
+    record.previous_checksum = tail.checksum if tail is not None else None
+    record.checksum = compute_checksum(
+        record.timestamp,
+        record.event_type,
+        record.user_id,
+        record.action,
+        record.description,
+        record.success,
+        record.previous_checksum
+    )
+
+
+def _portable_row(row: Tuple, legacy_before: Optional[datetime] = None) -> Tuple:
+    """
+    Row with the timestamp pre-rendered, so it pickles cheaply to worker
+    processes, plus whether it predates the chain cutover.
+    """
+    record_id, timestamp, event_type, user_id, action, description, success, checksum, previous_checksum = row
+    return (
+        str(record_id),
+        timestamp.isoformat() if timestamp else '',
+        event_type,
+        str(user_id) if user_id else '',
+        action,
+        description,
+        success,
+        checksum,
+        previous_checksum,
+        legacy_before is not None and timestamp is not None and timestamp < legacy_before,
+    )
+
+
+@dataclass(frozen=True)
+class ChainBreak:
+    position: int  # 0-based offset of the row within this run
+    record_id: Optional[str]
+    reason: str  # checksum_mismatch, broken_link, checkpoint_signature, checkpoint_anchor
+
+
+@dataclass
+class VerificationResult:
+    rows_verified: int = 0
+    total_verified: int = 0  # including rows covered by the starting checkpoint
+    break_count: int = 0
+    breaks: List[ChainBreak] = field(default_factory=list)
+    from_checkpoint: bool = False
+    checkpoint_saved: bool = False
+    last_key: Optional[Tuple[datetime, str]] = None
+    last_checksum: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.break_count == 0
+
+    def add_breaks(self, breaks: Sequence[ChainBreak]) -> None:
+        self.break_count += len(breaks)
+        room = MAX_RECORDED_BREAKS - len(self.breaks)
+        if room > 0:
+            self.breaks.extend(breaks[:room])
+
+
+def verify_chunk(rows: Sequence[Tuple], expected_previous: Optional[str], first_position: int) -> List[ChainBreak]:
+    """
+    Verify checksums and links of consecutive chain rows.
+
+    Runs in worker processes, so it only takes plain tuples.
+
+    Args:
+        rows: Rows in chain order, columns as in ``CHAIN_COLUMNS`` with the
+            id, timestamp and user id already rendered as strings, plus a
+            trailing flag for rows before the legacy cutover
+        expected_previous: Stored checksum of the row before ``rows[0]``;
+            None when unknown (start of the table), which skips that link
+        first_position: Run-wide position of ``rows[0]``
+
+    Returns:
+        Breaks found in this chunk
+    """
+    breaks = []
+    previous = expected_previous
+    for offset, (record_id, timestamp, event_type, user_id, action, description, success, checksum, previous_checksum, legacy) in enumerate(rows):
+        position = first_position + offset
+        if legacy:
+            # Unlinked and hashed without its timestamp (set only at INSERT) by the old writer
+            legacy_checksum = _checksum('', event_type, user_id, action, description, success, previous_checksum)
+            expected = _checksum(timestamp, event_type, user_id, action, description, success, previous_checksum)
+            if not (hmac.compare_digest(legacy_checksum, checksum or "") or hmac.compare_digest(expected, checksum or "")):
+                breaks.append(ChainBreak(position, record_id, "checksum_mismatch"))
+            previous = checksum
+            continue
+        if (offset or expected_previous is not None) and (previous_checksum or None) != (previous or None):
+            breaks.append(ChainBreak(position, record_id, "broken_link"))
+        expected = _checksum(timestamp, event_type, user_id, action, description, success, previous_checksum)
+        if not hmac.compare_digest(expected, checksum or ""):
+            breaks.append(ChainBreak(position, record_id, "checksum_mismatch"))
+        previous = checksum
+    return breaks
+
+
+def sign_checkpoint(key: bytes, last_timestamp: datetime, last_id: str, last_checksum: str, rows_verified: int) -> str:
+    """HMAC-SHA256 over the checkpoint fields."""
+    message = f"{last_timestamp.isoformat()}|{last_id}|{last_checksum}|{rows_verified}".encode()
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+
+class AuditChainVerifier:
+    """
+    Chunked, parallel, checkpointed verifier for ``audit_logs``.
+
+    Args:
+        engine: Engine for the audit database
+        signing_key: HMAC key for checkpoints (default: ``AUDIT_CHECKPOINT_KEY``);
+            without one, runs are full and no checkpoints are written
+        chunk_size: Rows per keyset page and per verification task
+        max_workers: Chunks verified concurrently
+        executor: Executor for chunk verification (default: a process pool)
+        legacy_cutover: Rows older than this are checked as legacy rows (default:
+            the cutover recorded in ``audit_chain_cutover``, if any)
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        signing_key: Optional[bytes] = None,
+        chunk_size: int = int(os.getenv("AUDIT_VERIFY_CHUNK_SIZE", 50000)),
+        max_workers: int = int(os.getenv("AUDIT_VERIFY_WORKERS", os.cpu_count() or 2)),
+        executor: Optional[Executor] = None,
+        legacy_cutover: Optional[datetime] = None,
+    ):
+        self.engine = engine
+        self.legacy_cutover = legacy_cutover
+        if signing_key is None and os.getenv("AUDIT_CHECKPOINT_KEY"):
+            signing_key = os.getenv("AUDIT_CHECKPOINT_KEY").encode()
+        self.signing_key = signing_key
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.executor = executor
+
+    def verify(self, incremental: bool = True, save_checkpoint: bool = True) -> VerificationResult:
+        """
+        Verify the chain, from the last valid checkpoint when ``incremental``.
+
+        Args:
+            incremental: Start after the latest checkpoint instead of the first row
+            save_checkpoint: Record a signed checkpoint when the run finds no breaks
+
+        Returns:
+            VerificationResult with counts and the first breaks found
+        """
+        result = VerificationResult()
+        start_key: Optional[Tuple[datetime, str]] = None
+        carry: Optional[str] = None
+
+        with self.engine.connect() as conn:
+            legacy_before = self.legacy_cutover or self._load_cutover(conn)
+            checkpoint = self._load_checkpoint(conn, result) if incremental and self.signing_key else None
+        if checkpoint is not None:
+            start_key = (checkpoint["last_timestamp"], checkpoint["last_id"])
+            carry = checkpoint["last_checksum"]
+            result.from_checkpoint = True
+            result.total_verified = checkpoint["rows_verified"]
+            result.last_key, result.last_checksum = start_key, carry
+
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            self._verify_from(start_key, carry, executor, result, legacy_before)
+        finally:
+            if self.executor is None:
+                executor.shutdown()
+
+        result.total_verified += result.rows_verified
+        logger.info(
+            f"Audit chain verified: {result.rows_verified} rows this run, {result.total_verified} total, "
+            f"{result.break_count} breaks"
+        )
+        if save_checkpoint and result.ok and result.rows_verified and self.signing_key:
+            self._save_checkpoint(result)
+            result.checkpoint_saved = True
+        return result
+
+    def _verify_from(
+        self,
+        start_key: Optional[Tuple[datetime, str]],
+        carry: Optional[str],
+        executor: Executor,
+        result: VerificationResult,
+        legacy_before: Optional[datetime] = None,
+    ) -> None:
+        """Page through rows after ``start_key`` and verify the pages in parallel, in order."""
+        pending: deque = deque()
+        position = 0
+        key = start_key
+        with self.engine.connect() as conn:
+            while True:
+                query = select(*CHAIN_COLUMNS).order_by(audit_logs.c.timestamp, audit_logs.c.id).limit(self.chunk_size)
+                if key is not None:
+                    query = query.where(tuple_(audit_logs.c.timestamp, audit_logs.c.id) > tuple_(*key))
+                rows = conn.execute(query).all()
+                if not rows:
+                    break
+
+                chunk = [_portable_row(row, legacy_before) for row in rows]
+                pending.append(executor.submit(verify_chunk, chunk, carry, position))
+                # Keep a bounded number of chunks in flight; collect in submission order
+                while len(pending) >= self.max_workers * 2:
+                    result.add_breaks(pending.popleft().result())
+
+                last = rows[-1]
+                key = (last[1], str(last[0]))
+                carry = last[7]
+                position += len(rows)
+                result.last_key, result.last_checksum = key, carry
+                if len(rows) < self.chunk_size:
+                    break
+
+        while pending:
+            result.add_breaks(pending.popleft().result())
+        result.rows_verified = position
+
+    def _load_cutover(self, conn: Connection) -> Optional[datetime]:
+        """Legacy cutover recorded by the migration, if the table exists."""
+        if not inspect(conn).has_table("audit_chain_cutover"):
+            return None
+        return conn.execute(select(func.max(audit_chain_cutover.c.legacy_before))).scalar()
+
+    def _load_checkpoint(self, conn: Connection, result: VerificationResult) -> Optional[dict]:
+        """Latest checkpoint if its signature and anchor row check out; breaks are recorded otherwise."""
+        row = conn.execute(
+            select(audit_chain_checkpoints).order_by(audit_chain_checkpoints.c.id.desc()).limit(1)
+        ).mappings().first()
+        if row is None:
+            return None
+
+        signature = sign_checkpoint(
+            self.signing_key, row["last_timestamp"], str(row["last_id"]), row["last_checksum"], row["rows_verified"]
+        )
+        if not hmac.compare_digest(signature, row["signature"] or ""):
+            logger.error(f"Audit checkpoint {row['id']} has an invalid signature; verifying the full chain")
+            result.add_breaks([ChainBreak(0, None, "checkpoint_signature")])
+            return None
+
+        anchor = conn.execute(
+            select(audit_logs.c.checksum).where(
+                audit_logs.c.timestamp == row["last_timestamp"], audit_logs.c.id == str(row["last_id"])
+            )
+        ).scalar()
+        if anchor != row["last_checksum"]:
+            logger.error(f"Audit row {row['last_id']} no longer matches checkpoint {row['id']}; verifying the full chain")
+            result.add_breaks([ChainBreak(0, str(row["last_id"]), "checkpoint_anchor")])
+            return None
+
+        return {**row, "last_id": str(row["last_id"])}
+
+    def _save_checkpoint(self, result: VerificationResult) -> None:
+        last_timestamp, last_id = result.last_key
+        signature = sign_checkpoint(
+            self.signing_key, last_timestamp, last_id, result.last_checksum, result.total_verified
+        )
+        with self.engine.begin() as conn:
+            conn.execute(
+                audit_chain_checkpoints.insert().values(
+                    created_at=datetime.utcnow(),
+                    last_timestamp=last_timestamp,
+                    last_id=last_id,
+                    last_checksum=result.last_checksum,
+                    rows_verified=result.total_verified,
+                    signature=signature,
+                )
+            )
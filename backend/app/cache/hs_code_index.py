@@ -0,0 +1,84 @@
+"""
+In-process prefix index over HS codes.
+
+HS autocomplete is dominated by numeric prefix lookups ("8471", "8471.30").
+The full nomenclature is a few thousand short codes, so it fits comfortably in
+memory as a digit trie. Each node keeps the first ``limit`` codes below it in
+lexical order, which makes a lookup a walk of at most ``len(prefix)`` nodes
+with no sorting or database round trip.
+"""
+
+import re
+import time
+from typing import Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_SEPARATORS = re.compile(r"[\s.\-]")
+
+
+def normalize_code(code: str) -> str:
+    """Strip the separators HS codes are commonly written with ("8471.30.00" -> "84713000")."""
+    return _SEPARATORS.sub("", code)
+
+
+class _Node:
+    __slots__ = ("children", "items")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.items: list = []
+
+
+class HSCodePrefixIndex(Generic[T]):
+    """
+    Immutable digit trie mapping code prefixes to their first ``limit`` matches.
+
+    Args:
+        entries: ``(code, value)`` pairs; codes are normalized before indexing
+        limit: Maximum matches retained (and returned) per prefix
+
+    An exact match always comes first because a code sorts before every
+    longer code it prefixes.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, T]], limit: int = 50):
+        self.limit = limit
+        self.loaded_at = time.monotonic()
+        self._root = _Node()
+        self._size = 0
+
+        for key, value in sorted(((normalize_code(code), value) for code, value in entries), key=lambda entry: entry[0]):
+            node = self._root
+            if len(node.items) < limit:
+                node.items.append(value)
+            for digit in key:
+                node = node.children.setdefault(digit, _Node())
+                if len(node.items) < limit:
+                    node.items.append(value)
+            self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def age(self) -> float:
+        """Seconds since the index was built."""
+        return time.monotonic() - self.loaded_at
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> List[T]:
+        """
+        Return codes starting with ``prefix`` in lexical order.
+
+        Args:
+            prefix: Code prefix, with or without separators
+            limit: Cap below the index limit
+
+        Returns:
+            Up to ``limit`` matching values; empty when nothing matches
+        """
+        node = self._root
+        for digit in normalize_code(prefix):
+            node = node.children.get(digit)
+            if node is None:
+                return []
+        return node.items[: limit if limit is not None else self.limit]
@@ -0,0 +1,128 @@
+"""
+Pre-serialised HS code hierarchy.
+
+The nomenclature changes a few times a year but the tree endpoint is hit on
+every classification screen. A snapshot links all nodes in one pass through a
+code -> node map and renders the tree to compact JSON once per depth. Each
+node's byte range in that buffer is recorded, so serving any subtree is a
+slice of pre-rendered bytes rather than a rebuild.
+
+Rendered shape (unchanged from the original endpoint)::
+
+    {"<code>": {"description": "...", "count": <children>, "children": {...}}, ...}
+"""
+
+import hashlib
+import json
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+Row = Tuple[str, Optional[str], Optional[str], int]
+
+
+class _Node:
+    __slots__ = ("code", "level", "head", "children")
+
+    def __init__(self, code: str, description: Optional[str], level: int):
+        self.code = code
+        self.level = level
+        # Everything up to the child count, encoded once and shared by every depth
+        self.head = (
+            json.dumps(code).encode() + b':{"description":' + json.dumps(description).encode() + b',"count":'
+        )
+        self.children: List["_Node"] = []
+
+
+def snapshot_version(rows: Sequence[Row]) -> str:
+    """Content hash identifying a nomenclature version."""
+    digest = hashlib.sha1()
+    for row in sorted(rows, key=lambda row: row[0]):
+        digest.update(json.dumps(row).encode())
+    return digest.hexdigest()[:16]
+
+
+class HSCodeTreeSnapshot:
+    """
+    Immutable rendered HS tree for depths ``1..max_depth``.
+
+    Args:
+        rows: ``(code, parent_code, description, level)`` for every code
+        max_depth: Deepest level rendered
+        version: Nomenclature version; derived from ``rows`` when omitted
+
+    Nodes whose parent is missing are unreachable from the roots and are left
+    out, as they were with the recursive CTE.
+    """
+
+    def __init__(self, rows: Sequence[Row], max_depth: int = 4, version: Optional[str] = None):
+        self.version = version or snapshot_version(rows)
+        self.max_depth = max_depth
+
+        nodes: Dict[str, _Node] = {}
+        ordered = sorted(rows, key=lambda row: row[0])
+        for code, _, description, level in ordered:
+            nodes[code] = _Node(code, description, level)
+
+        roots: List[_Node] = []
+        for code, parent_code, _, _ in ordered:
+            if parent_code is None:
+                roots.append(nodes[code])
+            elif parent_code in nodes:
+                nodes[parent_code].children.append(nodes[code])
+
+        self._rendered = {depth: self._render(roots, depth) for depth in range(1, max_depth + 1)}
+
+    @staticmethod
+    def _render(roots: List[_Node], depth: int) -> Tuple[bytes, Dict[str, Tuple[int, int]]]:
+        parts: List[bytes] = []
+        offsets: Dict[str, Tuple[int, int]] = {}
+        size = 0
+
+        def emit(chunk: bytes) -> None:
+            nonlocal size
+            parts.append(chunk)
+            size += len(chunk)
+
+        def members(nodes: Iterable[_Node]) -> None:
+            separator = b""
+            for node in nodes:
+                if node.level > depth:
+                    continue
+                emit(separator)
+                separator = b","
+                start = size
+                children = [child for child in node.children if child.level <= depth]
+                emit(node.head)
+                emit(b'%d,"children":{' % len(children))
+                members(children)
+                emit(b"}}")
+                offsets[node.code] = (start, size)
+
+        emit(b"{")
+        members(roots)
+        emit(b"}")
+        return b"".join(parts), offsets
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._rendered[self.max_depth][1]
+
+    def render(self, depth: int, code: Optional[str] = None) -> Optional[bytes]:
+        """
+        Return the JSON tree down to ``depth``, optionally just ``code``'s subtree.
+
+        Args:
+            depth: Deepest level included (``1..max_depth``)
+            code: Root of the requested subtree
+
+        Returns:
+            Compact JSON bytes, or None when ``code`` is not in the tree at ``depth``
+        """
+        body, offsets = self._rendered[depth]
+        if code is None:
+            return body
+        span = offsets.get(code)
+        if span is None:
+            return None
+        return b"{" + body[span[0]:span[1]] + b"}"
+
+    def etag(self, depth: int, code: Optional[str] = None) -> str:
+        return f'"{self.version}-{depth}-{code or "*"}"'
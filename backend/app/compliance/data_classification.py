@@ -6,18 +6,39 @@ Implements data classification for PII, sensitive, and public data with automate
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Set
 from enum import Enum
+import asyncio
 import re
 import json
-from sqlalchemy import Column, String, DateTime, Text, Boolean, Integer
+from collections import Counter
+from sqlalchemy import Column, String, DateTime, Text, Boolean, Integer, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 import logging
 
 from ..core.database import Base
+from .pattern_matcher import CompiledPatternSet, KeywordMatcher
+from .schema_sampler import TableInfo, list_tables, scan_tables
 
 logger = logging.getLogger(__name__)
 
+# Content keywords per category, matched as whole words in sample data
+SENSITIVE_KEYWORDS = {
+    "medical": ["diagnosis", "treatment", "medication", "symptom", "disease", "illness"],
+    "financial": ["account", "balance", "income", "salary", "payment", "transaction"],
+    "legal": ["lawsuit", "court", "legal", "attorney", "judge", "verdict"],
+}
+
+# Alternation order for the combined PII regex: where two patterns match at the
+# same position the earlier one wins, so loose patterns (a phone number also
+# matches the first ten digits of a card number) go last
+PII_MATCH_PRIORITY = ["ssn", "credit_card", "email", "ip_address", "date_of_birth"]
+
+# Document-number patterns that overlap other patterns (and each other: every
+# driver_license match is also a passport match) but are separate detections,
+# so each is scanned on its own instead of losing ties in the combined regex
+PII_SCANNED_SEPARATELY = ["passport", "driver_license"]
+
 class DataClassification(Enum):
     PUBLIC = "public"
     INTERNAL = "internal"
@@ -113,7 +134,23 @@ class DataClassifier:
         self.db = db
         self.classification_rules = self._load_classification_rules()
         self.pii_patterns = self._load_pii_patterns()
-        
+
+        # Compiled once per classifier; every value is scanned in one pass per matcher
+        separate = [name for name in PII_SCANNED_SEPARATELY if name in self.pii_patterns]
+        match_order = [name for name in PII_MATCH_PRIORITY if name in self.pii_patterns]
+        match_order += [name for name in self.pii_patterns if name not in match_order + separate]
+        self.pii_matchers = [
+            CompiledPatternSet({name: self.pii_patterns[name] for name in group}, re.IGNORECASE)
+            for group in [match_order] + [[name] for name in separate]
+        ]
+        self.sensitive_keyword_matcher = KeywordMatcher(
+            {keyword: category for category, keywords in SENSITIVE_KEYWORDS.items() for keyword in keywords},
+            whole_words=True
+        )
+        self.rule_keyword_matcher = KeywordMatcher(
+            {keyword: rule["name"] for rule in self.classification_rules for keyword in rule["keywords"]}
+        )
+
     def _load_classification_rules(self) -> List[Dict[str, Any]]:
         """Load classification rules from database or default rules"""
         default_rules = [
@@ -222,6 +259,14 @@ class DataClassifier:
         sample_data: Optional[str] = None
     ) -> ClassificationResult:
         """Classify a data element based on its metadata and sample data"""
+        return self.classify_element(element, sample_data)
+
+    def classify_element(
+        self,
+        element: DataElementModel,
+        sample_data: Optional[str] = None
+    ) -> ClassificationResult:
+        """Synchronous :meth:`classify_data_element`, for use from worker threads"""
         try:
             classification_scores = {}
             sensitivity_scores = {}
@@ -294,6 +339,9 @@ class DataClassifier:
             element.column_name.lower() if element.column_name else ""
         ]))
         
+        # One pass finds every rule keyword contained in the text
+        found_keywords = self.rule_keyword_matcher.found(text_to_analyze)
+
         # Check against classification rules
         for rule in self.classification_rules:
             score = 0
@@ -301,7 +349,7 @@ class DataClassifier:
             
             # Check keywords
             for keyword in rule["keywords"]:
-                if keyword.lower() in text_to_analyze:
+                if keyword.lower() in found_keywords:
                     score += rule["confidence"]
                     rule_reasons.append(f"Keyword '{keyword}' found in field metadata")
             
@@ -323,8 +371,11 @@ class DataClassifier:
         reasons = []
         
         # Check against PII patterns
-        for pii_type, pattern in self.pii_patterns.items():
-            matches = re.findall(pattern, sample_data, re.IGNORECASE)
+        pii_counts = Counter()
+        for matcher in self.pii_matchers:
+            pii_counts.update(matcher.counts(sample_data))
+        for pii_type in self.pii_patterns:
+            matches = pii_counts.get(pii_type, 0)
             if matches:
                 # Determine classification based on PII type
                 if pii_type in ["ssn", "passport", "driver_license"]:
@@ -340,18 +391,12 @@ class DataClassifier:
                     classifications[DataClassification.PII.value] = 70
                     sensitivities[DataSensitivity.MEDIUM.value] = 70
                 
-                reasons.append(f"Detected {pii_type} pattern in sample data ({len(matches)} matches)")
-        
-        # Check for other sensitive patterns
-        sensitive_patterns = {
-            "medical": r"\b(diagnosis|treatment|medication|symptom|disease|illness)\b",
-            "financial": r"\b(account|balance|income|salary|payment|transaction)\b",
-            "legal": r"\b(lawsuit|court|legal|attorney|judge|verdict)\b"
-        }
+                reasons.append(f"Detected {pii_type} pattern in sample data ({matches} matches)")
         
-        for category, pattern in sensitive_patterns.items():
-            matches = re.findall(pattern, sample_data, re.IGNORECASE)
-            if matches:
+        # Check for other sensitive content
+        keyword_counts = self.sensitive_keyword_matcher.label_counts(sample_data)
+        for category in SENSITIVE_KEYWORDS:
+            if keyword_counts.get(category):
                 if category == "medical":
                     classifications[DataClassification.HEALTH.value] = 85
                     sensitivities[DataSensitivity.CRITICAL.value] = 85
@@ -417,65 +462,92 @@ class DataClassifier:
     async def scan_database_schema(
         self, 
         connection_string: str, 
-        database_name: str
+        database_name: str,
+        schema: Optional[str] = None,
+        sample_rows: int = 100,
+        max_workers: int = 8,
+        timeout_ms: int = 30000
     ) -> List[Dict[str, Any]]:
-        """Scan database schema and classify all columns"""
+        """
+        Scan database schema and classify all columns.
+
+        Tables are sampled concurrently on ``max_workers`` threads (large
+        PostgreSQL tables through ``TABLESAMPLE``); every column is classified
+        by its name and, for text-like columns, by its sampled values.
+
+        Args:
+            connection_string: SQLAlchemy URL of the database to scan
+            database_name: Name recorded as the source system
+            schema: Schema to scan (default: ``public`` / the default schema)
+            sample_rows: Rows sampled per table
+            max_workers: Tables sampled at the same time (and pool connections)
+            timeout_ms: Statement timeout per sample query
+
+        Returns:
+            One result per column, in table and column order
+        """
         try:
-            # This would connect to the database and scan all tables/columns
-            # For now, returning a mock result
-            
-            scan_results = []
-            
-            # Mock database scan results
-            mock_tables = [
-                {
-                    "table": "users",
-                    "columns": [
-                        {"name": "email", "type": "varchar", "sample": "user@example.com"},
-                        {"name": "phone", "type": "varchar", "sample": "555-123-4567"},
-                        {"name": "ssn", "type": "varchar", "sample": "123-45-6789"},
-                        {"name": "address", "type": "text", "sample": "123 Main St"},
-                    ]
-                },
-                {
-                    "table": "payments",
-                    "columns": [
-                        {"name": "card_number", "type": "varchar", "sample": "4111-1111-1111-1111"},
-                        {"name": "amount", "type": "decimal", "sample": "99.99"},
-                    ]
-                }
-            ]
-            
-            for table in mock_tables:
-                for column in table["columns"]:
-                    element = DataElementModel(
-                        name=column["name"],
-                        data_type=column["type"],
-                        source_system=database_name,
-                        table_name=table["table"],
-                        column_name=column["name"],
-                        sample_data=column["sample"]
-                    )
-                    
-                    classification_result = await self.classify_data_element(element, column["sample"])
-                    
-                    scan_results.append({
-                        "database": database_name,
-                        "table": table["table"],
-                        "column": column["name"],
-                        "data_type": column["type"],
-                        "classification": classification_result.classification.value,
-                        "sensitivity": classification_result.sensitivity.value,
-                        "confidence": classification_result.confidence,
-                        "reasons": classification_result.reasons,
-                        "recommendations": classification_result.recommendations
-                    })
-            
-            return scan_results
+            engine = create_engine(
+                connection_string,
+                pool_size=max_workers,
+                max_overflow=0,
+                pool_pre_ping=True
+            )
+            try:
+                tables = await asyncio.to_thread(list_tables, engine, schema)
+                logger.info(f"Scanning {len(tables)} tables in {database_name} with {max_workers} workers")
+
+                def classify_table(info: TableInfo, samples: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+                    return self._classify_table(database_name, info, samples)
+
+                per_table = await asyncio.to_thread(
+                    scan_tables, engine, tables, classify_table, max_workers, sample_rows, timeout_ms
+                )
+            finally:
+                engine.dispose()
+
+            return [result for table_results in per_table for result in table_results]
             
         except Exception as e:
             logger.error(f"Error scanning database schema: {str(e)}")
             raise
+
+    def _classify_table(
+        self,
+        database_name: str,
+        info: TableInfo,
+        samples: Dict[str, List[str]]
+    ) -> List[Dict[str, Any]]:
+        """Classify every column of a sampled table"""
+        results = []
+        for column_name, data_type in info.columns:
+            values = samples.get(column_name) or []
+            sample_data = "\n".join(values) or None
+            element = DataElementModel(
+                name=column_name,
+                description=None,
+                data_type=data_type,
+                source_system=database_name,
+                table_name=info.name,
+                column_name=column_name,
+                sample_data=sample_data
+            )
+
+            classification_result = self.classify_element(element, sample_data)
+
+            results.append({
+                "database": database_name,
+                "table": info.name,
+                "column": column_name,
+                "data_type": data_type,
+                "sampled_values": len(values),
+                "classification": classification_result.classification.value,
+                "sensitivity": classification_result.sensitivity.value,
+                "confidence": classification_result.confidence,
+                "reasons": classification_result.reasons,
+                "recommendations": classification_result.recommendations
+            })
+        return results
     
     async def create_data_inventory(self, scan_results: List[Dict[str, Any]]) -> str:
         """Create or update data inventory from scan results"""
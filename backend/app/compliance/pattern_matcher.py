@@ -0,0 +1,165 @@
+"""
+Multi-pattern matchers used by data classification.
+
+:class:`CompiledPatternSet` folds many regexes into one alternation with a
+named group per pattern, so a value is scanned once instead of once per
+pattern. :class:`KeywordMatcher` is an Aho-Corasick automaton that finds every
+occurrence of a keyword list in a single pass over the text, with optional
+word-boundary checks; it uses the C implementation from ``pyahocorasick``
+when installed and a pure-Python automaton otherwise.
+"""
+
+import re
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Mapping, Set, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class CompiledPatternSet:
+    """
+    One compiled regex matching any of several named patterns.
+
+    Matches are non-overlapping and leftmost; when two patterns match at the
+    same position the one listed first wins, so list specific patterns before
+    looser ones that would also match their text.
+
+    Args:
+        patterns: Pattern name -> regex source, in priority order
+        flags: Regex flags applied to the combined pattern
+    """
+
+    def __init__(self, patterns: Mapping[str, str], flags: int = 0):
+        self.names = list(patterns)
+        self._groups: Dict[str, str] = {}
+        alternatives = []
+        for index, (name, pattern) in enumerate(patterns.items()):
+            # Group names must be identifiers; rule names may not be
+            group = f"p{index}"
+            self._groups[group] = name
+            alternatives.append(f"(?P<{group}>{pattern})")
+        self.regex = re.compile("|".join(alternatives), flags) if alternatives else None
+
+    def counts(self, text: str) -> Counter:
+        """Number of matches per pattern name (patterns without matches are absent)."""
+        counts: Counter = Counter()
+        if self.regex is None:
+            return counts
+        for match in self.regex.finditer(text):
+            counts[self._groups[match.lastgroup]] += 1
+        return counts
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a set of keywords.
+
+    Args:
+        keywords: Keyword -> label (e.g. a category or rule name); several
+            keywords may share a label
+        case_sensitive: Match case exactly; otherwise keywords and text are lowercased
+        whole_words: Only count hits not surrounded by word characters (like ``\\b`` in a regex)
+    """
+
+    def __init__(self, keywords: Mapping[str, str], case_sensitive: bool = False, whole_words: bool = False):
+        self.case_sensitive = case_sensitive
+        self.whole_words = whole_words
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (keyword, label) pairs ending here, including those inherited via fail links
+        self._out: List[List[Tuple[str, str]]] = [[]]
+        self._automaton = None
+
+        keywords = {
+            (keyword if case_sensitive else keyword.lower()): label
+            for keyword, label in keywords.items()
+            if keyword
+        }
+        if AHOCORASICK_AVAILABLE:
+            if keywords:
+                self._automaton = ahocorasick.Automaton()
+                for keyword, label in keywords.items():
+                    self._automaton.add_word(keyword, (keyword, label))
+                self._automaton.make_automaton()
+        else:
+            for keyword, label in keywords.items():
+                self._add(keyword, label)
+            self._build_fail_links()
+        self._size = len(keywords)
+
+    def _add(self, keyword: str, label: str) -> None:
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append((keyword, label))
+
+    def _build_fail_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, str, str]]:
+        """Yield ``(start, keyword, label)`` for every hit, overlapping hits included."""
+        if not self.case_sensitive:
+            text = text.lower()
+        for end, keyword, label in self._iter_ends(text):
+            start = end - len(keyword) + 1
+            if self.whole_words and not self._is_whole_word(text, start, end + 1):
+                continue
+            yield start, keyword, label
+
+    def _iter_ends(self, text: str) -> Iterable[Tuple[int, str, str]]:
+        """``(end index, keyword, label)`` for every hit."""
+        if self._automaton is not None:
+            for end, (keyword, label) in self._automaton.iter(text):
+                yield end, keyword, label
+            return
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword, label in out[state]:
+                yield end, keyword, label
+
+    @staticmethod
+    def _is_whole_word(text: str, start: int, end: int) -> bool:
+        before = text[start - 1] if start > 0 else ""
+        after = text[end] if end < len(text) else ""
+        return not (_is_word_char(before) or _is_word_char(after))
+
+    def found(self, text: str) -> Set[str]:
+        """Distinct keywords present in ``text``."""
+        return {keyword for _, keyword, _ in self.iter_matches(text)}
+
+    def label_counts(self, text: str) -> Counter:
+        """Number of hits per label."""
+        return Counter(label for _, _, label in self.iter_matches(text))
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def _is_word_char(char: str) -> bool:
+    return bool(char) and (char.isalnum() or char == "_")
+
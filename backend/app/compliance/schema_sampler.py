@@ -0,0 +1,157 @@
+"""
+Column sampling for database classification sweeps.
+
+Table and column metadata come from one catalog query. Each table is then
+sampled with a single ``SELECT`` of its text-like columns: on PostgreSQL large
+tables are read through ``TABLESAMPLE SYSTEM`` so only a few pages are
+touched, and every sample query runs under a statement timeout. Tables are
+processed on a bounded thread pool that shares one connection pool.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Text, cast, column, func, inspect, select, table, tablesample, text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Column types whose values are worth pattern-matching
+TEXT_TYPE_PREFIXES = ("char", "varchar", "character", "text", "citext", "json", "nvarchar", "nchar", "string", "clob")
+# Read this many times more rows than needed from TABLESAMPLE to make up for uneven pages
+OVERSAMPLE = 3
+# Tables smaller than sample_rows * this are read with a plain LIMIT
+SMALL_TABLE_FACTOR = 10
+# Longer values are truncated before matching
+MAX_VALUE_LENGTH = 512
+
+TABLES_QUERY = text("""
+    SELECT c.table_name, c.column_name, c.data_type, cls.reltuples::bigint AS estimated_rows
+    FROM information_schema.columns c
+    JOIN pg_namespace n ON n.nspname = c.table_schema
+    JOIN pg_class cls ON cls.relnamespace = n.oid AND cls.relname = c.table_name
+    WHERE c.table_schema = :schema AND cls.relkind IN ('r', 'p')
+    ORDER BY c.table_name, c.ordinal_position
+""")
+
+
+@dataclass
+class TableInfo:
+    name: str
+    schema: Optional[str] = None
+    columns: List[Tuple[str, str]] = field(default_factory=list)  # (name, data type)
+    estimated_rows: int = -1  # -1 when the planner has no estimate
+
+    @property
+    def text_columns(self) -> List[str]:
+        return [name for name, data_type in self.columns if is_text_type(data_type)]
+
+
+def is_text_type(data_type: str) -> bool:
+    return data_type.lower().startswith(TEXT_TYPE_PREFIXES)
+
+
+def list_tables(engine: Engine, schema: Optional[str] = None) -> List[TableInfo]:
+    """
+    All tables in ``schema`` with their columns and planner row estimates.
+
+    Args:
+        engine: Engine for the database to scan
+        schema: Schema name (default: ``public`` on PostgreSQL, the default schema elsewhere)
+
+    Returns:
+        TableInfo per table, ordered by name
+    """
+    if engine.dialect.name == "postgresql":
+        schema = schema or "public"
+        tables: Dict[str, TableInfo] = {}
+        with engine.connect() as conn:
+            for table_name, column_name, data_type, estimated_rows in conn.execute(TABLES_QUERY, {"schema": schema}):
+                info = tables.setdefault(table_name, TableInfo(table_name, schema, estimated_rows=int(estimated_rows)))
+                info.columns.append((column_name, data_type))
+        return list(tables.values())
+
+    inspector = inspect(engine)
+    return [
+        TableInfo(name, schema, [(col["name"], str(col["type"])) for col in inspector.get_columns(name, schema=schema)])
+        for name in sorted(inspector.get_table_names(schema=schema))
+    ]
+
+
+def sample_table(
+    engine: Engine,
+    info: TableInfo,
+    sample_rows: int = 100,
+    timeout_ms: int = 30000,
+) -> Dict[str, List[str]]:
+    """
+    Sample non-null values of ``info``'s text-like columns.
+
+    Args:
+        engine: Engine for the database
+        info: Table to sample
+        sample_rows: Rows to read at most
+        timeout_ms: Statement timeout for the sample query (PostgreSQL only)
+
+    Returns:
+        Column name -> sampled values; columns that are not text-like are absent
+    """
+    columns = info.text_columns
+    if not columns:
+        return {}
+
+    source = table(info.name, *(column(name) for name in columns), schema=info.schema)
+    postgres = engine.dialect.name == "postgresql"
+    if postgres and info.estimated_rows > sample_rows * SMALL_TABLE_FACTOR:
+        percent = min(100.0, 100.0 * sample_rows * OVERSAMPLE / info.estimated_rows)
+        source = tablesample(source, func.system(percent))
+    query = select(*(cast(source.c[name], Text) for name in columns)).limit(sample_rows)
+
+    samples: Dict[str, List[str]] = {name: [] for name in columns}
+    with engine.begin() as conn:
+        if postgres:
+            conn.execute(text("SELECT set_config('statement_timeout', :timeout, true)"), {"timeout": str(timeout_ms)})
+        for row in conn.execute(query):
+            for name, value in zip(columns, row):
+                if value is not None:
+                    samples[name].append(value[:MAX_VALUE_LENGTH])
+    return samples
+
+
+def scan_tables(
+    engine: Engine,
+    tables: List[TableInfo],
+    analyze: Callable[[TableInfo, Dict[str, List[str]]], Any],
+    max_workers: int = 8,
+    sample_rows: int = 100,
+    timeout_ms: int = 30000,
+) -> List[Any]:
+    """
+    Sample every table on a bounded pool and run ``analyze`` on each sample.
+
+    A table that cannot be sampled (permissions, timeout) is logged and
+    analysed with an empty sample, so one bad table does not abort the sweep.
+
+    Args:
+        engine: Engine whose pool should allow ``max_workers`` connections
+        tables: Tables from :func:`list_tables`
+        analyze: Called in the worker with the table and its samples
+        max_workers: Tables sampled concurrently
+        sample_rows: Rows to read per table
+        timeout_ms: Statement timeout per sample query
+
+    Returns:
+        ``analyze`` results in ``tables`` order
+    """
+    def work(info: TableInfo) -> Any:
+        try:
+            samples = sample_table(engine, info, sample_rows, timeout_ms)
+        except Exception as e:
+            logger.warning(f"Could not sample table {info.name}: {e}")
+            samples = {}
+        return analyze(info, samples)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="schema-scan") as pool:
+        return list(pool.map(work, tables))
@@ -1,5 +1,5 @@
 import os
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 class RateLimitConfig:
     # Default limits (requests per minute)
@@ -12,6 +12,13 @@ class RateLimitConfig:
     REDIS_PORT: int = int(os.getenv("RATE_LIMIT_REDIS_PORT", "6379"))
     REDIS_DB: int = int(os.getenv("RATE_LIMIT_REDIS_DB", "0"))
     REDIS_PASSWORD: Optional[str] = os.getenv("RATE_LIMIT_REDIS_PASSWORD")
+    # Keep the per-request Redis round trip bounded; fall back to local buckets beyond this
+    REDIS_TIMEOUT: float = float(os.getenv("RATE_LIMIT_REDIS_TIMEOUT", "0.05"))
+    REDIS_RETRY_INTERVAL: float = float(os.getenv("RATE_LIMIT_REDIS_RETRY_INTERVAL", "5"))
+
+    # Bucket keys and in-process fallback
+    KEY_PREFIX: str = "ratelimit"
+    FALLBACK_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_FALLBACK_MAX_KEYS", "100000"))
 
     # Custom per-endpoint limits (path -> limit string, e.g., "5/minute")
     CUSTOM_ENDPOINT_LIMITS: Dict[str, str] = {
@@ -38,4 +45,16 @@ class RateLimitConfig:
     @classmethod
     def get_custom_limit(cls, path: str) -> Optional[str]:
         """Return custom limit for a path if defined."""
-        return cls.CUSTOM_ENDPOINT_LIMITS.get(path)
\ No newline at end of file
+        return cls.CUSTOM_ENDPOINT_LIMITS.get(path)
+
+    @classmethod
+    def get_route_class(cls, path: str) -> str:
+        """Bucket a path shares: its own for custom-limited endpoints, otherwise 'default'."""
+        return path if path in cls.CUSTOM_ENDPOINT_LIMITS else "default"
+
+    @staticmethod
+    def parse_limit(limit: str) -> Tuple[int, float]:
+        """Parse a limit string such as "50/minute" into (requests, period seconds)."""
+        periods = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+        count, _, unit = limit.partition("/")
+        return int(count), float(periods[unit.strip().rstrip("s")])
\ No newline at end of file
@@ -4,18 +4,24 @@ Handles tenant detection, context switching, and isolation
 """
 
 import asyncio
+import os
+import threading
+import time
 from contextvars import ContextVar
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Callable, Sequence, Tuple
 from uuid import UUID
 import logging
 from functools import wraps
 
+from cachetools import TLRUCache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy import event, or_, select, text
 from fastapi import HTTPException, status
 from jose import jwt, JWTError
 
 from app.core.config import settings
+from app.events.local_pubsub import local_pubsub
 from app.models.tenant import Tenant, TenantQuota, TenantUsage
 
 logger = logging.getLogger(__name__)
@@ -25,16 +31,159 @@ current_tenant_id: ContextVar[Optional[UUID]] = ContextVar('current_tenant_id',
 current_tenant: ContextVar[Optional[Tenant]] = ContextVar('current_tenant', default=None)
 current_tenant_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar('current_tenant_context', default=None)
 
+# Local pub/sub channel announcing tenant changes; payload {"tenant_id": UUID, "subdomain": Optional[str]}
+TENANTS_CHANGED_CHANNEL = "tenants.changed"
+
+# Tenant cache bounds. notify_tenant_changed only reaches this process, so the
+# positive TTL is what bounds how long other workers keep serving a tenant after
+# it was suspended or deleted; keep it short.
+TENANT_CACHE_SIZE = int(os.getenv("TENANT_CACHE_SIZE", 10000))
+TENANT_CACHE_TTL = float(os.getenv("TENANT_CACHE_TTL_SECONDS", 15))
+TENANT_NEGATIVE_CACHE_TTL = float(os.getenv("TENANT_NEGATIVE_CACHE_TTL_SECONDS", 30))
+
+# Cache keys: ("id", UUID) or ("subdomain", str)
+TenantKey = Tuple[str, Any]
+
+_MISS = object()
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_tenant_rls(session, transaction, connection):
+    """
+    Scope each transaction to the request's tenant for row-level security.
+
+    Runs when a handler's session actually begins a transaction, so requests
+    that never touch the database never open a session just for RLS.
+    """
+    tenant_id = current_tenant_id.get()
+    if tenant_id is not None and connection.dialect.name == "postgresql":
+        connection.execute(
+            text("SELECT set_config('app.current_tenant_id', :tenant_id, true)"),
+            {"tenant_id": str(tenant_id)}
+        )
+
+
+def notify_tenant_changed(tenant_id: UUID, subdomain: Optional[str] = None):
+    """
+    Invalidate cached lookups for a tenant after it was created, updated or deleted.
+
+    Takes effect immediately in this process; other workers pick the change up
+    once their entry expires (``TENANT_CACHE_TTL``).
+    """
+    local_pubsub.publish(TENANTS_CHANGED_CHANNEL, {"tenant_id": tenant_id, "subdomain": subdomain})
+
 
 class TenantContext:
     """Manages tenant context and isolation"""
     
-    def __init__(self):
-        self._tenant_cache: Dict[UUID, Tenant] = {}
+    def __init__(
+        self,
+        max_size: int = TENANT_CACHE_SIZE,
+        ttl: float = TENANT_CACHE_TTL,
+        negative_ttl: float = TENANT_NEGATIVE_CACHE_TTL,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # LRU bounded, entries expire after ttl; None marks a key known not to exist
+        self._tenant_cache: TLRUCache = TLRUCache(maxsize=max_size, ttu=self._time_to_use, timer=timer)
+        self._cache_lock = threading.Lock()
         self._quota_cache: Dict[UUID, TenantQuota] = {}
-    
-    async def get_tenant_from_jwt(self, token: str) -> Optional[Tenant]:
-        """Extract tenant information from JWT token"""
+        local_pubsub.subscribe(TENANTS_CHANGED_CHANNEL, self._on_tenant_changed)
+
+    def _time_to_use(self, key: TenantKey, value: Optional[Tenant], now: float) -> float:
+        return now + (self.ttl if value is not None else self.negative_ttl)
+
+    def _cached(self, key: TenantKey):
+        with self._cache_lock:
+            return self._tenant_cache.get(key, _MISS)
+
+    def _remember(self, tenant: Tenant):
+        with self._cache_lock:
+            self._tenant_cache[("id", tenant.id)] = tenant
+            self._tenant_cache[("subdomain", tenant.subdomain)] = tenant
+
+    def _remember_missing(self, key: TenantKey):
+        with self._cache_lock:
+            self._tenant_cache[key] = None
+
+    def _on_tenant_changed(self, message: Dict[str, Any]):
+        """Drop every cached entry for a changed tenant, including negative ones"""
+        with self._cache_lock:
+            cached = self._tenant_cache.pop(("id", message["tenant_id"]), None)
+            if cached is not None:
+                self._tenant_cache.pop(("subdomain", cached.subdomain), None)
+            if message.get("subdomain"):
+                self._tenant_cache.pop(("subdomain", message["subdomain"]), None)
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._tenant_cache.clear()
+
+    async def _load_tenants(self, keys: Sequence[TenantKey], db: AsyncSession) -> Dict[TenantKey, Optional[Tenant]]:
+        """Resolve uncached keys with one lookup on the primary key / unique subdomain indexes"""
+        ids = [value for kind, value in keys if kind == "id"]
+        subdomains = [value for kind, value in keys if kind == "subdomain"]
+        conditions = []
+        if ids:
+            conditions.append(Tenant.id.in_(ids))
+        if subdomains:
+            conditions.append(Tenant.subdomain.in_(subdomains))
+
+        result = await db.execute(select(Tenant).where(or_(*conditions)))
+        found: Dict[TenantKey, Optional[Tenant]] = {}
+        for tenant in result.scalars().all():
+            self._remember(tenant)
+            found[("id", tenant.id)] = tenant
+            found[("subdomain", tenant.subdomain)] = tenant
+        for key in keys:
+            if key not in found:
+                self._remember_missing(key)
+                found[key] = None
+        return found
+
+    async def resolve_tenant(
+        self,
+        candidates: Sequence[TenantKey],
+        open_session: Callable[[], AsyncIterator[AsyncSession]],
+    ) -> Optional[Tenant]:
+        """
+        Return the tenant for the first candidate key that exists.
+
+        Args:
+            candidates: Keys in priority order, e.g. JWT claim, subdomain, header
+            open_session: Session dependency (such as ``get_db``), only entered on a cache miss
+
+        Returns:
+            The highest-priority tenant found, or None
+        """
+        resolved: Dict[TenantKey, Optional[Tenant]] = {}
+        pending = []
+        for key in candidates:
+            cached = self._cached(key)
+            if cached is _MISS:
+                pending.append(key)
+                continue
+            resolved[key] = cached
+            if cached is not None:
+                # Lower-priority keys can't win over this one
+                break
+
+        if pending:
+            sessions = open_session()
+            db = await sessions.__anext__()
+            try:
+                resolved.update(await self._load_tenants(pending, db))
+            finally:
+                await sessions.aclose()
+
+        for key in candidates:
+            if resolved.get(key) is not None:
+                return resolved[key]
+        return None
+
+    def tenant_id_from_jwt(self, token: str) -> Optional[UUID]:
+        """Read the tenant_id claim from a JWT token"""
         try:
             payload = jwt.decode(
                 token, 
@@ -46,25 +195,28 @@ class TenantContext:
             if not tenant_id:
                 return None
                 
-            return await self.get_tenant_by_id(UUID(tenant_id))
+            return UUID(tenant_id)
             
         except (JWTError, ValueError) as e:
             logger.warning(f"Invalid JWT token for tenant extraction: {e}")
             return None
     
+    async def get_tenant_from_jwt(self, token: str, db: Optional[AsyncSession] = None) -> Optional[Tenant]:
+        """Extract tenant information from JWT token"""
+        tenant_id = self.tenant_id_from_jwt(token)
+        if not tenant_id:
+            return None
+        return await self.get_tenant_by_id(tenant_id, db)
+    
     async def get_tenant_from_subdomain(self, subdomain: str, db: AsyncSession) -> Optional[Tenant]:
-        """Get tenant from subdomain"""
+        """Get tenant from subdomain with caching"""
+        key = ("subdomain", subdomain)
+        cached = self._cached(key)
+        if cached is not _MISS:
+            return cached
+
         try:
-            from sqlalchemy import select
-            
-            stmt = select(Tenant).where(Tenant.subdomain == subdomain)
-            result = await db.execute(stmt)
-            tenant = result.scalar_one_or_none()
-            
-            if tenant:
-                self._tenant_cache[tenant.id] = tenant
-            
-            return tenant
+            return (await self._load_tenants([key], db))[key]
             
         except Exception as e:
             logger.error(f"Error getting tenant from subdomain {subdomain}: {e}")
@@ -72,37 +224,36 @@ class TenantContext:
     
     async def get_tenant_by_id(self, tenant_id: UUID, db: Optional[AsyncSession] = None) -> Optional[Tenant]:
         """Get tenant by ID with caching"""
-        if tenant_id in self._tenant_cache:
-            return self._tenant_cache[tenant_id]
+        key = ("id", tenant_id)
+        cached = self._cached(key)
+        if cached is not _MISS:
+            return cached
         
         if not db:
             return None
             
         try:
-            from sqlalchemy import select
-            
-            stmt = select(Tenant).where(Tenant.id == tenant_id)
-            result = await db.execute(stmt)
-            tenant = result.scalar_one_or_none()
-            
-            if tenant:
-                self._tenant_cache[tenant_id] = tenant
-            
-            return tenant
+            return (await self._load_tenants([key], db))[key]
             
         except Exception as e:
             logger.error(f"Error getting tenant {tenant_id}: {e}")
             return None
     
-    async def set_tenant_context(self, tenant: Tenant, db: AsyncSession):
-        """Set tenant context for current request"""
+    async def set_tenant_context(self, tenant: Tenant, db: Optional[AsyncSession] = None):
+        """
+        Set tenant context for current request.
+
+        Sessions that begin a transaction afterwards pick up the tenant for RLS
+        automatically; ``db`` only needs passing for a session already inside one.
+        """
         try:
             # Set context variables
             current_tenant_id.set(tenant.id)
             current_tenant.set(tenant)
             
             # Set database tenant context
-            await self._set_db_tenant_context(tenant.id, db)
+            if db is not None:
+                await self._set_db_tenant_context(tenant.id, db)
             
             # Set additional context
             context = {
@@ -135,7 +286,7 @@ class TenantContext:
             logger.error(f"Error setting database tenant context: {e}")
             raise
     
-    async def clear_tenant_context(self, db: AsyncSession):
+    async def clear_tenant_context(self, db: Optional[AsyncSession] = None):
         """Clear tenant context"""
         try:
             # Clear context variables
@@ -144,9 +295,10 @@ class TenantContext:
             current_tenant_context.set(None)
             
             # Clear database context
-            await db.execute(
-                text("SELECT set_config('app.current_tenant_id', '', true)")
-            )
+            if db is not None:
+                await db.execute(
+                    text("SELECT set_config('app.current_tenant_id', '', true)")
+                )
             
         except Exception as e:
             logger.error(f"Error clearing tenant context: {e}")
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import date, datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, Date, DateTime, Float, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, Date, DateTime, Float, Index, Integer, String, Text, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -70,6 +70,16 @@ class ERPOutboxRecord(Base):
     __tablename__ = "erp_outbox"
     __table_args__ = (
         UniqueConstraint("tenant_id", "idempotency_key", name="uq_erp_outbox_idempotency"),
+        # Small, hot index covering only the rows the dispatcher can still claim
+        Index(
+            "ix_erp_outbox_pending_next_run_at",
+            "next_run_at",
+            "created_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # Serve the monitoring aggregates (GROUP BY status, time-windowed metrics)
+        Index("ix_erp_outbox_status_created_at", "status", "created_at"),
+        Index("ix_erp_outbox_created_at", "created_at"),
     )
 
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
@@ -89,3 +99,46 @@ class ERPOutboxRecord(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
     )
+
+
+class LTSDRecord(Base):
+    __tablename__ = "ltsd_declarations"
+    __table_args__ = (
+        # Expiry sweeps only ever walk active rows in valid_to order
+        Index(
+            "ix_ltsd_declarations_active_valid_to",
+            "valid_to",
+            "id",
+            postgresql_where=text("status = 'active'"),
+        ),
+        Index("ix_ltsd_declarations_partner_status", "partner_id", "status", "created_at"),
+    )
+
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    document_ref: Mapped[str] = mapped_column(String(64), index=True, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    partner_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    status: Mapped[str] = mapped_column(String(32), nullable=False)
+    ltsd_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    verdict: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    agreements: Mapped[list[str]] = mapped_column(ARRAY(String(32)), nullable=False, default=list)
+    valid_from: Mapped[date] = mapped_column(Date, nullable=False)
+    valid_to: Mapped[date] = mapped_column(Date, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class LTSDStatisticsCounter(Base):
+    """Running LTSD totals per partner, status and dimension (type, verdict, agreement)."""
+
+    __tablename__ = "ltsd_statistics_counters"
+
+    partner_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    status: Mapped[str] = mapped_column(String(32), primary_key=True)
+    dimension: Mapped[str] = mapped_column(String(16), primary_key=True)
+    value: Mapped[str] = mapped_column(String(32), primary_key=True)
+    declarations: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    validity_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
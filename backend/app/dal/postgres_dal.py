@@ -5,7 +5,7 @@ from __future__ import annotations
 import hashlib
 import json
 from datetime import date
-from typing import Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 from sqlalchemy import Select, and_, or_, select
 from sqlalchemy.exc import NoResultFound
@@ -77,6 +77,18 @@ class PostgresDAL:
                 raise NoResultFound(rule_id)
             return self._record_to_rule(record)
 
+    def get_rules(self, rule_ids: Iterable[str]) -> Dict[str, PSRARule]:
+        """Fetch several rules in one query; missing identifiers are simply absent."""
+
+        unique_ids = sorted(set(rule_ids))
+        if not unique_ids:
+            return {}
+        with session_scope(self._session_factory) as session:
+            records = session.scalars(
+                select(RuleRecord).where(RuleRecord.rule_id.in_(unique_ids))
+            ).all()
+            return {record.rule_id: self._record_to_rule(record) for record in records}
+
     def list_rules(
         self,
         *,
@@ -108,44 +120,66 @@ class PostgresDAL:
     # Verdicts
     # ------------------------------------------------------------------
     def persist_verdict(self, evaluation: EvaluationOutput) -> None:
+        self.persist_verdicts([evaluation])
+
+    def persist_verdicts(self, evaluations: Sequence[EvaluationOutput]) -> None:
+        """Upsert verdicts in a single transaction with one lookup for existing rows."""
+
+        if not evaluations:
+            return
+        rows = [self._verdict_data(evaluation) for evaluation in evaluations]
+        with session_scope(self._session_factory) as session:
+            existing = {
+                record.evaluation_id: record
+                for record in session.scalars(
+                    select(VerdictRecord).where(
+                        VerdictRecord.evaluation_id.in_({row["evaluation_id"] for row in rows})
+                    )
+                )
+            }
+            new_records = []
+            for data in rows:
+                record = existing.get(data["evaluation_id"])
+                if record:
+                    for key, value in data.items():
+                        setattr(record, key, value)
+                else:
+                    record = VerdictRecord(**data)
+                    existing[data["evaluation_id"]] = record
+                    new_records.append(record)
+            # Flushed as multi-row INSERTs
+            session.add_all(new_records)
+
+    @staticmethod
+    def _verdict_data(evaluation: EvaluationOutput) -> Dict[str, Any]:
         verdict = evaluation.verdict
         metadata = evaluation.input.context
         traceability = evaluation.rule.audit.traceability
-        input_hash = hashlib.sha256(
-            json.dumps(evaluation.input.model_dump(mode="json"), sort_keys=True).encode()
-        ).hexdigest()
-        with session_scope(self._session_factory) as session:
-            record = session.scalar(
-                select(VerdictRecord).where(VerdictRecord.evaluation_id == verdict.evaluation_id)
-            )
-            data = {
-                "evaluation_id": verdict.evaluation_id,
-                "rule_id": verdict.rule_id,
-                "status": verdict.status.value,
-                "confidence": verdict.confidence,
-                "citations": [c.model_dump(mode="json") for c in verdict.citations],
-                "reasons": [r.model_dump(mode="json") for r in verdict.disqualification_reasons],
-                "notes": verdict.notes,
-                "ledger_reference": verdict.ledger_reference,
-                "input_payload": evaluation.input.model_dump(mode="json"),
-                "input_hash": input_hash,
-                "processing_time_ms": evaluation.metrics.processing_time_ms,
-                "rules_evaluated": evaluation.metrics.rules_evaluated,
-                "decided_at": verdict.decided_at,
-                "tenant_id": metadata.tenant_id,
-                "request_id": metadata.request_id,
-                "agreement_code": metadata.agreement.code,
-                "hs_subheading": metadata.hs_code.subheading,
-                "effective_date": metadata.effective_date,
-                "import_country": metadata.import_country,
-                "export_country": metadata.export_country,
-                "lineage_required": traceability.lineage_required,
-            }
-            if record:
-                for key, value in data.items():
-                    setattr(record, key, value)
-            else:
-                session.add(VerdictRecord(**data))
+        input_payload = evaluation.input.model_dump(mode="json")
+        input_hash = hashlib.sha256(json.dumps(input_payload, sort_keys=True).encode()).hexdigest()
+        return {
+            "evaluation_id": verdict.evaluation_id,
+            "rule_id": verdict.rule_id,
+            "status": verdict.status.value,
+            "confidence": verdict.confidence,
+            "citations": [c.model_dump(mode="json") for c in verdict.citations],
+            "reasons": [r.model_dump(mode="json") for r in verdict.disqualification_reasons],
+            "notes": verdict.notes,
+            "ledger_reference": verdict.ledger_reference,
+            "input_payload": input_payload,
+            "input_hash": input_hash,
+            "processing_time_ms": evaluation.metrics.processing_time_ms,
+            "rules_evaluated": evaluation.metrics.rules_evaluated,
+            "decided_at": verdict.decided_at,
+            "tenant_id": metadata.tenant_id,
+            "request_id": metadata.request_id,
+            "agreement_code": metadata.agreement.code,
+            "hs_subheading": metadata.hs_code.subheading,
+            "effective_date": metadata.effective_date,
+            "import_country": metadata.import_country,
+            "export_country": metadata.export_country,
+            "lineage_required": traceability.lineage_required,
+        }
 
     def fetch_verdict(self, evaluation_id: str) -> EvaluationOutput:
         with session_scope(self._session_factory) as session:
@@ -43,3 +43,19 @@ def session_scope(factory: sessionmaker[Session]) -> Iterator[Session]:
         raise
     finally:
         session.close()
+
+
+_default_factory: sessionmaker[Session] | None = None
+
+
+def get_db() -> Iterator[Session]:
+    """FastAPI dependency yielding a session on the default DSN (see ``build_engine``)."""
+
+    global _default_factory
+    if _default_factory is None:
+        _default_factory = create_session_factory(build_engine())
+    session = _default_factory()
+    try:
+        yield session
+    finally:
+        session.close()
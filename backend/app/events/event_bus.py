@@ -1,20 +1,134 @@
 import os
 import json
 import logging
+import queue
+import threading
+import time
 import uuid
-from typing import Callable, Dict, Any
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
 import pika
-from pika.exceptions import AMQPConnectionError, AMQPChannelError
+from pika.exceptions import AMQPConnectionError, AMQPChannelError, AMQPError
 from contextlib import contextmanager
+from datetime import datetime
+
+from .event_log import EventLog
 
 logger = logging.getLogger(__name__)
 
+PERSISTENT = 2
+
+
+class EventPublishError(Exception):
+    """Raised when events could not be confirmed by the broker after retries."""
+
+
+class PikaChannel:
+    """
+    Publisher-confirm pika channel whose confirms are settled once per batch.
+
+    ``BlockingChannel.confirm_delivery`` makes every ``basic_publish`` wait for
+    its own ack, capping throughput at one message per broker round trip, and
+    the blocking adapter has no public way to receive confirms
+    asynchronously. Confirms are therefore enabled on the underlying
+    asynchronous channel: a batch is written back-to-back, its delivery tags
+    are recorded, and ``wait_for_confirms`` drains the acks/nacks with
+    ``process_data_events`` (RabbitMQ acks with ``multiple=True`` whenever it can).
+    """
+
+    def __init__(self, connection: pika.BlockingConnection):
+        self._connection = connection
+        self._channel = connection.channel()
+        self._next_tag = 0
+        self._outstanding: set = set()
+        self._nacked = 0
+        self._channel._impl.confirm_delivery(ack_nack_callback=self._on_confirm)
+
+    @property
+    def is_open(self) -> bool:
+        return self._connection.is_open and self._channel.is_open
+
+    def _on_confirm(self, frame) -> None:
+        method = frame.method
+        if method.multiple:
+            settled = {tag for tag in self._outstanding if tag <= method.delivery_tag}
+        else:
+            settled = {method.delivery_tag} & self._outstanding
+        self._outstanding -= settled
+        if isinstance(method, pika.spec.Basic.Nack):
+            self._nacked += len(settled)
+
+    def exchange_declare(self, **kwargs) -> None:
+        self._channel.exchange_declare(**kwargs)
+
+    def queue_declare(self, **kwargs) -> None:
+        self._channel.queue_declare(**kwargs)
+
+    def queue_bind(self, **kwargs) -> None:
+        self._channel.queue_bind(**kwargs)
+
+    def publish(self, exchange: str, routing_key: str, body: str, properties: pika.BasicProperties) -> None:
+        """Publish one message without waiting for its confirm."""
+        self._channel.basic_publish(exchange=exchange, routing_key=routing_key, body=body, properties=properties)
+        self._next_tag += 1
+        self._outstanding.add(self._next_tag)
+
+    def wait_for_confirms(self, timeout: float) -> None:
+        """Block until every published message is acked; raise on nack or timeout."""
+        deadline = time.monotonic() + timeout
+        while self._outstanding:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise AMQPChannelError(f"Timed out waiting for {len(self._outstanding)} publisher confirms")
+            self._connection.process_data_events(time_limit=remaining)
+        if self._nacked:
+            nacked, self._nacked = self._nacked, 0
+            raise AMQPChannelError(f"Broker nacked {nacked} messages")
+
+    def close(self) -> None:
+        try:
+            if self._connection.is_open:
+                self._connection.close()
+        except AMQPError:
+            pass
+
+
+class PikaTransport:
+    """Opens confirm-mode publisher channels on dedicated RabbitMQ connections."""
+
+    def __init__(self, parameters: pika.ConnectionParameters):
+        self.parameters = parameters
+
+    def connect(self) -> PikaChannel:
+        return PikaChannel(pika.BlockingConnection(self.parameters))
+
+
 class EventBus:
     """
     RabbitMQ-based event bus for publishing and subscribing to events.
     Supports DLQ for failed messages and event replay.
+
+    Every published event is first appended to a durable, segmented
+    :class:`EventLog` (``replay_store``), which replays by sequence or time
+    range straight from disk.
+
+    Publishing goes through a pool of long-lived, confirm-mode channels (one
+    connection each, created lazily up to ``pool_size``). Topology is declared
+    once, on the first connection and again after a reconnect. Messages are
+    published in batches of ``confirm_batch_size``, each followed by one
+    ``wait_for_confirms``; a batch that hits a dropped connection, a nack or
+    a confirm timeout is retried on a fresh connection, so delivery is
+    at-least-once (duplicates carry the same ``message_id``).
     """
-    def __init__(self):
+    def __init__(
+        self,
+        transport=None,
+        pool_size: Optional[int] = None,
+        confirm_batch_size: Optional[int] = None,
+        confirm_timeout: Optional[float] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.2,
+        event_log: Optional[EventLog] = None,
+    ):
         self.host = os.getenv("RABBITMQ_HOST", "localhost")
         self.port = int(os.getenv("RABBITMQ_PORT", 5672))
         self.username = os.getenv("RABBITMQ_USERNAME", "guest")
@@ -22,16 +136,31 @@ class EventBus:
         self.exchange = "psra_events"
         self.dlx_exchange = "psra_dlx"  # Dead letter exchange
         self.dlq_queue = "psra_dlq"     # Dead letter queue
-        self.replay_store: Dict[str, Dict[str, Any]] = {}  # In-memory store for replay (use DB in prod)
+        self.replay_store = event_log or EventLog()  # Durable, retention-bounded replay log
+
+        self.parameters = pika.ConnectionParameters(
+            host=self.host,
+            port=self.port,
+            credentials=pika.PlainCredentials(self.username, self.password),
+        )
+        self.transport = transport or PikaTransport(self.parameters)
+        self.pool_size = pool_size or int(os.getenv("RABBITMQ_PUBLISHER_POOL_SIZE", 4))
+        self.confirm_batch_size = confirm_batch_size or int(os.getenv("RABBITMQ_CONFIRM_BATCH_SIZE", 100))
+        self.confirm_timeout = confirm_timeout or float(os.getenv("RABBITMQ_CONFIRM_TIMEOUT", 10))
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._open_channels = 0
+        self._pool_lock = threading.Lock()
+        self._topology_declared = False
+        self._topology_lock = threading.Lock()
 
     @contextmanager
     def _get_connection(self):
-        """Context manager for RabbitMQ connection."""
+        """Context manager for a dedicated RabbitMQ connection (consumers)."""
         try:
-            credentials = pika.PlainCredentials(self.username, self.password)
-            connection = pika.BlockingConnection(
-                pika.ConnectionParameters(host=self.host, port=self.port, credentials=credentials)
-            )
+            connection = pika.BlockingConnection(self.parameters)
             yield connection
         except AMQPConnectionError as e:
             logger.error(f"Failed to connect to RabbitMQ: {e}")
@@ -64,35 +193,199 @@ class EventBus:
             )
             channel.queue_bind(exchange=self.exchange, queue=queue, routing_key=event_type)
 
-    def publish(self, event_type: str, event_data: Dict[str, Any], routing_key: str = None):
-        """Publish an event to the bus and store for replay."""
-        event_id = str(uuid.uuid4())
-        message = {
-            "event_id": event_id,
+    # Publisher channel pool
+
+    def _acquire_channel(self):
+        """Borrow an open publisher channel, connecting lazily up to ``pool_size``."""
+        while True:
+            try:
+                channel = self._idle.get_nowait()
+            except queue.Empty:
+                with self._pool_lock:
+                    can_open = self._open_channels < self.pool_size
+                    if can_open:
+                        self._open_channels += 1
+                if can_open:
+                    return self._open_channel()
+                try:
+                    channel = self._idle.get(timeout=self.confirm_timeout)
+                except queue.Empty:
+                    raise EventPublishError("No publisher channel became available") from None
+            if channel.is_open:
+                return channel
+            self._discard_channel(channel, broken=True)
+
+    def _open_channel(self):
+        try:
+            channel = self.transport.connect()
+            if not self._topology_declared:
+                with self._topology_lock:
+                    if not self._topology_declared:
+                        self._declare_infrastructure(channel)
+                        self._topology_declared = True
+            return channel
+        except BaseException:
+            with self._pool_lock:
+                self._open_channels -= 1
+            raise
+
+    def _release_channel(self, channel) -> None:
+        self._idle.put(channel)
+
+    def _discard_channel(self, channel, broken: bool = False) -> None:
+        channel.close()
+        with self._pool_lock:
+            self._open_channels -= 1
+        if broken:
+            # The broker may have been replaced; redeclare on the next connection
+            self._topology_declared = False
+
+    def close(self) -> None:
+        """Close all pooled publisher connections."""
+        while True:
+            try:
+                channel = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard_channel(channel)
+
+    # Publishing
+
+    def _build_message(self, event_type: str, event_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "event_id": str(uuid.uuid4()),
             "event_type": event_type,
             "data": event_data,
             "timestamp": event_data.get("timestamp"),  # Assumed in data
         }
-        # Store for replay
-        self.replay_store[event_id] = message
-        
-        with self._get_connection() as connection:
-            channel = connection.channel()
-            self._declare_infrastructure(channel)
-            channel.basic_publish(
-                exchange=self.exchange,
-                routing_key=routing_key or event_type,
-                body=json.dumps(message),
-                properties=pika.BasicProperties(delivery_mode=2)  # Persistent
-            )
-        logger.info(f"Published event {event_id} of type {event_type}")
-
-    def replay_events(self, event_ids: list = None):
-        """Replay stored events (all or specific IDs)."""
-        to_replay = self.replay_store.values() if not event_ids else [self.replay_store.get(eid) for eid in event_ids if eid in self.replay_store]
-        for event in to_replay:
-            self.publish(event["event_type"], event["data"])
-        logger.info(f"Replayed {len(to_replay)} events")
+
+    def _store(self, messages: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Append ``(routing_key, message)`` pairs to the replay log before publishing."""
+        self.replay_store.append_many(
+            json.dumps({"routing_key": routing_key, "message": message}, default=str).encode("utf-8")
+            for routing_key, message in messages
+        )
+
+    def _publish_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Publish one batch and wait for its confirms, reconnecting on failure."""
+        # Serialise up front so a bad payload fails before a channel is borrowed
+        bodies = [(routing_key, message, json.dumps(message, default=str)) for routing_key, message in batch]
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            try:
+                channel = self._acquire_channel()
+            except AMQPError as e:
+                last_error = e
+                logger.warning(f"RabbitMQ connect failed (attempt {attempt + 1}): {e}")
+                continue
+
+            confirmed = broken = False
+            try:
+                for routing_key, message, body in bodies:
+                    channel.publish(
+                        self.exchange,
+                        routing_key,
+                        body,
+                        pika.BasicProperties(
+                            delivery_mode=PERSISTENT,  # Persistent
+                            content_type="application/json",
+                            message_id=message["event_id"],
+                        ),
+                    )
+                channel.wait_for_confirms(self.confirm_timeout)
+                confirmed = True
+            except AMQPError as e:
+                last_error, broken = e, True
+                logger.warning(f"Publishing {len(batch)} events failed (attempt {attempt + 1}): {e!r}")
+            finally:
+                # Any failure (not only AMQP ones) may leave unsettled confirms
+                # behind, so the channel is never pooled again; either way its
+                # pool slot is given back
+                if confirmed:
+                    self._release_channel(channel)
+                else:
+                    self._discard_channel(channel, broken=broken)
+            if confirmed:
+                return
+
+        raise EventPublishError(
+            f"Failed to publish {len(batch)} events after {self.max_retries + 1} attempts: {last_error!r}"
+        ) from last_error
+
+    def publish_many(self, events: Iterable[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Publish ``(event_type, event_data)`` pairs, one confirm wait per batch.
+
+        Returns:
+            Event IDs in input order
+        """
+        messages = [(event_type, self._build_message(event_type, data)) for event_type, data in events]
+        self._store(messages)
+        for start in range(0, len(messages), self.confirm_batch_size):
+            self._publish_batch(messages[start:start + self.confirm_batch_size])
+        logger.info(f"Published {len(messages)} events")
+        return [message["event_id"] for _, message in messages]
+
+    def publish(self, event_type: str, event_data: Dict[str, Any], routing_key: str = None) -> str:
+        """Publish an event to the bus and store for replay."""
+        batch = [(routing_key or event_type, self._build_message(event_type, event_data))]
+        self._store(batch)
+        self._publish_batch(batch)
+        message = batch[0][1]
+        logger.info(f"Published event {message['event_id']} of type {event_type}")
+        return message["event_id"]
+
+    def replay_events(
+        self,
+        event_ids: list = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        start_seq: Optional[int] = None,
+        end_seq: Optional[int] = None,
+    ) -> int:
+        """
+        Re-publish logged events (all, specific IDs, or a time/sequence range).
+
+        Events are streamed from the log and re-sent with their original
+        ``event_id`` in confirm batches; they are not appended to the log again.
+
+        The log is indexed by sequence and time only, so ``event_ids`` is
+        resolved by scanning: the whole retained log (up to the log's
+        ``retention_bytes``) unless narrowed with ``since``/``start_seq``. The
+        scan stops once every requested id has been found.
+
+        Returns:
+            Number of events replayed
+        """
+        wanted = set(event_ids) if event_ids else None
+        replayed = 0
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+        records = self.replay_store.read(
+            start_seq=start_seq,
+            end_seq=end_seq,
+            since=since.timestamp() if since else None,
+            until=until.timestamp() if until else None,
+        )
+        for record in records:
+            entry = json.loads(record.payload)
+            if wanted is not None:
+                if entry["message"]["event_id"] not in wanted:
+                    continue
+                wanted.discard(entry["message"]["event_id"])
+            batch.append((entry["routing_key"], entry["message"]))
+            if len(batch) >= self.confirm_batch_size:
+                self._publish_batch(batch)
+                replayed += len(batch)
+                batch = []
+            if wanted is not None and not wanted:
+                break
+        if batch:
+            self._publish_batch(batch)
+            replayed += len(batch)
+        logger.info(f"Replayed {replayed} events")
+        return replayed
 
     def subscribe(self, queue: str, callback: Callable):
         """Subscribe to a queue and process messages with callback."""
@@ -0,0 +1,435 @@
+"""
+Segmented Event Log
+
+Append-only, size- and age-bounded local log that backs event replay. Events
+are written to fixed-size segment files with a sparse offset index, so range
+reads by sequence number or timestamp seek straight to the right place and
+then stream sequentially from disk. Memory use is a few index entries per
+segment, independent of how many events pass through.
+
+Layout::
+
+    <root>/<base_seq:020d>.log     # records: header + payload
+    <root>/<base_seq:020d>.index   # sparse (seq, timestamp, position) entries
+
+Record header (big-endian): seq u64, timestamp f64, payload length u32,
+crc32(payload) u32. A torn record at the end of a segment (crash mid-write)
+fails its length or CRC check and is truncated on open.
+
+Several processes (e.g. gunicorn or Celery workers) may share one log
+directory: every write takes an exclusive ``flock`` on ``<root>/.lock`` and
+first catches up with whatever other processes appended, rolled or retired
+since (the active segment's new tail, new segments, removed ones), so
+sequence numbers are always allocated from the files rather than from
+per-process state.
+"""
+
+import fcntl
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG_DIR = os.getenv("EVENT_LOG_DIR", "var/events")
+
+_HEADER = struct.Struct(">QdII")
+_INDEX_ENTRY = struct.Struct(">QdQ")
+_READ_BUFFER = 1024 * 1024
+_LOCK_NAME = ".lock"
+
+
+@dataclass(frozen=True)
+class LogRecord:
+    seq: int
+    timestamp: float
+    payload: bytes
+
+
+class _Segment:
+    """One segment file plus its in-memory sparse index."""
+
+    def __init__(self, root: Path, base_seq: int):
+        self.base_seq = base_seq
+        self.log_path = root / f"{base_seq:020d}.log"
+        self.index_path = root / f"{base_seq:020d}.index"
+        self.next_seq = base_seq
+        self.size = 0
+        self.last_timestamp: Optional[float] = None
+        self.index_seqs = array("Q")
+        self.index_times = array("d")
+        self.index_positions = array("Q")
+
+    @property
+    def first_timestamp(self) -> Optional[float]:
+        return self.index_times[0] if self.index_times else None
+
+    def add_index_entry(self, seq: int, timestamp: float, position: int) -> None:
+        self.index_seqs.append(seq)
+        self.index_times.append(timestamp)
+        self.index_positions.append(position)
+
+    def load_index(self) -> None:
+        """Load index entries written since the last load (all of them the first time)."""
+        try:
+            with open(self.index_path, "rb") as handle:
+                handle.seek(len(self.index_seqs) * _INDEX_ENTRY.size)
+                data = handle.read()
+        except FileNotFoundError:
+            return
+        usable = len(data) - len(data) % _INDEX_ENTRY.size
+        for seq, timestamp, position in _INDEX_ENTRY.iter_unpack(data[:usable]):
+            self.add_index_entry(seq, timestamp, position)
+
+    def seek_position(self, start_seq: Optional[int], since: Optional[float]) -> int:
+        """File position of the last indexed record at or before both bounds."""
+        if start_seq is None and since is None:
+            return 0
+        slot = len(self.index_seqs) - 1
+        if start_seq is not None:
+            slot = min(slot, bisect_right(self.index_seqs, start_seq) - 1)
+        if since is not None:
+            # Strictly earlier entry: records sharing ``since`` may precede an entry stamped ``since``
+            slot = min(slot, bisect_left(self.index_times, since) - 1)
+        return self.index_positions[slot] if slot >= 0 else 0
+
+
+def _scan(handle, position: int) -> Iterator[tuple]:
+    """Yield ``(seq, timestamp, position, payload)`` for each intact record from ``position``."""
+    handle.seek(position)
+    while True:
+        header = handle.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return
+        seq, timestamp, length, checksum = _HEADER.unpack(header)
+        payload = handle.read(length)
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            return
+        yield seq, timestamp, position, payload
+        position += _HEADER.size + length
+
+
+class EventLog:
+    """
+    Durable append-only event log with segment rolling and retention.
+
+    Appends go to the active segment; once it reaches ``segment_bytes`` a new
+    segment is started and closed segments are dropped, oldest first, while
+    the log exceeds ``retention_bytes`` or their newest event is older than
+    ``retention_seconds``. An index entry is written every
+    ``index_interval_bytes`` and for the first record of each segment.
+
+    The directory is created on first use; appends are flushed to the OS
+    immediately and fsynced when ``fsync`` is set. Instances in different
+    processes may share ``root``; see the module docstring.
+    """
+
+    def __init__(
+        self,
+        root: Optional[os.PathLike] = None,
+        *,
+        segment_bytes: int = 64 * 1024 * 1024,
+        retention_bytes: int = 1024 * 1024 * 1024,
+        retention_seconds: float = 7 * 24 * 3600,
+        index_interval_bytes: int = 4096,
+        fsync: bool = False,
+        clock=time.time,
+    ):
+        self.root = Path(root or DEFAULT_LOG_DIR)
+        self.segment_bytes = segment_bytes
+        self.retention_bytes = retention_bytes
+        self.retention_seconds = retention_seconds
+        self.index_interval_bytes = index_interval_bytes
+        self.fsync = fsync
+        self.clock = clock
+
+        self._segments: List[_Segment] = []
+        self._log_file = None
+        self._index_file = None
+        self._bytes_since_index = 0
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._lock_pid: Optional[int] = None
+        self._opened = False
+
+    # Lifecycle
+
+    @contextmanager
+    def _locked(self):
+        """Hold the thread lock and the cross-process file lock, with segment state current."""
+        with self._lock:
+            if self._lock_pid != os.getpid():
+                # flock is tied to the open file description, which a forked child shares
+                self.root.mkdir(parents=True, exist_ok=True)
+                self._lock_file = open(self.root / _LOCK_NAME, "ab")
+                self._lock_pid = os.getpid()
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                if self._opened:
+                    self._refresh()
+                else:
+                    self._open()
+                yield
+            finally:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """
+        Catch up with other processes' writes since our last look.
+
+        Only what can have changed is re-read: retention removes the oldest
+        segments, appends extend the active one (re-scanned from its last
+        index entry) and rolls add segments after it.
+        """
+        while len(self._segments) > 1 and not self._segments[0].log_path.exists():
+            self._segments.pop(0)
+        active = self._segments[-1]
+        try:
+            size = active.log_path.stat().st_size
+        except FileNotFoundError:
+            size = None
+        if size is None or size < active.size:
+            # Retired or rewritten underneath us; rebuild from the directory
+            self._close_segments()
+            self._open()
+            return
+
+        rolled = False
+        while True:
+            if active.log_path.stat().st_size != active.size:
+                active.load_index()
+                self._recover(active)
+            following = _Segment(self.root, active.next_seq)
+            # An empty segment has no successor (and would name itself)
+            if active.next_seq == active.base_seq or not following.log_path.exists():
+                break
+            self._segments.append(following)
+            active = following
+            rolled = True
+
+        if rolled:
+            self._log_file.close()
+            self._index_file.close()
+            self._open_active()
+        elif active.index_positions:
+            self._bytes_since_index = active.size - active.index_positions[-1]
+
+    def _open(self) -> None:
+        if self._opened:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        base_seqs = sorted(int(path.stem) for path in self.root.glob("*.log"))
+        for base_seq in base_seqs:
+            segment = _Segment(self.root, base_seq)
+            segment.load_index()
+            self._recover(segment)
+            self._segments.append(segment)
+
+        if not self._segments:
+            self._segments.append(_Segment(self.root, 0))
+        self._open_active()
+        self._opened = True
+
+    def _recover(self, segment: _Segment) -> None:
+        """Re-derive a segment's tail from its last index entry, truncating torn writes."""
+        index_entries = len(segment.index_seqs)
+        with open(segment.log_path, "rb", buffering=_READ_BUFFER) as handle:
+            # Drop index entries whose record never made it to disk intact
+            while segment.index_seqs:
+                first = next(_scan(handle, segment.index_positions[-1]), None)
+                if first is not None and first[0] == segment.index_seqs[-1]:
+                    break
+                for entries in (segment.index_seqs, segment.index_times, segment.index_positions):
+                    entries.pop()
+
+            start = segment.index_positions[-1] if segment.index_positions else 0
+            end = start
+            for seq, timestamp, position, payload in _scan(handle, start):
+                if not segment.index_seqs:
+                    segment.add_index_entry(seq, timestamp, position)
+                segment.next_seq = seq + 1
+                segment.last_timestamp = timestamp
+                end = position + _HEADER.size + len(payload)
+
+        if segment.log_path.stat().st_size > end:
+            logger.warning(f"Truncating torn tail of event log segment {segment.log_path.name} at byte {end}")
+            os.truncate(segment.log_path, end)
+        if len(segment.index_seqs) != index_entries:
+            segment.index_path.write_bytes(
+                b"".join(
+                    _INDEX_ENTRY.pack(seq, timestamp, position)
+                    for seq, timestamp, position in zip(
+                        segment.index_seqs, segment.index_times, segment.index_positions
+                    )
+                )
+            )
+        segment.size = end
+
+    def _open_active(self) -> None:
+        segment = self._segments[-1]
+        self._log_file = open(segment.log_path, "ab")
+        self._index_file = open(segment.index_path, "ab")
+        self._bytes_since_index = 0
+        if segment.index_positions:
+            self._bytes_since_index = segment.size - segment.index_positions[-1]
+
+    def _close_segments(self) -> None:
+        if self._log_file is not None:
+            self._log_file.close()
+            self._index_file.close()
+            self._log_file = self._index_file = None
+        self._segments = []
+        self._opened = False
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_segments()
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = self._lock_pid = None
+
+    # Writing
+
+    def append(self, payload: bytes, timestamp: Optional[float] = None) -> int:
+        """Append one event; returns its sequence number."""
+        return self.append_many([payload], timestamp)[0]
+
+    def append_many(self, payloads: Iterable[bytes], timestamp: Optional[float] = None) -> List[int]:
+        """Append events with a single flush; returns their sequence numbers."""
+        with self._locked():
+            seqs = []
+            for payload in payloads:
+                segment = self._segments[-1]
+                if segment.size >= self.segment_bytes:
+                    self._roll()
+                    segment = self._segments[-1]
+
+                # Timestamps never go backwards, so time ranges can stop at the first later record
+                stamp = max(timestamp or self.clock(), segment.last_timestamp or 0.0)
+                seq = segment.next_seq
+                position = segment.size
+                if not segment.index_seqs or self._bytes_since_index >= self.index_interval_bytes:
+                    segment.add_index_entry(seq, stamp, position)
+                    self._index_file.write(_INDEX_ENTRY.pack(seq, stamp, position))
+                    self._bytes_since_index = 0
+
+                record = _HEADER.pack(seq, stamp, len(payload), zlib.crc32(payload)) + payload
+                self._log_file.write(record)
+                segment.size += len(record)
+                segment.next_seq = seq + 1
+                segment.last_timestamp = stamp
+                self._bytes_since_index += len(record)
+                seqs.append(seq)
+
+            self._flush()
+            return seqs
+
+    def _flush(self) -> None:
+        self._log_file.flush()
+        self._index_file.flush()
+        if self.fsync:
+            os.fsync(self._log_file.fileno())
+            os.fsync(self._index_file.fileno())
+
+    def _roll(self) -> None:
+        previous = self._segments[-1]
+        self._flush()
+        os.fsync(self._log_file.fileno())
+        self._log_file.close()
+        self._index_file.close()
+
+        self._segments.append(_Segment(self.root, previous.next_seq))
+        self._open_active()
+        self._apply_retention()
+
+    def enforce_retention(self) -> int:
+        """Delete closed segments beyond the size/age limits; returns segments removed."""
+        with self._locked():
+            return self._apply_retention()
+
+    def _apply_retention(self) -> int:
+        cutoff = self.clock() - self.retention_seconds
+        removed = 0
+        while len(self._segments) > 1:
+            oldest = self._segments[0]
+            total = sum(segment.size for segment in self._segments)
+            expired = oldest.last_timestamp is not None and oldest.last_timestamp < cutoff
+            if total <= self.retention_bytes and not expired:
+                break
+            for path in (oldest.log_path, oldest.index_path):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._segments.pop(0)
+            removed += 1
+        if removed:
+            logger.info(f"Event log retention removed {removed} segments")
+        return removed
+
+    # Reading
+
+    @property
+    def first_seq(self) -> int:
+        with self._locked():
+            return self._segments[0].base_seq
+
+    @property
+    def next_seq(self) -> int:
+        with self._locked():
+            return self._segments[-1].next_seq
+
+    def __len__(self) -> int:
+        """Number of retained events."""
+        with self._locked():
+            return self._segments[-1].next_seq - self._segments[0].base_seq
+
+    def read(
+        self,
+        start_seq: Optional[int] = None,
+        end_seq: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> Iterator[LogRecord]:
+        """
+        Stream retained events in order, bounded by sequence and/or timestamp.
+
+        ``start_seq``/``since`` are inclusive lower bounds, ``end_seq``/``until``
+        inclusive upper bounds. Events appended after the call starts are not
+        included.
+        """
+        with self._locked():
+            segments = list(self._segments)
+            stop_seq = segments[-1].next_seq
+        if end_seq is not None:
+            stop_seq = min(stop_seq, end_seq + 1)
+
+        for segment in segments:
+            if segment.next_seq <= (start_seq or 0) or segment.base_seq >= stop_seq:
+                continue
+            if since is not None and (segment.last_timestamp is None or segment.last_timestamp < since):
+                continue
+            if until is not None and segment.first_timestamp is not None and segment.first_timestamp > until:
+                return
+
+            position = segment.seek_position(start_seq, since)
+            try:
+                handle = open(segment.log_path, "rb", buffering=_READ_BUFFER)
+            except FileNotFoundError:
+                continue  # Removed by retention while reading
+            with handle:
+                for seq, timestamp, _, payload in _scan(handle, position):
+                    if seq >= stop_seq or (until is not None and timestamp > until):
+                        return
+                    if (start_seq is not None and seq < start_seq) or (since is not None and timestamp < since):
+                        continue
+                    yield LogRecord(seq, timestamp, payload)
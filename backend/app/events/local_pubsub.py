@@ -0,0 +1,49 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Any], None]
+
+
+class LocalPubSub:
+    """
+    In-process publish/subscribe for cache invalidation and similar signals.
+
+    Handlers run synchronously in the publisher's thread, in subscription
+    order. A failing handler is logged and does not stop the others or the
+    publisher; unlike the RabbitMQ event bus nothing is persisted or retried.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel: str, handler: Handler) -> Callable[[], None]:
+        """Register ``handler`` for ``channel``; returns a function that unsubscribes it."""
+        with self._lock:
+            self._handlers[channel].append(handler)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if handler in self._handlers[channel]:
+                    self._handlers[channel].remove(handler)
+
+        return unsubscribe
+
+    def publish(self, channel: str, message: Any = None) -> int:
+        """Deliver ``message`` to every handler on ``channel``; returns how many were called."""
+        with self._lock:
+            handlers = list(self._handlers.get(channel, ()))
+        for handler in handlers:
+            try:
+                handler(message)
+            except Exception as e:
+                logger.error(f"Local subscriber on {channel} failed: {e}")
+        return len(handlers)
+
+
+# Process-wide channel registry
+local_pubsub = LocalPubSub()
@@ -0,0 +1,136 @@
+import json
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from pika.exceptions import AMQPChannelError, AMQPConnectionError
+
+
+def _topic_matches(pattern: List[str], words: List[str]) -> bool:
+    """AMQP topic matching: ``*`` is exactly one word, ``#`` zero or more."""
+    if not pattern:
+        return not words
+    head, rest = pattern[0], pattern[1:]
+    if head == "#":
+        return any(_topic_matches(rest, words[i:]) for i in range(len(words) + 1))
+    if not words:
+        return False
+    return (head == "*" or head == words[0]) and _topic_matches(rest, words[1:])
+
+
+class InMemoryBroker:
+    """
+    In-process stand-in for RabbitMQ implementing the event bus transport.
+
+    Routes through topic/direct exchanges into in-memory queues and settles
+    publisher confirms on ``wait_for_confirms``. ``fail_next`` and ``nack_next``
+    inject dropped connections and broker nacks for reconnect tests.
+    """
+
+    def __init__(self):
+        self.exchanges: Dict[str, str] = {}
+        self.queues: Dict[str, Deque[Dict[str, Any]]] = {}
+        self.bindings: List[Tuple[str, str, str]] = []
+        self.published: List[Dict[str, Any]] = []
+        self.connections = 0
+        self.declarations = 0
+        self.confirm_waits = 0
+        self._channels: List["InMemoryChannel"] = []
+        self._fail_publishes = 0
+        self._nack_publishes = 0
+        self._lock = threading.Lock()
+
+    def connect(self) -> "InMemoryChannel":
+        with self._lock:
+            self.connections += 1
+            channel = InMemoryChannel(self)
+            self._channels.append(channel)
+            return channel
+
+    def fail_next(self, publishes: int = 1) -> None:
+        """Drop the publishing connection on each of the next ``publishes`` publishes."""
+        self._fail_publishes += publishes
+
+    def nack_next(self, publishes: int = 1) -> None:
+        """Nack the next ``publishes`` messages instead of routing them."""
+        self._nack_publishes += publishes
+
+    def drop_connections(self) -> None:
+        with self._lock:
+            for channel in self._channels:
+                channel.is_open = False
+
+    def messages(self, queue: str) -> List[Dict[str, Any]]:
+        return [json.loads(message["body"]) for message in self.queues.get(queue, ())]
+
+    def _publish(self, channel: "InMemoryChannel", exchange: str, routing_key: str, body: str, properties) -> bool:
+        with self._lock:
+            if self._fail_publishes:
+                self._fail_publishes -= 1
+                channel.is_open = False
+                raise AMQPConnectionError("Connection reset by broker stand-in")
+            if self._nack_publishes:
+                self._nack_publishes -= 1
+                return False
+
+            message = {"exchange": exchange, "routing_key": routing_key, "body": body, "properties": properties}
+            self.published.append(message)
+            exchange_type = self.exchanges.get(exchange)
+            if exchange_type is None:
+                raise AMQPChannelError(f"NOT_FOUND - no exchange '{exchange}'")
+            words = routing_key.split(".")
+            for bound_exchange, queue, binding_key in self.bindings:
+                if bound_exchange != exchange:
+                    continue
+                if exchange_type == "topic":
+                    matched = _topic_matches(binding_key.split("."), words)
+                else:
+                    matched = binding_key == routing_key
+                if matched:
+                    self.queues[queue].append(message)
+            return True
+
+
+class InMemoryChannel:
+    """A confirm-mode publisher channel on an :class:`InMemoryBroker`."""
+
+    def __init__(self, broker: InMemoryBroker):
+        self.broker = broker
+        self.is_open = True
+        self._nacked = 0
+
+    def _check_open(self) -> None:
+        if not self.is_open:
+            raise AMQPConnectionError("Connection is closed")
+
+    def exchange_declare(self, exchange: str, exchange_type: str = "direct", durable: bool = False, **kwargs) -> None:
+        self._check_open()
+        self.broker.declarations += 1
+        self.broker.exchanges.setdefault(exchange, exchange_type)
+
+    def queue_declare(self, queue: str, durable: bool = False, arguments: Dict[str, Any] = None, **kwargs) -> None:
+        self._check_open()
+        self.broker.declarations += 1
+        self.broker.queues.setdefault(queue, deque())
+
+    def queue_bind(self, exchange: str, queue: str, routing_key: str = None, **kwargs) -> None:
+        self._check_open()
+        self.broker.declarations += 1
+        binding = (exchange, queue, routing_key or queue)
+        if binding not in self.broker.bindings:
+            self.broker.bindings.append(binding)
+
+    def publish(self, exchange: str, routing_key: str, body: str, properties) -> None:
+        self._check_open()
+        if not self.broker._publish(self, exchange, routing_key, body, properties):
+            self._nacked += 1
+
+    def wait_for_confirms(self, timeout: float) -> None:
+        self._check_open()
+        self.broker.confirm_waits += 1
+        if self._nacked:
+            nacked, self._nacked = self._nacked, 0
+            raise AMQPChannelError(f"Broker nacked {nacked} messages")
+
+    def close(self) -> None:
+        self.is_open = False
@@ -1,24 +1,34 @@
 """
 Performance metrics tracking with Prometheus.
 Tracks response times, percentiles, and exposes /metrics endpoint.
+
+Percentiles come from per-endpoint streaming sketches (see ``sketch.py``):
+requests only add to a fixed-size sketch, and quantiles over the configured
+window are computed when Prometheus scrapes. With ``METRICS_SKETCH_DIR`` set,
+each worker periodically writes its sketches there and every worker's scrape
+merges them, so percentiles cover the whole deployment.
 """
 
 from fastapi import FastAPI, Request, Response
 from prometheus_client import (
     Counter,
-    Gauge,
     Histogram,
     generate_latest,
     CONTENT_TYPE_LATEST,
     REGISTRY
 )
+from prometheus_client.core import GaugeMetricFamily
+import json
+import os
+import threading
 import time
-import numpy as np
-from typing import Dict
-from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 from starlette.middleware.base import BaseHTTPMiddleware
 import logging
 
+from .sketch import WindowedSketch
+
 logger = logging.getLogger(__name__)
 
 # Prometheus metrics
@@ -35,15 +45,186 @@ REQUEST_LATENCY = Histogram(
     buckets=[0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0]
 )
 
-RESPONSE_TIME_METRICS = Gauge(
-    "http_response_time_metrics_ms",
-    "Response time metrics in milliseconds",
-    ["metric", "endpoint"],
-)
+# Streaming percentile configuration
+PERCENTILE_WINDOW_SECONDS = float(os.getenv("METRICS_PERCENTILE_WINDOW_SECONDS", "300"))
+PERCENTILE_SLICES = int(os.getenv("METRICS_PERCENTILE_SLICES", "5"))
+SKETCH_RELATIVE_ACCURACY = float(os.getenv("METRICS_SKETCH_ACCURACY", "0.01"))
+SKETCH_SHARE_DIR = os.getenv("METRICS_SKETCH_DIR")
+SKETCH_SHARE_INTERVAL = float(os.getenv("METRICS_SKETCH_SHARE_INTERVAL", "5"))
+
+QUANTILES = (0.5, 0.95, 0.99)
+P95_ALERT_THRESHOLD_MS = 1000
+# Minimum seconds between two high-p95 alerts for the same endpoint
+P95_ALERT_INTERVAL_SECONDS = float(os.getenv("METRICS_P95_ALERT_INTERVAL_SECONDS", "300"))
+
+class LatencySketchCollector:
+    """
+    Prometheus collector for windowed latency quantiles per endpoint.
+
+    Everything here describes the last ``window_seconds`` only, so it is all
+    exported as gauges: ``http_request_duration_window_seconds`` (p50/p95/p99),
+    ``http_request_duration_window_observations`` and
+    ``http_request_duration_window_total_seconds`` (request count and summed
+    duration in the window), plus the ``http_response_time_metrics_ms`` gauges
+    (min/max/avg/p50/p95/p99) that dashboards already use. Cumulative totals
+    for ``rate()`` are on the ``http_request_duration_seconds`` histogram.
+
+    A p95 above ``P95_ALERT_THRESHOLD_MS`` is logged at most once per
+    ``alert_interval`` seconds per endpoint, however often Prometheus scrapes.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = PERCENTILE_WINDOW_SECONDS,
+        slices: int = PERCENTILE_SLICES,
+        relative_accuracy: float = SKETCH_RELATIVE_ACCURACY,
+        share_dir: Optional[str] = SKETCH_SHARE_DIR,
+        alert_interval: float = P95_ALERT_INTERVAL_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.window_seconds = window_seconds
+        self.slices = slices
+        self.relative_accuracy = relative_accuracy
+        self.share_dir = Path(share_dir) if share_dir else None
+        self.sketches: Dict[str, WindowedSketch] = {}
+        self._sharing: Optional[threading.Thread] = None
+        self.alert_interval = alert_interval
+        self.clock = clock
+        self._last_alert: Dict[str, float] = {}
+
+    def _new_sketch(self) -> WindowedSketch:
+        return WindowedSketch(self.window_seconds, self.slices, self.relative_accuracy)
+
+    def observe(self, endpoint: str, seconds: float):
+        """Record one request duration; O(1)."""
+        sketch = self.sketches.get(endpoint)
+        if sketch is None:
+            sketch = self.sketches.setdefault(endpoint, self._new_sketch())
+        sketch.add(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {endpoint: sketch.to_dict() for endpoint, sketch in list(self.sketches.items())}
+
+    # Cross-worker sharing
+
+    def write_snapshot(self):
+        """Atomically publish this worker's sketches for the other workers."""
+        self.share_dir.mkdir(parents=True, exist_ok=True)
+        path = self.share_dir / f"{os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, path)
+
+    def _peer_snapshots(self) -> List[Dict[str, Dict[str, Any]]]:
+        if self.share_dir is None or not self.share_dir.exists():
+            return []
+        own = f"{os.getpid()}.json"
+        cutoff = time.time() - self.window_seconds
+        snapshots = []
+        for path in self.share_dir.glob("*.json"):
+            try:
+                if path.name == own or path.stat().st_mtime < cutoff:
+                    continue
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError) as e:
+                logger.debug(f"Skipping latency snapshot {path}: {e}")
+        return snapshots
+
+    def start_sharing(self, interval: float = SKETCH_SHARE_INTERVAL):
+        """Write snapshots every ``interval`` seconds from a daemon thread."""
+        if self.share_dir is None or self._sharing is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.write_snapshot()
+                except Exception as e:
+                    logger.error(f"Error writing latency snapshot: {e}")
+
+        self._sharing = threading.Thread(target=run, name="latency-sketch-share", daemon=True)
+        self._sharing.start()
+
+    # Prometheus export
+
+    def _alert_high_p95(self, endpoint: str, p95_ms: float):
+        now = self.clock()
+        last = self._last_alert.get(endpoint)
+        if last is not None and now - last < self.alert_interval:
+            return
+        self._last_alert[endpoint] = now
+        logger.error(
+            f"ALERT: High p95 latency",
+            extra={
+                "endpoint": endpoint,
+                "p95_ms": round(p95_ms, 2),
+                "threshold_ms": P95_ALERT_THRESHOLD_MS
+            }
+        )
+
+    def collect(self):
+        window = f"over the last {int(self.window_seconds)}s"
+        quantile_gauges = GaugeMetricFamily(
+            "http_request_duration_window_seconds",
+            f"HTTP request latency quantiles {window}",
+            labels=["endpoint", "quantile"],
+        )
+        observations = GaugeMetricFamily(
+            "http_request_duration_window_observations",
+            f"HTTP requests observed {window}",
+            labels=["endpoint"],
+        )
+        total_seconds = GaugeMetricFamily(
+            "http_request_duration_window_total_seconds",
+            f"Summed HTTP request latency {window}",
+            labels=["endpoint"],
+        )
+        gauges = GaugeMetricFamily(
+            "http_response_time_metrics_ms",
+            "Response time metrics in milliseconds",
+            labels=["metric", "endpoint"],
+        )
 
-# Storage for response times
-response_times: Dict[str, deque] = {}
-MAX_RECORDS = 1000  # Keep last 1000 records per endpoint
+        peers = self._peer_snapshots()
+        endpoints = set(self.sketches)
+        for peer in peers:
+            endpoints.update(peer)
+
+        for endpoint in sorted(endpoints):
+            local = self.sketches.get(endpoint) or self._new_sketch()
+            sketch = local.merged(peer[endpoint] for peer in peers if endpoint in peer)
+            if not sketch.count:
+                continue
+
+            quantiles = {q: sketch.quantile(q) for q in QUANTILES}
+            for q, value in quantiles.items():
+                quantile_gauges.add_metric([endpoint, str(q)], value)
+            observations.add_metric([endpoint], sketch.count)
+            total_seconds.add_metric([endpoint], sketch.sum)
+
+            metrics = {
+                "min": sketch.min * 1000,
+                "max": sketch.max * 1000,
+                "avg": sketch.average * 1000,
+                "p50": quantiles[0.5] * 1000,
+                "p95": quantiles[0.95] * 1000,
+                "p99": quantiles[0.99] * 1000,
+            }
+            for metric, value in metrics.items():
+                gauges.add_metric([metric, endpoint], value)
+
+            # Check for alert threshold (p95 > 1000ms)
+            if metrics["p95"] > P95_ALERT_THRESHOLD_MS:
+                self._alert_high_p95(endpoint, metrics["p95"])
+
+        yield quantile_gauges
+        yield observations
+        yield total_seconds
+        yield gauges
+
+LATENCY_SKETCHES = LatencySketchCollector()
+REGISTRY.register(LATENCY_SKETCHES)
 
 class PerformanceMetricsMiddleware(BaseHTTPMiddleware):
     """Middleware to track performance metrics."""
@@ -53,7 +234,7 @@ class PerformanceMetricsMiddleware(BaseHTTPMiddleware):
         if request.url.path == "/metrics":
             return await call_next(request)
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         method = request.method
         endpoint = request.url.path
 
@@ -66,7 +247,7 @@ class PerformanceMetricsMiddleware(BaseHTTPMiddleware):
             raise
         finally:
             # Calculate response time
-            process_time = (time.time() - start_time) * 1000  # in milliseconds
+            process_time = (time.perf_counter() - start_time) * 1000  # in milliseconds
 
             # Track request count
             REQUEST_COUNT.labels(
@@ -75,16 +256,11 @@ class PerformanceMetricsMiddleware(BaseHTTPMiddleware):
                 status_code=status_code
             ).inc()
 
-            # Store response time
-            if endpoint not in response_times:
-                response_times[endpoint] = deque(maxlen=MAX_RECORDS)
-            response_times[endpoint].append(process_time)
-
-            # Update Prometheus metrics
+            # Update Prometheus metrics; percentiles are derived at scrape time
             REQUEST_LATENCY.labels(method=method, endpoint=endpoint).observe(
                 process_time / 1000
             )
-            self._update_percentile_metrics(endpoint)
+            LATENCY_SKETCHES.observe(endpoint, process_time / 1000)
 
             # Log slow requests (> 1000ms)
             if process_time > 1000:
@@ -100,39 +276,6 @@ class PerformanceMetricsMiddleware(BaseHTTPMiddleware):
 
         return response
 
-    def _update_percentile_metrics(self, endpoint: str):
-        """Calculate and update percentile metrics for an endpoint."""
-        times = list(response_times.get(endpoint, []))
-        if not times:
-            return
-
-        try:
-            metrics = {
-                "min": float(np.min(times)),
-                "max": float(np.max(times)),
-                "avg": float(np.mean(times)),
-                "p50": float(np.percentile(times, 50)),
-                "p95": float(np.percentile(times, 95)),
-                "p99": float(np.percentile(times, 99)),
-            }
-
-            for metric, value in metrics.items():
-                RESPONSE_TIME_METRICS.labels(metric=metric, endpoint=endpoint).set(value)
-
-            # Check for alert threshold (p95 > 1000ms)
-            if metrics["p95"] > 1000:
-                logger.error(
-                    f"ALERT: High p95 latency",
-                    extra={
-                        "endpoint": endpoint,
-                        "p95_ms": round(metrics["p95"], 2),
-                        "threshold_ms": 1000
-                    }
-                )
-
-        except Exception as e:
-            logger.error(f"Error updating percentile metrics: {e}")
-
 def setup_metrics(app: FastAPI):
     """Setup metrics endpoint."""
 
@@ -147,4 +290,7 @@ def setup_metrics(app: FastAPI):
     # Add middleware
     app.add_middleware(PerformanceMetricsMiddleware)
 
+    # Share percentile sketches with the other workers
+    LATENCY_SKETCHES.start_sharing()
+
     logger.info("Performance metrics enabled at /metrics")
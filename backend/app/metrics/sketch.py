@@ -0,0 +1,209 @@
+"""
+Streaming quantile sketches for latency metrics.
+
+:class:`DDSketch` keeps counts in logarithmically sized buckets, so any
+quantile it reports is within ``relative_accuracy`` of the true value while
+memory stays fixed (about 800 buckets cover 10 us .. 1 h at 1 %). Adding an
+observation is a log and an increment; sketches with the same accuracy merge
+by adding bucket counts, which is what makes per-worker sketches combinable.
+
+:class:`WindowedSketch` rotates a ring of sketches so quantiles cover only the
+last ``window_seconds``.
+"""
+
+import math
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Values at or below this are counted as zero (no log bucket)
+MIN_INDEXABLE = 1e-9
+
+
+class DDSketch:
+    """
+    Relative-error quantile sketch (DDSketch) over non-negative values.
+
+    Args:
+        relative_accuracy: Maximum relative error of reported quantiles
+        max_buckets: Bucket cap; beyond it the lowest buckets are collapsed
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._multiplier = 1 / math.log(self.gamma)
+        self._bins: List[int] = []
+        self._offset = 0  # bucket key of _bins[0]
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, count: int = 1) -> None:
+        self.count += count
+        self.sum += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= MIN_INDEXABLE:
+            self.zero_count += count
+        else:
+            self._add_key(math.ceil(math.log(value) * self._multiplier), count)
+
+    def _add_key(self, key: int, count: int) -> None:
+        bins = self._bins
+        if not bins:
+            bins.append(0)
+            self._offset = key
+        index = key - self._offset
+        if index < 0:
+            bins[0:0] = [0] * -index
+            self._offset = key
+            index = 0
+        elif index >= len(bins):
+            bins.extend([0] * (index - len(bins) + 1))
+        bins[index] += count
+
+        if len(bins) > self.max_buckets:
+            # Fold the lowest buckets together; high quantiles keep full accuracy
+            extra = len(bins) - self.max_buckets
+            self._bins = [sum(bins[: extra + 1])] + bins[extra + 1 :]
+            self._offset += extra
+
+    def merge(self, other: "DDSketch") -> None:
+        """Add ``other``'s observations into this sketch."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        if not other.count:
+            return
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.zero_count += other.zero_count
+        for index, count in enumerate(other._bins):
+            if count:
+                self._add_key(other._offset + index, count)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated ``q``-quantile (0..1), or None when the sketch is empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        key = self._offset
+        for index, count in enumerate(self._bins):
+            seen += count
+            if seen > rank:
+                key = self._offset + index
+                break
+        value = 2 * self.gamma ** key / (self.gamma + 1)
+        return min(max(value, self.min), self.max)
+
+    @property
+    def average(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "offset": self._offset,
+            "bins": list(self._bins),
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_buckets: int = 2048) -> "DDSketch":
+        sketch = cls(data["relative_accuracy"], max_buckets)
+        sketch._offset = data["offset"]
+        sketch._bins = list(data["bins"])
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+
+class WindowedSketch:
+    """
+    DDSketch over a sliding time window, built from ``slices`` rotating sketches.
+
+    Slices are aligned to wall-clock epochs, so windows from different workers
+    line up and can be merged slice by slice.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 300.0,
+        slices: int = 5,
+        relative_accuracy: float = 0.01,
+        clock=time.time,
+    ):
+        self.window_seconds = window_seconds
+        self.slices = slices
+        self.slice_seconds = window_seconds / slices
+        self.relative_accuracy = relative_accuracy
+        self.clock = clock
+        self._ring: List[Optional[Tuple[int, DDSketch]]] = [None] * slices
+        self._current_epoch = -1
+        self._current: Optional[DDSketch] = None
+        self._lock = threading.Lock()
+
+    def _epoch(self) -> int:
+        return int(self.clock() // self.slice_seconds)
+
+    def add(self, value: float) -> None:
+        epoch = self._epoch()
+        with self._lock:
+            if epoch != self._current_epoch:
+                self._current = DDSketch(self.relative_accuracy)
+                self._current_epoch = epoch
+                self._ring[epoch % self.slices] = (epoch, self._current)
+            self._current.add(value)
+
+    def _live(self) -> List[Tuple[int, DDSketch]]:
+        oldest = self._epoch() - self.slices + 1
+        return [entry for entry in self._ring if entry is not None and entry[0] >= oldest]
+
+    def live_slices(self) -> List[Tuple[int, DDSketch]]:
+        """``(epoch, sketch)`` for each slice still inside the window."""
+        with self._lock:
+            return self._live()
+
+    def merged(self, snapshots: Iterable[Dict[str, Any]] = ()) -> DDSketch:
+        """
+        One sketch covering the whole window.
+
+        Args:
+            snapshots: :meth:`to_dict` output from other workers to fold in;
+                slices that have left the window are skipped
+        """
+        result = DDSketch(self.relative_accuracy)
+        for _, sketch in self.live_slices():
+            result.merge(sketch)
+        oldest = self._epoch() - self.slices + 1
+        for snapshot in snapshots:
+            if snapshot["slice_seconds"] != self.slice_seconds:
+                continue
+            for epoch, data in snapshot["slices"]:
+                if epoch >= oldest:
+                    result.merge(DDSketch.from_dict(data))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            # Serialise under the lock; the current slice keeps changing afterwards
+            slices = [(epoch, sketch.to_dict()) for epoch, sketch in self._live()]
+        return {"slice_seconds": self.slice_seconds, "slices": slices}
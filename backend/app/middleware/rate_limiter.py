@@ -1,25 +1,174 @@
-from fastapi import Request, HTTPException
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.middleware import SlowAPIMiddleware
-from slowapi.errors import RateLimitExceeded
-from redis import Redis
-from app.core.rate_limit_config import RateLimitConfig
-
-# Initialize Redis-backed limiter
+"""
+Distributed GCRA rate limiting.
+
+Each request costs one ``EVALSHA`` of a small Lua script that implements the
+generic cell rate algorithm (a token bucket stored as a single "theoretical
+arrival time"), so the check and the update are atomic in Redis and there are
+no window edges to burst through. Buckets are keyed by tenant, caller and
+route class, where tenant and caller come only from what authentication put
+on ``request.state``; unauthenticated requests are keyed on the client IP, so
+rotating ``X-API-Key`` or ``X-Tenant-ID`` headers does not buy new buckets. If Redis is unreachable the same algorithm runs
+on in-process buckets until Redis is retried.
+
+Responses carry ``RateLimit-Limit``, ``RateLimit-Remaining``,
+``RateLimit-Reset`` and ``RateLimit-Policy`` headers; rejected requests get a
+429 with ``Retry-After``.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.datastructures import MutableHeaders
+
+from ..core.rate_limit_config import RateLimitConfig
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: bucket; ARGV: emission interval (us), burst capacity, cost.
+# Returns {allowed, remaining, retry_after_us, reset_after_us}.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval * cost
+local allow_at = new_tat - interval * burst
+if now < allow_at then
+    return {0, 0, allow_at - now, tat - now}
+end
+redis.call('SET', KEYS[1], string.format('%.0f', new_tat), 'PX', math.max(1, math.ceil((new_tat - now) / 1000)))
+return {1, math.floor((now - allow_at) / interval), 0, new_tat - now}
+"""
+
 redis_conn = Redis(
     host=RateLimitConfig.REDIS_HOST,
     port=RateLimitConfig.REDIS_PORT,
     db=RateLimitConfig.REDIS_DB,
     password=RateLimitConfig.REDIS_PASSWORD,
-    decode_responses=True,
-)
-limiter = Limiter(
-    key_func=get_remote_address,  # Default key by IP; overridden per user
-    storage_uri=f"redis://{RateLimitConfig.REDIS_HOST}:{RateLimitConfig.REDIS_PORT}/{RateLimitConfig.REDIS_DB}",
-    strategy="fixed-window",  # Or "moving-window" for sliding
+    socket_timeout=RateLimitConfig.REDIS_TIMEOUT,
+    socket_connect_timeout=RateLimitConfig.REDIS_TIMEOUT,
 )
 
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # seconds until the bucket is full again
+    retry_after: float  # seconds until this request would be allowed; 0 when allowed
+    period: float
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+            "RateLimit-Policy": f"{self.limit};w={int(self.period)}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class LocalBuckets:
+    """In-process GCRA buckets, LRU-bounded to ``max_keys``; used while Redis is down."""
+
+    def __init__(self, max_keys: int = RateLimitConfig.FALLBACK_MAX_KEYS, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, interval: float, burst: int, cost: int = 1) -> Tuple[bool, int, float, float]:
+        with self._lock:
+            now = self.clock()
+            tat = max(self._tats.get(key, now), now)
+            new_tat = tat + interval * cost
+            allow_at = new_tat - interval * burst
+            if now < allow_at:
+                return False, 0, allow_at - now, tat - now
+            self._tats[key] = new_tat
+            self._tats.move_to_end(key)
+            if len(self._tats) > self.max_keys:
+                self._tats.popitem(last=False)
+            return True, int((now - allow_at) // interval), 0.0, new_tat - now
+
+
+class RateLimiter:
+    """
+    GCRA limiter over Redis with an in-process fallback.
+
+    Args:
+        redis: Async Redis client; None limits in-process only
+        fallback: Buckets used when Redis fails
+        retry_interval: Seconds to stay on the fallback before trying Redis again
+    """
+
+    def __init__(
+        self,
+        redis: Optional[Redis] = None,
+        fallback: Optional[LocalBuckets] = None,
+        retry_interval: float = RateLimitConfig.REDIS_RETRY_INTERVAL,
+        clock=time.monotonic,
+    ):
+        self.redis = redis
+        self.fallback = fallback or LocalBuckets()
+        self.retry_interval = retry_interval
+        self.clock = clock
+        self._script = redis.register_script(GCRA_SCRIPT) if redis is not None else None
+        self._redis_down_until = 0.0
+
+    async def hit(self, key: str, limit: int, period: float, cost: int = 1) -> RateLimitDecision:
+        """
+        Spend ``cost`` tokens from the bucket for ``key``.
+
+        Args:
+            key: Bucket key
+            limit: Requests allowed per ``period``; also the burst size
+            period: Window in seconds
+            cost: Tokens this request consumes
+
+        Returns:
+            RateLimitDecision with the outcome and header values
+        """
+        interval = period / limit
+        if self._script is not None and self.clock() >= self._redis_down_until:
+            try:
+                allowed, remaining, retry_after, reset_after = await self._script(
+                    keys=[key], args=[interval * 1_000_000, limit, cost]
+                )
+                return RateLimitDecision(
+                    bool(allowed), limit, int(remaining), reset_after / 1_000_000, retry_after / 1_000_000, period
+                )
+            except RedisError as e:
+                logger.warning(f"Rate limit store unavailable, using local buckets for {self.retry_interval}s: {e}")
+                self._redis_down_until = self.clock() + self.retry_interval
+
+        allowed, remaining, retry_after, reset_after = self.fallback.hit(key, interval, limit, cost)
+        return RateLimitDecision(allowed, limit, remaining, reset_after, retry_after, period)
+
+
+limiter = RateLimiter(redis_conn)
+
+def get_remote_address(request: Request) -> str:
+    """Client IP of the request."""
+    return request.client.host if request.client else "127.0.0.1"
+
 def get_user_tier(request: Request) -> str:
     """Extract user tier from request. Assumes auth sets request.state.user with 'tier'."""
     user = getattr(request.state, "user", None)
@@ -37,47 +186,69 @@ def is_admin_bypass(request: Request) -> bool:
     client_ip = get_remote_address(request)
     return client_ip in RateLimitConfig.INTERNAL_IPS
 
-# Custom rate limit exceeded handler
-@_rate_limit_exceeded_handler
-def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
-    """Return 429 with JSON error."""
-    raise HTTPException(status_code=429, detail="Rate limit exceeded. Try again later.")
+def get_authenticated_identity(request: Request) -> Optional[str]:
+    """Caller identity verified by auth middleware (``request.state``), or None."""
+    api_key_id = getattr(request.state, "api_key_id", None)
+    if api_key_id:
+        return f"key:{api_key_id}"
+    user = getattr(request.state, "user", None)
+    if isinstance(user, dict) and user.get("id"):
+        return f"user:{user['id']}"
+    return None
+
+def rate_limit_key(request: Request) -> str:
+    """
+    Bucket key: tenant, authenticated caller or client IP, then route class.
+
+    Request headers are never trusted here: they are read before (or without)
+    authentication, so a client could mint a fresh bucket per request.
+    """
+    tenant = getattr(request.state, "tenant_id", None) or "-"
+    identity = get_authenticated_identity(request) or "ip:" + get_remote_address(request)
+    route_class = RateLimitConfig.get_route_class(request.url.path)
+    return f"{RateLimitConfig.KEY_PREFIX}:{tenant}:{identity}:{route_class}"
 
 # Middleware class
-class RateLimitingMiddleware(SlowAPIMiddleware):
-    def __init__(self, app):
-        super().__init__(app, limiter)
+class RateLimitingMiddleware:
+    """Pure ASGI middleware enforcing the per-tier / per-endpoint limits."""
+
+    def __init__(self, app, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter
 
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
             await self.app(scope, receive, send)
             return
 
-        request = Request(scope, receive)
-        
+        request = Request(scope)
+
         # Admin bypass
         if is_admin_bypass(request):
             await self.app(scope, receive, send)
             return
 
-        # Get user-specific limit
-        tier = get_user_tier(request)
-        limit_str = RateLimitConfig.get_limit_for_tier(tier)
-        
-        # Check for custom per-endpoint limit
-        path = request.url.path
-        custom_limit = RateLimitConfig.get_custom_limit(path)
-        if custom_limit:
-            limit_str = custom_limit
-        
-        # Apply limit using limiter (this will check and set headers)
-        # Note: slowapi handles the actual limiting; we just configure it here
-        # For per-request limits, we can use limiter.check_request_limit or integrate with routes
-        # But for global middleware, rely on per-route decorators or global defaults
-        
-        await self.app(scope, receive, send)
-
-# To use per-endpoint limits, decorate routes like:
-# @app.get("/api/ml/predict")
-# @limiter.limit("50/minute")  # Overrides global
-# async def predict(...): ...
\ No newline at end of file
+        # Per-endpoint limit wins over the user's tier limit
+        limit_str = RateLimitConfig.get_custom_limit(request.url.path)
+        if not limit_str:
+            limit_str = RateLimitConfig.get_limit_for_tier(get_user_tier(request))
+        limit, period = RateLimitConfig.parse_limit(limit_str)
+
+        decision = await (self.limiter or limiter).hit(rate_limit_key(request), limit, period)
+        headers = decision.headers()
+
+        if not decision.allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded. Try again later."},
+                headers=headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -6,14 +6,14 @@ Handles tenant detection and context setting for all requests
 import logging
 from typing import Optional
 from urllib.parse import urlparse
+from uuid import UUID
 import time
 
 from fastapi import Request, Response, HTTPException, status
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.tenant_context import tenant_context, TenantIsolationError
+from app.core.tenant_context import tenant_context, TenantIsolationError, TenantKey
 from app.core.database import get_db
 from app.models.tenant import TenantStatus
 
@@ -44,20 +44,8 @@ class TenantMiddleware(BaseHTTPMiddleware):
             return response
         
         try:
-            # Get database session
-            db = None
-            async for session in get_db():
-                db = session
-                break
-            
-            if not db:
-                return JSONResponse(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    content={"detail": "Database connection failed"}
-                )
-            
-            # Detect tenant
-            tenant = await self._detect_tenant(request, db)
+            # Detect tenant; a database session is only opened on a cache miss
+            tenant = await self._detect_tenant(request)
             
             if not tenant:
                 return JSONResponse(
@@ -69,11 +57,11 @@ class TenantMiddleware(BaseHTTPMiddleware):
             if tenant.status != TenantStatus.ACTIVE:
                 return JSONResponse(
                     status_code=status.HTTP_403_FORBIDDEN,
-                    content={"detail": f"Tenant is {tenant.status.value}"}
+                    content={"detail": f"Tenant is {TenantStatus(tenant.status).value}"}
                 )
             
-            # Set tenant context
-            await tenant_context.set_tenant_context(tenant, db)
+            # Set tenant context; handler sessions apply it for RLS when they begin
+            await tenant_context.set_tenant_context(tenant)
             
             # Add tenant info to request state
             request.state.tenant = tenant
@@ -115,8 +103,7 @@ class TenantMiddleware(BaseHTTPMiddleware):
             
         finally:
             # Clear tenant context
-            if db:
-                await tenant_context.clear_tenant_context(db)
+            await tenant_context.clear_tenant_context()
     
     def _should_skip_tenant_detection(self, request: Request) -> bool:
         """Check if tenant detection should be skipped for this path"""
@@ -133,97 +120,72 @@ class TenantMiddleware(BaseHTTPMiddleware):
         
         return False
     
-    async def _detect_tenant(self, request: Request, db: AsyncSession):
-        """Detect tenant from request"""
-        tenant = None
+    async def _detect_tenant(self, request: Request):
+        """
+        Detect tenant from request.
+
+        Candidates are collected in priority order (JWT, subdomain, header,
+        query parameter) without touching the database, then resolved together
+        from the tenant cache with at most one lookup.
+        """
+        candidates = [
+            key for key in (
+                self._tenant_key_from_jwt(request),
+                self._tenant_key_from_subdomain(request),
+                self._tenant_key_from_header(request),
+                self._tenant_key_from_query(request),
+            )
+            if key is not None
+        ]
+        if not candidates:
+            return None
+        return await tenant_context.resolve_tenant(candidates, get_db)
+    
+    def _tenant_key_from_jwt(self, request: Request) -> Optional[TenantKey]:
+        """Tenant ID claim from the bearer token"""
+        # Get token from Authorization header
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return None
         
-        # Method 1: Try JWT token first
-        tenant = await self._detect_tenant_from_jwt(request)
-        if tenant:
-            return tenant
+        tenant_id = tenant_context.tenant_id_from_jwt(auth_header.split(" ")[1])
+        return ("id", tenant_id) if tenant_id else None
+    
+    def _tenant_key_from_subdomain(self, request: Request) -> Optional[TenantKey]:
+        """Subdomain of the Host header"""
+        host = request.headers.get("host", "")
+        if not host:
+            return None
         
-        # Method 2: Try subdomain
-        tenant = await self._detect_tenant_from_subdomain(request, db)
-        if tenant:
-            return tenant
+        # Extract subdomain
+        parts = host.split(".")
+        if len(parts) < 3:  # Need at least subdomain.domain.tld
+            return None
         
-        # Method 3: Try custom header
-        tenant = await self._detect_tenant_from_header(request, db)
-        if tenant:
-            return tenant
+        subdomain = parts[0]
         
-        # Method 4: Try query parameter (for development)
-        tenant = await self._detect_tenant_from_query(request, db)
-        if tenant:
-            return tenant
+        # Skip common subdomains
+        if subdomain in ["www", "api", "admin"]:
+            return None
         
-        return None
+        return ("subdomain", subdomain)
     
-    async def _detect_tenant_from_jwt(self, request: Request):
-        """Detect tenant from JWT token"""
-        try:
-            # Get token from Authorization header
-            auth_header = request.headers.get("Authorization")
-            if not auth_header or not auth_header.startswith("Bearer "):
-                return None
-            
-            token = auth_header.split(" ")[1]
-            return await tenant_context.get_tenant_from_jwt(token)
-            
-        except Exception as e:
-            logger.debug(f"Failed to detect tenant from JWT: {e}")
-            return None
+    def _tenant_key_from_header(self, request: Request) -> Optional[TenantKey]:
+        """Tenant ID from the X-Tenant-ID header"""
+        return self._tenant_id_key(request.headers.get("X-Tenant-ID"))
     
-    async def _detect_tenant_from_subdomain(self, request: Request, db: AsyncSession):
-        """Detect tenant from subdomain"""
-        try:
-            host = request.headers.get("host", "")
-            if not host:
-                return None
-            
-            # Extract subdomain
-            parts = host.split(".")
-            if len(parts) < 3:  # Need at least subdomain.domain.tld
-                return None
-            
-            subdomain = parts[0]
-            
-            # Skip common subdomains
-            if subdomain in ["www", "api", "admin"]:
-                return None
-            
-            return await tenant_context.get_tenant_from_subdomain(subdomain, db)
-            
-        except Exception as e:
-            logger.debug(f"Failed to detect tenant from subdomain: {e}")
-            return None
+    def _tenant_key_from_query(self, request: Request) -> Optional[TenantKey]:
+        """Tenant ID from the tenant_id query parameter (development only)"""
+        return self._tenant_id_key(request.query_params.get("tenant_id"))
     
-    async def _detect_tenant_from_header(self, request: Request, db: AsyncSession):
-        """Detect tenant from custom header"""
-        try:
-            tenant_id = request.headers.get("X-Tenant-ID")
-            if not tenant_id:
-                return None
-            
-            from uuid import UUID
-            return await tenant_context.get_tenant_by_id(UUID(tenant_id), db)
-            
-        except Exception as e:
-            logger.debug(f"Failed to detect tenant from header: {e}")
+    @staticmethod
+    def _tenant_id_key(value: Optional[str]) -> Optional[TenantKey]:
+        if not value:
             return None
-    
-    async def _detect_tenant_from_query(self, request: Request, db: AsyncSession):
-        """Detect tenant from query parameter (development only)"""
         try:
-            tenant_id = request.query_params.get("tenant_id")
-            if not tenant_id:
-                return None
-            
-            from uuid import UUID
-            return await tenant_context.get_tenant_by_id(UUID(tenant_id), db)
-            
-        except Exception as e:
-            logger.debug(f"Failed to detect tenant from query: {e}")
+            return ("id", UUID(value))
+        except ValueError:
+            logger.debug(f"Ignoring malformed tenant id {value!r}")
             return None
     
     async def _track_api_usage(self, tenant_id, request: Request, response: Response):
@@ -1,5 +1,6 @@
 import logging
-from tenacity import CircuitBreaker, CircuitBreakerOpen
+import threading
+import time
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
@@ -29,38 +30,199 @@ CIRCUIT_CONFIGS = {
         "recovery_timeout": 60,
         "expected_exception": Exception,
     },
+    "webhook": {
+        "failure_threshold": 5,
+        "recovery_timeout": 120,
+        "expected_exception": Exception,
+        "half_open_max_calls": 1,  # Trickle a single probe delivery at a time
+    },
 }
 
-# Circuit breakers for each service
-circuit_breakers = {}
-for service, config in CIRCUIT_CONFIGS.items():
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreakerOpen(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, name: str, retry_at: float):
+        super().__init__(f"Circuit '{name}' is open")
+        self.name = name
+        self.retry_at = retry_at
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a bounded half-open probe budget.
+
+    The breaker can wrap callables (``breaker(func)`` / ``breaker.call(func)``)
+    or be fed externally via ``allow_request``/``record_success``/``record_failure``
+    when the protected operation is driven elsewhere (e.g. async HTTP calls).
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 60,
+        expected_exception=Exception,
+        half_open_max_calls: int = 1,
+        name: str = "default",
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.expected_exception = expected_exception
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = STATE_CLOSED
+        self._failure_count = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._lock = threading.Lock()
+
+        self._success_callbacks = []
+        self._failure_callbacks = []
+        self._state_change_callbacks = []
+
+    # Callback registration -------------------------------------------------
+    def add_success_callback(self, callback):
+        self._success_callbacks.append(callback)
+
+    def add_failure_callback(self, callback):
+        self._failure_callbacks.append(callback)
+
+    def add_state_change_callback(self, callback):
+        self._state_change_callbacks.append(callback)
+
+    # State -----------------------------------------------------------------
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    @property
+    def failure_count(self) -> int:
+        return self._failure_count
+
+    @property
+    def retry_at(self) -> float:
+        """Monotonic timestamp at which an open circuit admits probe traffic."""
+        return self._opened_at + self.recovery_timeout
+
+    def _maybe_half_open(self):
+        if self._state == STATE_OPEN and time.monotonic() >= self.retry_at:
+            self._transition(STATE_HALF_OPEN)
+
+    def _transition(self, new_state: str):
+        previous = self._state
+        if previous == new_state:
+            return
+        self._state = new_state
+        if new_state == STATE_OPEN:
+            self._opened_at = time.monotonic()
+        if new_state != STATE_HALF_OPEN:
+            self._half_open_in_flight = 0
+        for callback in self._state_change_callbacks:
+            callback(self, previous, new_state)
+
+    def allow_request(self) -> bool:
+        """Reserve permission for one call; half-open circuits admit a trickle."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failure_count = 0
+            if self._state != STATE_CLOSED:
+                self._transition(STATE_CLOSED)
+        for callback in self._success_callbacks:
+            callback(self)
+
+    def record_failure(self):
+        with self._lock:
+            self._failure_count += 1
+            if self._state == STATE_HALF_OPEN or self._failure_count >= self.failure_threshold:
+                self._transition(STATE_OPEN)
+        for callback in self._failure_callbacks:
+            callback(self)
+
+    def reset(self):
+        with self._lock:
+            self._failure_count = 0
+            self._transition(STATE_CLOSED)
+
+    # Call wrapping -----------------------------------------------------------
+    def call(self, func, *args, **kwargs):
+        if not self.allow_request():
+            raise CircuitBreakerOpen(self.name, self.retry_at)
+        try:
+            result = func(*args, **kwargs)
+        except self.expected_exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def __call__(self, func):
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+
+        wrapper.__name__ = getattr(func, "__name__", "wrapped")
+        wrapper.__doc__ = getattr(func, "__doc__", None)
+        return wrapper
+
+
+def on_success(service_name):
+    def _on_success(retry_state):
+        circuit_metrics[service_name]["success"] += 1
+    return _on_success
+
+
+def on_failure(service_name):
+    def _on_failure(retry_state):
+        circuit_metrics[service_name]["failure"] += 1
+    return _on_failure
+
+
+def on_state_change(service_name):
+    def _on_state_change(retry_state, previous_state, current_state):
+        circuit_metrics[service_name]["state_changes"] += 1
+        logger.info(f"Circuit for {service_name} changed from {previous_state} to {current_state}")
+    return _on_state_change
+
+
+def _build_breaker(name: str, config: dict) -> CircuitBreaker:
     breaker = CircuitBreaker(
         failure_threshold=config["failure_threshold"],
         recovery_timeout=config["recovery_timeout"],
         expected_exception=config["expected_exception"],
+        half_open_max_calls=config.get("half_open_max_calls", 1),
+        name=name,
     )
     # Attach metrics listeners
-    def on_success(service_name):
-        def _on_success(retry_state):
-            circuit_metrics[service_name]["success"] += 1
-        return _on_success
-
-    def on_failure(service_name):
-        def _on_failure(retry_state):
-            circuit_metrics[service_name]["failure"] += 1
-        return _on_failure
-
-    def on_state_change(service_name):
-        def _on_state_change(retry_state, previous_state, current_state):
-            circuit_metrics[service_name]["state_changes"] += 1
-            logger.info(f"Circuit for {service_name} changed from {previous_state} to {current_state}")
-        return _on_state_change
-
-    breaker.add_success_callback(on_success(service))
-    breaker.add_failure_callback(on_failure(service))
-    breaker.add_state_change_callback(on_state_change(service))
-    
-    circuit_breakers[service] = breaker
+    breaker.add_success_callback(on_success(name))
+    breaker.add_failure_callback(on_failure(name))
+    breaker.add_state_change_callback(on_state_change(name))
+    return breaker
+
+
+# Circuit breakers for each service
+circuit_breakers = {}
+for service, config in CIRCUIT_CONFIGS.items():
+    circuit_breakers[service] = _build_breaker(service, config)
+
+# Per-endpoint breakers keyed by "<service_type>:<endpoint_key>"; like every
+# breaker here they are per process, so each worker keeps its own circuit state
+endpoint_breakers = {}
+_endpoint_lock = threading.Lock()
+
 
 def get_circuit_breaker(service_type: str):
     """Retrieve the circuit breaker for a given service type."""
@@ -68,6 +230,26 @@ def get_circuit_breaker(service_type: str):
         raise ValueError(f"Unknown service type: {service_type}")
     return circuit_breakers[service_type]
 
+
+def get_endpoint_breaker(service_type: str, endpoint_key: str):
+    """Retrieve (or lazily create) a circuit breaker for a single endpoint.
+
+    Each endpoint gets its own breaker configured from ``CIRCUIT_CONFIGS[service_type]``
+    so one failing partner cannot trip the circuit for every other partner.
+    """
+    if service_type not in CIRCUIT_CONFIGS:
+        raise ValueError(f"Unknown service type: {service_type}")
+    name = f"{service_type}:{endpoint_key}"
+    breaker = endpoint_breakers.get(name)
+    if breaker is None:
+        with _endpoint_lock:
+            breaker = endpoint_breakers.get(name)
+            if breaker is None:
+                breaker = _build_breaker(name, CIRCUIT_CONFIGS[service_type])
+                endpoint_breakers[name] = breaker
+    return breaker
+
+
 def get_metrics(service_type: str):
     """Get metrics for a service type."""
-    return circuit_metrics.get(service_type, {"success": 0, "failure": 0, "state_changes": 0})
\ No newline at end of file
+    return circuit_metrics.get(service_type, {"success": 0, "failure": 0, "state_changes": 0})
@@ -1,7 +1,7 @@
 """External customs connectors exposed by the PSRA backend."""
 
 from .hmrc import HMRCConnector
-from .taric import TARICConnector
+from .taric import AsyncTARICConnector, TARICConnector
 from .wco import WCOConnector
 
-__all__ = ["HMRCConnector", "TARICConnector", "WCOConnector"]
+__all__ = ["AsyncTARICConnector", "HMRCConnector", "TARICConnector", "WCOConnector"]
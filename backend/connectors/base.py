@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
+import sqlite3
 import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Tuple
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
 import httpx
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class ConnectorHealth:
@@ -32,7 +40,9 @@ class TTLCache:
     def __init__(self, ttl_seconds: float, maxsize: int = 512) -> None:
         self._ttl = ttl_seconds
         self._maxsize = maxsize
-        self._data: Dict[Any, Tuple[float, Any]] = {}
+        # Insertion-ordered: every set moves the key to the end, so the first
+        # entry is always the stalest and eviction is O(1)
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
         self._lock = threading.Lock()
 
     def get(self, key: Any) -> Any:
@@ -49,10 +59,11 @@ class TTLCache:
         with self._lock:
             if self._maxsize <= 0:
                 self._data.clear()
-            elif len(self._data) >= self._maxsize and self._data:
-                # Remove the stalest item to free room.
-                oldest_key = min(self._data.items(), key=lambda item: item[1][0])[0]
-                del self._data[oldest_key]
+            else:
+                self._data.pop(key, None)
+                if len(self._data) >= self._maxsize:
+                    # Remove the stalest item to free room.
+                    self._data.popitem(last=False)
             self._data[key] = (time.time(), value)
 
     def clear(self) -> None:
@@ -126,3 +137,235 @@ class ExternalConnector:
 
     def __exit__(self, exc_type, exc, tb) -> None:
         self.close()
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A stored JSON response with its HTTP validators."""
+
+    key: str
+    body: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class ResponseCache:
+    """Persistent SQLite store for connector responses.
+
+    Entries outlive their TTL on disk so they can be revalidated with
+    ``If-None-Match`` / ``If-Modified-Since`` instead of refetched, and so a
+    restarted process starts warm. Pass ``":memory:"`` for a per-process cache.
+    """
+
+    def __init__(self, path: str | Path = ":memory:") -> None:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, CachedResponse]:
+        """Stored entries for ``keys``, fresh or not, in as few queries as possible."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, CachedResponse] = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, body, etag, last_modified, fetched_at, expires_at FROM responses WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+            for key, body, etag, last_modified, fetched_at, expires_at in rows:
+                found[key] = CachedResponse(key, json.loads(body), etag, last_modified, fetched_at, expires_at)
+        return found
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, entries: Iterable[CachedResponse]) -> None:
+        rows = [
+            (e.key, json.dumps(e.body), e.etag, e.last_modified, e.fetched_at, e.expires_at)
+            for e in entries
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class AsyncExternalConnector:
+    """Async base for origin connectors: pooled client, bounded concurrency and
+    a persistent, revalidating response cache.
+
+    Lookups for many keys go through :meth:`_get_many`, which reads the cache
+    in one pass, fetches only missing or expired entries (at most
+    ``max_concurrency`` in flight) and writes the results back in one
+    transaction. A connector belongs to the event loop it is first used on.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        base_url: str,
+        timeout: float = 5.0,
+        cache_ttl_seconds: float = 86400.0,
+        cache: ResponseCache | None = None,
+        cache_path: str | Path | None = None,
+        max_concurrency: int = 16,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._name = name
+        self._ttl = cache_ttl_seconds
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            transport=transport,
+            headers={"User-Agent": f"psra-ltsd/{name}-connector"},
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+        self._owns_cache = cache is None
+        self._cache = cache or ResponseCache(cache_path or ":memory:")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        async with self._semaphore:
+            response = await self._client.request(method, path, **kwargs)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    async def _fetch(self, key: str, path: str, params: Dict[str, Any] | None, cached: CachedResponse | None) -> CachedResponse:
+        """GET ``path``, conditionally when a stored entry has validators."""
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        try:
+            response = await self._request("GET", path, params=params, headers=headers)
+        except httpx.HTTPError as exc:
+            if cached is None:
+                raise
+            logger.warning(f"{self._name}: serving stale {key} after request failure: {exc}")
+            return cached
+
+        now = time.time()
+        if response.status_code == 304 and cached is not None:
+            return CachedResponse(key, cached.body, cached.etag, cached.last_modified, now, now + self._ttl)
+        return CachedResponse(
+            key,
+            response.json(),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            now,
+            now + self._ttl,
+        )
+
+    async def _get_many(
+        self,
+        requests: Dict[str, Tuple[str, Dict[str, Any] | None]],
+        *,
+        raise_errors: bool = False,
+    ) -> Dict[str, Any]:
+        """Resolve many cache keys at once.
+
+        Args:
+            requests: Cache key -> (path, query params)
+            raise_errors: Raise the first failed request instead of omitting its key
+
+        Returns:
+            Cache key -> response body; keys whose request failed are absent
+        """
+        stored = self._cache.get_many(requests)
+        results = {key: entry.body for key, entry in stored.items() if entry.fresh}
+        pending = [key for key in requests if key not in results]
+
+        fetched = await asyncio.gather(
+            *(self._fetch(key, *requests[key], stored.get(key)) for key in pending),
+            return_exceptions=True,
+        )
+        updates = []
+        for key, entry in zip(pending, fetched):
+            if isinstance(entry, BaseException):
+                if raise_errors:
+                    self._cache.put_many(updates)
+                    raise entry
+                logger.error(f"{self._name}: request for {key} failed: {entry}")
+                continue
+            updates.append(entry)
+            results[key] = entry.body
+        self._cache.put_many(updates)
+        return results
+
+    async def _get(self, key: str, path: str, params: Dict[str, Any] | None = None) -> Any:
+        results = await self._get_many({key: (path, params)}, raise_errors=True)
+        return results[key]
+
+    async def health(self) -> ConnectorHealth:
+        start = time.perf_counter()
+        try:
+            response = await self._client.get("/health")
+            response.raise_for_status()
+            latency_ms = (time.perf_counter() - start) * 1000.0
+            payload: Dict[str, Any] = response.json() if response.content else {}
+            return ConnectorHealth(
+                name=self._name,
+                status="pass",
+                latency_ms=latency_ms,
+                checked_at=time.time(),
+                details=payload,
+            )
+        except Exception as exc:  # pragma: no cover - defensive safeguard
+            latency_ms = (time.perf_counter() - start) * 1000.0
+            return ConnectorHealth(
+                name=self._name,
+                status="fail",
+                latency_ms=latency_ms,
+                checked_at=time.time(),
+                details={"error": str(exc)},
+            )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+        if self._owns_cache:
+            self._cache.close()
+
+    async def __aenter__(self) -> "AsyncExternalConnector":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import os
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
 
-from backend.connectors.base import ExternalConnector
+from backend.connectors.base import AsyncExternalConnector, ExternalConnector, ResponseCache
 
 
 class TARICConnector(ExternalConnector):
@@ -43,3 +46,89 @@ class TARICConnector(ExternalConnector):
             return response.json()
 
         return self._cached(key, loader)
+
+
+class AsyncTARICConnector(AsyncExternalConnector):
+    """Async TARIC client with batched lookups and a persistent response cache.
+
+    Responses are cached per commodity code, origin country and measure date,
+    so bulk enrichment of a bill of materials only requests codes it has not
+    seen (or whose entries expired and changed upstream), and a restarted
+    worker starts with a warm cache when ``cache_path`` is set.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str = "https://taric.api.europa.eu",
+        timeout: float = 5.0,
+        cache_ttl_seconds: float = 86400.0,
+        cache: ResponseCache | None = None,
+        cache_path: str | Path | None = None,
+        max_concurrency: int = 16,
+        transport=None,
+    ) -> None:
+        super().__init__(
+            name="taric",
+            base_url=base_url,
+            timeout=timeout,
+            cache_ttl_seconds=cache_ttl_seconds,
+            cache=cache,
+            cache_path=cache_path or os.getenv("TARIC_CACHE_PATH"),
+            max_concurrency=max_concurrency,
+            transport=transport,
+        )
+
+    @staticmethod
+    def _lookups(
+        kind: str,
+        commodity_codes: Iterable[str],
+        country: Optional[str],
+        on_date: date | str | None,
+    ) -> Dict[str, Tuple[str, Tuple[str, Dict[str, Any] | None]]]:
+        """Commodity code -> (cache key, (path, params)), duplicates removed."""
+        if isinstance(on_date, date):
+            on_date = on_date.isoformat()
+        params = {name: value for name, value in (("country", country), ("date", on_date)) if value}
+        return {
+            code: (
+                f"taric:{kind}:{code}:{country or '*'}:{on_date or 'current'}",
+                (f"/commodities/{code}/{kind}", params or None),
+            )
+            for code in dict.fromkeys(commodity_codes)
+        }
+
+    async def _fetch_many(
+        self,
+        kind: str,
+        commodity_codes: Iterable[str],
+        country: Optional[str],
+        on_date: date | str | None,
+    ) -> Dict[str, Any]:
+        lookups = self._lookups(kind, commodity_codes, country, on_date)
+        results = await self._get_many({key: request for key, request in lookups.values()})
+        return {code: results[key] for code, (key, _) in lookups.items() if key in results}
+
+    async def fetch_duty_rates(
+        self, commodity_code: str, *, country: Optional[str] = None, on_date: date | str | None = None
+    ) -> Dict[str, Any]:
+        key, (path, params) = self._lookups("duty-rates", [commodity_code], country, on_date)[commodity_code]
+        return await self._get(key, path, params)
+
+    async def fetch_documents(
+        self, commodity_code: str, *, country: Optional[str] = None, on_date: date | str | None = None
+    ) -> Dict[str, Any]:
+        key, (path, params) = self._lookups("documents", [commodity_code], country, on_date)[commodity_code]
+        return await self._get(key, path, params)
+
+    async def fetch_duty_rates_many(
+        self, commodity_codes: Iterable[str], *, country: Optional[str] = None, on_date: date | str | None = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Duty rates for many codes; codes whose lookup failed are omitted (and logged)."""
+        return await self._fetch_many("duty-rates", commodity_codes, country, on_date)
+
+    async def fetch_documents_many(
+        self, commodity_codes: Iterable[str], *, country: Optional[str] = None, on_date: date | str | None = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Required documents for many codes; codes whose lookup failed are omitted (and logged)."""
+        return await self._fetch_many("documents", commodity_codes, country, on_date)
@@ -1,6 +1,8 @@
 """ERP integration package."""
 
+from .dispatcher import OutboxDispatcher
 from .service import (
+    BulkInventoryGateway,
     ERPIntegrationService,
     FatalERPIntegrationError,
     InventoryGateway,
@@ -12,8 +14,10 @@ from .service import (
 __all__ = [
     "ERPIntegrationService",
     "InventoryGateway",
+    "BulkInventoryGateway",
     "OutboxEntry",
     "OutboxStatus",
     "ProcessSummary",
     "FatalERPIntegrationError",
+    "OutboxDispatcher",
 ]
@@ -18,7 +18,8 @@ Environment Variables:
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Optional
 
@@ -103,6 +104,71 @@ class OdooConnection:
             raise RuntimeError("Connection not established.")
         return self._odoo.execute(model, "write", record_ids, values)
 
+    def create_many(self, model: str, values_list: list[dict[str, Any]]) -> list[int]:
+        """Create several records in a single call (Odoo 12+ multi-create)."""
+        if not self._odoo:
+            raise RuntimeError("Connection not established.")
+        if not values_list:
+            return []
+        record_ids = self._odoo.execute(model, "create", values_list)
+        return record_ids if isinstance(record_ids, list) else [record_ids]
+
+
+# Maximum values per ``in`` domain; keeps XML/JSON-RPC payloads and SQL IN lists bounded
+SEARCH_CHUNK_SIZE = 1000
+
+
+def _chunks(values: list[Any], size: int = SEARCH_CHUNK_SIZE) -> Iterator[list[Any]]:
+    for offset in range(0, len(values), size):
+        yield values[offset : offset + size]
+
+
+def _many2one_id(value: Any) -> Optional[int]:
+    """Normalise a many2one value from ``search_read`` ([id, name] or False)."""
+    if isinstance(value, (list, tuple)):
+        return value[0] if value else None
+    return value or None
+
+
+@dataclass
+class _SyncIdCache:
+    """Code -> Odoo id lookups resolved once per sync call."""
+
+    products: dict[str, dict[str, Any]] = field(default_factory=dict)
+    lots: dict[tuple[int, str], int] = field(default_factory=dict)
+
+    def resolve_products(
+        self, conn: OdooConnection, codes: Iterable[str], fields: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch unseen product codes with chunked ``in`` domains."""
+        missing = sorted({code for code in codes if code not in self.products})
+        for chunk in _chunks(missing):
+            for record in conn.search_read(
+                "product.product",
+                [("default_code", "in", chunk)],
+                ["default_code", *fields],
+            ):
+                self.products.setdefault(record["default_code"], record)
+        return self.products
+
+    def resolve_lots(self, conn: OdooConnection, pairs: Iterable[tuple[int, str]]) -> dict[tuple[int, str], int]:
+        """Fetch unseen (product_id, lot name) pairs with chunked ``in`` domains."""
+        missing = sorted({pair for pair in pairs if pair not in self.lots})
+        for chunk in _chunks(missing):
+            wanted = set(chunk)
+            for record in conn.search_read(
+                "stock.production.lot",
+                [
+                    ("product_id", "in", sorted({product_id for product_id, _ in chunk})),
+                    ("name", "in", sorted({name for _, name in chunk})),
+                ],
+                ["id", "product_id", "name"],
+            ):
+                key = (_many2one_id(record["product_id"]), record["name"])
+                if key in wanted:
+                    self.lots.setdefault(key, record["id"])
+        return self.lots
+
 
 @dataclass
 class ProductSyncResult:
@@ -261,86 +327,90 @@ class OdooAdapter:
         with self.connect() as conn:
             created = 0
             updated = 0
-
-            for item in items:
-                product_code = item["product_code"]
-                quantity = item["quantity"]
-                lot_number = item.get("lot_number")
-
-                # Find product
-                products = conn.search_read(
+            cache = _SyncIdCache()
+
+            # Resolve every product code up front instead of one search_read per line
+            products = cache.resolve_products(conn, (item["product_code"] for item in items), ["id"])
+            missing_codes = sorted({item["product_code"] for item in items} - products.keys())
+            if missing_codes and create_missing_products:
+                # Create basic products in one call
+                new_ids = conn.create_many(
                     "product.product",
-                    [("default_code", "=", product_code)],
-                    ["id"],
+                    [
+                        {"name": code, "default_code": code, "type": "product"}
+                        for code in missing_codes
+                    ],
                 )
-
-                if not products:
-                    if create_missing_products:
-                        # Create basic product
-                        product_id = conn.create(
-                            "product.product",
-                            {
-                                "name": product_code,
-                                "default_code": product_code,
-                                "type": "product",
-                            },
-                        )
-                        created += 1
-                    else:
-                        continue
-                else:
-                    product_id = products[0]["id"]
-
-                # Create inventory adjustment using stock.quant
-                # In Odoo 14+, direct stock.quant manipulation is used
-                quant_values = {
-                    "product_id": product_id,
-                    "location_id": location_id,
-                    "quantity": quantity,
-                }
-
-                if lot_number:
-                    # Find or create lot
-                    lots = conn.search_read(
-                        "stock.production.lot",
-                        [
-                            ("product_id", "=", product_id),
-                            ("name", "=", lot_number),
-                        ],
-                        ["id"],
-                    )
-                    if lots:
-                        lot_id = lots[0]["id"]
-                    else:
-                        lot_id = conn.create(
-                            "stock.production.lot",
-                            {
-                                "product_id": product_id,
-                                "name": lot_number,
-                                "company_id": 1,
-                            },
-                        )
-                    quant_values["lot_id"] = lot_id
-
-                # Check if quant exists
-                quant_domain = [
-                    ("product_id", "=", product_id),
-                    ("location_id", "=", location_id),
-                ]
-                if lot_number:
-                    quant_domain.append(("lot_id", "=", lot_id))
-
-                existing_quants = conn.search_read("stock.quant", quant_domain, ["id"])
-
-                if existing_quants:
-                    # Update existing quant
-                    conn.write("stock.quant", [existing_quants[0]["id"]], quant_values)
+                for code, product_id in zip(missing_codes, new_ids):
+                    products[code] = {"id": product_id, "default_code": code}
+                created += len(new_ids)
+
+            lines = [
+                (products[item["product_code"]]["id"], item["quantity"], item.get("lot_number"))
+                for item in items
+                if item["product_code"] in products
+            ]
+
+            # Find or create lots in bulk
+            lot_pairs = sorted({(product_id, lot) for product_id, _, lot in lines if lot})
+            lots = cache.resolve_lots(conn, lot_pairs)
+            missing_lots = [pair for pair in lot_pairs if pair not in lots]
+            new_lot_ids = conn.create_many(
+                "stock.production.lot",
+                [
+                    {"product_id": product_id, "name": lot_number, "company_id": 1}
+                    for product_id, lot_number in missing_lots
+                ],
+            )
+            lots.update(zip(missing_lots, new_lot_ids))
+
+            # Load existing quants for all products at this location in chunked reads
+            quants_by_lot: dict[tuple[int, Optional[int]], int] = {}
+            quants_by_product: dict[int, int] = {}
+            for chunk in _chunks(sorted({product_id for product_id, _, _ in lines})):
+                for quant in conn.search_read(
+                    "stock.quant",
+                    [("product_id", "in", chunk), ("location_id", "=", location_id)],
+                    ["id", "product_id", "lot_id"],
+                ):
+                    product_id = _many2one_id(quant["product_id"])
+                    quants_by_lot.setdefault((product_id, _many2one_id(quant["lot_id"])), quant["id"])
+                    quants_by_product.setdefault(product_id, quant["id"])
+
+            # In Odoo 14+, direct stock.quant manipulation is used
+            to_create: dict[tuple[int, Optional[int]], dict[str, Any]] = {}
+            quant_quantities: dict[int, float] = {}
+            for product_id, quantity, lot_number in lines:
+                lot_id = lots[(product_id, lot_number)] if lot_number else None
+                key = (product_id, lot_id)
+                existing_quant = quants_by_lot.get(key) if lot_id else quants_by_product.get(product_id)
+
+                if existing_quant is not None:
+                    quant_quantities[existing_quant] = quantity
+                    updated += 1
+                elif key in to_create:
+                    # Repeated line for a quant created in this sync: last quantity wins
+                    to_create[key]["quantity"] = quantity
                     updated += 1
                 else:
-                    # Create new quant
-                    conn.create("stock.quant", quant_values)
+                    quant_values = {
+                        "product_id": product_id,
+                        "location_id": location_id,
+                        "quantity": quantity,
+                    }
+                    if lot_id:
+                        quant_values["lot_id"] = lot_id
+                    to_create[key] = quant_values
                     created += 1
 
+            conn.create_many("stock.quant", list(to_create.values()))
+            # One write per distinct quantity rather than one per line
+            to_update: dict[float, list[int]] = {}
+            for quant_id, quantity in quant_quantities.items():
+                to_update.setdefault(quantity, []).append(quant_id)
+            for quantity, quant_ids in to_update.items():
+                conn.write("stock.quant", quant_ids, {"quantity": quantity})
+
             return InventorySyncResult(
                 items_processed=len(items),
                 items_created=created,
@@ -378,27 +448,24 @@ class OdooAdapter:
             Dictionary with bom_id and status
         """
         with self.connect() as conn:
-            # Find product
-            products = conn.search_read(
-                "product.product",
-                [("default_code", "=", product_code)],
+            # Resolve the finished product and every component in one search_read
+            cache = _SyncIdCache()
+            products = cache.resolve_products(
+                conn,
+                [product_code, *(comp["product_code"] for comp in components)],
                 ["id", "product_tmpl_id"],
             )
 
-            if not products:
+            if product_code not in products:
                 raise ValueError(f"Product {product_code} not found in Odoo")
 
-            product_tmpl_id = products[0]["product_tmpl_id"][0]
+            product_tmpl_id = products[product_code]["product_tmpl_id"][0]
 
             # Prepare BoM lines
             bom_lines = []
             for comp in components:
-                comp_products = conn.search_read(
-                    "product.product",
-                    [("default_code", "=", comp["product_code"])],
-                    ["id"],
-                )
-                if not comp_products:
+                comp_product = products.get(comp["product_code"])
+                if comp_product is None:
                     continue
 
                 bom_lines.append(
@@ -406,7 +473,7 @@ class OdooAdapter:
                         0,
                         0,
                         {
-                            "product_id": comp_products[0]["id"],
+                            "product_id": comp_product["id"],
                             "product_qty": comp["quantity"],
                             "product_uom_id": comp.get("uom_id", 1),
                         },
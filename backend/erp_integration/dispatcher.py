@@ -0,0 +1,175 @@
+"""Event-driven dispatcher that drains the ERP outbox via Postgres LISTEN/NOTIFY."""
+
+from __future__ import annotations
+
+import logging
+import select
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+import psycopg2
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine
+
+from backend.erp_integration.service import ERPIntegrationService
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxDispatcher:
+    """Long-running loop that sleeps until the outbox actually has work.
+
+    The dispatcher blocks on the LISTEN connection's socket until either a
+    ``NOTIFY`` from :meth:`ERPIntegrationService.enqueue_recipe_sync` arrives or
+    the earliest pending ``next_run_at`` (a retry coming due) is reached. An idle
+    outbox therefore costs no queries beyond one ``MIN(next_run_at)`` lookup per
+    ``max_idle_seconds``, which only guards against missed notifications.
+    """
+
+    STOP_CHECK_SECONDS = 1.0
+    RECONNECT_BACKOFF_SECONDS = 1.0
+    MAX_RECONNECT_BACKOFF_SECONDS = 60.0
+
+    def __init__(
+        self,
+        service: ERPIntegrationService,
+        engine: Engine,
+        *,
+        batch_size: int = 100,
+        max_idle_seconds: float = 300.0,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self._service = service
+        self._engine = engine
+        self._batch_size = batch_size
+        self._max_idle_seconds = max_idle_seconds
+        self._clock = clock
+        self._stop = threading.Event()
+        self._connection: Optional[Any] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def run_forever(self) -> None:
+        """Drain the outbox and wait for wakeups until :meth:`stop` is called.
+
+        A dropped database connection is logged and the LISTEN connection is
+        re-established with exponential backoff; the first pass after a
+        reconnect drains unconditionally to pick up anything enqueued while
+        notifications could not be received.
+        """
+
+        backoff = self.RECONNECT_BACKOFF_SECONDS
+        try:
+            while not self._stop.is_set():
+                try:
+                    if self._connection is None:
+                        self._listen()
+                    self.drain()
+                    self.wait(self.seconds_until_due())
+                except (psycopg2.OperationalError, sa_exc.OperationalError):
+                    logger.warning(
+                        "ERP outbox dispatcher lost its database connection; reconnecting",
+                        extra={"retry_in_seconds": backoff},
+                        exc_info=True,
+                    )
+                    self._close()
+                    self._stop.wait(backoff)
+                    backoff = min(backoff * 2, self.MAX_RECONNECT_BACKOFF_SECONDS)
+                else:
+                    backoff = self.RECONNECT_BACKOFF_SECONDS
+        finally:
+            self._close()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def start_in_thread(self) -> threading.Thread:
+        thread = threading.Thread(target=self.run_forever, name="erp-outbox-dispatcher", daemon=True)
+        thread.start()
+        return thread
+
+    # ------------------------------------------------------------------
+    # Steps
+    # ------------------------------------------------------------------
+    def drain(self) -> int:
+        """Process batches until no due rows remain; returns rows handled."""
+
+        handled = 0
+        while not self._stop.is_set():
+            summary = self._service.process_pending(limit=self._batch_size)
+            batch = summary.processed + summary.failed
+            handled += batch
+            if batch < self._batch_size:
+                break
+        if handled:
+            logger.info("ERP outbox drained", extra={"handled": handled})
+        return handled
+
+    def seconds_until_due(self) -> float:
+        """Seconds until the earliest pending row becomes due, capped at the idle limit."""
+
+        due = self._service.next_due_at()
+        if due is None:
+            return self._max_idle_seconds
+        if due.tzinfo is None:
+            due = due.replace(tzinfo=timezone.utc)
+        remaining = (due - self._clock()).total_seconds()
+        return min(max(remaining, 0.0), self._max_idle_seconds)
+
+    def wait(self, timeout: float) -> bool:
+        """Block until a notification arrives or ``timeout`` elapses.
+
+        Returns ``True`` when woken by a notification.
+        """
+
+        if timeout <= 0 or self._stop.is_set():
+            return False
+        if self._connection is None:
+            self._stop.wait(timeout)
+            return False
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stop.is_set():
+                return False
+            # Short slices keep stop() responsive; they poll the socket, not the database
+            readable, _, _ = select.select(
+                [self._connection], [], [], min(remaining, self.STOP_CHECK_SECONDS)
+            )
+            if readable:
+                break
+        self._connection.poll()
+        woken = bool(self._connection.notifies)
+        # Coalesce bursts of NOTIFYs into a single drain
+        self._connection.notifies.clear()
+        return woken
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+    def _listen(self) -> None:
+        raw = self._engine.raw_connection()
+        connection = raw.driver_connection
+        # Keep the autocommit LISTEN connection out of the shared pool
+        raw.detach()
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self._service.NOTIFY_CHANNEL}"')
+        self._connection = connection
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            try:
+                with self._connection.cursor() as cursor:
+                    cursor.execute(f'UNLISTEN "{self._service.NOTIFY_CHANNEL}"')
+            except Exception:  # noqa: BLE001 - best effort on shutdown
+                logger.debug("UNLISTEN failed during dispatcher shutdown", exc_info=True)
+            try:
+                self._connection.close()
+            except Exception:  # noqa: BLE001 - the connection may already be gone
+                logger.debug("Closing the LISTEN connection failed", exc_info=True)
+            self._connection = None
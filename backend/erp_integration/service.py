@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional, Protocol, Sequence
+from typing import Optional, Protocol, Sequence, Union
 from uuid import UUID
 
-from sqlalchemy import Select, select
+from sqlalchemy import Select, and_, bindparam, func, or_, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -37,6 +39,28 @@ class InventoryGateway(Protocol):
         """Persist a recipe in the downstream ERP and return the external identifier."""
 
 
+class BulkInventoryGateway(InventoryGateway, Protocol):
+    """Inventory implementations that can upsert several recipes per ERP call."""
+
+    def upsert_recipes(
+        self, *, tenant_id: UUID, commands: Sequence[RecipeSyncCommand]
+    ) -> Sequence[Union[Optional[str], Exception]]:
+        """Persist recipes in one call, returning an external id or an error per command."""
+
+
+@dataclass(frozen=True, slots=True)
+class _ClaimedEntry:
+    """Outbox row claimed for dispatch outside of the claiming transaction."""
+
+    record_id: UUID
+    saga_id: UUID
+    tenant_id: UUID
+    attempts: int
+    claimed_at: datetime
+    command: RecipeSyncCommand
+    recipe_code: str
+
+
 @dataclass(frozen=True, slots=True)
 class OutboxEntry:
     """Lightweight representation of an outbox record."""
@@ -59,6 +83,8 @@ class ProcessSummary:
     failed: int
     completed_ids: Sequence[UUID]
     failed_ids: Sequence[UUID]
+    # Outcomes dropped because the row was reclaimed by another worker meanwhile
+    superseded: int = 0
 
 
 class ERPIntegrationService:
@@ -66,10 +92,23 @@ class ERPIntegrationService:
 
     MAX_ATTEMPTS = 5
     BACKOFF_SECONDS = (30, 120, 600, 1800, 3600)
-
-    def __init__(self, session_factory: sessionmaker[Session], inventory_gateway: InventoryGateway):
+    CLAIM_TIMEOUT_SECONDS = 900
+    NOTIFY_CHANNEL = "erp_outbox"
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session],
+        inventory_gateway: InventoryGateway,
+        *,
+        max_concurrency: int = 8,
+        per_tenant_concurrency: int = 2,
+        bulk_size: int = 50,
+    ):
         self._session_factory = session_factory
         self._inventory_gateway = inventory_gateway
+        self._max_concurrency = max_concurrency
+        self._per_tenant_concurrency = per_tenant_concurrency
+        self._bulk_size = bulk_size
 
     # ------------------------------------------------------------------
     # Outbox management
@@ -98,6 +137,11 @@ class ERPIntegrationService:
                     record = self._get_existing_entry(session, command.tenant_id, command.idempotency_key)
                     if record is None:
                         raise
+                else:
+                    # Delivered on commit; wakes any OutboxDispatcher listening on the channel
+                    session.execute(
+                        select(func.pg_notify(self.NOTIFY_CHANNEL, str(record.saga_id)))
+                    )
             return self._to_entry(record)
 
     def get_entry(self, saga_id: UUID) -> Optional[OutboxEntry]:
@@ -116,6 +160,16 @@ class ERPIntegrationService:
                 return RecipeSyncResult.model_validate(record.result_payload)
             return None
 
+    def next_due_at(self) -> Optional[datetime]:
+        """Earliest ``next_run_at`` among pending rows (served by the partial index)."""
+
+        with session_scope(self._session_factory) as session:
+            return session.scalar(
+                select(func.min(ERPOutboxRecord.next_run_at)).where(
+                    ERPOutboxRecord.status == OutboxStatus.PENDING.value
+                )
+            )
+
     def list_dead_letters(self, *, limit: int = 100) -> Sequence[OutboxEntry]:
         with session_scope(self._session_factory) as session:
             stmt: Select[ERPOutboxRecord] = (
@@ -131,47 +185,191 @@ class ERPIntegrationService:
     # Processing
     # ------------------------------------------------------------------
     def process_pending(self, *, limit: int = 10) -> ProcessSummary:
-        """Process pending outbox entries respecting retry semantics."""
+        """Process pending outbox entries respecting retry semantics.
+
+        Runs as a three phase pipeline so row locks are never held across ERP
+        calls: claim and commit a batch, dispatch it concurrently (bulk where
+        the gateway supports it), then write the outcomes back in one
+        transaction.
+        """
+
+        claimed = self._claim_batch(limit)
+        if not claimed:
+            return ProcessSummary(processed=0, failed=0, completed_ids=[], failed_ids=[])
+
+        outcomes = self._dispatch(claimed)
+        return self._record_outcomes(claimed, outcomes)
+
+    def _claim_batch(self, limit: int) -> list[_ClaimedEntry]:
+        """Phase 1: lock due rows, mark them in progress and commit immediately."""
 
-        processed: list[UUID] = []
-        failed: list[UUID] = []
         with session_scope(self._session_factory) as session:
             now = datetime.utcnow()
+            stale_before = now - timedelta(seconds=self.CLAIM_TIMEOUT_SECONDS)
             stmt: Select[ERPOutboxRecord] = (
                 select(ERPOutboxRecord)
-                .where(ERPOutboxRecord.status == OutboxStatus.PENDING.value)
-                .where(ERPOutboxRecord.next_run_at <= now)
+                .where(
+                    or_(
+                        and_(
+                            ERPOutboxRecord.status == OutboxStatus.PENDING.value,
+                            ERPOutboxRecord.next_run_at <= now,
+                        ),
+                        # Reclaim rows orphaned by a worker that died mid-dispatch
+                        and_(
+                            ERPOutboxRecord.status == OutboxStatus.IN_PROGRESS.value,
+                            ERPOutboxRecord.processing_started_at < stale_before,
+                        ),
+                    )
+                )
                 .order_by(ERPOutboxRecord.created_at.asc())
                 .limit(limit)
                 .with_for_update(skip_locked=True)
             )
             records = session.execute(stmt).scalars().all()
+            claimed: list[_ClaimedEntry] = []
             for record in records:
                 record.status = OutboxStatus.IN_PROGRESS.value
                 record.processing_started_at = now
                 record.attempts += 1
-                session.flush()
-
                 command = RecipeSyncCommand.model_validate(record.payload)
-                try:
-                    external_id = self._inventory_gateway.upsert_recipe(
-                        tenant_id=command.tenant_id, command=command
+                claimed.append(
+                    _ClaimedEntry(
+                        record_id=record.id,
+                        saga_id=record.saga_id,
+                        tenant_id=record.tenant_id,
+                        attempts=record.attempts,
+                        claimed_at=now,
+                        command=command,
+                        recipe_code=record.payload["recipe"]["recipe_code"],
                     )
-                    self._mark_success(record, external_id)
-                    processed.append(record.saga_id)
-                except FatalERPIntegrationError as exc:  # pragma: no cover - exercised via subclass
-                    self._mark_dead(record, str(exc))
-                    failed.append(record.saga_id)
-                except Exception as exc:  # noqa: BLE001
-                    self._mark_retry(record, str(exc))
-                    failed.append(record.saga_id)
+                )
+            return claimed
+
+    def _dispatch(
+        self, claimed: Sequence[_ClaimedEntry]
+    ) -> dict[UUID, Union[Optional[str], Exception]]:
+        """Phase 2: call the gateway concurrently, capped per tenant.
+
+        Each tenant's units go into their own queue, drained by at most
+        ``per_tenant_concurrency`` lanes. Lanes are submitted round-robin
+        across tenants, so every tenant starts early and no pool thread ever
+        sits waiting for a busy tenant's slot.
+        """
+
+        by_tenant: dict[UUID, list[_ClaimedEntry]] = defaultdict(list)
+        for entry in claimed:
+            by_tenant[entry.tenant_id].append(entry)
+
+        bulk = getattr(self._inventory_gateway, "upsert_recipes", None)
+        chunk_size = self._bulk_size if bulk is not None else 1
+        queues = {
+            tenant_id: deque(
+                entries[offset : offset + chunk_size] for offset in range(0, len(entries), chunk_size)
+            )
+            for tenant_id, entries in by_tenant.items()
+        }
+        lanes = [
+            tenant_id
+            for lane in range(self._per_tenant_concurrency)
+            for tenant_id, units in queues.items()
+            if lane < len(units)
+        ]
+
+        def run(unit: list[_ClaimedEntry]) -> list[tuple[UUID, Union[Optional[str], Exception]]]:
+            tenant_id = unit[0].tenant_id
+            try:
+                if bulk is not None:
+                    results = list(bulk(tenant_id=tenant_id, commands=[e.command for e in unit]))
+                    if len(results) != len(unit):
+                        raise RuntimeError(
+                            f"upsert_recipes returned {len(results)} results for {len(unit)} commands"
+                        )
+                else:
+                    results = [
+                        self._inventory_gateway.upsert_recipe(
+                            tenant_id=tenant_id, command=unit[0].command
+                        )
+                    ]
+            except Exception as exc:  # noqa: BLE001
+                results = [exc] * len(unit)
+            return [(entry.saga_id, result) for entry, result in zip(unit, results)]
+
+        def drain(tenant_id: UUID) -> list[tuple[UUID, Union[Optional[str], Exception]]]:
+            lane_outcomes = []
+            units = queues[tenant_id]
+            while True:
+                try:
+                    unit = units.popleft()
+                except IndexError:
+                    return lane_outcomes
+                lane_outcomes.extend(run(unit))
+
+        outcomes: dict[UUID, Union[Optional[str], Exception]] = {}
+        workers = max(1, min(self._max_concurrency, len(lanes)))
+        if workers == 1:
+            for tenant_id in queues:
+                outcomes.update(drain(tenant_id))
+            return outcomes
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="erp-outbox") as pool:
+            for lane_outcomes in pool.map(drain, lanes):
+                outcomes.update(lane_outcomes)
+        return outcomes
+
+    def _record_outcomes(
+        self,
+        claimed: Sequence[_ClaimedEntry],
+        outcomes: dict[UUID, Union[Optional[str], Exception]],
+    ) -> ProcessSummary:
+        """Phase 3: write outcomes back, fenced on this worker's claim.
+
+        A row only takes the outcome while it is still ``in_progress`` with
+        the ``processing_started_at`` this worker claimed it with. A row that
+        went stale and was reclaimed by another worker keeps that worker's
+        outcome, and this one is counted as superseded.
+        """
+
+        # SET columns come from each row's outcome values
+        fenced = (
+            update(ERPOutboxRecord)
+            .where(
+                ERPOutboxRecord.id == bindparam("record_id"),
+                ERPOutboxRecord.status == OutboxStatus.IN_PROGRESS.value,
+                ERPOutboxRecord.processing_started_at == bindparam("claimed_at"),
+            )
+        )
+        processed: list[UUID] = []
+        failed: list[UUID] = []
+        superseded = 0
+        with session_scope(self._session_factory) as session:
+            connection = session.connection()
+            for entry in claimed:
+                row = self._outcome_values(entry, outcomes[entry.saga_id])
+                if connection.execute(fenced, {**row, "claimed_at": entry.claimed_at}).rowcount == 0:
+                    superseded += 1
+                elif row["status"] == OutboxStatus.COMPLETED.value:
+                    processed.append(entry.saga_id)
+                else:
+                    failed.append(entry.saga_id)
+
         return ProcessSummary(
             processed=len(processed),
             failed=len(failed),
             completed_ids=processed,
             failed_ids=failed,
+            superseded=superseded,
         )
 
+    def _outcome_values(
+        self, entry: _ClaimedEntry, outcome: Union[Optional[str], Exception]
+    ) -> dict:
+        """Phase 3 helper: translate a gateway outcome into an outbox row update."""
+
+        if isinstance(outcome, FatalERPIntegrationError):
+            return self._dead_values(entry, str(outcome))
+        if isinstance(outcome, Exception):
+            return self._retry_values(entry, str(outcome))
+        return self._success_values(entry, outcome)
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
@@ -185,34 +383,50 @@ class ERPIntegrationService:
             )
         )
 
-    def _mark_success(self, record: ERPOutboxRecord, external_id: Optional[str]) -> None:
-        record.status = OutboxStatus.COMPLETED.value
-        record.processed_at = datetime.utcnow()
+    def _success_values(self, entry: _ClaimedEntry, external_id: Optional[str]) -> dict:
+        processed_at = datetime.utcnow()
         result = RecipeSyncResult(
-            external_recipe_id=external_id or record.payload["recipe"]["recipe_code"],
-            processed_at=record.processed_at,
-            attempts=record.attempts,
+            external_recipe_id=external_id or entry.recipe_code,
+            processed_at=processed_at,
+            attempts=entry.attempts,
             notes=None,
         )
-        record.result_payload = result.model_dump(mode="json")
-        record.last_error = None
-        record.next_run_at = record.processed_at
-
-    def _mark_dead(self, record: ERPOutboxRecord, error: str) -> None:
-        record.status = OutboxStatus.DEAD.value
-        record.last_error = error
-        record.processed_at = datetime.utcnow()
-        record.next_run_at = record.processed_at
-
-    def _mark_retry(self, record: ERPOutboxRecord, error: str) -> None:
-        record.last_error = error
-        record.processed_at = datetime.utcnow()
-        if record.attempts >= self.MAX_ATTEMPTS:
-            self._mark_dead(record, error)
-            return
-        delay = self._backoff_seconds(record.attempts)
-        record.status = OutboxStatus.PENDING.value
-        record.next_run_at = record.processed_at + timedelta(seconds=delay)
+        return {
+            "record_id": entry.record_id,
+            "status": OutboxStatus.COMPLETED.value,
+            "processed_at": processed_at,
+            "result_payload": result.model_dump(mode="json"),
+            "last_error": None,
+            "next_run_at": processed_at,
+            "updated_at": processed_at,
+        }
+
+    def _dead_values(self, entry: _ClaimedEntry, error: str) -> dict:
+        processed_at = datetime.utcnow()
+        return {
+            "record_id": entry.record_id,
+            "status": OutboxStatus.DEAD.value,
+            "processed_at": processed_at,
+            "result_payload": None,
+            "last_error": error,
+            "next_run_at": processed_at,
+            "updated_at": processed_at,
+        }
+
+    def _retry_values(self, entry: _ClaimedEntry, error: str) -> dict:
+        if entry.attempts >= self.MAX_ATTEMPTS:
+            return self._dead_values(entry, error)
+        processed_at = datetime.utcnow()
+        delay = self._backoff_seconds(entry.attempts)
+        return {
+            "record_id": entry.record_id,
+            "status": OutboxStatus.PENDING.value,
+            "processed_at": processed_at,
+            "result_payload": None,
+            "last_error": error,
+            "next_run_at": processed_at + timedelta(seconds=delay),
+            "updated_at": processed_at,
+        }
 
     def _to_entry(self, record: ERPOutboxRecord) -> OutboxEntry:
         return OutboxEntry(
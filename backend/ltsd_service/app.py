@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import hashlib
 import io
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import date, datetime, timezone
-from typing import Annotated, Callable, Optional, Protocol
+from typing import Annotated, Any, Callable, Optional, Protocol, Sequence
 from uuid import UUID, uuid4
 
-from fastapi import Depends, FastAPI, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import Depends, FastAPI, HTTPException, Request, status
+from fastapi.responses import Response
 from pydantic import Field, model_validator
 from sqlalchemy.exc import NoResultFound
 
@@ -19,12 +20,17 @@ from backend.app.contracts.psra import (
     EvaluationInput,
     EvaluationOutput,
     PSRABaseModel,
+    PSRARule,
     RuleId,
     VerdictStatus,
 )
 from backend.app.dal.postgres_dal import PostgresDAL
 from backend.app.db.session import build_engine, create_session_factory
 from backend.rules_engine.origin import OriginEvaluationError, evaluate_origin
+from backend.services.certificate_store import CertificateStore, serve_certificate
+
+
+MAX_BATCH_SIZE = 1000
 
 
 class EvaluateRequest(PSRABaseModel):
@@ -45,6 +51,28 @@ class EvaluateResponse(PSRABaseModel):
     ledger_reference: Annotated[str, Field(pattern=r"^ledger://[-/a-z0-9]+$")]
 
 
+class EvaluateBatchRequest(PSRABaseModel):
+    """Many LTSD evaluations submitted together (e.g. ERP mass re-evaluation)."""
+
+    items: Annotated[list[EvaluateRequest], Field(min_length=1, max_length=MAX_BATCH_SIZE)]
+
+
+class EvaluateBatchItem(PSRABaseModel):
+    """Outcome of one item of a batch evaluation, in request order."""
+
+    index: int
+    status_code: int
+    evaluation: Optional[EvaluationOutput] = None
+    ledger_reference: Optional[Annotated[str, Field(pattern=r"^ledger://[-/a-z0-9]+$")]] = None
+    detail: Optional[str] = None
+
+
+class EvaluateBatchResponse(PSRABaseModel):
+    """Response contract for batch LTSD evaluations."""
+
+    results: list[EvaluateBatchItem]
+
+
 class Party(PSRABaseModel):
     """Represents a supplier or customer on the LTSD certificate."""
 
@@ -102,6 +130,9 @@ class LedgerPublisher(Protocol):
     def append_evaluation(self, evaluation: EvaluationOutput) -> str:
         """Persist an evaluation result and return the ledger reference."""
 
+    def append_evaluations(self, evaluations: Sequence[EvaluationOutput]) -> list[str]:
+        """Persist several evaluation results atomically, returning references in order."""
+
     def append_certificate(self, record: CertificateLedgerRecord) -> str:
         """Persist a certificate issuance record and return the ledger reference."""
 
@@ -118,6 +149,11 @@ class InMemoryLedger(LedgerPublisher):
         self.evaluations.append((reference, evaluation))
         return reference
 
+    def append_evaluations(self, evaluations: Sequence[EvaluationOutput]) -> list[str]:
+        entries = [(f"ledger://evaluation/{uuid4()}", evaluation) for evaluation in evaluations]
+        self.evaluations.extend(entries)
+        return [reference for reference, _ in entries]
+
     def append_certificate(self, record: CertificateLedgerRecord) -> str:
         reference = f"ledger://certificate/{uuid4()}"
         self.certificates.append((reference, record))
@@ -131,11 +167,17 @@ class DependencyContainer:
         self,
         dal_factory: Callable[[], PostgresDAL],
         ledger_factory: Callable[[], LedgerPublisher],
+        certificate_store_factory: Callable[[], CertificateStore] = CertificateStore,
+        executor_factory: Optional[Callable[[], Executor]] = None,
     ) -> None:
         self._dal_factory = dal_factory
         self._ledger_factory = ledger_factory
+        self._certificate_store_factory = certificate_store_factory
+        self._executor_factory = executor_factory or _default_executor_factory
         self._dal: Optional[PostgresDAL] = None
         self._ledger: Optional[LedgerPublisher] = None
+        self._certificate_store: Optional[CertificateStore] = None
+        self._executor: Optional[Executor] = None
 
     def dal(self) -> PostgresDAL:
         if self._dal is None:
@@ -147,6 +189,16 @@ class DependencyContainer:
             self._ledger = self._ledger_factory()
         return self._ledger
 
+    def certificate_store(self) -> CertificateStore:
+        if self._certificate_store is None:
+            self._certificate_store = self._certificate_store_factory()
+        return self._certificate_store
+
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._executor_factory()
+        return self._executor
+
 
 def _default_dal_factory() -> PostgresDAL:
     engine = build_engine()
@@ -158,16 +210,32 @@ def _default_ledger_factory() -> LedgerPublisher:
     return InMemoryLedger()
 
 
+def _default_executor_factory() -> Executor:
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="ltsd-evaluate")
+
+
 def create_app(
     *,
     dal: Optional[PostgresDAL] = None,
     ledger: Optional[LedgerPublisher] = None,
+    certificate_store: Optional[CertificateStore] = None,
+    evaluation_executor: Optional[Executor] = None,
 ) -> FastAPI:
-    """Create a configured FastAPI application for LTSD operations."""
+    """Create a configured FastAPI application for LTSD operations.
+
+    ``evaluation_executor`` runs batch evaluations. It defaults to a small
+    thread pool; pass a process pool to spread large batches over cores.
+    """
 
     container = DependencyContainer(
         dal_factory=(lambda: dal) if dal is not None else _default_dal_factory,
         ledger_factory=(lambda: ledger) if ledger is not None else _default_ledger_factory,
+        certificate_store_factory=(
+            (lambda: certificate_store) if certificate_store is not None else CertificateStore
+        ),
+        executor_factory=(
+            (lambda: evaluation_executor) if evaluation_executor is not None else _default_executor_factory
+        ),
     )
 
     app = FastAPI(
@@ -188,6 +256,9 @@ def create_app(
     def _get_ledger() -> LedgerPublisher:
         return container.ledger()
 
+    def _get_certificate_store() -> CertificateStore:
+        return container.certificate_store()
+
     @app.get("/healthz", status_code=status.HTTP_200_OK)
     def healthcheck() -> dict[str, str]:
         """Lightweight readiness probe."""
@@ -225,13 +296,86 @@ def create_app(
 
         return EvaluateResponse(evaluation=evaluation, ledger_reference=ledger_reference)
 
+    @app.post("/evaluate:batch", response_model=EvaluateBatchResponse, status_code=status.HTTP_200_OK)
+    def evaluate_batch(  # noqa: D401 - FastAPI endpoint docstring
+        request: EvaluateBatchRequest,
+        dal: PostgresDAL = Depends(_get_dal),
+        ledger: LedgerPublisher = Depends(_get_ledger),
+    ) -> EvaluateBatchResponse:
+        """Evaluate many inputs with one rule query, one ledger append and one verdict write.
+
+        Items are independent: an unknown rule or evaluation error is reported
+        for that item only. Every returned verdict is ledgered before it is
+        persisted, exactly as for ``/evaluate``.
+        """
+
+        rules = dal.get_rules(item.rule_id for item in request.items)
+        results: list[Optional[EvaluateBatchItem]] = [None] * len(request.items)
+
+        pending = []
+        for index, item in enumerate(request.items):
+            if item.rule_id in rules:
+                pending.append(index)
+            else:
+                results[index] = EvaluateBatchItem(
+                    index=index, status_code=status.HTTP_404_NOT_FOUND, detail="rule_not_found"
+                )
+
+        outcomes = container.executor().map(
+            _evaluate_item,
+            [(request.items[index], rules[request.items[index].rule_id]) for index in pending],
+        )
+
+        evaluated: list[tuple[int, EvaluationOutput]] = []
+        for index, outcome in zip(pending, outcomes):
+            if isinstance(outcome, OriginEvaluationError):
+                results[index] = EvaluateBatchItem(
+                    index=index,
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=str(outcome),
+                )
+            else:
+                evaluated.append((index, outcome))
+
+        if evaluated:
+            references = ledger.append_evaluations([evaluation for _, evaluation in evaluated])
+            stamped = [
+                (
+                    index,
+                    evaluation.model_copy(
+                        update={
+                            "verdict": evaluation.verdict.model_copy(update={"ledger_reference": reference})
+                        }
+                    ),
+                    reference,
+                )
+                for (index, evaluation), reference in zip(evaluated, references)
+            ]
+            dal.persist_verdicts([evaluation for _, evaluation, _ in stamped])
+
+            for index, evaluation, reference in stamped:
+                results[index] = EvaluateBatchItem(
+                    index=index,
+                    status_code=status.HTTP_200_OK,
+                    evaluation=evaluation,
+                    ledger_reference=reference,
+                )
+
+        return EvaluateBatchResponse(results=results)
+
     @app.post("/generate", status_code=status.HTTP_200_OK)
     def generate_certificate(  # noqa: D401 - FastAPI endpoint docstring
         request: GenerateCertificateRequest,
+        http_request: Request,
         dal: PostgresDAL = Depends(_get_dal),
         ledger: LedgerPublisher = Depends(_get_ledger),
-    ) -> StreamingResponse:
-        """Generate a signed LTSD certificate PDF based on a prior evaluation."""
+        store: CertificateStore = Depends(_get_certificate_store),
+    ) -> Response:
+        """Generate a signed LTSD certificate PDF based on a prior evaluation.
+
+        Identical requests for the same verdict return the certificate rendered
+        and ledgered the first time instead of issuing a new one.
+        """
 
         try:
             evaluation = dal.fetch_verdict(str(request.evaluation_id))
@@ -244,43 +388,95 @@ def create_app(
                 detail="certificate_available_only_for_qualified_verdicts",
             )
 
-        issued_at = datetime.now(timezone.utc)
-        pdf_bytes = _render_certificate_pdf(evaluation, request, issued_at)
-        notary_hash = hashlib.sha256(pdf_bytes).hexdigest()
-
-        ledger_record = CertificateLedgerRecord(
-            evaluation_id=request.evaluation_id,
-            certificate_code=request.certificate_code,
-            sha256=notary_hash,
-            issued_at=issued_at,
-            valid_from=request.valid_from,
-            valid_to=request.valid_to,
-            supplier=request.supplier,
-            customer=request.customer,
-            signatory_name=request.signatory_name,
-            signatory_title=request.signatory_title,
-            issue_location=request.issue_location,
-            notes=request.notes,
+        def _issue() -> tuple[bytes, dict[str, Any]]:
+            issued_at = datetime.now(timezone.utc)
+            pdf_bytes = _render_certificate_pdf(evaluation, request, issued_at)
+            notary_hash = hashlib.sha256(pdf_bytes).hexdigest()
+
+            ledger_record = CertificateLedgerRecord(
+                evaluation_id=request.evaluation_id,
+                certificate_code=request.certificate_code,
+                sha256=notary_hash,
+                issued_at=issued_at,
+                valid_from=request.valid_from,
+                valid_to=request.valid_to,
+                supplier=request.supplier,
+                customer=request.customer,
+                signatory_name=request.signatory_name,
+                signatory_title=request.signatory_title,
+                issue_location=request.issue_location,
+                notes=request.notes,
+            )
+            ledger_reference = ledger.append_certificate(ledger_record)
+            return pdf_bytes, {
+                "ledger_reference": ledger_reference,
+                "evaluation_id": str(request.evaluation_id),
+                "issued_at": issued_at.isoformat(),
+            }
+
+        stored, _ = store.get_or_create(_certificate_key(evaluation, request), _issue)
+
+        return serve_certificate(
+            stored,
+            http_request.headers,
+            filename=f"ltsd-certificate-{request.evaluation_id}.pdf",
+            headers={
+                "X-Notary-Hash": stored.sha256,
+                "X-Ledger-Reference": stored.metadata["ledger_reference"],
+                "X-Certificate-Key": stored.key,
+            },
         )
-        ledger_reference = ledger.append_certificate(ledger_record)
-
-        headers = {
-            "X-Notary-Hash": notary_hash,
-            "X-Ledger-Reference": ledger_reference,
-            "Content-Disposition": (
-                f"attachment; filename=ltsd-certificate-{request.evaluation_id}.pdf"
-            ),
-        }
 
-        return StreamingResponse(
-            io.BytesIO(pdf_bytes),
-            media_type="application/pdf",
-            headers=headers,
+    @app.get("/certificates/{certificate_key}", status_code=status.HTTP_200_OK)
+    def download_certificate(  # noqa: D401 - FastAPI endpoint docstring
+        certificate_key: str,
+        http_request: Request,
+        store: CertificateStore = Depends(_get_certificate_store),
+    ) -> Response:
+        """Re-download a previously generated certificate straight from the store."""
+
+        try:
+            stored = store.get(certificate_key)
+        except ValueError:
+            stored = None
+        if stored is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="certificate_not_found")
+
+        return serve_certificate(
+            stored,
+            http_request.headers,
+            filename=f"ltsd-certificate-{stored.metadata.get('evaluation_id', certificate_key)}.pdf",
+            headers={
+                "X-Notary-Hash": stored.sha256,
+                "X-Ledger-Reference": stored.metadata["ledger_reference"],
+                "X-Certificate-Key": stored.key,
+            },
         )
 
     return app
 
 
+def _evaluate_item(item: tuple[EvaluateRequest, PSRARule]) -> EvaluationOutput | OriginEvaluationError:
+    """Evaluate one batch item; evaluation errors are returned so siblings still complete."""
+
+    request, rule = item
+    try:
+        return evaluate_origin(request.evaluation_input, rule, evaluation_id=request.evaluation_id)
+    except OriginEvaluationError as exc:
+        return exc
+
+
+def _certificate_key(evaluation: EvaluationOutput, request: GenerateCertificateRequest) -> str:
+    """Content address of a certificate: the verdict plus the requested certificate details."""
+
+    return CertificateStore.key_for(
+        {
+            "verdict": evaluation.verdict.model_dump(mode="json"),
+            "request": request.model_dump(mode="json"),
+        }
+    )
+
+
 def _render_certificate_pdf(
     evaluation: EvaluationOutput,
     request: GenerateCertificateRequest,
@@ -0,0 +1,44 @@
+-- Audit hash chain verification
+-- Purpose: Let the chain verifier page through audit_logs in (timestamp, id)
+--          order and resume from signed checkpoints instead of re-reading
+--          the whole table every night
+
+-- ============================================================================
+-- CHAIN ORDER INDEX
+-- ============================================================================
+
+-- Useful for: Keyset pages WHERE (timestamp, id) > last key ORDER BY timestamp, id
+CREATE INDEX IF NOT EXISTS idx_audit_chain_order
+ON audit_logs (timestamp, id);
+
+-- ============================================================================
+-- CHECKPOINTS
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS audit_chain_checkpoints (
+    id SERIAL PRIMARY KEY,
+    created_at TIMESTAMP NOT NULL DEFAULT now(),
+    last_timestamp TIMESTAMP NOT NULL,
+    last_id UUID NOT NULL,
+    last_checksum VARCHAR(64) NOT NULL,
+    rows_verified BIGINT NOT NULL,
+    signature VARCHAR(64) NOT NULL
+);
+
+-- ============================================================================
+-- LEGACY CUTOVER
+-- ============================================================================
+
+-- Rows written before this were hashed with an empty timestamp and never
+-- linked; the verifier accepts that legacy hash for them and skips their
+-- links. Run once the old writers are stopped.
+CREATE TABLE IF NOT EXISTS audit_chain_cutover (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    legacy_before TIMESTAMP NOT NULL
+);
+
+INSERT INTO audit_chain_cutover (id, legacy_before)
+VALUES (1, (now() AT TIME ZONE 'utc'))
+ON CONFLICT (id) DO NOTHING;
+
+ANALYZE audit_logs;
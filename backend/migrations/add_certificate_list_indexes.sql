@@ -0,0 +1,45 @@
+-- Keyset pagination and search for /certificates
+-- Purpose: Page by seeking on (sort column, id) instead of OFFSET, and serve
+--          ILIKE '%term%' search from trigram indexes instead of a full scan
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- =============================================================================
+-- KEYSET SORT ORDERS
+-- =============================================================================
+
+-- Useful for: Default listing (ORDER BY created_at DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_certificates_created_at_id
+ON certificates (created_at, id);
+
+-- Useful for: sort_by=certificate_number
+CREATE INDEX IF NOT EXISTS idx_certificates_number_id
+ON certificates (certificate_number, id);
+
+-- Useful for: sort_by=status / origin_country / destination_country
+CREATE INDEX IF NOT EXISTS idx_certificates_status_id
+ON certificates (status, id);
+
+-- Countries are nullable; the endpoint sorts on COALESCE(country, '') so NULL
+-- rows stay reachable by the seek, and the indexes match that expression
+CREATE INDEX IF NOT EXISTS idx_certificates_origin_country_id
+ON certificates ((COALESCE(origin_country, '')), id);
+
+CREATE INDEX IF NOT EXISTS idx_certificates_destination_country_id
+ON certificates ((COALESCE(destination_country, '')), id);
+
+-- =============================================================================
+-- SEARCH
+-- =============================================================================
+
+-- Useful for: Substring search (ILIKE '%term%') on each searchable column
+CREATE INDEX IF NOT EXISTS idx_certificates_number_trgm
+ON certificates USING gin (certificate_number gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_certificates_exporter_trgm
+ON certificates USING gin (exporter gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_certificates_importer_trgm
+ON certificates USING gin (importer gin_trgm_ops);
+
+ANALYZE certificates;
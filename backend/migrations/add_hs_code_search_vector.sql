@@ -0,0 +1,39 @@
+-- Precomputed full-text and trigram search for HS codes
+-- Purpose: Serve /hs-codes/search from indexes instead of computing
+--          to_tsvector per row and scanning with ILIKE '%..%'
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- =============================================================================
+-- STORED SEARCH VECTOR
+-- =============================================================================
+
+-- English descriptions are stemmed and weighted highest; the other languages
+-- use the 'simple' configuration so words are matched as written
+ALTER TABLE hs_codes ADD COLUMN IF NOT EXISTS search_vector tsvector
+GENERATED ALWAYS AS (
+    setweight(to_tsvector('english'::regconfig, coalesce(description_en, '')), 'A') ||
+    setweight(
+        to_tsvector(
+            'simple'::regconfig,
+            coalesce(description_fr, '') || ' ' ||
+            coalesce(description_es, '') || ' ' ||
+            coalesce(description_de, '')
+        ),
+        'B'
+    )
+) STORED;
+
+-- Useful for: Description search (search_vector @@ tsquery)
+CREATE INDEX IF NOT EXISTS idx_hs_codes_search_vector
+ON hs_codes USING gin (search_vector);
+
+-- =============================================================================
+-- CODE LOOKUPS
+-- =============================================================================
+
+-- Useful for: Prefix and fuzzy code matches (code ILIKE 'prefix%', code % 'query')
+CREATE INDEX IF NOT EXISTS idx_hs_codes_code_trgm
+ON hs_codes USING gin (code gin_trgm_ops);
+
+ANALYZE hs_codes;
@@ -0,0 +1,9 @@
+-- Keyset pagination for /rules/by-fta
+-- Purpose: Let every page seek straight to (fta_id, hs_code, id) > cursor
+--          instead of scanning and discarding OFFSET rows
+
+-- Useful for: Paging an FTA's rules in (hs_code, id) order and per-chapter counts
+CREATE INDEX IF NOT EXISTS idx_rules_fta_hs_code_id
+ON rules (fta_id, hs_code, id);
+
+ANALYZE rules;
@@ -220,5 +220,7 @@ class LTSDStatistics(BaseModel):
     revoked_declarations: int
     by_type: dict[str, int]
     by_verdict: dict[str, int]
+    by_status: dict[str, int] = Field(default_factory=dict)
+    by_agreement: dict[str, int] = Field(default_factory=dict)  # Qualified agreements
     average_validity_days: float
     compliance_rate: float  # Percentage qualified
@@ -32,6 +32,7 @@ class WebhookDeliveryStatus(str, Enum):
     SUCCESS = "success"
     FAILED = "failed"
     RETRY = "retry"
+    DEFERRED = "deferred"  # Endpoint circuit open; parked until half-open probe
 
 
 class WebhookCreate(BaseModel):
@@ -0,0 +1,277 @@
+"""
+Content-Addressed Certificate Store
+
+Local blob store for rendered LTSD certificate PDFs. Each PDF is keyed by the
+sha256 of its canonical certificate payload, so identical inputs are rendered
+once and every later download is a disk read. Stored PDFs are served with a
+strong ETag (the PDF's own sha256), ``If-None-Match`` revalidation and single
+byte-range requests.
+
+Layout::
+
+    <root>/<key[:2]>/<key>.<sha256>.pdf  # one render, named by its own sha256
+    <root>/<key[:2]>/<key>.json          # sha256, size, blob name and issuance metadata
+
+The metadata file is created exclusively (hard link of a finished temp file),
+so the first render of a key to finish wins in every thread and process, and
+its PDF can never be paired with another render's sha256 or metadata. Stores
+written before blobs were named by sha256 keep their ``<key>.pdf``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from fastapi import status
+from fastapi.responses import FileResponse, Response
+
+DEFAULT_STORE_DIR = os.getenv("LTSD_CERTIFICATE_STORE_DIR", "var/ltsd/certificates")
+PDF_MEDIA_TYPE = "application/pdf"
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+@dataclass(frozen=True)
+class StoredCertificate:
+    """A rendered certificate PDF persisted in the store."""
+
+    key: str
+    sha256: str
+    size: int
+    path: Path
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.sha256}"'
+
+    def read(self, start: int = 0, end: Optional[int] = None) -> bytes:
+        """Read bytes ``start``..``end`` (inclusive) from disk."""
+        end = self.size - 1 if end is None else end
+        with self.path.open("rb") as handle:
+            handle.seek(start)
+            return handle.read(end - start + 1)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _create_exclusive(path: Path, data: bytes) -> bool:
+    """
+    Create ``path`` holding ``data`` unless it already exists.
+
+    Readers never see a partial file. Returns whether this call created it.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            return False
+        return True
+    finally:
+        os.unlink(tmp_path)
+
+
+class CertificateStore:
+    """Content-addressed, render-once store for certificate PDFs."""
+
+    def __init__(self, root: Optional[os.PathLike] = None):
+        self.root = Path(root or DEFAULT_STORE_DIR)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    @staticmethod
+    def key_for(payload: Mapping[str, Any]) -> str:
+        """sha256 of the canonical (sorted, compact) JSON form of ``payload``."""
+        canonical = json.dumps(
+            payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        if not re.fullmatch(r"[0-9a-f]{64}", key):
+            raise ValueError(f"Invalid certificate key: {key!r}")
+        directory = self.root / key[:2]
+        return directory / f"{key}.pdf", directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[StoredCertificate]:
+        pdf_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+        except FileNotFoundError:
+            return None
+        if "blob" in meta:
+            pdf_path = pdf_path.with_name(meta["blob"])
+        if not pdf_path.exists():
+            return None
+        return StoredCertificate(
+            key=key,
+            sha256=meta["sha256"],
+            size=meta["size"],
+            path=pdf_path,
+            metadata=meta.get("metadata", {}),
+        )
+
+    def put(self, key: str, pdf_bytes: bytes, metadata: Optional[Dict[str, Any]] = None) -> StoredCertificate:
+        """
+        Store a rendered PDF unless another render of ``key`` was stored first.
+
+        Returns:
+            The stored certificate, which is the earlier render's if there was one
+        """
+        return self._put(key, pdf_bytes, metadata)[0]
+
+    def _put(
+        self, key: str, pdf_bytes: bytes, metadata: Optional[Dict[str, Any]]
+    ) -> Tuple[StoredCertificate, bool]:
+        """Write this render's blob, then try to publish it; returns (winner, whether it is ours)."""
+        pdf_path, meta_path = self._paths(key)
+        pdf_path.parent.mkdir(parents=True, exist_ok=True)
+
+        sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+        blob_path = pdf_path.with_name(f"{key}.{sha256}.pdf")
+        _write_atomic(blob_path, pdf_bytes)
+        meta = {"sha256": sha256, "size": len(pdf_bytes), "blob": blob_path.name, "metadata": metadata or {}}
+        if _create_exclusive(meta_path, json.dumps(meta, sort_keys=True, default=str).encode("utf-8")):
+            stored = StoredCertificate(
+                key=key, sha256=sha256, size=len(pdf_bytes), path=blob_path, metadata=meta["metadata"]
+            )
+            return stored, True
+
+        winner = self.get(key)
+        if winner is None:
+            raise RuntimeError(f"Certificate {key} has metadata but no PDF")
+        if winner.path != blob_path:
+            # A different render won; ours is unreferenced
+            blob_path.unlink(missing_ok=True)
+        return winner, False
+
+    def get_or_create(
+        self,
+        key: str,
+        render: Callable[[], Tuple[bytes, Dict[str, Any]]],
+    ) -> Tuple[StoredCertificate, bool]:
+        """
+        Return the stored certificate for ``key``, rendering it at most once.
+
+        Concurrent callers in this process wait for the first render instead of
+        producing their own; across processes the first render stored wins
+        (see :meth:`put`).
+
+        Returns:
+            Tuple of (stored certificate, whether this call's render was stored)
+        """
+        stored = self.get(key)
+        if stored is not None:
+            return stored, False
+
+        with self._locks_guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            stored = self.get(key)
+            if stored is not None:
+                return stored, False
+            pdf_bytes, metadata = render()
+            stored, created = self._put(key, pdf_bytes, metadata)
+
+        with self._locks_guard:
+            self._locks.pop(key, None)
+        return stored, created
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def _parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range.
+
+    Returns ``None`` when the header should be ignored (multiple or malformed
+    ranges); raises ``ValueError`` when the range cannot be satisfied.
+    """
+    match = _RANGE_PATTERN.match(range_header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+def serve_certificate(
+    stored: StoredCertificate,
+    request_headers: Mapping[str, str],
+    *,
+    filename: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Build the HTTP response for a stored certificate.
+
+    Honours ``If-None-Match`` (304) and a single ``Range`` (206/416); otherwise
+    streams the whole file from disk.
+    """
+    response_headers = {
+        "ETag": stored.etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"attachment; filename={filename}",
+        **(headers or {}),
+    }
+
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, stored.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=response_headers)
+
+    range_header = request_headers.get("range")
+    if range_header:
+        try:
+            byte_range = _parse_range(range_header, stored.size)
+        except ValueError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**response_headers, "Content-Range": f"bytes */{stored.size}"},
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            return Response(
+                content=stored.read(start, end),
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                media_type=PDF_MEDIA_TYPE,
+                headers={**response_headers, "Content-Range": f"bytes {start}-{end}/{stored.size}"},
+            )
+
+    return FileResponse(stored.path, media_type=PDF_MEDIA_TYPE, headers=response_headers)
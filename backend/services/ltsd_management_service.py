@@ -11,13 +11,18 @@ Comprehensive LTSD lifecycle management:
 
 from __future__ import annotations
 
+from collections import defaultdict
 from datetime import date, datetime
-from typing import List, Optional
-from uuid import UUID
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
 
+from sqlalchemy import Integer, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import NoResultFound
 
+from backend.app.dal.models import LTSDRecord, LTSDStatisticsCounter
+
 from backend.models.ltsd_models import (
     LTSDDeclaration,
     LTSDStatus,
@@ -32,20 +37,61 @@ from backend.models.ltsd_models import (
     OriginAssessment,
     OriginVerdict,
 )
-from backend.services.pdf_generator_service import (
-    PDFGeneratorService,
-    CertificateData,
-    ProductInfo,
-)
+from backend.services.certificate_store import CertificateStore, StoredCertificate
+
+# Declaration fields that determine the rendered certificate
+CERTIFICATE_PAYLOAD_FIELDS = {
+    "id",
+    "document_ref",
+    "version",
+    "ltsd_type",
+    "supplier",
+    "customer",
+    "products",
+    "declared_origin",
+    "assessment",
+    "valid_from",
+    "valid_to",
+    "issued_at",
+    "signatory_name",
+    "signatory_title",
+    "issue_location",
+    "notes",
+}
+
+# Rows expired per sweep transaction; keeps row locks and WAL bursts short
+EXPIRY_CHUNK_SIZE = 1000
+
+# (partner_id, status, dimension, value) -> [declarations, validity_days]
+CounterDeltas = Dict[Tuple[str, str, str, str], List[int]]
+
+
+def _value(field) -> Optional[str]:
+    return getattr(field, "value", field)
 
 
 class LTSDManagementService:
     """Service for managing LTSD declarations."""
 
-    def __init__(self, db_session: Session, webhook_service=None):
+    def __init__(
+        self,
+        db_session: Session,
+        webhook_service=None,
+        certificate_store: Optional[CertificateStore] = None,
+    ):
         self.db = db_session
         self.webhook_service = webhook_service
-        self.pdf_generator = PDFGeneratorService()
+        self._pdf_generator = None
+        self.certificate_store = certificate_store or CertificateStore()
+
+    @property
+    def pdf_generator(self):
+        """PDF generator, imported on first use so non-rendering paths don't need it."""
+        if self._pdf_generator is None:
+            from backend.services.pdf_generator_service import PDFGeneratorService
+
+            self._pdf_generator = PDFGeneratorService()
+        return self._pdf_generator
 
     def create_ltsd(self, request: LTSDCreateRequest, partner_id: str) -> LTSDDeclaration:
         """
@@ -88,9 +134,8 @@ class LTSDManagementService:
             created_by=partner_id,
         )
 
-        # TODO: Persist to database
-        # self.db.add(declaration)
-        # self.db.commit()
+        self._stage(declaration, partner_id)
+        self.db.commit()
 
         # Trigger webhook event
         if self.webhook_service:
@@ -98,13 +143,15 @@ class LTSDManagementService:
 
         return declaration
 
-    def get_ltsd(self, ltsd_id: UUID, partner_id: str) -> LTSDDeclaration:
+    def get_ltsd(self, ltsd_id: UUID, partner_id: str, for_update: bool = False) -> LTSDDeclaration:
         """
         Retrieve LTSD by ID.
 
         Args:
             ltsd_id: LTSD UUID
             partner_id: Partner identifier for access control
+            for_update: Lock the row until the transaction ends, for callers
+                that write the declaration back (expiry sweeps skip it meanwhile)
 
         Returns:
             LTSD declaration
@@ -112,14 +159,13 @@ class LTSDManagementService:
         Raises:
             NoResultFound: If LTSD not found or access denied
         """
-        # TODO: Query database with partner access check
-        # declaration = self.db.query(LTSDDeclaration).filter_by(
-        #     id=ltsd_id,
-        #     created_by=partner_id
-        # ).one()
-
-        # Placeholder
-        raise NoResultFound(f"LTSD {ltsd_id} not found")
+        query = select(LTSDRecord).where(LTSDRecord.id == ltsd_id, LTSDRecord.partner_id == partner_id)
+        if for_update:
+            query = query.with_for_update()
+        record = self.db.scalars(query).one_or_none()
+        if record is None:
+            raise NoResultFound(f"LTSD {ltsd_id} not found")
+        return self._to_declaration(record)
 
     def list_ltsd(self, params: LTSDListParams, partner_id: str) -> tuple[List[LTSDDeclaration], int]:
         """
@@ -132,24 +178,39 @@ class LTSDManagementService:
         Returns:
             Tuple of (declarations, total_count)
         """
-        # TODO: Query database with filters
-        # query = self.db.query(LTSDDeclaration).filter_by(created_by=partner_id)
-        #
-        # if params.status:
-        #     query = query.filter_by(status=params.status)
-        # if params.ltsd_type:
-        #     query = query.filter_by(ltsd_type=params.ltsd_type)
-        # if params.valid_at:
-        #     query = query.filter(
-        #         LTSDDeclaration.valid_from <= params.valid_at,
-        #         LTSDDeclaration.valid_to >= params.valid_at
-        #     )
-        #
-        # total = query.count()
-        # declarations = query.offset(params.offset).limit(params.limit).all()
-
-        # Placeholder
-        return [], 0
+        filters = [LTSDRecord.partner_id == partner_id]
+        if params.status:
+            filters.append(LTSDRecord.status == _value(params.status))
+        if params.ltsd_type:
+            filters.append(LTSDRecord.ltsd_type == _value(params.ltsd_type))
+        if params.valid_at:
+            filters.append(LTSDRecord.valid_from <= params.valid_at)
+            filters.append(LTSDRecord.valid_to >= params.valid_at)
+
+        records = self.db.scalars(
+            select(LTSDRecord)
+            .where(*filters)
+            .order_by(LTSDRecord.created_at.desc(), LTSDRecord.id)
+            .offset(params.offset)
+            .limit(params.limit)
+        ).all()
+
+        if params.valid_at:
+            total = self.db.scalar(select(func.count()).select_from(LTSDRecord).where(*filters))
+        else:
+            # Status/type totals are maintained incrementally; no COUNT(*) over the partner's rows
+            counter = LTSDStatisticsCounter
+            query = select(func.coalesce(func.sum(counter.declarations), 0)).where(
+                counter.partner_id == partner_id,
+                counter.dimension == "type",
+            )
+            if params.status:
+                query = query.where(counter.status == _value(params.status))
+            if params.ltsd_type:
+                query = query.where(counter.value == _value(params.ltsd_type))
+            total = self.db.scalar(query)
+
+        return [self._to_declaration(record) for record in records], int(total or 0)
 
     def update_ltsd(
         self,
@@ -173,14 +234,14 @@ class LTSDManagementService:
             ValueError: If LTSD cannot be updated (e.g., revoked)
         """
         # Get current declaration
-        current = self.get_ltsd(ltsd_id, partner_id)
+        current = self.get_ltsd(ltsd_id, partner_id, for_update=True)
 
         if current.status not in [LTSDStatus.DRAFT, LTSDStatus.ACTIVE]:
             raise ValueError(f"Cannot update LTSD in status {current.status}")
 
         # Create new version
         new_version = current.model_copy(update={
-            "id": UUID(),  # New ID for new version
+            "id": uuid4(),  # New ID for new version
             "version": current.version + 1,
             "updated_at": datetime.utcnow(),
         })
@@ -197,9 +258,9 @@ class LTSDManagementService:
         current.status = LTSDStatus.SUPERSEDED
         current.superseded_by = new_version.id
 
-        # TODO: Persist both versions
-        # self.db.add(new_version)
-        # self.db.commit()
+        self._stage(current, partner_id)
+        self._stage(new_version, partner_id)
+        self.db.commit()
 
         # Trigger webhook
         if self.webhook_service:
@@ -223,7 +284,7 @@ class LTSDManagementService:
             Validation result with assessment
         """
         # Get declaration
-        declaration = self.get_ltsd(request.ltsd_id, partner_id)
+        declaration = self.get_ltsd(request.ltsd_id, partner_id, for_update=True)
 
         validation_errors = []
         warnings = []
@@ -265,8 +326,8 @@ class LTSDManagementService:
 
         # Update declaration with assessment
         declaration.assessment = assessment
-        # TODO: Persist update
-        # self.db.commit()
+        self._stage(declaration, partner_id)
+        self.db.commit()
 
         # Trigger webhook
         if self.webhook_service:
@@ -296,7 +357,7 @@ class LTSDManagementService:
         Returns:
             Revoked LTSD declaration
         """
-        declaration = self.get_ltsd(request.ltsd_id, partner_id)
+        declaration = self.get_ltsd(request.ltsd_id, partner_id, for_update=True)
 
         if declaration.status == LTSDStatus.REVOKED:
             raise ValueError("LTSD already revoked")
@@ -306,8 +367,8 @@ class LTSDManagementService:
         declaration.revoked_at = datetime.utcnow()
         declaration.notes = f"{declaration.notes or ''}\n\nREVOKED: {request.reason}".strip()
 
-        # TODO: Persist
-        # self.db.commit()
+        self._stage(declaration, partner_id)
+        self.db.commit()
 
         # Trigger webhook
         if self.webhook_service:
@@ -347,22 +408,22 @@ class LTSDManagementService:
         if validation_result.validation_errors:
             raise ValueError(f"Cannot activate: {', '.join(validation_result.validation_errors)}")
 
+        # Validation committed; re-read under lock so nothing written since is lost
+        declaration = self.get_ltsd(ltsd_id, partner_id, for_update=True)
+        if declaration.status != LTSDStatus.DRAFT:
+            raise ValueError(f"Can only activate DRAFT declarations, current status: {declaration.status}")
+
         # Activate
+        declaration.assessment = validation_result.assessment
         declaration.status = LTSDStatus.ACTIVE
         declaration.issued_at = datetime.utcnow()
 
-        # Generate PDF certificate
-        cert_data = self._convert_to_certificate_data(declaration)
-        pdf_bytes, pdf_hash = self.pdf_generator.generate_ltsd_certificate(cert_data), None
-        pdf_hash = self.pdf_generator.generate_certificate_hash(pdf_bytes)
-
-        declaration.pdf_sha256 = pdf_hash
-
-        # TODO: Store PDF in MinIO/S3
-        # pdf_url = self._store_pdf(declaration.id, pdf_bytes)
+        # Generate PDF certificate once; downloads are served from the store
+        stored = self.get_certificate_pdf(declaration)
+        declaration.pdf_sha256 = stored.sha256
 
-        # TODO: Persist
-        # self.db.commit()
+        self._stage(declaration, partner_id)
+        self.db.commit()
 
         # Trigger webhook
         if self.webhook_service:
@@ -374,67 +435,197 @@ class LTSDManagementService:
         """
         Get LTSD statistics for partner.
 
+        Reads the incrementally maintained counters (a handful of rows per
+        partner) instead of aggregating the declarations table.
+
         Args:
             partner_id: Partner identifier
 
         Returns:
             Statistics summary
         """
-        # TODO: Query database for statistics
-        # total = self.db.query(LTSDDeclaration).filter_by(created_by=partner_id).count()
-        # active = self.db.query(LTSDDeclaration).filter_by(
-        #     created_by=partner_id,
-        #     status=LTSDStatus.ACTIVE
-        # ).count()
-        # ...
-
-        # Placeholder
+        counters = self.db.scalars(
+            select(LTSDStatisticsCounter).where(LTSDStatisticsCounter.partner_id == partner_id)
+        ).all()
+
+        by_dimension: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        by_status: Dict[str, int] = defaultdict(int)
+        validity_days = 0
+        for counter in counters:
+            if not counter.declarations:
+                continue
+            by_dimension[counter.dimension][counter.value] += counter.declarations
+            if counter.dimension == "type":
+                # Every declaration has exactly one type, so type rows give the totals
+                by_status[counter.status] += counter.declarations
+                validity_days += counter.validity_days
+
+        total = sum(by_status.values())
+        by_verdict = dict(by_dimension["verdict"])
         return LTSDStatistics(
-            total_declarations=0,
-            active_declarations=0,
-            expired_declarations=0,
-            revoked_declarations=0,
-            by_type={},
-            by_verdict={},
-            average_validity_days=365.0,
-            compliance_rate=0.0,
+            total_declarations=total,
+            active_declarations=by_status.get(LTSDStatus.ACTIVE.value, 0),
+            expired_declarations=by_status.get(LTSDStatus.EXPIRED.value, 0),
+            revoked_declarations=by_status.get(LTSDStatus.REVOKED.value, 0),
+            by_type=dict(by_dimension["type"]),
+            by_verdict=by_verdict,
+            by_status=dict(by_status),
+            by_agreement=dict(by_dimension["agreement"]),
+            average_validity_days=validity_days / total if total else 0.0,
+            compliance_rate=(
+                by_verdict.get(OriginVerdict.QUALIFIED.value, 0) / total * 100 if total else 0.0
+            ),
         )
 
-    def check_expiry(self) -> List[LTSDDeclaration]:
+    def check_expiry(
+        self,
+        today: Optional[date] = None,
+        chunk_size: int = EXPIRY_CHUNK_SIZE,
+        on_expired: Optional[Callable[[List[LTSDDeclaration]], None]] = None,
+    ) -> int:
         """
         Check for expiring/expired LTSDs and update status.
 
+        Expires active declarations with ``valid_to <= today``. Walks the
+        partial ``(valid_to, id)`` index over active rows in keyset chunks.
+        Each chunk is its own short transaction that locks only the rows it
+        flips (``SKIP LOCKED``, so concurrent writers and sweeps are never
+        blocked), moves their statistics counters from active to expired and
+        commits before webhooks are triggered. Expired declarations are
+        handed out a chunk at a time and never accumulated, so memory stays
+        bounded however large the backlog is.
+
+        Args:
+            today: Sweep date (default: today)
+            chunk_size: Rows expired per transaction
+            on_expired: Called with each committed chunk's expired declarations
+
         Returns:
-            List of declarations that were updated
+            Number of declarations expired
         """
-        today = date.today()
-        updated = []
-
-        # TODO: Query active declarations with valid_to <= today
-        # expired = self.db.query(LTSDDeclaration).filter(
-        #     LTSDDeclaration.status == LTSDStatus.ACTIVE,
-        #     LTSDDeclaration.valid_to <= today
-        # ).all()
-        #
-        # for declaration in expired:
-        #     declaration.status = LTSDStatus.EXPIRED
-        #     updated.append(declaration)
-        #
-        #     # Trigger webhook
-        #     if self.webhook_service:
-        #         self._trigger_webhook(
-        #             "ltsd.expired",
-        #             declaration,
-        #             declaration.created_by
-        #         )
-        #
-        # self.db.commit()
-
-        return updated
-
-    def _convert_to_certificate_data(self, declaration: LTSDDeclaration) -> CertificateData:
+        today = today or date.today()
+        table = LTSDRecord.__table__
+
+        expired = 0
+        cursor = None
+        while True:
+            batch = (
+                select(table.c.id)
+                .where(table.c.status == LTSDStatus.ACTIVE.value, table.c.valid_to <= today)
+                .order_by(table.c.valid_to, table.c.id)
+                .limit(chunk_size)
+                .with_for_update(skip_locked=True)
+            )
+            if cursor is not None:
+                # Rows skipped because another transaction holds them are not revisited
+                batch = batch.where(tuple_(table.c.valid_to, table.c.id) > tuple_(*cursor))
+            batch = batch.cte("expiry_batch")
+
+            flipped = (
+                update(table)
+                .where(table.c.id.in_(select(batch.c.id)))
+                .values(status=LTSDStatus.EXPIRED.value, updated_at=datetime.utcnow())
+                .returning(
+                    table.c.id,
+                    table.c.partner_id,
+                    table.c.ltsd_type,
+                    table.c.verdict,
+                    table.c.agreements,
+                    table.c.valid_from,
+                    table.c.valid_to,
+                )
+                .cte("expired")
+            )
+            # Fold the chunk into one row per counter key server-side; ids come
+            # back highest (valid_to, id) first so the first one advances the cursor
+            groups = self.db.execute(
+                select(
+                    flipped.c.partner_id,
+                    flipped.c.ltsd_type,
+                    flipped.c.verdict,
+                    flipped.c.agreements,
+                    func.count().label("declarations"),
+                    func.sum(flipped.c.valid_to - flipped.c.valid_from, type_=Integer).label("validity_days"),
+                    func.max(flipped.c.valid_to).label("last_valid_to"),
+                    func.array_agg(
+                        aggregate_order_by(flipped.c.id, flipped.c.valid_to.desc(), flipped.c.id.desc())
+                    ).label("ids"),
+                ).group_by(
+                    flipped.c.partner_id, flipped.c.ltsd_type, flipped.c.verdict, flipped.c.agreements
+                )
+            ).all()
+            if not groups:
+                self.db.commit()
+                break
+
+            deltas: CounterDeltas = defaultdict(lambda: [0, 0])
+            for group in groups:
+                self._count(deltas, group, LTSDStatus.ACTIVE.value, -group.declarations, -group.validity_days)
+                self._count(deltas, group, LTSDStatus.EXPIRED.value, group.declarations, group.validity_days)
+            self._apply_counter_deltas(deltas)
+            self.db.commit()
+
+            chunk = sum(group.declarations for group in groups)
+            expired += chunk
+            cursor = max((group.last_valid_to, group.ids[0]) for group in groups)
+
+            if on_expired or self.webhook_service:
+                ids = [ltsd_id for group in groups for ltsd_id in group.ids]
+                # Plain rows rather than ORM entities; only what _to_declaration reads
+                records = self.db.execute(
+                    select(table.c.payload, table.c.status, table.c.partner_id)
+                    .where(table.c.id.in_(ids))
+                    .order_by(table.c.valid_to, table.c.id)
+                ).all()
+                declarations = [self._to_declaration(record) for record in records]
+
+                # Trigger webhook
+                if self.webhook_service:
+                    for record, declaration in zip(records, declarations):
+                        self._trigger_webhook("ltsd.expired", declaration, record.partner_id)
+                if on_expired:
+                    on_expired(declarations)
+
+            if chunk < chunk_size:
+                break
+
+        return expired
+
+    def get_certificate_pdf(self, declaration: LTSDDeclaration) -> StoredCertificate:
+        """
+        Return the stored certificate PDF for a declaration, rendering it only
+        if this exact certificate payload has never been rendered before.
+
+        Args:
+            declaration: LTSD declaration
+
+        Returns:
+            Stored certificate (path, sha256, size)
+        """
+        key = self.certificate_key(declaration)
+
+        def _render():
+            cert_data = self._convert_to_certificate_data(declaration)
+            pdf_bytes = self.pdf_generator.generate_ltsd_certificate(cert_data)
+            return pdf_bytes, {
+                "ltsd_id": str(declaration.id),
+                "document_ref": declaration.document_ref,
+                "version": declaration.version,
+            }
+
+        stored, _ = self.certificate_store.get_or_create(key, _render)
+        return stored
+
+    @staticmethod
+    def certificate_key(declaration: LTSDDeclaration) -> str:
+        """Content address of a declaration's certificate (sha256 of its canonical payload)."""
+        return CertificateStore.key_for(
+            declaration.model_dump(mode="json", include=CERTIFICATE_PAYLOAD_FIELDS)
+        )
+
+    def _convert_to_certificate_data(self, declaration: LTSDDeclaration) -> "CertificateData":
         """Convert LTSD declaration to PDF certificate data."""
-        from backend.services.pdf_generator_service import CertificateData
+        from backend.services.pdf_generator_service import CertificateData, ProductInfo
 
         # Convert products
         products = [
@@ -476,6 +667,87 @@ class LTSDManagementService:
             notes=declaration.notes,
         )
 
+    def _stage(self, declaration: LTSDDeclaration, partner_id: str) -> None:
+        """
+        Write a declaration and its counter deltas into the current transaction.
+
+        Existing declarations must have been read with ``get_ltsd(...,
+        for_update=True)`` in this transaction, or a concurrent change (e.g.
+        an expiry sweep) would be overwritten.
+        """
+        record = self.db.get(LTSDRecord, declaration.id, with_for_update=True)
+        deltas: CounterDeltas = defaultdict(lambda: [0, 0])
+        if record is None:
+            record = LTSDRecord(id=declaration.id, partner_id=partner_id, created_at=declaration.created_at)
+            self.db.add(record)
+        else:
+            self._count(deltas, record, record.status, -1, -self._validity_days(record))
+
+        assessment = declaration.assessment
+        record.document_ref = declaration.document_ref
+        record.version = declaration.version
+        record.status = _value(declaration.status)
+        record.ltsd_type = _value(declaration.ltsd_type)
+        record.verdict = _value(assessment.verdict) if assessment else None
+        record.agreements = list(assessment.qualified_agreements) if assessment else []
+        record.valid_from = declaration.valid_from
+        record.valid_to = declaration.valid_to
+        record.payload = declaration.model_dump(mode="json")
+        self._count(deltas, record, record.status, 1, self._validity_days(record))
+
+        self._apply_counter_deltas(deltas)
+
+    @staticmethod
+    def _validity_days(record: LTSDRecord) -> int:
+        return (record.valid_to - record.valid_from).days
+
+    @staticmethod
+    def _count(deltas: CounterDeltas, record, status: str, declarations: int, validity_days: int) -> None:
+        """
+        Add counter contributions for declarations sharing ``record``'s partner,
+        type, verdict and agreements (negative amounts remove them).
+        """
+        keys = [("type", record.ltsd_type)]
+        if record.verdict:
+            keys.append(("verdict", record.verdict))
+        keys.extend(("agreement", agreement) for agreement in record.agreements or ())
+        for dimension, value in keys:
+            entry = deltas[(record.partner_id, status, dimension, value)]
+            entry[0] += declarations
+            entry[1] += validity_days
+
+    def _apply_counter_deltas(self, deltas: CounterDeltas) -> None:
+        """Upsert counter deltas in key order so concurrent writers never deadlock."""
+        rows = [
+            {
+                "partner_id": partner_id,
+                "status": status,
+                "dimension": dimension,
+                "value": value,
+                "declarations": count,
+                "validity_days": days,
+            }
+            for (partner_id, status, dimension, value), (count, days) in sorted(deltas.items())
+            if count or days
+        ]
+        if not rows:
+            return
+        counter = LTSDStatisticsCounter
+        stmt = pg_insert(counter).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[counter.partner_id, counter.status, counter.dimension, counter.value],
+            set_={
+                "declarations": counter.declarations + stmt.excluded.declarations,
+                "validity_days": counter.validity_days + stmt.excluded.validity_days,
+            },
+        )
+        self.db.execute(stmt)
+
+    @staticmethod
+    def _to_declaration(record: LTSDRecord) -> LTSDDeclaration:
+        # Status columns are updated in bulk by expiry sweeps; they win over the payload
+        return LTSDDeclaration.model_validate({**record.payload, "status": record.status})
+
     def _trigger_webhook(self, event_type: str, declaration: LTSDDeclaration, partner_id: str):
         """Trigger webhook event for LTSD lifecycle event."""
         if not self.webhook_service:
@@ -498,6 +770,10 @@ class LTSDManagementService:
 _ltsd_service: Optional[LTSDManagementService] = None
 
 
-def get_ltsd_service(db_session: Session, webhook_service=None) -> LTSDManagementService:
+def get_ltsd_service(
+    db_session: Session,
+    webhook_service=None,
+    certificate_store: Optional[CertificateStore] = None,
+) -> LTSDManagementService:
     """Get or create LTSD management service instance."""
-    return LTSDManagementService(db_session, webhook_service)
+    return LTSDManagementService(db_session, webhook_service, certificate_store)
@@ -9,6 +9,7 @@ This service provides ML-based predictive capabilities:
 
 Features:
 - Scikit-learn based ML models (Decision Tree, Logistic Regression)
+- Versioned model artefacts loaded lazily from the model registry
 - Confidence thresholds and explainability
 - Historical data analysis
 - Mock training data based on CFO dashboard metrics
@@ -16,26 +17,59 @@ Features:
 
 from __future__ import annotations
 
+import hashlib
 import logging as log_module
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 import numpy as np
 from dataclasses import dataclass, field
 
-# ML imports
-try:
-    from sklearn.tree import DecisionTreeClassifier
-    from sklearn.linear_model import LogisticRegression
-    from sklearn.preprocessing import StandardScaler
-    from sklearn.model_selection import train_test_split
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+from backend.services.predictive_model_registry import (
+    FEATURE_NAMES,
+    SKLEARN_AVAILABLE,
+    ModelArtifact,
+    ModelRegistry,
+    train_models,
+)
+
+if not SKLEARN_AVAILABLE:
     log_module.warning("scikit-learn not available. Predictive analytics will use fallback logic.")
 
 
 logger = log_module.getLogger(__name__)
 
+# Column order of the risk model's feature matrix
+RISK_FEATURES = FEATURE_NAMES
+
+# Column order of the compliance model's feature matrix (EU value share in the last slot)
+COMPLIANCE_FEATURES = (
+    "material_count",
+    "eu_content_percentage",
+    "complexity_score",
+    "supplier_reliability",
+    "eu_value_percentage",
+)
+
+# Country risk used for BOM-level geographic exposure
+COUNTRY_RISK_SCORES = {
+    # Low risk EU countries
+    "DE": 0.1, "FR": 0.1, "IT": 0.15, "ES": 0.15, "NL": 0.1,
+    "BE": 0.1, "AT": 0.1, "PL": 0.2, "SE": 0.1, "DK": 0.1,
+    # Medium risk
+    "GB": 0.25, "US": 0.3, "CA": 0.25, "JP": 0.25, "KR": 0.3,
+    # Higher risk
+    "CN": 0.5, "IN": 0.4, "TR": 0.45, "RU": 0.7,
+}
+
+# Country risk used for individual components
+COMPONENT_COUNTRY_RISK_SCORES = {
+    "DE": 0.1, "FR": 0.1, "IT": 0.15, "ES": 0.15, "NL": 0.1,
+    "GB": 0.25, "US": 0.3, "CN": 0.5, "RU": 0.7,
+}
+
+UNKNOWN_COUNTRY_RISK = 0.5
+
 
 # Data Models
 @dataclass
@@ -48,6 +82,7 @@ class RiskScore:
     explanation: str
     recommendations: List[str] = field(default_factory=list)
     calculated_at: datetime = field(default_factory=datetime.utcnow)
+    model_version: Optional[str] = None  # None for rule-based scores
 
 
 @dataclass
@@ -62,6 +97,7 @@ class CompliancePrediction:
     trade_agreements: List[str] = field(default_factory=list)
     qualified_agreements: List[str] = field(default_factory=list)
     predicted_at: datetime = field(default_factory=datetime.utcnow)
+    model_version: Optional[str] = None  # None for rule-based predictions
 
 
 @dataclass
@@ -76,6 +112,77 @@ class SupplyChainRiskReport:
     mitigation_strategies: List[str]
     explanation: str
     analyzed_at: datetime = field(default_factory=datetime.utcnow)
+    concentration_metrics: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class BomFrame:
+    """
+    Columnar view of a bill of materials, built once per supply chain analysis.
+
+    Origin countries are factorised into integer codes (in order of first
+    appearance) so per-country counts, shares and exposures are single
+    ``np.bincount``/fancy-indexing passes instead of dict loops.
+    """
+    material_count: int
+    countries: np.ndarray  # unique origin codes, first-appearance order
+    country_codes: np.ndarray  # per-material index into ``countries``
+    country_counts: np.ndarray  # materials per country
+    percentages: np.ndarray  # per-material BOM percentage (default 50)
+    supplier_reliability: np.ndarray
+
+    @classmethod
+    def from_bom(cls, materials: List[Dict], suppliers: List[Dict]) -> "BomFrame":
+        # Factorise origins in one pass; dict insertion order is first appearance
+        country_index: Dict[str, int] = {}
+        country_codes = np.fromiter(
+            (
+                country_index.setdefault(m.get("origin_country", "XX"), len(country_index))
+                for m in materials
+            ),
+            dtype=np.intp,
+            count=len(materials),
+        )
+        percentages = np.fromiter(
+            (m.get("percentage", 50) for m in materials), dtype=float, count=len(materials)
+        )
+        reliability = np.fromiter(
+            (s.get("reliability_score", 0.5) for s in suppliers), dtype=float, count=len(suppliers)
+        )
+
+        return cls(
+            material_count=len(materials),
+            countries=np.array(list(country_index), dtype=object),
+            country_codes=country_codes,
+            country_counts=np.bincount(country_codes, minlength=len(country_index)),
+            percentages=percentages,
+            supplier_reliability=reliability,
+        )
+
+    def country_shares(self) -> np.ndarray:
+        if not self.material_count:
+            return np.zeros(0)
+        return self.country_counts / self.material_count
+
+    def country_risk(self, table: Dict[str, float]) -> np.ndarray:
+        """Risk score per unique country (lookups scale with countries, not materials)."""
+        return np.array(
+            [table.get(country, UNKNOWN_COUNTRY_RISK) for country in self.countries.tolist()],
+            dtype=float,
+        )
+
+    def hhi(self) -> float:
+        """Herfindahl-Hirschman index of origin-country shares (0-1)."""
+        shares = self.country_shares()
+        return float(np.dot(shares, shares))
+
+    def top_share(self, n: int = 1) -> float:
+        """Combined share of the ``n`` largest origin countries."""
+        shares = self.country_shares()
+        if not len(shares):
+            return 0.0
+        n = min(n, len(shares))
+        return float(np.partition(shares, len(shares) - n)[-n:].sum())
 
 
 class PredictiveAnalyticsService:
@@ -88,12 +195,17 @@ class PredictiveAnalyticsService:
     3. Analyze supply chain risks
     """
 
-    def __init__(self):
-        """Initialize predictive analytics service."""
-        self.risk_model = None
-        self.compliance_model = None
-        self.scaler = StandardScaler() if SKLEARN_AVAILABLE else None
-        self.is_trained = False
+    def __init__(self, registry: Optional[ModelRegistry] = None):
+        """
+        Initialize predictive analytics service.
+
+        Models are not trained here; they are loaded from ``registry`` on
+        first use, so construction is cheap and every worker scores with the
+        same published version.
+        """
+        self.registry = registry or ModelRegistry()
+        self._fallback_artifact: Optional[ModelArtifact] = None
+        self._fallback_lock = threading.Lock()
 
         # Confidence thresholds
         self.HIGH_CONFIDENCE_THRESHOLD = 0.75
@@ -104,93 +216,67 @@ class PredictiveAnalyticsService:
         self.HIGH_RISK_THRESHOLD = 0.60
         self.MEDIUM_RISK_THRESHOLD = 0.40
 
-        # Initialize with mock training data
-        self._initialize_models()
-
         logger.info("Predictive Analytics Service initialized")
 
-    def _initialize_models(self):
-        """Initialize and train models with mock historical data."""
-        if not SKLEARN_AVAILABLE:
-            logger.warning("Scikit-learn not available. Using rule-based fallback.")
-            return
-
-        try:
-            # Generate mock training data based on CFO dashboard (42 passed, 3 failed)
-            X_train, y_risk, y_compliance = self._generate_mock_training_data()
-
-            # Train risk scoring model (Decision Tree)
-            self.risk_model = DecisionTreeClassifier(
-                max_depth=5,
-                min_samples_split=5,
-                random_state=42
-            )
-            self.risk_model.fit(X_train, y_risk)
-
-            # Train compliance prediction model (Logistic Regression)
-            self.compliance_model = LogisticRegression(
-                random_state=42,
-                max_iter=1000
-            )
-            self.compliance_model.fit(X_train, y_compliance)
-
-            # Fit scaler
-            self.scaler.fit(X_train)
-
-            self.is_trained = True
-            logger.info("ML models trained successfully with mock data")
-
-        except Exception as e:
-            logger.error(f"Error initializing models: {e}")
-            self.is_trained = False
-
-    def _generate_mock_training_data(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-        """
-        Generate mock training data based on CFO dashboard statistics.
+    # Model access
 
-        Simulates 45 historical assessments (42 passed, 3 failed).
-        Features: material_count, eu_content_percentage, complexity_score,
-                  supplier_reliability, documentation_quality
-
-        Returns:
-            Tuple of (features, risk_labels, compliance_labels)
-        """
-        np.random.seed(42)
-
-        # 42 successful assessments (compliant, low risk)
-        successful_assessments = []
-        for _ in range(42):
-            assessment = [
-                np.random.randint(3, 15),      # material_count
-                np.random.uniform(65, 95),     # eu_content_percentage
-                np.random.uniform(0.2, 0.6),   # complexity_score
-                np.random.uniform(0.7, 1.0),   # supplier_reliability
-                np.random.uniform(0.7, 1.0),   # documentation_quality
-            ]
-            successful_assessments.append(assessment)
-
-        # 3 failed assessments (non-compliant, high risk)
-        failed_assessments = []
-        for _ in range(3):
-            assessment = [
-                np.random.randint(15, 25),     # material_count (high complexity)
-                np.random.uniform(20, 45),     # eu_content_percentage (low EU content)
-                np.random.uniform(0.7, 0.95),  # complexity_score (high)
-                np.random.uniform(0.2, 0.5),   # supplier_reliability (low)
-                np.random.uniform(0.3, 0.6),   # documentation_quality (poor)
-            ]
-            failed_assessments.append(assessment)
-
-        # Combine data
-        X = np.array(successful_assessments + failed_assessments)
-
-        # Risk labels: 0 = low risk, 1 = high risk
-        y_risk = np.array([0] * 42 + [1] * 3)
-
-        # Compliance labels: 1 = compliant, 0 = non-compliant
-        y_compliance = np.array([1] * 42 + [0] * 3)
-
-        return X, y_risk, y_compliance
+    def _models(self) -> Optional[ModelArtifact]:
+        """Current model artefact, hot-swapped by the registry when republished."""
+        if not SKLEARN_AVAILABLE:
+            return None
+        artifact = self.registry.get()
+        if artifact is not None:
+            return artifact
+        return self._unpublished_models()
+
+    def _unpublished_models(self) -> Optional[ModelArtifact]:
+        """Train in-process when no artefact has been published yet."""
+        if self._fallback_artifact is None:
+            with self._fallback_lock:
+                if self._fallback_artifact is None:
+                    logger.warning(
+                        f"No published predictive models in {self.registry.root}; "
+                        "training in-process. Run "
+                        "'python -m backend.services.predictive_model_registry train' "
+                        "to publish an artefact."
+                    )
+                    try:
+                        models = train_models()
+                    except Exception as e:
+                        logger.error(f"Error initializing models: {e}")
+                        return None
+                    self._fallback_artifact = ModelArtifact(
+                        version="unpublished",
+                        checksum=hashlib.sha256(b"unpublished").hexdigest(),
+                        risk_model=models["risk_model"],
+                        compliance_model=models["compliance_model"],
+                        scaler=models["scaler"],
+                    )
+        return self._fallback_artifact
+
+    @property
+    def is_trained(self) -> bool:
+        return self._models() is not None
+
+    @property
+    def model_version(self) -> Optional[str]:
+        artifact = self._models()
+        return artifact.version if artifact else None
+
+    @property
+    def risk_model(self):
+        artifact = self._models()
+        return artifact.risk_model if artifact else None
+
+    @property
+    def compliance_model(self):
+        artifact = self._models()
+        return artifact.compliance_model if artifact else None
+
+    @property
+    def scaler(self):
+        artifact = self._models()
+        return artifact.scaler if artifact else None
 
     def calculate_risk_score(self, assessment_data: Dict) -> RiskScore:
         """
@@ -207,29 +293,63 @@ class PredictiveAnalyticsService:
         Returns:
             RiskScore object with score, confidence, and explanation
         """
-        try:
-            # Extract features
-            features = self._extract_risk_features(assessment_data)
+        return self.calculate_risk_scores([assessment_data])[0]
 
-            if SKLEARN_AVAILABLE and self.is_trained and self.risk_model:
-                # Use ML model
-                risk_score = self._predict_risk_with_ml(features)
-            else:
-                # Use rule-based fallback
-                risk_score = self._predict_risk_with_rules(features)
+    def calculate_risk_scores(self, assessments: List[Dict]) -> List[RiskScore]:
+        """
+        Calculate risk scores for many assessments in one model pass.
 
-            return risk_score
+        Features for every assessment are stacked into a single (N, 5) matrix
+        and scored with one ``predict_proba`` call, so batch cost is dominated
+        by feature extraction rather than per-row model overhead.
+        ``predict_compliance_probabilities`` does the same for the compliance model.
 
-        except Exception as e:
-            logger.error(f"Error calculating risk score: {e}")
-            return RiskScore(
-                score=0.5,
-                confidence=0.3,
-                risk_level="MEDIUM",
-                factors={"error": 1.0},
-                explanation=f"Error in risk calculation: {str(e)}",
-                recommendations=["Manual review required"]
-            )
+        Args:
+            assessments: List of assessment dictionaries (see calculate_risk_score)
+
+        Returns:
+            RiskScore objects in the same order as the input
+        """
+        results: List[Optional[RiskScore]] = [None] * len(assessments)
+        positions: List[int] = []
+        features_list: List[Dict[str, float]] = []
+
+        for index, assessment_data in enumerate(assessments):
+            try:
+                features_list.append(self._extract_risk_features(assessment_data))
+                positions.append(index)
+            except Exception as e:
+                logger.error(f"Error calculating risk score: {e}")
+                results[index] = self._risk_error_score(e)
+
+        if features_list:
+            try:
+                # Resolve the artefact once so a hot swap cannot split a batch
+                artifact = self._models()
+                if artifact is not None and artifact.risk_model is not None:
+                    # Use ML model
+                    scores = self._predict_risk_batch_with_ml(features_list, artifact)
+                else:
+                    # Use rule-based fallback
+                    scores = [self._predict_risk_with_rules(f) for f in features_list]
+            except Exception as e:
+                logger.error(f"Error calculating risk score: {e}")
+                scores = [self._risk_error_score(e) for _ in features_list]
+
+            for index, risk_score in zip(positions, scores):
+                results[index] = risk_score
+
+        return results
+
+    def _risk_error_score(self, error: Exception) -> RiskScore:
+        return RiskScore(
+            score=0.5,
+            confidence=0.3,
+            risk_level="MEDIUM",
+            factors={"error": 1.0},
+            explanation=f"Error in risk calculation: {str(error)}",
+            recommendations=["Manual review required"]
+        )
 
     def predict_compliance_probability(self, product_data: Dict) -> CompliancePrediction:
         """
@@ -246,30 +366,62 @@ class PredictiveAnalyticsService:
         Returns:
             CompliancePrediction with probability and explanation
         """
-        try:
-            # Extract features
-            features = self._extract_compliance_features(product_data)
+        return self.predict_compliance_probabilities([product_data])[0]
 
-            if SKLEARN_AVAILABLE and self.is_trained and self.compliance_model:
-                # Use ML model
-                prediction = self._predict_compliance_with_ml(features, product_data)
-            else:
-                # Use rule-based fallback
-                prediction = self._predict_compliance_with_rules(features, product_data)
+    def predict_compliance_probabilities(self, products: List[Dict]) -> List[CompliancePrediction]:
+        """
+        Predict compliance probability for many products in one model pass.
 
-            return prediction
+        Args:
+            products: List of product dictionaries (see predict_compliance_probability)
 
-        except Exception as e:
-            logger.error(f"Error predicting compliance: {e}")
-            return CompliancePrediction(
-                probability=0.5,
-                confidence=0.3,
-                verdict="UNCERTAIN",
-                compliance_factors={"error": 0.5},
-                risk_factors=["Prediction error occurred"],
-                explanation=f"Error in compliance prediction: {str(e)}",
-                trade_agreements=product_data.get("trade_agreements", [])
-            )
+        Returns:
+            CompliancePrediction objects in the same order as the input
+        """
+        results: List[Optional[CompliancePrediction]] = [None] * len(products)
+        positions: List[int] = []
+        features_list: List[Dict[str, float]] = []
+
+        for index, product_data in enumerate(products):
+            try:
+                features_list.append(self._extract_compliance_features(product_data))
+                positions.append(index)
+            except Exception as e:
+                logger.error(f"Error predicting compliance: {e}")
+                results[index] = self._compliance_error_prediction(e, product_data)
+
+        if features_list:
+            scored = [products[index] for index in positions]
+            try:
+                artifact = self._models()
+                if artifact is not None and artifact.compliance_model is not None:
+                    # Use ML model
+                    predictions = self._predict_compliance_batch_with_ml(features_list, scored, artifact)
+                else:
+                    # Use rule-based fallback
+                    predictions = [
+                        self._predict_compliance_with_rules(features, product_data)
+                        for features, product_data in zip(features_list, scored)
+                    ]
+            except Exception as e:
+                logger.error(f"Error predicting compliance: {e}")
+                predictions = [self._compliance_error_prediction(e, product_data) for product_data in scored]
+
+            for index, prediction in zip(positions, predictions):
+                results[index] = prediction
+
+        return results
+
+    def _compliance_error_prediction(self, error: Exception, product_data: Dict) -> CompliancePrediction:
+        return CompliancePrediction(
+            probability=0.5,
+            confidence=0.3,
+            verdict="UNCERTAIN",
+            compliance_factors={"error": 0.5},
+            risk_factors=["Prediction error occurred"],
+            explanation=f"Error in compliance prediction: {str(error)}",
+            trade_agreements=product_data.get("trade_agreements", [])
+        )
 
     def analyze_supply_chain_risk(self, bom_data: Dict) -> SupplyChainRiskReport:
         """
@@ -286,15 +438,16 @@ class PredictiveAnalyticsService:
             SupplyChainRiskReport with comprehensive risk analysis
         """
         try:
-            # Extract materials and analyze
+            # Extract materials and build the shared columnar frame
             materials = bom_data.get("materials", [])
             suppliers = bom_data.get("suppliers", [])
+            frame = BomFrame.from_bom(materials, suppliers)
 
             # Calculate risk components
-            geographic_risks = self._analyze_geographic_risk(materials)
-            supplier_risks = self._analyze_supplier_risk(suppliers)
-            concentration_risk = self._analyze_concentration_risk(materials)
-            complexity_risk = self._analyze_complexity_risk(materials)
+            geographic_risks = self._analyze_geographic_risk(frame)
+            supplier_risks = self._analyze_supplier_risk(frame)
+            concentration_risk = self._analyze_concentration_risk(frame)
+            complexity_risk = self._analyze_complexity_risk(frame)
 
             # Aggregate overall risk
             risk_breakdown = {
@@ -304,7 +457,7 @@ class PredictiveAnalyticsService:
                 "complexity": complexity_risk,
             }
 
-            overall_risk = np.mean(list(risk_breakdown.values()))
+            overall_risk = float(np.mean(list(risk_breakdown.values())))
 
             # Determine confidence based on data completeness
             data_completeness = self._assess_data_completeness(bom_data)
@@ -329,18 +482,26 @@ class PredictiveAnalyticsService:
                 materials
             )
 
-            # Analyze component-level risks
+            # Analyze component-level risks (top 10 rows of the frame)
+            component_scores = self._calculate_component_risks(frame, limit=10)
             component_risks = [
                 {
                     "material": mat.get("description", "Unknown"),
                     "hs_code": mat.get("hs_code", ""),
                     "origin": mat.get("origin_country", "Unknown"),
-                    "risk_score": self._calculate_component_risk(mat),
+                    "risk_score": score,
                     "risk_factors": self._identify_component_risk_factors(mat),
                 }
-                for mat in materials[:10]  # Limit to top 10 for performance
+                for mat, score in zip(materials[:10], component_scores)
             ]
 
+            concentration_metrics = {
+                "hhi": frame.hhi(),
+                "top_country_share": frame.top_share(1),
+                "top_3_country_share": frame.top_share(3),
+                "country_count": float(len(frame.countries)),
+            }
+
             return SupplyChainRiskReport(
                 overall_risk_score=overall_risk,
                 confidence=confidence,
@@ -349,7 +510,8 @@ class PredictiveAnalyticsService:
                 geographic_risks=geographic_risks,
                 recommendations=recommendations,
                 mitigation_strategies=mitigation_strategies,
-                explanation=explanation
+                explanation=explanation,
+                concentration_metrics=concentration_metrics
             )
 
         except Exception as e:
@@ -438,50 +600,61 @@ class PredictiveAnalyticsService:
 
     # ML prediction methods
 
-    def _predict_risk_with_ml(self, features: Dict[str, float]) -> RiskScore:
+    def _predict_risk_with_ml(self, features: Dict[str, float], artifact: ModelArtifact) -> RiskScore:
         """Predict risk using ML model."""
-        # Convert features to array
-        feature_array = np.array([[
-            features["material_count"],
-            features["eu_content_percentage"],
-            features["complexity_score"],
-            features["supplier_reliability"],
-            features["documentation_quality"],
-        ]])
+        return self._predict_risk_batch_with_ml([features], artifact)[0]
 
-        # Predict
-        risk_class = self.risk_model.predict(feature_array)[0]
-        risk_proba = self.risk_model.predict_proba(feature_array)[0]
-
-        # Calculate risk score (0-1 scale)
-        risk_score = risk_proba[1] if len(risk_proba) > 1 else float(risk_class)
+    def _predict_risk_batch_with_ml(
+        self,
+        features_list: List[Dict[str, float]],
+        artifact: ModelArtifact
+    ) -> List[RiskScore]:
+        """Predict risk for a batch of feature dicts with a single model call."""
+        risk_model = artifact.risk_model
+        # Convert features to an (N, 5) matrix
+        feature_matrix = np.array(
+            [[features[name] for name in RISK_FEATURES] for features in features_list],
+            dtype=float,
+        )
 
-        # Determine confidence (based on prediction probability margin)
-        confidence = max(risk_proba) if len(risk_proba) > 1 else 0.7
+        # Predict
+        risk_proba = risk_model.predict_proba(feature_matrix)
 
-        # Determine risk level
-        if risk_score >= self.CRITICAL_RISK_THRESHOLD:
-            risk_level = "CRITICAL"
-        elif risk_score >= self.HIGH_RISK_THRESHOLD:
-            risk_level = "HIGH"
-        elif risk_score >= self.MEDIUM_RISK_THRESHOLD:
-            risk_level = "MEDIUM"
+        if risk_proba.shape[1] > 1:
+            # Calculate risk score (0-1 scale) and confidence from the probability margin
+            risk_scores = risk_proba[:, 1]
+            confidences = risk_proba.max(axis=1)
         else:
-            risk_level = "LOW"
+            risk_scores = risk_model.predict(feature_matrix).astype(float)
+            confidences = np.full(len(features_list), 0.7)
 
-        # Build explanation
-        explanation = self._build_risk_explanation(risk_score, risk_level, features)
-
-        # Generate recommendations
-        recommendations = self._generate_recommendations(risk_level, features)
+        risk_levels = self._classify_risk_levels(risk_scores)
 
-        return RiskScore(
-            score=risk_score,
-            confidence=confidence,
-            risk_level=risk_level,
-            factors=features,
-            explanation=explanation,
-            recommendations=recommendations
+        results = []
+        for features, risk_score, confidence, risk_level in zip(
+            features_list, risk_scores.tolist(), confidences.tolist(), risk_levels.tolist()
+        ):
+            results.append(RiskScore(
+                score=risk_score,
+                confidence=confidence,
+                risk_level=risk_level,
+                factors=features,
+                explanation=self._build_risk_explanation(risk_score, risk_level, features),
+                recommendations=self._generate_recommendations(risk_level, features),
+                model_version=artifact.version
+            ))
+        return results
+
+    def _classify_risk_levels(self, risk_scores: np.ndarray) -> np.ndarray:
+        """Map risk scores to CRITICAL/HIGH/MEDIUM/LOW in one vectorised pass."""
+        return np.select(
+            [
+                risk_scores >= self.CRITICAL_RISK_THRESHOLD,
+                risk_scores >= self.HIGH_RISK_THRESHOLD,
+                risk_scores >= self.MEDIUM_RISK_THRESHOLD,
+            ],
+            ["CRITICAL", "HIGH", "MEDIUM"],
+            default="LOW",
         )
 
     def _predict_risk_with_rules(self, features: Dict[str, float]) -> RiskScore:
@@ -531,56 +704,77 @@ class PredictiveAnalyticsService:
     def _predict_compliance_with_ml(
         self,
         features: Dict[str, float],
-        product_data: Dict
+        product_data: Dict,
+        artifact: ModelArtifact
     ) -> CompliancePrediction:
         """Predict compliance using ML model."""
-        # Convert features to array
-        feature_array = np.array([[
-            features["material_count"],
-            features["eu_content_percentage"],
-            features["complexity_score"],
-            features["supplier_reliability"],
-            features.get("eu_value_percentage", features["eu_content_percentage"]),
-        ]])
+        return self._predict_compliance_batch_with_ml([features], [product_data], artifact)[0]
 
-        # Predict
-        compliance_proba = self.compliance_model.predict_proba(feature_array)[0]
-        probability = compliance_proba[1] if len(compliance_proba) > 1 else 0.5
+    def _predict_compliance_batch_with_ml(
+        self,
+        features_list: List[Dict[str, float]],
+        products: List[Dict],
+        artifact: ModelArtifact
+    ) -> List[CompliancePrediction]:
+        """Predict compliance for a batch of feature dicts with a single model call."""
+        # Convert features to an (N, 5) matrix; EU value share falls back to EU content share
+        feature_matrix = np.array(
+            [
+                [features.get(name, features["eu_content_percentage"]) for name in COMPLIANCE_FEATURES]
+                for features in features_list
+            ],
+            dtype=float,
+        )
 
-        # Determine confidence
-        confidence = max(compliance_proba) if len(compliance_proba) > 1 else 0.7
+        # Predict
+        compliance_proba = artifact.compliance_model.predict_proba(feature_matrix)
 
-        # Determine verdict
-        if probability >= 0.70:
-            verdict = "LIKELY_COMPLIANT"
-        elif probability >= 0.40:
-            verdict = "UNCERTAIN"
+        if compliance_proba.shape[1] > 1:
+            probabilities = compliance_proba[:, 1]
+            confidences = compliance_proba.max(axis=1)
         else:
-            verdict = "LIKELY_NON_COMPLIANT"
-
-        # Identify risk factors
-        risk_factors = self._identify_risk_factors(features, probability)
-
-        # Determine qualified agreements
-        trade_agreements = product_data.get("trade_agreements", ["CETA", "EU-UK-TCA"])
-        qualified_agreements = trade_agreements if probability >= 0.60 else []
-
-        explanation = self._build_compliance_explanation(
-            probability,
-            verdict,
-            features,
-            risk_factors
-        )
+            probabilities = np.full(len(features_list), 0.5)
+            confidences = np.full(len(features_list), 0.7)
+
+        verdicts = self._classify_compliance_verdicts(probabilities)
+
+        results = []
+        for features, product_data, probability, confidence, verdict in zip(
+            features_list, products, probabilities.tolist(), confidences.tolist(), verdicts.tolist()
+        ):
+            # Identify risk factors
+            risk_factors = self._identify_risk_factors(features, probability)
+
+            # Determine qualified agreements
+            trade_agreements = product_data.get("trade_agreements", ["CETA", "EU-UK-TCA"])
+            qualified_agreements = trade_agreements if probability >= 0.60 else []
+
+            explanation = self._build_compliance_explanation(
+                probability,
+                verdict,
+                features,
+                risk_factors
+            )
 
-        return CompliancePrediction(
-            probability=probability,
-            confidence=confidence,
-            verdict=verdict,
-            compliance_factors=features,
-            risk_factors=risk_factors,
-            explanation=explanation,
-            trade_agreements=trade_agreements,
-            qualified_agreements=qualified_agreements
+            results.append(CompliancePrediction(
+                probability=probability,
+                confidence=confidence,
+                verdict=verdict,
+                compliance_factors=features,
+                risk_factors=risk_factors,
+                explanation=explanation,
+                trade_agreements=trade_agreements,
+                qualified_agreements=qualified_agreements,
+                model_version=artifact.version
+            ))
+        return results
+
+    def _classify_compliance_verdicts(self, probabilities: np.ndarray) -> np.ndarray:
+        """Map compliance probabilities to verdicts in one vectorised pass."""
+        return np.select(
+            [probabilities >= 0.70, probabilities >= 0.40],
+            ["LIKELY_COMPLIANT", "UNCERTAIN"],
+            default="LIKELY_NON_COMPLIANT",
         )
 
     def _predict_compliance_with_rules(
@@ -636,71 +830,37 @@ class PredictiveAnalyticsService:
 
     # Supply chain analysis methods
 
-    def _analyze_geographic_risk(self, materials: List[Dict]) -> Dict[str, float]:
+    def _analyze_geographic_risk(self, frame: BomFrame) -> Dict[str, float]:
         """Analyze geographic risk from material origins."""
-        country_risk_scores = {
-            # Low risk EU countries
-            "DE": 0.1, "FR": 0.1, "IT": 0.15, "ES": 0.15, "NL": 0.1,
-            "BE": 0.1, "AT": 0.1, "PL": 0.2, "SE": 0.1, "DK": 0.1,
-            # Medium risk
-            "GB": 0.25, "US": 0.3, "CA": 0.25, "JP": 0.25, "KR": 0.3,
-            # Higher risk
-            "CN": 0.5, "IN": 0.4, "TR": 0.45, "RU": 0.7,
-        }
-
-        country_counts = {}
-        for material in materials:
-            country = material.get("origin_country", "XX")
-            country_counts[country] = country_counts.get(country, 0) + 1
-
-        geographic_risks = {}
-        total_materials = len(materials) if materials else 1
+        if not frame.material_count:
+            return {"overall": 0.3}
 
-        for country, count in country_counts.items():
-            risk = country_risk_scores.get(country, 0.5)
-            weight = count / total_materials
-            geographic_risks[country] = risk * weight
+        exposures = frame.country_risk(COUNTRY_RISK_SCORES) * frame.country_shares()
 
-        overall = sum(geographic_risks.values()) if geographic_risks else 0.3
-        geographic_risks["overall"] = overall
+        geographic_risks = dict(zip(frame.countries.tolist(), exposures.tolist()))
+        geographic_risks["overall"] = float(exposures.sum())
 
         return geographic_risks
 
-    def _analyze_supplier_risk(self, suppliers: List[Dict]) -> float:
+    def _analyze_supplier_risk(self, frame: BomFrame) -> float:
         """Analyze supplier-related risk."""
-        if not suppliers:
+        if not len(frame.supplier_reliability):
             return 0.4  # Medium risk if no supplier data
 
-        # Average supplier reliability
-        reliability_scores = [
-            s.get("reliability_score", 0.5) for s in suppliers
-        ]
-        avg_reliability = np.mean(reliability_scores)
-
-        # Convert to risk (inverse of reliability)
-        return 1 - avg_reliability
+        # Convert average reliability to risk (inverse of reliability)
+        return float(1 - frame.supplier_reliability.mean())
 
-    def _analyze_concentration_risk(self, materials: List[Dict]) -> float:
+    def _analyze_concentration_risk(self, frame: BomFrame) -> float:
         """Analyze supply concentration risk."""
-        if not materials:
+        if not frame.material_count:
             return 0.3
 
-        # Check if too many materials from single country
-        country_counts = {}
-        for material in materials:
-            country = material.get("origin_country", "XX")
-            country_counts[country] = country_counts.get(country, 0) + 1
-
-        if country_counts:
-            max_concentration = max(country_counts.values()) / len(materials)
-            # High concentration = high risk
-            return max_concentration * 0.7
-
-        return 0.3
+        # High concentration in a single country = high risk
+        return frame.top_share(1) * 0.7
 
-    def _analyze_complexity_risk(self, materials: List[Dict]) -> float:
+    def _analyze_complexity_risk(self, frame: BomFrame) -> float:
         """Analyze complexity-related risk."""
-        material_count = len(materials) if materials else 0
+        material_count = frame.material_count
 
         # More materials = higher complexity = higher risk
         if material_count > 20:
@@ -739,21 +899,11 @@ class PredictiveAnalyticsService:
 
         return completeness_score
 
-    def _calculate_component_risk(self, material: Dict) -> float:
-        """Calculate risk score for individual component."""
-        country_risk_scores = {
-            "DE": 0.1, "FR": 0.1, "IT": 0.15, "ES": 0.15, "NL": 0.1,
-            "GB": 0.25, "US": 0.3, "CN": 0.5, "RU": 0.7,
-        }
-
-        country = material.get("origin_country", "XX")
-        base_risk = country_risk_scores.get(country, 0.5)
-
-        # Adjust for value percentage if available
-        value_pct = material.get("percentage", 50) / 100
-        weighted_risk = base_risk * (0.5 + value_pct * 0.5)
-
-        return weighted_risk
+    def _calculate_component_risks(self, frame: BomFrame, limit: Optional[int] = None) -> List[float]:
+        """Calculate risk scores for components, weighted by value percentage."""
+        base_risk = frame.country_risk(COMPONENT_COUNTRY_RISK_SCORES)[frame.country_codes[:limit]]
+        value_pct = frame.percentages[:limit] / 100
+        return (base_risk * (0.5 + value_pct * 0.5)).tolist()
 
     def _identify_component_risk_factors(self, material: Dict) -> List[str]:
         """Identify risk factors for component."""
@@ -0,0 +1,312 @@
+"""
+Model Registry for Predictive Analytics
+
+Trains the predictive analytics models offline and stores them as versioned,
+checksummed artefacts on local disk. Workers lazily load the current artefact
+on first use (NumPy arrays are memory-mapped) and hot-swap it when a newer
+version is published, so every process scores with the same models.
+
+Layout::
+
+    <root>/CURRENT                      # name of the active version
+    <root>/<version>/models.joblib      # risk model, compliance model, scaler
+    <root>/<version>/manifest.json      # version, sha256, features, metadata
+
+Usage:
+    python -m backend.services.predictive_model_registry train [--root DIR]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging as log_module
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    import joblib
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.tree import DecisionTreeClassifier
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+
+logger = log_module.getLogger(__name__)
+
+DEFAULT_MODEL_DIR = os.getenv("PREDICTIVE_MODEL_DIR", "var/models/predictive")
+CURRENT_POINTER = "CURRENT"
+ARTIFACT_FILE = "models.joblib"
+MANIFEST_FILE = "manifest.json"
+FEATURE_NAMES = (
+    "material_count",
+    "eu_content_percentage",
+    "complexity_score",
+    "supplier_reliability",
+    "documentation_quality",
+)
+
+
+class ModelArtifactError(Exception):
+    """Raised when an artefact is missing, unreadable or fails its checksum."""
+
+
+@dataclass
+class ModelArtifact:
+    """A loaded, verified set of predictive models."""
+    version: str
+    checksum: str
+    risk_model: Any
+    compliance_model: Any
+    scaler: Any
+    trained_at: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def generate_mock_training_data() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Generate mock training data based on CFO dashboard statistics.
+
+    Simulates 45 historical assessments (42 passed, 3 failed).
+    Features: material_count, eu_content_percentage, complexity_score,
+              supplier_reliability, documentation_quality
+
+    Returns:
+        Tuple of (features, risk_labels, compliance_labels)
+    """
+    rng = np.random.RandomState(42)
+
+    # 42 successful assessments (compliant, low risk)
+    successful_assessments = []
+    for _ in range(42):
+        assessment = [
+            rng.randint(3, 15),      # material_count
+            rng.uniform(65, 95),     # eu_content_percentage
+            rng.uniform(0.2, 0.6),   # complexity_score
+            rng.uniform(0.7, 1.0),   # supplier_reliability
+            rng.uniform(0.7, 1.0),   # documentation_quality
+        ]
+        successful_assessments.append(assessment)
+
+    # 3 failed assessments (non-compliant, high risk)
+    failed_assessments = []
+    for _ in range(3):
+        assessment = [
+            rng.randint(15, 25),     # material_count (high complexity)
+            rng.uniform(20, 45),     # eu_content_percentage (low EU content)
+            rng.uniform(0.7, 0.95),  # complexity_score (high)
+            rng.uniform(0.2, 0.5),   # supplier_reliability (low)
+            rng.uniform(0.3, 0.6),   # documentation_quality (poor)
+        ]
+        failed_assessments.append(assessment)
+
+    # Combine data
+    X = np.array(successful_assessments + failed_assessments)
+
+    # Risk labels: 0 = low risk, 1 = high risk
+    y_risk = np.array([0] * 42 + [1] * 3)
+
+    # Compliance labels: 1 = compliant, 0 = non-compliant
+    y_compliance = np.array([1] * 42 + [0] * 3)
+
+    return X, y_risk, y_compliance
+
+
+def train_models() -> Dict[str, Any]:
+    """Train the risk (Decision Tree) and compliance (Logistic Regression) models."""
+    if not SKLEARN_AVAILABLE:
+        raise ModelArtifactError("scikit-learn is required to train predictive models")
+
+    X_train, y_risk, y_compliance = generate_mock_training_data()
+
+    risk_model = DecisionTreeClassifier(
+        max_depth=5,
+        min_samples_split=5,
+        random_state=42
+    )
+    risk_model.fit(X_train, y_risk)
+
+    compliance_model = LogisticRegression(
+        random_state=42,
+        max_iter=1000
+    )
+    compliance_model.fit(X_train, y_compliance)
+
+    scaler = StandardScaler()
+    scaler.fit(X_train)
+
+    return {
+        "risk_model": risk_model,
+        "compliance_model": compliance_model,
+        "scaler": scaler,
+    }
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, data: str) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class ModelRegistry:
+    """
+    Versioned on-disk store for predictive model artefacts.
+
+    ``publish`` writes a new version directory and then atomically repoints
+    ``CURRENT`` at it, so readers never observe a half-written artefact.
+    ``get`` returns the cached artefact and re-reads the pointer at most once
+    per ``refresh_interval`` seconds, swapping in a newer version when found.
+    """
+
+    def __init__(self, root: Optional[os.PathLike] = None, refresh_interval: float = 30.0):
+        self.root = Path(root or DEFAULT_MODEL_DIR)
+        self.refresh_interval = refresh_interval
+        self._artifact: Optional[ModelArtifact] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    # Publishing
+
+    def publish(self, models: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Persist a trained model set as a new version and make it current."""
+        if not SKLEARN_AVAILABLE:
+            raise ModelArtifactError("scikit-learn is required to publish predictive models")
+
+        trained_at = datetime.now(timezone.utc)
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=self.root, prefix=".staging-"))
+
+        artifact_path = staging / ARTIFACT_FILE
+        joblib.dump(models, artifact_path)
+        checksum = _sha256(artifact_path)
+        version = f"{trained_at:%Y%m%dT%H%M%S%fZ}-{checksum[:12]}"
+
+        manifest = {
+            "version": version,
+            "sha256": checksum,
+            "trained_at": trained_at.isoformat(),
+            "features": list(FEATURE_NAMES),
+            "models": {name: type(model).__name__ for name, model in models.items()},
+            "metadata": metadata or {},
+        }
+        (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+        os.replace(staging, self.root / version)
+        _write_atomic(self.root / CURRENT_POINTER, version + "\n")
+
+        logger.info(f"Published predictive model version {version}")
+        return version
+
+    def train_and_publish(self, metadata: Optional[Dict[str, Any]] = None) -> str:
+        return self.publish(train_models(), metadata)
+
+    # Loading
+
+    def current_version(self) -> Optional[str]:
+        try:
+            version = (self.root / CURRENT_POINTER).read_text().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def load(self, version: Optional[str] = None) -> ModelArtifact:
+        """Load and checksum-verify a specific version (default: current)."""
+        if not SKLEARN_AVAILABLE:
+            raise ModelArtifactError("scikit-learn is required to load predictive models")
+
+        version = version or self.current_version()
+        if version is None:
+            raise ModelArtifactError(f"No model version published in {self.root}")
+
+        version_dir = self.root / version
+        try:
+            manifest = json.loads((version_dir / MANIFEST_FILE).read_text())
+        except (OSError, ValueError) as e:
+            raise ModelArtifactError(f"Unreadable manifest for model version {version}: {e}") from e
+
+        artifact_path = version_dir / ARTIFACT_FILE
+        try:
+            checksum = _sha256(artifact_path)
+        except OSError as e:
+            raise ModelArtifactError(f"Missing artefact for model version {version}: {e}") from e
+        if checksum != manifest.get("sha256"):
+            raise ModelArtifactError(f"Checksum mismatch for model version {version}")
+
+        # Map tree/coefficient arrays read-only instead of copying them per worker
+        models = joblib.load(artifact_path, mmap_mode="r")
+
+        return ModelArtifact(
+            version=version,
+            checksum=checksum,
+            risk_model=models.get("risk_model"),
+            compliance_model=models.get("compliance_model"),
+            scaler=models.get("scaler"),
+            trained_at=manifest.get("trained_at"),
+            metadata=manifest.get("metadata", {}),
+        )
+
+    def get(self) -> Optional[ModelArtifact]:
+        """
+        Return the current artefact, loading or hot-swapping it when needed.
+
+        A failed swap keeps serving the previously loaded version.
+        """
+        now = time.monotonic()
+        artifact = self._artifact
+        if artifact is not None and now - self._checked_at < self.refresh_interval:
+            return artifact
+
+        with self._lock:
+            if self._artifact is not None and now - self._checked_at < self.refresh_interval:
+                return self._artifact
+            self._checked_at = now
+            version = self.current_version()
+            if version is None or (self._artifact is not None and self._artifact.version == version):
+                return self._artifact
+            try:
+                self._artifact = self.load(version)
+                logger.info(f"Loaded predictive model version {version}")
+            except ModelArtifactError as e:
+                logger.error(f"Error loading predictive model version {version}: {e}")
+            return self._artifact
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Predictive analytics model registry")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    train = subparsers.add_parser("train", help="Train models and publish a new version")
+    train.add_argument("--root", default=DEFAULT_MODEL_DIR, help="Artefact directory")
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        version = ModelRegistry(args.root).train_and_publish()
+        print(version)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Lease-aware in-process secret cache.
+
+Secrets are held in memory for their lease (or a default TTL for KV secrets,
+which carry no lease) and refreshed by a background thread once a configurable
+fraction of the lease has elapsed, so readers normally never wait on Vault.
+Only secrets read since their last (re)load are refreshed; idle ones are
+dropped instead, so the next read fetches them again. Concurrent misses for the same key share a single fetch. If Vault cannot be
+reached, the last good value keeps being served for a grace period past its
+lease before reads start failing.
+
+Created: 2025-10-13
+"""
+
+import heapq
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A loader returns the secret value and its lease duration in seconds (0 = use default TTL)
+Loader = Callable[[], Tuple[Any, float]]
+
+
+@dataclass
+class CachedSecret:
+    value: Any
+    fetched_at: float
+    expires_at: float
+    refresh_at: float
+    read_at: float
+
+
+class _Flight:
+    """One in-progress fetch that concurrent callers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry: Optional[CachedSecret] = None
+        self.error: Optional[BaseException] = None
+
+
+class SecretCache:
+    """
+    In-memory secret cache with refresh-ahead, single-flight loads and
+    stale-on-error.
+
+    Args:
+        default_ttl: Seconds to keep secrets whose loader reports no lease
+        refresh_ratio: Fraction of the lease after which a background refresh starts
+        stale_grace: Seconds past expiry a cached value may be served while refreshes fail
+        retry_interval: Seconds between background refresh attempts after a failure
+        fatal_errors: Exception types that evict the secret instead of serving it stale
+            (e.g. the secret was deleted)
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        default_ttl: float = 300.0,
+        refresh_ratio: float = 0.75,
+        stale_grace: float = 300.0,
+        retry_interval: float = 5.0,
+        fatal_errors: Tuple[type, ...] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.default_ttl = default_ttl
+        self.refresh_ratio = refresh_ratio
+        self.stale_grace = stale_grace
+        self.retry_interval = retry_interval
+        self.fatal_errors = fatal_errors
+        self.clock = clock
+
+        self._entries: Dict[str, CachedSecret] = {}
+        self._loaders: Dict[str, Loader] = {}
+        self._flights: Dict[str, _Flight] = {}
+        self._schedule: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._refresher: Optional[threading.Thread] = None
+        self._shutdown = False
+
+    def get(self, key: str, loader: Loader) -> Any:
+        """
+        Return the cached value for ``key``, loading it with ``loader`` on a miss.
+
+        Args:
+            key: Cache key (e.g. ``kv:api-keys/openai``)
+            loader: Fetches ``(value, lease_seconds)`` from Vault
+
+        Returns:
+            The secret value
+
+        Raises:
+            Whatever ``loader`` raises, when there is no value within its grace period
+        """
+        entry = self._entries.get(key)
+        now = self.clock()
+        if entry is not None and now < entry.expires_at + self.stale_grace:
+            # Past expires_at only while background refreshes are failing
+            entry.read_at = now
+            return entry.value
+
+        try:
+            return self._load(key, loader).value
+        except Exception as e:
+            # Another thread may have loaded it meanwhile; otherwise surface the error
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() < entry.expires_at + self.stale_grace:
+                logger.warning(f"Serving stale secret {key} after load failure: {e}")
+                return entry.value
+            raise
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop ``key`` (or every key) so the next read goes to Vault."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._loaders.clear()
+            else:
+                self._entries.pop(key, None)
+                self._loaders.pop(key, None)
+
+    def peek(self, key: str) -> Optional[CachedSecret]:
+        """Cached entry for ``key`` without loading or refreshing it."""
+        return self._entries.get(key)
+
+    def _load(self, key: str, loader: Loader, refresh: bool = False) -> CachedSecret:
+        """
+        Fetch ``key`` once no matter how many threads ask at the same time.
+
+        A background ``refresh`` carries the previous entry's last read time
+        over; any other load counts as a read.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.entry
+
+        try:
+            value, lease = loader()
+            now = self.clock()
+            ttl = lease if lease and lease > 0 else self.default_ttl
+            with self._lock:
+                previous = self._entries.get(key)
+                read_at = previous.read_at if refresh and previous is not None else now
+                entry = CachedSecret(value, now, now + ttl, now + ttl * self.refresh_ratio, read_at)
+                self._entries[key] = entry
+                self._loaders[key] = loader
+                heapq.heappush(self._schedule, (entry.refresh_at, key))
+                self._wakeup.notify()
+            self._ensure_refresher()
+            flight.entry = entry
+            return entry
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _ensure_refresher(self) -> None:
+        if self._refresher and self._refresher.is_alive():
+            return
+        with self._lock:
+            if self._refresher and self._refresher.is_alive():
+                return
+            self._shutdown = False
+            self._refresher = threading.Thread(target=self._refresh_loop, name="secret-cache-refresh", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        """Refresh entries as their ``refresh_at`` comes due, earliest first."""
+        while True:
+            with self._lock:
+                while not self._shutdown:
+                    delay = self._schedule[0][0] - self.clock() if self._schedule else None
+                    if delay is not None and delay <= 0:
+                        break
+                    self._wakeup.wait(timeout=delay)
+                if self._shutdown:
+                    return
+                due_at, key = heapq.heappop(self._schedule)
+                entry = self._entries.get(key)
+                loader = self._loaders.get(key)
+                # Skip heap items made obsolete by a newer load or an invalidation
+                if entry is None or loader is None or entry.refresh_at > due_at:
+                    continue
+                if entry.read_at < entry.fetched_at:
+                    # Nobody read it since the last refresh; let the next read fetch it
+                    del self._entries[key]
+                    self._loaders.pop(key, None)
+                    logger.debug(f"Dropped idle secret {key}")
+                    continue
+
+            try:
+                self._load(key, loader, refresh=True)
+                logger.debug(f"Refreshed secret {key}")
+            except Exception as e:
+                now = self.clock()
+                with self._lock:
+                    if not isinstance(e, self.fatal_errors) and now < entry.expires_at + self.stale_grace:
+                        heapq.heappush(self._schedule, (now + self.retry_interval, key))
+                        entry.refresh_at = now + self.retry_interval
+                    elif self._entries.get(key) is entry:
+                        # Gone, or past the grace period; stop serving and stop retrying
+                        del self._entries[key]
+                        self._loaders.pop(key, None)
+                logger.error(f"Background refresh of secret {key} failed: {e}")
+
+    def close(self) -> None:
+        """Stop the background refresher."""
+        with self._lock:
+            self._shutdown = True
+            self._wakeup.notify_all()
+        if self._refresher and self._refresher.is_alive():
+            self._refresher.join(timeout=5)
@@ -9,6 +9,7 @@ Features:
 - Connection pooling and retry logic
 - Lease management
 - Dynamic secret support
+- Lease-aware in-process secret cache with background refresh
 
 Created: 2025-10-13
 """
@@ -23,6 +24,8 @@ import hvac
 from hvac.exceptions import VaultError, InvalidPath, Forbidden
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from .secret_cache import SecretCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -51,6 +54,12 @@ class VaultClient:
         VAULT_SECRET_ID: AppRole secret_id for authentication
         VAULT_NAMESPACE: Vault namespace (optional)
         VAULT_TOKEN: Direct token authentication (for testing only)
+        VAULT_SECRET_CACHE_ENABLED: Cache secret reads in memory (default: true)
+        VAULT_SECRET_CACHE_TTL: Seconds to cache KV secrets, which have no lease (default: 300)
+        VAULT_SECRET_REFRESH_RATIO: Fraction of the TTL/lease after which a cached
+            secret is refreshed in the background (default: 0.75)
+        VAULT_SECRET_STALE_GRACE: Seconds a KV secret may be served past its TTL
+            while Vault is unreachable (default: 300)
     """
 
     def __init__(
@@ -61,7 +70,8 @@ class VaultClient:
         namespace: Optional[str] = None,
         token: Optional[str] = None,
         mount_point: str = "secret",
-        auto_renew: bool = True
+        auto_renew: bool = True,
+        cache_secrets: Optional[bool] = None
     ):
         """
         Initialize Vault client with AppRole authentication.
@@ -74,6 +84,8 @@ class VaultClient:
             token: Direct token (for testing only)
             mount_point: KV secrets engine mount point
             auto_renew: Automatically renew token before expiration
+            cache_secrets: Serve secret reads from the in-process cache
+                (default: VAULT_SECRET_CACHE_ENABLED)
         """
         self.vault_addr = vault_addr or os.getenv("VAULT_ADDR", "http://127.0.0.1:8200")
         self.role_id = role_id or os.getenv("VAULT_ROLE_ID")
@@ -82,6 +94,21 @@ class VaultClient:
         self.token = token or os.getenv("VAULT_TOKEN")
         self.mount_point = mount_point
         self.auto_renew = auto_renew
+        if cache_secrets is None:
+            cache_secrets = os.getenv("VAULT_SECRET_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.cache_secrets = cache_secrets
+
+        refresh_ratio = float(os.getenv("VAULT_SECRET_REFRESH_RATIO", 0.75))
+        # KV secrets stay valid in Vault after our TTL, so they may be served stale
+        self._secret_cache = SecretCache(
+            default_ttl=float(os.getenv("VAULT_SECRET_CACHE_TTL", 300)),
+            refresh_ratio=refresh_ratio,
+            stale_grace=float(os.getenv("VAULT_SECRET_STALE_GRACE", 300)),
+            fatal_errors=(VaultSecretNotFoundError,),
+        )
+        # Dynamic credentials are revoked when their lease ends, so never past it.
+        # Replaced ones are left to expire: callers may still hold them.
+        self._lease_cache = SecretCache(refresh_ratio=refresh_ratio, stale_grace=0)
 
         # Initialize client
         self.client = None
@@ -226,21 +253,8 @@ class VaultClient:
         wait=wait_exponential(multiplier=1, min=2, max=10),
         retry=retry_if_exception_type(VaultError)
     )
-    def read_secret(self, path: str, version: Optional[int] = None) -> Dict[str, Any]:
-        """
-        Read a secret from Vault KV v2.
-
-        Args:
-            path: Secret path (without mount point)
-            version: Secret version (None for latest)
-
-        Returns:
-            Secret data dictionary
-
-        Raises:
-            VaultSecretNotFoundError: If secret doesn't exist
-            VaultClientError: For other errors
-        """
+    def _fetch_secret(self, path: str, version: Optional[int] = None) -> Dict[str, Any]:
+        """Read a secret version from Vault KV v2, bypassing the cache."""
         try:
             # KV v2 read
             response = self.client.secrets.kv.v2.read_secret_version(
@@ -268,6 +282,39 @@ class VaultClient:
             logger.error(f"Failed to read secret {path}: {e}")
             raise VaultClientError(f"Failed to read secret: {e}") from e
 
+    def read_secret(self, path: str, version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Read a secret from Vault KV v2.
+
+        The latest version is served from the in-process cache when caching is
+        enabled; pinned versions always go to Vault.
+
+        Args:
+            path: Secret path (without mount point)
+            version: Secret version (None for latest)
+
+        Returns:
+            Secret data dictionary
+
+        Raises:
+            VaultSecretNotFoundError: If secret doesn't exist
+            VaultClientError: For other errors
+        """
+        if version is not None or not self.cache_secrets:
+            return self._fetch_secret(path, version)
+        secret_data = self._secret_cache.get(f"kv:{path}", lambda: (self._fetch_secret(path), 0))
+        # Callers get their own copy so they cannot mutate the cached secret
+        return dict(secret_data)
+
+    def invalidate_secret(self, path: Optional[str] = None):
+        """
+        Drop a cached secret so the next read goes to Vault.
+
+        Args:
+            path: Secret path (None to drop every cached secret)
+        """
+        self._secret_cache.invalidate(f"kv:{path}" if path is not None else None)
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -294,6 +341,7 @@ class VaultClient:
             )
 
             version = response['data']['version']
+            self.invalidate_secret(path)
             logger.info(f"Wrote secret: {path} (version {version})")
             return response['data']
 
@@ -315,6 +363,7 @@ class VaultClient:
             versions: List of versions to delete (None for latest)
         """
         try:
+            self.invalidate_secret(path)
             if versions:
                 # Delete specific versions
                 self.client.secrets.kv.v2.delete_secret_versions(
@@ -402,12 +451,29 @@ class VaultClient:
         """
         Get dynamic database credentials from Vault.
 
+        Credentials are reused for their lease and replaced in the background
+        before it ends, instead of minting a new database user on every call.
+        Replaced credentials stay valid until their own lease ends, so holders
+        such as connection pools keep working. Credentials not requested since
+        they were last issued are not renewed; the next call generates a fresh set.
+
         Args:
             role: Database role name
 
         Returns:
             Dictionary with username and password
         """
+        if not self.cache_secrets:
+            return self._generate_database_credentials(role)
+
+        def load():
+            credentials = self._generate_database_credentials(role)
+            return credentials, credentials['lease_duration']
+
+        return dict(self._lease_cache.get(f"database:{role}", load))
+
+    def _generate_database_credentials(self, role: str) -> Dict[str, str]:
+        """Request a new set of dynamic database credentials."""
         try:
             response = self.client.secrets.database.generate_credentials(
                 name=role
@@ -517,6 +583,8 @@ class VaultClient:
     def close(self):
         """Close the Vault client and cleanup resources"""
         self._shutdown = True
+        self._secret_cache.close()
+        self._lease_cache.close()
 
         if self._token_renew_thread and self._token_renew_thread.is_alive():
             self._token_renew_thread.join(timeout=5)
@@ -0,0 +1,169 @@
+"""
+Webhook Endpoint Health Tracking
+
+Per-webhook health tracker that feeds the resilience circuit breakers, computes
+adaptive retry delays from recent error rates, and tells callers how long to
+defer deliveries to endpoints whose circuit is open.
+
+All of this state is in memory and per process: each Celery delivery worker
+trips, probes and recovers an endpoint's circuit from the deliveries it made
+itself, and no other process (the API included) sees it.
+"""
+
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ..app.resilience.circuit_breaker import get_endpoint_breaker
+
+# Configuration
+BREAKER_SERVICE_TYPE = "webhook"
+LATENCY_BUCKETS_MS: Tuple[int, ...] = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+ERROR_RATE_WINDOW = 100  # Most recent outcomes considered for the error rate
+MAX_ADAPTIVE_MULTIPLIER = 8.0
+MAX_DEFERRALS = 24  # Times one delivery may be pushed back before it fails
+DEFER_SPREAD_SECONDS = 15.0  # Jitter added per deferral so parked deliveries don't land together
+MAX_DEFER_SPREAD_SECONDS = 300.0
+
+
+@dataclass
+class EndpointHealth:
+    """Rolling health statistics for a single webhook endpoint."""
+
+    webhook_id: str
+    latency_counts: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    latency_sum_ms: int = 0
+    outcomes: Deque[bool] = field(default_factory=lambda: deque(maxlen=ERROR_RATE_WINDOW))
+    total: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    deferrals: int = 0
+
+    def record(self, success: bool, duration_ms: Optional[int]) -> None:
+        self.total += 1
+        self.outcomes.append(success)
+        if success:
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+        if duration_ms is not None:
+            self.latency_counts[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+            self.latency_sum_ms += duration_ms
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1.0 - (sum(self.outcomes) / len(self.outcomes))
+
+    def latency_histogram(self) -> Dict[str, int]:
+        """Cumulative (Prometheus-style) latency histogram keyed by upper bound."""
+        histogram: Dict[str, int] = {}
+        running = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.latency_counts):
+            running += count
+            histogram[str(bound)] = running
+        histogram["+Inf"] = running + self.latency_counts[-1]
+        return histogram
+
+    def snapshot(self) -> Dict[str, Any]:
+        observed = sum(self.latency_counts)
+        return {
+            "webhook_id": self.webhook_id,
+            "total_deliveries": self.total,
+            "failed_deliveries": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "deferred_deliveries": self.deferrals,
+            "error_rate": round(self.error_rate, 4),
+            "latency_ms_histogram": self.latency_histogram(),
+            "latency_ms_avg": round(self.latency_sum_ms / observed, 2) if observed else 0.0,
+        }
+
+
+class WebhookHealthTracker:
+    """
+    Tracks per-endpoint delivery health and gates deliveries via circuit breakers.
+
+    Deliveries to an open circuit are short-circuited instead of consuming a
+    worker and an HTTP connection; ``defer_delay`` says when to try them again.
+    The tracker holds no deliveries itself: callers reschedule them through the
+    task queue, so they survive worker restarts and any worker can pick them up.
+    When they come due, the half-open probe budget admits a few and the rest are
+    deferred again until a probe succeeds.
+    """
+
+    def __init__(self, service_type: str = BREAKER_SERVICE_TYPE):
+        self.service_type = service_type
+        self._health: Dict[str, EndpointHealth] = {}
+        self._lock = threading.RLock()
+
+    def breaker_for(self, webhook_id: str):
+        return get_endpoint_breaker(self.service_type, webhook_id)
+
+    def health_for(self, webhook_id: str) -> EndpointHealth:
+        health = self._health.get(webhook_id)
+        if health is None:
+            with self._lock:
+                health = self._health.setdefault(webhook_id, EndpointHealth(webhook_id))
+        return health
+
+    def allow_delivery(self, webhook_id: str) -> bool:
+        """Reserve a delivery slot; False means the endpoint circuit is open."""
+        return self.breaker_for(webhook_id).allow_request()
+
+    def record_result(self, webhook_id: str, success: bool, duration_ms: Optional[int] = None) -> None:
+        with self._lock:
+            self.health_for(webhook_id).record(success, duration_ms)
+        breaker = self.breaker_for(webhook_id)
+        if success:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    def retry_delay(self, webhook_id: str, attempt: int, initial_delay: float, max_delay: float) -> float:
+        """
+        Exponential backoff stretched by the endpoint's recent error rate.
+
+        A healthy endpoint retries on the base schedule; an endpoint failing most
+        deliveries backs off up to ``MAX_ADAPTIVE_MULTIPLIER`` times longer.
+        """
+        base = initial_delay * (2 ** (attempt - 1))
+        error_rate = self.health_for(webhook_id).error_rate
+        multiplier = 1.0 + (MAX_ADAPTIVE_MULTIPLIER - 1.0) * error_rate ** 2
+        return min(base * multiplier, max_delay)
+
+    def defer_delay(self, webhook_id: str, deferrals: int) -> Optional[float]:
+        """
+        Seconds until a delivery to an open circuit should be attempted again.
+
+        Args:
+            webhook_id: Webhook identifier
+            deferrals: How often this delivery has been deferred, including now
+
+        Returns:
+            Delay in seconds, or None once the delivery has used up ``MAX_DEFERRALS``
+        """
+        if deferrals > MAX_DEFERRALS:
+            return None
+        with self._lock:
+            self.health_for(webhook_id).deferrals += 1
+        wait = max(self.breaker_for(webhook_id).retry_at - time.monotonic(), 1.0)
+        spread = min(DEFER_SPREAD_SECONDS * deferrals, MAX_DEFER_SPREAD_SECONDS)
+        return wait + random.uniform(0, spread)
+
+    def get_endpoint_stats(self, webhook_id: str) -> Dict[str, Any]:
+        snapshot = self.health_for(webhook_id).snapshot()
+        snapshot["circuit_state"] = self.breaker_for(webhook_id).state
+        return snapshot
+
+    def get_all_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {webhook_id: self.get_endpoint_stats(webhook_id) for webhook_id in list(self._health)}
+
+
+# Tracker shared by the WebhookService instances of one (worker) process
+webhook_health_tracker = WebhookHealthTracker()
@@ -5,14 +5,13 @@ Manages webhook registration, delivery, and retry logic with exponential backoff
 Integrates with PostgreSQL for persistence and Redis/Celery for async delivery.
 """
 
-import asyncio
 import hashlib
 import hmac
 import json
 import logging
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from uuid import uuid4
 
 import httpx
@@ -30,6 +29,7 @@ from ..models.webhook_models import (
     WebhookStatus,
     WebhookUpdate,
 )
+from .webhook_health import WebhookHealthTracker, webhook_health_tracker
 
 logger = logging.getLogger(__name__)
 
@@ -39,14 +39,37 @@ INITIAL_RETRY_DELAY = 60  # seconds
 MAX_RETRY_DELAY = 3600  # 1 hour
 DELIVERY_TIMEOUT = 30  # seconds
 
+# (webhook_id, event_data, countdown_seconds, deferrals, attempt) -> None
+DeferScheduler = Callable[[str, Dict[str, Any], float, int, int], None]
+
+
+def schedule_deferred_delivery(
+    webhook_id: str, event_data: Dict[str, Any], countdown: float, deferrals: int, attempt: int
+) -> None:
+    """Re-enqueue a deferred or retried delivery on the Celery broker, where it outlives this worker."""
+    from ..tasks.webhook_delivery import deliver_webhook_event
+
+    deliver_webhook_event.apply_async(
+        args=[webhook_id, event_data],
+        kwargs={"deferrals": deferrals, "attempt": attempt},
+        countdown=countdown,
+    )
+
 
 class WebhookService:
     """
     Service for managing webhooks and delivering events to external endpoints.
     """
 
-    def __init__(self, db_session: AsyncSession):
+    def __init__(
+        self,
+        db_session: AsyncSession,
+        health_tracker: Optional[WebhookHealthTracker] = None,
+        defer_scheduler: Optional[DeferScheduler] = None,
+    ):
         self.db = db_session
+        self.health = health_tracker or webhook_health_tracker
+        self.defer_scheduler = defer_scheduler or schedule_deferred_delivery
 
     async def create_webhook(
         self,
@@ -203,15 +226,22 @@ class WebhookService:
 
         return True
 
-    async def deliver_event(self, webhook_id: str, event: WebhookEvent) -> WebhookDelivery:
+    async def deliver_event(
+        self, webhook_id: str, event: WebhookEvent, deferrals: int = 0, attempt: int = 1
+    ) -> WebhookDelivery:
         """
-        Deliver an event to a webhook endpoint (with retries).
+        Make one delivery attempt of an event to a webhook endpoint.
 
         This method should be called asynchronously (e.g., via Celery task).
+        A failed attempt is not waited out in the worker: the next one is
+        re-enqueued through ``defer_scheduler`` with the backoff as countdown,
+        up to ``MAX_RETRY_ATTEMPTS``.
 
         Args:
             webhook_id: Webhook identifier
             event: Event to deliver
+            deferrals: How often this delivery was already deferred for an open circuit
+            attempt: Attempt number, starting at 1
 
         Returns:
             Delivery record
@@ -230,81 +260,81 @@ class WebhookService:
             event_type=event.event.value,
             payload=event.dict(),
             status=WebhookDeliveryStatus.PENDING,
-            attempt=1,
+            attempt=attempt,
             created_at=datetime.utcnow(),
         )
 
-        # Attempt delivery with retries
-        for attempt in range(1, MAX_RETRY_ATTEMPTS + 1):
-            delivery.attempt = attempt
-
-            try:
-                result = await self._send_webhook(webhook, event)
-
-                if result["success"]:
-                    delivery.status = WebhookDeliveryStatus.SUCCESS
-                    delivery.response_status = result["status_code"]
-                    delivery.response_body = result.get("response_body", "")[:1000]
-                    delivery.delivered_at = datetime.utcnow()
-                    delivery.duration_ms = result["duration_ms"]
+        # Short-circuit endpoints whose circuit is open instead of burning a worker
+        if not self.health.allow_delivery(webhook_id):
+            self._defer_delivery(delivery, event, deferrals + 1)
+            return delivery
 
-                    # Update webhook stats
-                    await self._update_webhook_stats(webhook_id, success=True)
+        try:
+            result = await self._send_webhook(webhook, event)
+            self.health.record_result(webhook_id, result["success"], result.get("duration_ms"))
+
+            if result["success"]:
+                delivery.status = WebhookDeliveryStatus.SUCCESS
+                delivery.response_status = result["status_code"]
+                delivery.response_body = result.get("response_body", "")[:1000]
+                delivery.delivered_at = datetime.utcnow()
+                delivery.duration_ms = result["duration_ms"]
+
+                # Update webhook stats
+                await self._update_webhook_stats(webhook_id, success=True)
+
+                logger.info(
+                    f"Webhook delivered successfully",
+                    extra={
+                        "webhook_id": webhook_id,
+                        "delivery_id": delivery_id,
+                        "attempt": attempt,
+                    },
+                )
+            else:
+                # Delivery failed, will retry
+                delivery.status = WebhookDeliveryStatus.RETRY
+                delivery.response_status = result.get("status_code")
+                delivery.error_message = result.get("error", "")[:500]
+
+                if attempt < MAX_RETRY_ATTEMPTS:
+                    # Exponential backoff, stretched by the endpoint's recent error rate
+                    retry_delay = self.health.retry_delay(
+                        webhook_id, attempt, INITIAL_RETRY_DELAY, MAX_RETRY_DELAY
+                    )
+                    delivery.next_retry_at = datetime.utcnow() + timedelta(seconds=retry_delay)
 
-                    logger.info(
-                        f"Webhook delivered successfully",
+                    logger.warning(
+                        f"Webhook delivery failed, will retry",
                         extra={
                             "webhook_id": webhook_id,
                             "delivery_id": delivery_id,
                             "attempt": attempt,
+                            "retry_in": retry_delay,
                         },
                     )
 
-                    break  # Success, exit retry loop
+                    # Retry from the broker rather than holding this worker
+                    self.defer_scheduler(webhook_id, event.dict(), retry_delay, deferrals, attempt + 1)
                 else:
-                    # Delivery failed, will retry
-                    delivery.status = WebhookDeliveryStatus.RETRY
-                    delivery.response_status = result.get("status_code")
-                    delivery.error_message = result.get("error", "")[:500]
-
-                    if attempt < MAX_RETRY_ATTEMPTS:
-                        # Calculate next retry with exponential backoff
-                        retry_delay = min(
-                            INITIAL_RETRY_DELAY * (2 ** (attempt - 1)),
-                            MAX_RETRY_DELAY,
-                        )
-                        delivery.next_retry_at = datetime.utcnow() + timedelta(seconds=retry_delay)
-
-                        logger.warning(
-                            f"Webhook delivery failed, will retry",
-                            extra={
-                                "webhook_id": webhook_id,
-                                "delivery_id": delivery_id,
-                                "attempt": attempt,
-                                "retry_in": retry_delay,
-                            },
-                        )
-
-                        # Wait before retry
-                        await asyncio.sleep(retry_delay)
-                    else:
-                        # Max retries exceeded
-                        delivery.status = WebhookDeliveryStatus.FAILED
-                        await self._update_webhook_stats(webhook_id, success=False)
-
-                        logger.error(
-                            f"Webhook delivery failed after {MAX_RETRY_ATTEMPTS} attempts",
-                            extra={
-                                "webhook_id": webhook_id,
-                                "delivery_id": delivery_id,
-                            },
-                        )
-
-            except Exception as e:
-                logger.exception(f"Webhook delivery exception: {e}")
-                delivery.status = WebhookDeliveryStatus.FAILED
-                delivery.error_message = str(e)[:500]
-                await self._update_webhook_stats(webhook_id, success=False)
+                    # Max retries exceeded
+                    delivery.status = WebhookDeliveryStatus.FAILED
+                    await self._update_webhook_stats(webhook_id, success=False)
+
+                    logger.error(
+                        f"Webhook delivery failed after {MAX_RETRY_ATTEMPTS} attempts",
+                        extra={
+                            "webhook_id": webhook_id,
+                            "delivery_id": delivery_id,
+                        },
+                    )
+
+        except Exception as e:
+            logger.exception(f"Webhook delivery exception: {e}")
+            self.health.record_result(webhook_id, success=False)
+            delivery.status = WebhookDeliveryStatus.FAILED
+            delivery.error_message = str(e)[:500]
+            await self._update_webhook_stats(webhook_id, success=False)
 
         # Save delivery record to database
         # await self.db.execute(insert(webhook_deliveries).values(delivery.dict()))
@@ -312,6 +342,40 @@ class WebhookService:
 
         return delivery
 
+    def _defer_delivery(self, delivery: WebhookDelivery, event: WebhookEvent, deferrals: int) -> None:
+        """
+        Reschedule a delivery for an endpoint whose circuit is open.
+
+        Args:
+            delivery: Delivery record to mark as deferred
+            event: Event to redeliver once the circuit admits probe traffic
+            deferrals: Deferral count including this one
+        """
+        retry_in = self.health.defer_delay(delivery.webhook_id, deferrals)
+        if retry_in is None:
+            delivery.status = WebhookDeliveryStatus.FAILED
+            delivery.error_message = f"Circuit open, gave up after {deferrals - 1} deferrals"
+            logger.error(
+                "Webhook circuit still open, dropping delivery",
+                extra={"webhook_id": delivery.webhook_id, "delivery_id": delivery.id},
+            )
+            return
+
+        # The attempt is not used up: the circuit never let it reach the endpoint
+        self.defer_scheduler(delivery.webhook_id, event.dict(), retry_in, deferrals, delivery.attempt)
+        delivery.status = WebhookDeliveryStatus.DEFERRED
+        delivery.next_retry_at = datetime.utcnow() + timedelta(seconds=retry_in)
+
+        logger.warning(
+            "Webhook circuit open, delivery deferred",
+            extra={
+                "webhook_id": delivery.webhook_id,
+                "delivery_id": delivery.id,
+                "retry_in": round(retry_in, 1),
+                "deferrals": deferrals,
+            },
+        )
+
     async def _send_webhook(self, webhook: WebhookConfig, event: WebhookEvent) -> Dict[str, Any]:
         """
         Send HTTP POST request to webhook endpoint.
@@ -430,6 +494,8 @@ class WebhookService:
 
         # Query delivery logs for detailed stats (pseudo-code)
         # This would aggregate data from webhook_deliveries table
+        # Endpoint health (circuit state, error rate, latency) is per delivery
+        # worker process; see webhook_health. It is not reported here.
 
         return WebhookStats(
             webhook_id=webhook.id,
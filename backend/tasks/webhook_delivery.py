@@ -29,13 +29,20 @@ class WebhookDeliveryTask(Task):
 
 
 @celery_app.task(base=WebhookDeliveryTask, name="webhooks.deliver_event")
-def deliver_webhook_event(webhook_id: str, event_data: dict):
+def deliver_webhook_event(webhook_id: str, event_data: dict, deferrals: int = 0, attempt: int = 1):
     """
     Celery task to deliver a webhook event asynchronously.
 
+    Each run makes one attempt. Failed attempts and deliveries to an endpoint
+    whose circuit is open are re-enqueued by the service with a countdown
+    (see ``schedule_deferred_delivery``), carrying ``attempt`` and their
+    deferral count in ``deferrals``.
+
     Args:
         webhook_id: Webhook identifier
         event_data: Serialized WebhookEvent data
+        deferrals: How often this delivery was already deferred
+        attempt: Delivery attempt number, starting at 1
 
     Returns:
         Delivery ID if successful
@@ -71,7 +78,7 @@ def deliver_webhook_event(webhook_id: str, event_data: dict):
         async def _deliver():
             async with async_session() as session:
                 service = WebhookService(session)
-                delivery = await service.deliver_event(webhook_id, event)
+                delivery = await service.deliver_event(webhook_id, event, deferrals=deferrals, attempt=attempt)
                 return delivery.id
 
         # Run async delivery
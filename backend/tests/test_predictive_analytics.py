@@ -406,6 +406,133 @@ def test_supply_chain_risk():
         print(f"  - {strategy}")
 
 
+def test_bom_frame_concentration_metrics():
+    """Test columnar BOM aggregates used by supply chain analysis."""
+    from backend.services.predictive_analytics_service import BomFrame
+
+    materials = generate_supply_chain_risk_data()["materials"] + [
+        {"hs_code": "854140", "origin_country": "CN", "percentage": 10.0},
+        {"hs_code": "854232"},
+    ]
+    frame = BomFrame.from_bom(materials, [])
+
+    assert frame.countries.tolist() == ["DE", "FR", "CN", "IT", "PL", "ES", "NL", "XX"]
+    assert frame.country_counts.tolist() == [1, 1, 2, 1, 1, 1, 1, 1]
+    assert frame.top_share(1) == 2 / 9
+    assert abs(frame.top_share(3) - 4 / 9) < 1e-12
+    assert abs(frame.hhi() - (4 + 7) / 81) < 1e-12
+
+
+def _varied_assessments(count: int) -> List[Dict]:
+    """Assessments spanning low to high risk by varying origins and supplier data."""
+    origins = ["DE", "FR", "CN", "VN", "IT", "US", "PL", "IN"]
+    assessments = []
+    for i in range(count):
+        data = generate_sample_assessment_data() if i % 2 else generate_high_risk_assessment_data()
+        materials = [m for p in data["products"] for m in p.get("materials", [])]
+        for offset, material in enumerate(materials):
+            material["origin_country"] = origins[(i + offset * 3) % len(origins)]
+        data["materials"] = materials[: 1 + i % len(materials)] * (1 + i % 7)
+        data["supplier_info"]["reliability_score"] = (i % 10) / 10
+        data["documentation_quality"] = ((i * 7) % 10) / 10
+        assessments.append(data)
+    return assessments
+
+
+def _risk_level(service, score: float) -> str:
+    if score >= service.CRITICAL_RISK_THRESHOLD:
+        return "CRITICAL"
+    if score >= service.HIGH_RISK_THRESHOLD:
+        return "HIGH"
+    if score >= service.MEDIUM_RISK_THRESHOLD:
+        return "MEDIUM"
+    return "LOW"
+
+
+def test_batch_risk_scores_match_per_row_model_calls():
+    """Test the single-pass batch path against one model call per assessment."""
+    import numpy as np
+
+    from backend.services.predictive_analytics_service import get_predictive_analytics_service
+
+    service = get_predictive_analytics_service()
+    artifact = service._models()
+    assessments = _varied_assessments(60)
+    # Malformed assessment falls back to the error score without failing the batch
+    assessments.append({"materials": None, "supplier_info": None})
+
+    batch = service.calculate_risk_scores(assessments)
+
+    assert len(batch) == len(assessments)
+    assert batch[-1].factors == {"error": 1.0}
+    assert len({round(r.score, 6) for r in batch[:-1]}) > 1
+
+    for data, result in zip(assessments[:-1], batch[:-1]):
+        features = service._extract_risk_features(data)
+        if artifact is None:
+            expected = service._predict_risk_with_rules(features)
+            assert (result.score, result.risk_level) == (expected.score, expected.risk_level)
+            continue
+        # Scoring as it was done before batching: one (1, 5) array per assessment
+        row = np.array([[
+            features["material_count"],
+            features["eu_content_percentage"],
+            features["complexity_score"],
+            features["supplier_reliability"],
+            features["documentation_quality"],
+        ]])
+        proba = artifact.risk_model.predict_proba(row)[0]
+        score = proba[1] if len(proba) > 1 else float(artifact.risk_model.predict(row)[0])
+        assert abs(result.score - score) < 1e-12
+        assert abs(result.confidence - (max(proba) if len(proba) > 1 else 0.7)) < 1e-12
+        assert result.risk_level == _risk_level(service, score)
+
+
+def test_batch_compliance_predictions_match_per_row_model_calls():
+    """Test the compliance model is scored in one pass with per-row results unchanged."""
+    import numpy as np
+
+    from backend.services.predictive_analytics_service import get_predictive_analytics_service
+
+    service = get_predictive_analytics_service()
+    artifact = service._models()
+    products = []
+    for i, data in enumerate(_varied_assessments(40)):
+        product = generate_compliance_prediction_data()
+        product["materials"] = data["materials"]
+        product["supplier"] = {"reliability_score": data["supplier_info"]["reliability_score"]}
+        products.append(product)
+    products.append({"materials": [{"value": "not-a-number"}]})
+
+    batch = service.predict_compliance_probabilities(products)
+
+    assert len(batch) == len(products)
+    assert batch[-1].compliance_factors == {"error": 0.5}
+    for product, result in zip(products[:-1], batch[:-1]):
+        features = service._extract_compliance_features(product)
+        if artifact is None:
+            expected = service._predict_compliance_with_rules(features, product)
+            assert (result.probability, result.verdict) == (expected.probability, expected.verdict)
+            continue
+        row = np.array([[
+            features["material_count"],
+            features["eu_content_percentage"],
+            features["complexity_score"],
+            features["supplier_reliability"],
+            features["eu_value_percentage"],
+        ]])
+        proba = artifact.compliance_model.predict_proba(row)[0]
+        assert abs(result.probability - proba[1]) < 1e-12
+        assert abs(result.confidence - max(proba)) < 1e-12
+        expected_verdict = (
+            "LIKELY_COMPLIANT" if proba[1] >= 0.70
+            else "UNCERTAIN" if proba[1] >= 0.40
+            else "LIKELY_NON_COMPLIANT"
+        )
+        assert result.verdict == expected_verdict
+        assert result.qualified_agreements == (product["trade_agreements"] if proba[1] >= 0.60 else [])
+
+
 def test_api_request_format():
     """Generate sample API request JSON for documentation."""
     print("\n" + "="*80)
@@ -485,6 +612,8 @@ def run_all_tests():
         test_risk_score_calculation()
         test_compliance_prediction()
         test_supply_chain_risk()
+        test_batch_risk_scores_match_per_row_model_calls()
+        test_batch_compliance_predictions_match_per_row_model_calls()
         test_api_request_format()
 
         print("\n" + "="*80)
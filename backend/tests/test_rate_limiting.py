@@ -1,15 +1,16 @@
 import pytest
+import fakeredis
 from fastapi import FastAPI, Request
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
-from app.middleware.rate_limiter import RateLimitingMiddleware, get_user_tier, is_admin_bypass
+from app.middleware.rate_limiter import RateLimiter, RateLimitingMiddleware, get_user_tier, is_admin_bypass
 from app.core.rate_limit_config import RateLimitConfig
 
-# Mock Redis
+# In-memory Redis stand-in
 @pytest.fixture
 def mock_redis():
-    with patch("app.middleware.rate_limiter.redis_conn") as mock_conn:
-        yield mock_conn
+    with patch("app.middleware.rate_limiter.limiter", RateLimiter(fakeredis.FakeAsyncRedis())) as mock_limiter:
+        yield mock_limiter
 
 # Test app setup
 @pytest.fixture
@@ -53,34 +54,34 @@ def test_is_admin_bypass_ip():
         assert is_admin_bypass(request) is True
 
 def test_rate_limit_anonymous(client, mock_redis):
-    # Mock limiter to simulate exceeding limit
-    with patch("slowapi.Limiter.check_request_limit", side_effect=Exception("Rate limit exceeded")):
-        response = client.get("/test")
-        assert response.status_code == 429
-        assert "Rate limit exceeded" in response.json()["detail"]
+    # Anonymous tier allows 10 requests per minute
+    responses = [client.get("/test") for _ in range(RateLimitConfig.DEFAULT_ANONYMOUS_LIMIT + 1)]
+    assert all(response.status_code == 200 for response in responses[:-1])
+    assert responses[-1].status_code == 429
+    assert "Rate limit exceeded" in responses[-1].json()["detail"]
+    assert "Retry-After" in responses[-1].headers
 
 def test_rate_limit_authenticated(client, mock_redis):
     # Assume auth sets tier
     with patch("app.middleware.rate_limiter.get_user_tier", return_value="authenticated"):
-        # Mock no exceed
-        with patch("slowapi.Limiter.check_request_limit", return_value=None):
-            response = client.get("/test")
-            assert response.status_code == 200
-            # Check headers (slowapi adds them)
-            assert "X-RateLimit-Limit" in response.headers
+        response = client.get("/test")
+        assert response.status_code == 200
+        assert response.headers["RateLimit-Limit"] == str(RateLimitConfig.DEFAULT_AUTHENTICATED_LIMIT)
+        assert response.headers["RateLimit-Remaining"] == str(RateLimitConfig.DEFAULT_AUTHENTICATED_LIMIT - 1)
 
 def test_custom_endpoint_limit(client, mock_redis):
     # For /api/ml/predict, custom limit applies
-    with patch("slowapi.Limiter.check_request_limit", return_value=None):
-        response = client.get("/api/ml/predict")
-        assert response.status_code == 200
-        # In real scenario, verify limit via Redis or logs
+    response = client.get("/api/ml/predict")
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Limit"] == "50"
 
 def test_admin_bypass(client, mock_redis):
     headers = {RateLimitConfig.ADMIN_BYPASS_HEADER: RateLimitConfig.ADMIN_BYPASS_SECRET}
     # Even if limit exceeded, bypass should allow
-    with patch("slowapi.Limiter.check_request_limit", side_effect=Exception("Rate limit exceeded")):
-        response = client.get("/test", headers=headers)
-        assert response.status_code == 200  # Bypassed
+    for _ in range(RateLimitConfig.DEFAULT_ANONYMOUS_LIMIT + 1):
+        client.get("/test")
+    response = client.get("/test", headers=headers)
+    assert response.status_code == 200  # Bypassed
+    assert "RateLimit-Limit" not in response.headers
 
 # Run with: pytest tests/test_rate_limiting.py
\ No newline at end of file
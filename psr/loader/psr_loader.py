@@ -7,7 +7,7 @@ import sys
 from pathlib import Path
 from typing import Iterable, List
 
-from psr.validator import validate_directory
+from psr.validator import validate_directory, validate_directory_incremental, watch_directory
 
 DEFAULT_SCHEMA = Path(__file__).resolve().parent.parent / "schema" / "psr_rule.schema.v2.json"
 DEFAULT_RULES_DIR = Path(__file__).resolve().parent.parent / "rules"
@@ -43,17 +43,62 @@ def parse_args(argv: Iterable[str]) -> argparse.Namespace:
         action="store_true",
         help="Do not fail if the rules directory is empty",
     )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=None,
+        help="Content-hash manifest; only rules changed since it was written are revalidated",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and report rules as they change (Ctrl-C to stop)",
+    )
+    parser.add_argument(
+        "--interval-ms",
+        type=int,
+        default=500,
+        help="Polling interval for --watch (default: %(default)s)",
+    )
     return parser.parse_args(list(argv))
 
 
-def run_validation(schema: Path, rules_dir: Path) -> List[tuple[str, List[str]]]:
+def run_validation(schema: Path, rules_dir: Path, manifest: Path | None = None) -> List[tuple[str, List[str]]]:
     if not schema.exists():
         raise FileNotFoundError(f"Schema not found: {schema}")
     if not rules_dir.exists():
         raise FileNotFoundError(f"Rules directory not found: {rules_dir}")
+    if manifest is not None:
+        return validate_directory_incremental(schema, rules_dir, manifest)
     return validate_directory(schema, rules_dir)
 
 
+def run_watch(schema: Path, rules_dir: Path, manifest: Path | None, interval_ms: int) -> int:
+    if not schema.exists():
+        raise FileNotFoundError(f"Schema not found: {schema}")
+    if not rules_dir.exists():
+        raise FileNotFoundError(f"Rules directory not found: {rules_dir}")
+
+    def report(changed: List[tuple[str, List[str]]], removed: List[str]) -> None:
+        for path, errors in sorted(changed):
+            if errors:
+                print(f"[FAIL] {path}")
+                for err in errors:
+                    print(f"    - {err}")
+            else:
+                print(f"[OK]   {path}")
+        for path in removed:
+            print(f"[GONE] {path}")
+        sys.stdout.flush()
+
+    print(f"[WATCH] {rules_dir} (Ctrl-C to stop)")
+    try:
+        watch_directory(schema, rules_dir, report, manifest_path=manifest, interval_ms=interval_ms)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
 def emit_text(results: List[tuple[str, List[str]]], *, allow_empty: bool) -> int:
     invalid = 0
     yaml_count = 0
@@ -89,7 +134,9 @@ def emit_json(results: List[tuple[str, List[str]]], *, allow_empty: bool) -> int
 
 def main(argv: Iterable[str] | None = None) -> int:
     args = parse_args(sys.argv[1:] if argv is None else argv)
-    results = run_validation(args.schema, args.rules_dir)
+    if args.watch:
+        return run_watch(args.schema, args.rules_dir, args.manifest, args.interval_ms)
+    results = run_validation(args.schema, args.rules_dir, args.manifest)
     if args.format == "json":
         exit_code = emit_json(results, allow_empty=args.allow_empty)
     else:
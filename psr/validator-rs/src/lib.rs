@@ -2,11 +2,15 @@ use jsonschema::{paths::JSONPointer, error::ValidationError, JSONSchema};
 use pyo3::exceptions::PyRuntimeError;
 use pyo3::prelude::*;
 use rayon::prelude::*;
+use serde::{Deserialize, Serialize};
 use serde_json::Value as JsonValue;
 use serde_yaml::Value as YamlValue;
-use std::fs::File;
+use std::collections::{BTreeMap, HashMap, HashSet};
+use std::fs::{self, File};
 use std::io::Read;
 use std::path::{Path, PathBuf};
+use std::sync::{Arc, Mutex, OnceLock};
+use std::time::{Duration, SystemTime, UNIX_EPOCH};
 use thiserror::Error;
 use walkdir::WalkDir;
 
@@ -32,18 +36,108 @@ enum ValidatorError {
     },
     #[error("schema validation error: {0}")]
     Validation(String),
+    #[error("failed to write manifest {path:?}: {source}")]
+    Manifest {
+        path: PathBuf,
+        #[source]
+        source: serde_json::Error,
+    },
+}
+
+/// Bumped whenever the manifest layout or the error rendering changes.
+const MANIFEST_VERSION: u32 = 1;
+
+/// Files modified this close to a scan may change again within the same
+/// mtime tick, so their stamps are not trusted on the next run.
+const RACY_WINDOW: Duration = Duration::from_secs(2);
+
+/// Size and modification time of a file, used to skip hashing unchanged files.
+#[derive(Clone, Copy, Debug, PartialEq, Eq, Serialize, Deserialize)]
+struct FileStamp {
+    len: u64,
+    modified_ns: u64,
+}
+
+impl FileStamp {
+    fn of(metadata: &fs::Metadata) -> Self {
+        let modified_ns = metadata
+            .modified()
+            .ok()
+            .and_then(|time| time.duration_since(UNIX_EPOCH).ok())
+            .map(|age| age.as_nanos() as u64)
+            .unwrap_or(0);
+        FileStamp {
+            len: metadata.len(),
+            modified_ns,
+        }
+    }
+
+    /// Stamp to record for a file seen at `now`; recently modified files get
+    /// an mtime that never matches, forcing a rehash next time.
+    fn recordable(self, now: SystemTime) -> Self {
+        let cutoff = now
+            .checked_sub(RACY_WINDOW)
+            .and_then(|time| time.duration_since(UNIX_EPOCH).ok())
+            .map(|age| age.as_nanos() as u64)
+            .unwrap_or(0);
+        if self.modified_ns >= cutoff {
+            FileStamp {
+                modified_ns: 0,
+                ..self
+            }
+        } else {
+            self
+        }
+    }
+}
+
+/// 64-bit FNV-1a; enough to tell whether a rule file's bytes changed.
+fn content_digest(bytes: &[u8]) -> String {
+    let mut hash: u64 = 0xcbf2_9ce4_8422_2325;
+    for byte in bytes {
+        hash ^= u64::from(*byte);
+        hash = hash.wrapping_mul(0x0000_0100_0000_01b3);
+    }
+    format!("{hash:016x}")
+}
+
+struct CachedSchema {
+    stamp: FileStamp,
+    digest: String,
+    schema: JSONSchema,
 }
 
-fn load_schema(schema_path: &Path) -> Result<JSONSchema, ValidatorError> {
-    let file = File::open(schema_path).map_err(|source| ValidatorError::Io {
+/// Compiled schemas by canonical path, shared by every call in this process.
+static SCHEMA_CACHE: OnceLock<Mutex<HashMap<PathBuf, Arc<CachedSchema>>>> = OnceLock::new();
+
+fn load_schema(schema_path: &Path) -> Result<Arc<CachedSchema>, ValidatorError> {
+    let io_err = |source| ValidatorError::Io {
         path: schema_path.to_path_buf(),
         source,
-    })?;
-    let schema_json: JsonValue = serde_json::from_reader(file).map_err(|source| ValidatorError::Schema {
+    };
+    let key = fs::canonicalize(schema_path).map_err(io_err)?;
+    let stamp = FileStamp::of(&fs::metadata(&key).map_err(io_err)?);
+    let cache = SCHEMA_CACHE.get_or_init(|| Mutex::new(HashMap::new()));
+    if let Some(cached) = cache.lock().unwrap().get(&key) {
+        if cached.stamp == stamp {
+            return Ok(Arc::clone(cached));
+        }
+    }
+
+    // Compile outside the lock; a concurrent miss at worst compiles twice
+    let bytes = fs::read(&key).map_err(io_err)?;
+    let schema_json: JsonValue = serde_json::from_slice(&bytes).map_err(|source| ValidatorError::Schema {
         path: schema_path.to_path_buf(),
         source,
     })?;
-    JSONSchema::compile(&schema_json).map_err(|err| ValidatorError::Validation(err.to_string()))
+    let schema = JSONSchema::compile(&schema_json).map_err(|err| ValidatorError::Validation(err.to_string()))?;
+    let compiled = Arc::new(CachedSchema {
+        stamp,
+        digest: content_digest(&bytes),
+        schema,
+    });
+    cache.lock().unwrap().insert(key, Arc::clone(&compiled));
+    Ok(compiled)
 }
 
 fn read_yaml(path: &Path) -> Result<JsonValue, ValidatorError> {
@@ -59,6 +153,14 @@ fn read_yaml(path: &Path) -> Result<JsonValue, ValidatorError> {
     parse_yaml_str(&buf, Some(path))
 }
 
+fn parse_yaml_bytes(bytes: Vec<u8>, path: &Path) -> Result<JsonValue, ValidatorError> {
+    let contents = String::from_utf8(bytes).map_err(|err| ValidatorError::Io {
+        path: path.to_path_buf(),
+        source: std::io::Error::new(std::io::ErrorKind::InvalidData, err),
+    })?;
+    parse_yaml_str(&contents, Some(path))
+}
+
 fn parse_yaml_str(contents: &str, origin: Option<&Path>) -> Result<JsonValue, ValidatorError> {
     let yaml: YamlValue = serde_yaml::from_str(contents).map_err(|source| ValidatorError::YamlParse {
         path: origin.map(|p| p.to_path_buf()),
@@ -111,54 +213,222 @@ fn ensure_schema_path(schema_path: &str) -> Result<PathBuf, ValidatorError> {
     Ok(path)
 }
 
+fn ensure_directory(directory: &str) -> Result<PathBuf, ValidatorError> {
+    let path = PathBuf::from(directory);
+    if !path.exists() {
+        return Err(ValidatorError::Io {
+            path,
+            source: std::io::Error::new(std::io::ErrorKind::NotFound, "directory not found"),
+        });
+    }
+    Ok(path)
+}
+
+fn rule_files(directory: &Path) -> impl Iterator<Item = PathBuf> {
+    WalkDir::new(directory)
+        .into_iter()
+        .filter_map(|entry| entry.ok())
+        .filter(|entry| entry.file_type().is_file())
+        .filter(|entry| {
+            entry
+                .path()
+                .extension()
+                .and_then(|ext| ext.to_str())
+                .map(|ext| matches!(ext, "yml" | "yaml"))
+                .unwrap_or(false)
+        })
+        .map(|entry| entry.into_path())
+}
+
+#[derive(Clone, Debug, Serialize, Deserialize)]
+struct ManifestEntry {
+    stamp: FileStamp,
+    digest: String,
+    errors: Vec<String>,
+}
+
+/// Validation results of a rule directory keyed by file, valid for one schema.
+#[derive(Debug, Default, Serialize, Deserialize)]
+struct Manifest {
+    version: u32,
+    schema: String,
+    files: BTreeMap<String, ManifestEntry>,
+}
+
+impl Manifest {
+    fn empty(schema_digest: &str) -> Self {
+        Manifest {
+            version: MANIFEST_VERSION,
+            schema: schema_digest.to_string(),
+            files: BTreeMap::new(),
+        }
+    }
+
+    /// Previous manifest at `path`, or an empty one if it is missing,
+    /// unreadable or was written for another schema or manifest version.
+    fn load(path: &Path, schema_digest: &str) -> Self {
+        fs::read(path)
+            .ok()
+            .and_then(|bytes| serde_json::from_slice::<Manifest>(&bytes).ok())
+            .filter(|manifest| manifest.version == MANIFEST_VERSION && manifest.schema == schema_digest)
+            .unwrap_or_else(|| Manifest::empty(schema_digest))
+    }
+
+    /// Writes via a temporary file so an interrupted run never leaves a torn manifest.
+    fn save(&self, path: &Path) -> Result<(), ValidatorError> {
+        let io_err = |source| ValidatorError::Io {
+            path: path.to_path_buf(),
+            source,
+        };
+        let payload = serde_json::to_vec(self).map_err(|source| ValidatorError::Manifest {
+            path: path.to_path_buf(),
+            source,
+        })?;
+        let mut tmp_name = path.file_name().unwrap_or_default().to_os_string();
+        tmp_name.push(".tmp");
+        let tmp_path = path.with_file_name(tmp_name);
+        fs::write(&tmp_path, payload).map_err(io_err)?;
+        fs::rename(&tmp_path, path).map_err(io_err)
+    }
+}
+
+enum FileOutcome {
+    Unchanged(ManifestEntry),
+    Revalidated(ManifestEntry),
+    Unreadable(String),
+}
+
+fn check_file(schema: &JSONSchema, path: &Path, previous: Option<&ManifestEntry>, now: SystemTime) -> FileOutcome {
+    let metadata = match fs::metadata(path) {
+        Ok(metadata) => metadata,
+        Err(source) => {
+            let err = ValidatorError::Io {
+                path: path.to_path_buf(),
+                source,
+            };
+            return FileOutcome::Unreadable(err.to_string());
+        }
+    };
+    let stamp = FileStamp::of(&metadata);
+    if let Some(entry) = previous.filter(|entry| entry.stamp == stamp) {
+        return FileOutcome::Unchanged(entry.clone());
+    }
+
+    let bytes = match fs::read(path) {
+        Ok(bytes) => bytes,
+        Err(source) => {
+            let err = ValidatorError::Io {
+                path: path.to_path_buf(),
+                source,
+            };
+            return FileOutcome::Unreadable(err.to_string());
+        }
+    };
+    let digest = content_digest(&bytes);
+    let stamp = stamp.recordable(now);
+    if let Some(entry) = previous.filter(|entry| entry.digest == digest) {
+        // Touched but not edited
+        return FileOutcome::Unchanged(ManifestEntry {
+            stamp,
+            ..entry.clone()
+        });
+    }
+    let errors = match parse_yaml_bytes(bytes, path) {
+        Ok(payload) => collect_errors(schema, &payload),
+        Err(err) => vec![err.to_string()],
+    };
+    FileOutcome::Revalidated(ManifestEntry { stamp, digest, errors })
+}
+
+/// Outcome of one incremental pass over a rule directory.
+struct Scan {
+    results: Vec<(String, Vec<String>)>,
+    changed: Vec<(String, Vec<String>)>,
+    removed: Vec<String>,
+}
+
+/// Validates only files whose content differs from `manifest` and updates it in place.
+fn scan_incremental(schema: &JSONSchema, directory: &Path, manifest: &mut Manifest) -> Scan {
+    let now = SystemTime::now();
+    let previous = &manifest.files;
+    let outcomes: Vec<(String, FileOutcome)> = rule_files(directory)
+        .par_bridge()
+        .map(|path| {
+            let key = path.display().to_string();
+            let outcome = check_file(schema, &path, previous.get(&key), now);
+            (key, outcome)
+        })
+        .collect();
+
+    let seen: HashSet<&str> = outcomes.iter().map(|(key, _)| key.as_str()).collect();
+    let mut removed: Vec<String> = previous
+        .keys()
+        .filter(|key| !seen.contains(key.as_str()))
+        .cloned()
+        .collect();
+    removed.sort();
+
+    let mut files = BTreeMap::new();
+    let mut results = Vec::with_capacity(outcomes.len());
+    let mut changed = Vec::new();
+    for (key, outcome) in outcomes {
+        match outcome {
+            FileOutcome::Unchanged(entry) => {
+                results.push((key.clone(), entry.errors.clone()));
+                files.insert(key, entry);
+            }
+            FileOutcome::Revalidated(entry) => {
+                results.push((key.clone(), entry.errors.clone()));
+                changed.push((key.clone(), entry.errors.clone()));
+                files.insert(key, entry);
+            }
+            // Not recorded, so the file is retried on the next pass
+            FileOutcome::Unreadable(error) => {
+                results.push((key.clone(), vec![error.clone()]));
+                changed.push((key, vec![error]));
+            }
+        }
+    }
+    manifest.files = files;
+    results.sort();
+    changed.sort();
+    Scan {
+        results,
+        changed,
+        removed,
+    }
+}
+
 #[pyfunction]
 fn validate_rule(schema_path: &str, rule_path: &str) -> PyResult<Vec<String>> {
     let schema_path = ensure_schema_path(schema_path).map_err(to_py_err)?;
-    let schema = load_schema(&schema_path).map_err(to_py_err)?;
+    let cached = load_schema(&schema_path).map_err(to_py_err)?;
     let rule_path_buf = PathBuf::from(rule_path);
     let payload = read_yaml(&rule_path_buf).map_err(to_py_err)?;
-    Ok(collect_errors(&schema, &payload))
+    Ok(collect_errors(&cached.schema, &payload))
 }
 
 #[pyfunction]
 fn validate_rule_str(schema_path: &str, yaml_text: &str) -> PyResult<Vec<String>> {
     let schema_path = ensure_schema_path(schema_path).map_err(to_py_err)?;
-    let schema = load_schema(&schema_path).map_err(to_py_err)?;
+    let cached = load_schema(&schema_path).map_err(to_py_err)?;
     let payload = parse_yaml_str(yaml_text, None).map_err(to_py_err)?;
-    Ok(collect_errors(&schema, &payload))
+    Ok(collect_errors(&cached.schema, &payload))
 }
 
 #[pyfunction]
 fn validate_directory(schema_path: &str, directory: &str) -> PyResult<Vec<(String, Vec<String>)>> {
     let schema_path = ensure_schema_path(schema_path).map_err(to_py_err)?;
-    let schema = load_schema(&schema_path).map_err(to_py_err)?;
-    let dir_path = PathBuf::from(directory);
-    if !dir_path.exists() {
-        return Err(to_py_err(ValidatorError::Io {
-            path: dir_path,
-            source: std::io::Error::new(std::io::ErrorKind::NotFound, "directory not found"),
-        }));
-    }
+    let cached = load_schema(&schema_path).map_err(to_py_err)?;
+    let dir_path = ensure_directory(directory).map_err(to_py_err)?;
 
-    let results: Vec<(String, Vec<String>)> = WalkDir::new(&dir_path)
-        .into_iter()
-        .filter_map(|entry| entry.ok())
-        .filter(|entry| entry.file_type().is_file())
-        .filter(|entry| {
-            entry
-                .path()
-                .extension()
-                .and_then(|ext| ext.to_str())
-                .map(|ext| matches!(ext, "yml" | "yaml"))
-                .unwrap_or(false)
-        })
+    let results: Vec<(String, Vec<String>)> = rule_files(&dir_path)
         .par_bridge()
-        .map(|entry| {
-            let path = entry.path().to_path_buf();
+        .map(|path| {
             let data = read_yaml(&path);
             match data {
                 Ok(payload) => {
-                    let errors = collect_errors(&schema, &payload);
+                    let errors = collect_errors(&cached.schema, &payload);
                     (path.display().to_string(), errors)
                 }
                 Err(err) => (path.display().to_string(), vec![err.to_string()]),
@@ -169,6 +439,120 @@ fn validate_directory(schema_path: &str, directory: &str) -> PyResult<Vec<(Strin
     Ok(results)
 }
 
+/// Like `validate_directory`, but reuses the results stored in the manifest at
+/// `manifest_path` for files whose content has not changed, then rewrites it.
+#[pyfunction]
+fn validate_directory_incremental(
+    py: Python<'_>,
+    schema_path: &str,
+    directory: &str,
+    manifest_path: &str,
+) -> PyResult<Vec<(String, Vec<String>)>> {
+    let schema_path = ensure_schema_path(schema_path).map_err(to_py_err)?;
+    let cached = load_schema(&schema_path).map_err(to_py_err)?;
+    let dir_path = ensure_directory(directory).map_err(to_py_err)?;
+    let manifest_path = PathBuf::from(manifest_path);
+
+    py.allow_threads(|| -> Result<Vec<(String, Vec<String>)>, ValidatorError> {
+        let mut manifest = Manifest::load(&manifest_path, &cached.digest);
+        let scan = scan_incremental(&cached.schema, &dir_path, &mut manifest);
+        if !scan.changed.is_empty() || !scan.removed.is_empty() || !manifest_path.exists() {
+            manifest.save(&manifest_path)?;
+        }
+        Ok(scan.results)
+    })
+    .map_err(to_py_err)
+}
+
+/// Polls `directory` every `interval_ms` and calls `callback(changed, removed)`
+/// with `(path, errors)` pairs for new or edited rules and the paths of deleted
+/// ones. The first call carries every rule. Schema edits are picked up and
+/// revalidate the whole directory. Returns when the callback returns `False`
+/// or raises (including `KeyboardInterrupt`).
+#[pyfunction]
+#[pyo3(signature = (schema_path, directory, callback, manifest_path=None, interval_ms=500))]
+fn watch_directory(
+    py: Python<'_>,
+    schema_path: &str,
+    directory: &str,
+    callback: &PyAny,
+    manifest_path: Option<&str>,
+    interval_ms: u64,
+) -> PyResult<()> {
+    let schema_path = ensure_schema_path(schema_path).map_err(to_py_err)?;
+    let dir_path = ensure_directory(directory).map_err(to_py_err)?;
+    let manifest_path = manifest_path.map(PathBuf::from);
+    let interval = Duration::from_millis(interval_ms.max(1));
+    let mut manifest: Option<Manifest> = None;
+    let mut schema_error: Option<String> = None;
+    let mut first = true;
+
+    loop {
+        let report = py.allow_threads(|| -> Result<Option<Scan>, ValidatorError> {
+            let cached = load_schema(&schema_path)?;
+            if manifest.as_ref().map_or(true, |current| current.schema != cached.digest) {
+                manifest = Some(match &manifest_path {
+                    Some(path) => Manifest::load(path, &cached.digest),
+                    None => Manifest::empty(&cached.digest),
+                });
+            }
+            let manifest = manifest.as_mut().expect("manifest initialised above");
+            let scan = scan_incremental(&cached.schema, &dir_path, manifest);
+            if scan.changed.is_empty() && scan.removed.is_empty() {
+                return Ok(None);
+            }
+            if let Some(path) = &manifest_path {
+                manifest.save(path)?;
+            }
+            Ok(Some(scan))
+        });
+
+        let delivery = match report {
+            Ok(scan) => {
+                let recovered = schema_error.take().is_some();
+                match scan {
+                    Some(scan) if first || recovered => Some((scan.results, scan.removed)),
+                    Some(scan) => Some((scan.changed, scan.removed)),
+                    None if first || recovered => {
+                        let results = manifest
+                            .as_ref()
+                            .map(|current| {
+                                current
+                                    .files
+                                    .iter()
+                                    .map(|(path, entry)| (path.clone(), entry.errors.clone()))
+                                    .collect()
+                            })
+                            .unwrap_or_default();
+                        Some((results, Vec::new()))
+                    }
+                    None => None,
+                }
+            }
+            // A half-saved schema should not end the session; report it once and keep polling
+            Err(err) => {
+                let message = err.to_string();
+                if schema_error.as_deref() == Some(message.as_str()) {
+                    None
+                } else {
+                    schema_error = Some(message.clone());
+                    Some((vec![(schema_path.display().to_string(), vec![message])], Vec::new()))
+                }
+            }
+        };
+        first = false;
+
+        if let Some((changed, removed)) = delivery {
+            let outcome = callback.call1((changed, removed))?;
+            if let Ok(false) = outcome.extract::<bool>() {
+                return Ok(());
+            }
+        }
+        py.allow_threads(|| std::thread::sleep(interval));
+        py.check_signals()?;
+    }
+}
+
 fn to_py_err(err: ValidatorError) -> PyErr {
     PyRuntimeError::new_err(err.to_string())
 }
@@ -178,5 +562,7 @@ fn psr_validator(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(validate_rule, m)?)?;
     m.add_function(wrap_pyfunction!(validate_rule_str, m)?)?;
     m.add_function(wrap_pyfunction!(validate_directory, m)?)?;
+    m.add_function(wrap_pyfunction!(validate_directory_incremental, m)?)?;
+    m.add_function(wrap_pyfunction!(watch_directory, m)?)?;
     Ok(())
 }
@@ -6,7 +6,7 @@ import os
 import pathlib
 import subprocess
 import sys
-from typing import List, Sequence, Tuple
+from typing import Callable, List, Optional, Sequence, Tuple
 
 _PACKAGE_ROOT = pathlib.Path(__file__).resolve().parent
 _PROJECT_ROOT = _PACKAGE_ROOT.parent
@@ -66,8 +66,42 @@ def validate_directory(
     return [(path, list(errors)) for path, errors in results]
 
 
+def validate_directory_incremental(
+    schema_path: os.PathLike[str] | str,
+    directory: os.PathLike[str] | str,
+    manifest_path: os.PathLike[str] | str,
+) -> List[Tuple[str, List[str]]]:
+    """Validate ``directory``, revalidating only rules changed since the manifest was written."""
+    native = _load_native()
+    results: Sequence[Tuple[str, Sequence[str]]] = native.validate_directory_incremental(
+        str(schema_path), str(directory), str(manifest_path)
+    )
+    return [(path, list(errors)) for path, errors in results]
+
+
+def watch_directory(
+    schema_path: os.PathLike[str] | str,
+    directory: os.PathLike[str] | str,
+    callback: Callable[[List[Tuple[str, List[str]]], List[str]], Optional[bool]],
+    *,
+    manifest_path: os.PathLike[str] | str | None = None,
+    interval_ms: int = 500,
+) -> None:
+    """Poll ``directory`` and call ``callback(changed, removed)`` until it returns ``False``."""
+    native = _load_native()
+    native.watch_directory(
+        str(schema_path),
+        str(directory),
+        callback,
+        None if manifest_path is None else str(manifest_path),
+        interval_ms,
+    )
+
+
 __all__ = [
     "validate_rule",
     "validate_rule_text",
     "validate_directory",
+    "validate_directory_incremental",
+    "watch_directory",
 ]
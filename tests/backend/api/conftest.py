@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+import backend.app
+
+API_DIR = Path(backend.app.__file__).parent / "api"
+
+
+@pytest.fixture(scope="module")
+def load_api_module():
+    """
+    Import ``backend.app.api`` modules without running the package ``__init__``.
+
+    The package eagerly imports every endpoint, several of which depend on
+    modules that are not part of this tree. ``stubs`` registers stand-in
+    sibling modules (e.g. ``models``) for the module under test.
+    """
+    before = set(sys.modules)
+    with pytest.MonkeyPatch.context() as patch:
+        for name, path in (("backend.app.api", API_DIR), ("backend.app.api.endpoints", API_DIR / "endpoints")):
+            package = types.ModuleType(name)
+            package.__path__ = [str(path)]
+            patch.setitem(sys.modules, name, package)
+
+        def load(name: str, **stubs: Dict[str, Any]) -> types.ModuleType:
+            for stub_name, attributes in stubs.items():
+                module = types.ModuleType(f"backend.app.api.{stub_name}")
+                module.__dict__.update(attributes)
+                patch.setitem(sys.modules, module.__name__, module)
+            return importlib.import_module(f"backend.app.api.{name}")
+
+        yield load
+    for name in set(sys.modules) - before:
+        if name.startswith("backend.app.api"):
+            del sys.modules[name]
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+import types
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import Column, DateTime, Integer, String, create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import StaticPool
+
+import backend.app.db.session as db_session
+
+# certificates_list imports its model and schema from ``app.models``/``app.schemas``,
+# which are not in this tree; these stand-ins let the real queries run.
+Base = declarative_base()
+START = datetime(2024, 1, 1)
+
+
+class Certificate(Base):
+    __tablename__ = "certificates"
+    id = Column(Integer, primary_key=True)
+    certificate_number = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    origin_country = Column(String, nullable=True)
+    destination_country = Column(String, nullable=True)
+    fta_agreement = Column(String, nullable=True)
+    exporter = Column(String, nullable=True)
+    importer = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+
+
+class CertificateSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    certificate_number: str
+    origin_country: Optional[str] = None
+
+
+ORIGINS = ["DE", None, "AT", "NL", None, "AT", "BE", None, "DE", "FR", None]
+
+
+@pytest.fixture(scope="module")
+def endpoint(load_api_module):
+    pagination = load_api_module("pagination")
+    aliases = {
+        "app": {},
+        "app.api": {},
+        "app.api.pagination": vars(pagination),
+        "app.db": {},
+        "app.db.session": vars(db_session),
+        "app.models": {},
+        "app.models.certificate": {"Certificate": Certificate},
+        "app.schemas": {},
+        "app.schemas.certificate": {"Certificate": CertificateSchema},
+    }
+    with pytest.MonkeyPatch.context() as patch:
+        for name, attributes in aliases.items():
+            module = types.ModuleType(name)
+            module.__dict__.update(attributes)
+            patch.setitem(sys.modules, name, module)
+        yield load_api_module("endpoints.certificates_list")
+
+
+def _seed(session: Session) -> None:
+    session.add_all(
+        Certificate(
+            id=i + 1,
+            certificate_number=f"EUR1-{i:04d}",
+            status="active",
+            origin_country=origin,
+            created_at=START + timedelta(days=i % 4),
+        )
+        for i, origin in enumerate(ORIGINS)
+    )
+    session.commit()
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        _seed(session)
+        yield session
+
+
+def _walk(endpoint, db, **params) -> list:
+    seen, cursor = [], None
+    while True:
+        page = endpoint.get_certificates(
+            params=endpoint.CertificateQueryParams(page_size=3, cursor=cursor, exact_count=True, **params), db=db
+        )
+        seen += [item.id for item in page.items]
+        cursor = page.next_cursor
+        if cursor is None:
+            return seen
+
+
+def _expected(key, descending: bool) -> list:
+    rows = sorted(((key(i), i + 1) for i in range(len(ORIGINS))), reverse=descending)
+    return [certificate_id for _, certificate_id in rows]
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_seek_on_nullable_country_keeps_null_rows(endpoint, db, sort_order) -> None:
+    seen = _walk(endpoint, db, sort_by="origin_country", sort_order=sort_order)
+
+    assert seen == _expected(lambda i: ORIGINS[i] or "", sort_order == "desc")
+
+
+def test_seek_on_created_at_pages_through_ties_by_id(endpoint, db) -> None:
+    seen = _walk(endpoint, db, sort_by="created_at", sort_order="desc")
+
+    assert seen == _expected(lambda i: START + timedelta(days=i % 4), True)
+
+
+@pytest.mark.parametrize(
+    "sort_by, sort_order",
+    [("created_at", "desc"), ("origin_country", "desc"), ("certificate_number", "asc")],
+)
+def test_cursor_from_another_sort_is_a_400(endpoint, db, sort_by, sort_order) -> None:
+    first = endpoint.get_certificates(
+        params=endpoint.CertificateQueryParams(page_size=3, sort_by="origin_country", sort_order="asc"), db=db
+    )
+
+    with pytest.raises(HTTPException) as excinfo:
+        endpoint.get_certificates(
+            params=endpoint.CertificateQueryParams(cursor=first.next_cursor, sort_by=sort_by, sort_order=sort_order),
+            db=db,
+        )
+
+    assert excinfo.value.status_code == 400
+
+
+class _ExplainSession:
+    """Just enough of a postgres Session for ``_count``'s EXPLAIN path."""
+
+    def __init__(self, plan) -> None:
+        self.bind = SimpleNamespace(dialect=postgresql.dialect())
+        self.plan = plan
+        self.statements = []
+
+    def connection(self) -> "_ExplainSession":
+        return self
+
+    def exec_driver_sql(self, sql, params):
+        self.statements.append((sql, params))
+        return SimpleNamespace(scalar=lambda: self.plan)
+
+
+@pytest.mark.parametrize("plan", [[{"Plan": {"Plan Rows": 1234}}], json.dumps([{"Plan": {"Plan Rows": 1234}}])])
+def test_estimate_reads_plan_rows_from_explain(endpoint, db, plan) -> None:
+    explain = _ExplainSession(plan)
+    query = db.query(Certificate).filter(Certificate.status == "active").order_by(Certificate.id)
+
+    assert endpoint._count(explain, query, exact=False) == (1234, True)
+    assert endpoint._count(explain, query, exact=True) == (len(ORIGINS), False)
+
+    [(sql, params)] = explain.statements
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "ORDER BY" not in sql
+    assert list(params.values()) == ["active"]
+
+
+@pytest.fixture(scope="module")
+def postgres_dsn() -> str:
+    if shutil.which("docker") is None:
+        pytest.skip("Docker is required to run Postgres test container")
+    from testcontainers.postgres import PostgresContainer
+
+    with PostgresContainer("postgres:15-alpine") as container:
+        yield container.get_connection_url()
+
+
+def test_postgres_seek_and_estimate(endpoint, postgres_dsn) -> None:
+    engine = db_session.build_engine(postgres_dsn)
+    Base.metadata.create_all(engine)
+    try:
+        with Session(engine) as session:
+            _seed(session)
+            session.execute(text("ANALYZE certificates"))
+            seen = _walk(endpoint, session, sort_by="origin_country", sort_order="desc")
+            page = endpoint.get_certificates(params=endpoint.CertificateQueryParams(), db=session)
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+    assert seen == _expected(lambda i: ORIGINS[i] or "", True)
+    assert page.total_is_estimate
+    assert page.total > 0
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+
+@pytest.fixture(scope="module")
+def pagination(load_api_module):
+    return load_api_module("pagination")
+
+
+def test_cursor_round_trips_sort_key_values(pagination) -> None:
+    created = datetime(2024, 3, 1, 12, 30, 15, 250)
+
+    cursor = pagination.encode_cursor(created, "8471.30", 42)
+
+    assert "=" not in cursor
+    assert pagination.decode_cursor(cursor, datetime.fromisoformat, str, int) == (created, "8471.30", 42)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        base64.urlsafe_b64encode(b"{not json").decode(),
+        base64.urlsafe_b64encode(b'{"hs_code": "0101"}').decode(),
+        ("0101", "forty-two"),
+    ],
+)
+def test_malformed_cursor_is_a_400(pagination, cursor) -> None:
+    if isinstance(cursor, tuple):
+        cursor = pagination.encode_cursor(*cursor)
+    with pytest.raises(HTTPException) as excinfo:
+        pagination.decode_cursor(cursor, str, int)
+
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.parametrize("values", [("0101",), ("0101", 1, "extra")])
+def test_cursor_with_wrong_arity_is_a_400(pagination, values: tuple) -> None:
+    with pytest.raises(HTTPException) as excinfo:
+        pagination.decode_cursor(pagination.encode_cursor(*values), str, int)
+
+    assert excinfo.value.status_code == 400
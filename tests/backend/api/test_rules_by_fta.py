@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import StaticPool
+
+# The endpoint imports its models from ``backend.app.api.models``/``database``;
+# these minimal tables stand in for them so the real queries run on SQLite.
+Base = declarative_base()
+NOW = datetime(2024, 1, 1)
+
+
+class FTA(Base):
+    __tablename__ = "ftas"
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+
+
+class HSCode(Base):
+    __tablename__ = "hs_codes"
+    code = Column(String, primary_key=True)
+    description = Column(String, nullable=False)
+
+
+class Rule(Base):
+    __tablename__ = "rules"
+    id = Column(Integer, primary_key=True)
+    fta_id = Column(Integer, ForeignKey("ftas.id"), nullable=False)
+    hs_code = Column(String, ForeignKey("hs_codes.code"), nullable=False)
+    rule_type = Column(String, nullable=False)
+    description = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=NOW)
+    updated_at = Column(DateTime, nullable=False, default=NOW)
+
+
+@pytest.fixture(scope="module")
+def endpoint(load_api_module):
+    load_api_module("pagination")
+    module = load_api_module(
+        "endpoints.rules_by_fta",
+        models={"FTA": FTA, "HSCode": HSCode, "Rule": Rule},
+        database={"get_db": lambda: None},
+    )
+    return module.get_rules_by_fta
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([FTA(id=1, name="CETA"), FTA(id=2, name="EU-Japan")])
+        # Chapter 01: 4 codes, 02: 2 codes, 03: 5 codes (none covered by FTA 1)
+        codes = ["0101", "0102", "0103", "0104", "0201", "0202"] + [f"030{i}" for i in range(1, 6)]
+        session.add_all(HSCode(code=code, description=f"HS {code}") for code in codes)
+        # Ids deliberately out of hs_code order so the (hs_code, id) seek matters
+        rules = [
+            (10, "0102"), (3, "0101"), (7, "0101"), (1, "0201"), (12, "0102"),
+            (5, "0202"), (2, "0201"), (9, "0101"),
+        ]
+        session.add_all(
+            Rule(id=rule_id, fta_id=1, hs_code=code, rule_type="rules_of_origin", description="PSR")
+            for rule_id, code in rules
+        )
+        session.add(Rule(id=99, fta_id=2, hs_code="0301", rule_type="other", description="other FTA"))
+        session.commit()
+        yield session
+
+
+def _page(endpoint, db, fta="1", limit=3, cursor=None, chapter=None):
+    return asyncio.run(endpoint(fta, limit=limit, cursor=cursor, chapter=chapter, db=db))
+
+
+def test_cursor_walks_every_rule_once_in_hs_code_id_order(endpoint, db) -> None:
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = _page(endpoint, db, cursor=cursor)
+        seen += [(rule.hs_code, rule.id) for rule in page.rules]
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == [
+        ("0101", 3), ("0101", 7), ("0101", 9), ("0102", 10), ("0102", 12),
+        ("0201", 1), ("0201", 2), ("0202", 5),
+    ]
+    assert pages == page.total_pages == 3
+    assert page.total_count == 8
+
+
+def test_chapter_stats_are_grouped_per_chapter(endpoint, db) -> None:
+    page = _page(endpoint, db, fta="ceta")
+
+    assert [(s.chapter, s.rule_count, s.coverage_percentage) for s in page.chapter_stats] == [
+        ("01", 5, 125.0),
+        ("02", 3, 150.0),
+    ]
+
+    filtered = _page(endpoint, db, chapter="02", limit=2)
+    assert [(s.chapter, s.rule_count) for s in filtered.chapter_stats] == [("02", 3)]
+    assert [rule.id for rule in filtered.rules] == [1, 2]
+    assert [rule.id for rule in _page(endpoint, db, chapter="02", cursor=filtered.next_cursor).rules] == [5]
+
+
+@pytest.mark.parametrize("cursor", ["%%%", ("0101",), ("0101", 3, 4)])
+def test_bad_cursor_is_rejected_before_querying(load_api_module, endpoint, db, cursor) -> None:
+    if isinstance(cursor, tuple):
+        cursor = load_api_module("pagination").encode_cursor(*cursor)
+    with pytest.raises(HTTPException) as excinfo:
+        _page(endpoint, db, cursor=cursor)
+
+    assert excinfo.value.status_code == 400
+
+
+def test_unknown_fta_is_a_404(endpoint, db) -> None:
+    with pytest.raises(HTTPException) as excinfo:
+        _page(endpoint, db, fta="999")
+
+    assert excinfo.value.status_code == 404
+
+
+def test_chapter_stats_count_rules_without_an_exact_hs_code_row(endpoint, db) -> None:
+    db.add_all([
+        Rule(id=20, fta_id=1, hs_code="010599", rule_type="other", description="subheading"),
+        Rule(id=21, fta_id=1, hs_code="0401", rule_type="other", description="no chapter codes"),
+    ])
+    db.commit()
+
+    page = _page(endpoint, db)
+
+    assert [(s.chapter, s.rule_count, s.coverage_percentage) for s in page.chapter_stats] == [
+        ("01", 6, 150.0),
+        ("02", 3, 150.0),
+        ("04", 1, 0),
+    ]
+    assert page.total_count == 10
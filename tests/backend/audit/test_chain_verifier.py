@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text, update
+from testcontainers.postgres import PostgresContainer
+
+from backend.app.audit.chain_verifier import (
+    AuditChainVerifier,
+    audit_chain_checkpoints,
+    audit_logs,
+    compute_checksum,
+    link_next,
+)
+
+KEY = b"test-checkpoint-key"
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE audit_logs (
+                id TEXT PRIMARY KEY, timestamp DATETIME NOT NULL, event_type TEXT, user_id TEXT,
+                action TEXT, description TEXT, success BOOLEAN, checksum TEXT NOT NULL, previous_checksum TEXT
+            )
+        """))
+        conn.execute(text("""
+            CREATE TABLE audit_chain_checkpoints (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, created_at DATETIME, last_timestamp DATETIME,
+                last_id TEXT, last_checksum TEXT, rows_verified BIGINT, signature TEXT
+            )
+        """))
+    return engine
+
+
+def append_rows(engine, count: int) -> list[dict]:
+    with engine.begin() as conn:
+        existing = conn.execute(text("SELECT count(*) FROM audit_logs")).scalar()
+        previous = conn.execute(text("SELECT checksum FROM audit_logs ORDER BY timestamp DESC, id DESC LIMIT 1")).scalar()
+        rows = []
+        for i in range(existing, existing + count):
+            row = {
+                "id": str(uuid.uuid4()),
+                # Two rows per second so (timestamp, id) ordering is exercised
+                "timestamp": START + timedelta(seconds=i // 2),
+                "event_type": "data_read",
+                "user_id": str(uuid.UUID(int=i % 7)),
+                "action": "read",
+                "description": f"event {i}",
+                "success": i % 3 != 0,
+            }
+            rows.append(row)
+        rows.sort(key=lambda r: (r["timestamp"], r["id"]))
+        for row in rows:
+            row["previous_checksum"] = previous
+            row["checksum"] = previous = compute_checksum(
+                row["timestamp"], row["event_type"], row["user_id"], row["action"],
+                row["description"], row["success"], row["previous_checksum"],
+            )
+        conn.execute(audit_logs.insert(), rows)
+    return rows
+
+
+def append_legacy_rows(engine, count: int) -> None:
+    """Rows as the pre-chain writer stored them: unlinked, hashed before the timestamp was set."""
+    with engine.begin() as conn:
+        conn.execute(audit_logs.insert(), [
+            {
+                "id": str(uuid.uuid4()),
+                "timestamp": START + timedelta(seconds=i),
+                "event_type": "data_read",
+                "user_id": None,
+                "action": "read",
+                "description": f"legacy {i}",
+                "success": True,
+                "previous_checksum": None,
+                "checksum": compute_checksum(None, "data_read", None, "read", f"legacy {i}", True, None),
+            }
+            for i in range(count)
+        ])
+
+
+def append_linked(engine, count: int, timestamp: datetime) -> list[SimpleNamespace]:
+    records = []
+    for i in range(count):
+        record = SimpleNamespace(
+            id=str(uuid.uuid4()), timestamp=timestamp, event_type="data_read", user_id=None,
+            action="read", description=f"linked {i}", success=True,
+        )
+        with engine.begin() as conn:
+            link_next(conn, record)
+            conn.execute(audit_logs.insert(), vars(record))
+        records.append(record)
+    return records
+
+
+def make_verifier(engine, executor=None, **kwargs) -> AuditChainVerifier:
+    return AuditChainVerifier(engine, signing_key=KEY, chunk_size=64, max_workers=2, executor=executor, **kwargs)
+
+
+def test_full_then_incremental_verification(engine):
+    append_rows(engine, 300)
+
+    # Default executor is a process pool; chunks must survive pickling
+    first = make_verifier(engine).verify()
+    assert first.ok and first.rows_verified == 300 and first.checkpoint_saved
+
+    append_rows(engine, 50)
+    with ThreadPoolExecutor(2) as pool:
+        second = make_verifier(engine, pool).verify()
+    assert second.ok and second.from_checkpoint
+    assert (second.rows_verified, second.total_verified) == (50, 350)
+
+
+def test_tampering_is_reported_and_not_checkpointed(engine):
+    rows = append_rows(engine, 200)
+    edited, rehashed = rows[70], rows[150]
+    with engine.begin() as conn:
+        conn.execute(update(audit_logs).where(audit_logs.c.id == edited["id"]).values(description="edited"))
+        # Rewrites a row consistently with its own checksum; the next row's link exposes it
+        conn.execute(update(audit_logs).where(audit_logs.c.id == rehashed["id"]).values(
+            success=not rehashed["success"],
+            checksum=compute_checksum(
+                rehashed["timestamp"], rehashed["event_type"], rehashed["user_id"], rehashed["action"],
+                rehashed["description"], not rehashed["success"], rehashed["previous_checksum"],
+            ),
+        ))
+
+    with ThreadPoolExecutor(2) as pool:
+        result = make_verifier(engine, pool).verify()
+
+    assert not result.ok and not result.checkpoint_saved
+    assert [(b.position, b.reason) for b in result.breaks] == [(70, "checksum_mismatch"), (151, "broken_link")]
+    assert result.breaks[0].record_id == edited["id"]
+
+
+def test_forged_checkpoint_falls_back_to_full_run(engine):
+    append_rows(engine, 100)
+    with ThreadPoolExecutor(2) as pool:
+        assert make_verifier(engine, pool).verify().checkpoint_saved
+        with engine.begin() as conn:
+            conn.execute(update(audit_chain_checkpoints).values(rows_verified=1_000_000))
+
+        result = make_verifier(engine, pool).verify()
+
+    assert [b.reason for b in result.breaks] == ["checkpoint_signature"]
+    assert not result.from_checkpoint and result.rows_verified == 100
+
+
+def test_link_next_chains_appends_in_order_despite_clock_skew(engine):
+    append_rows(engine, 10)
+    # A writer whose clock is behind the tail still lands after it
+    records = append_linked(engine, 5, START - timedelta(days=1))
+
+    assert records[0].timestamp > START
+    assert [r.timestamp for r in records] == sorted({r.timestamp for r in records})
+    assert all(later.previous_checksum == earlier.checksum for earlier, later in zip(records, records[1:]))
+    with ThreadPoolExecutor(2) as pool:
+        result = make_verifier(engine, pool).verify()
+    assert result.ok and result.rows_verified == 15
+
+
+def test_legacy_rows_before_cutover_are_accepted(engine):
+    append_legacy_rows(engine, 40)
+    append_linked(engine, 10, START + timedelta(hours=1))
+
+    with ThreadPoolExecutor(2) as pool:
+        without_cutover = make_verifier(engine, pool).verify()
+        with_cutover = make_verifier(engine, pool, legacy_cutover=START + timedelta(minutes=30)).verify()
+        # A cutover recorded by the migration is picked up when none is passed
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE audit_chain_cutover (id INTEGER PRIMARY KEY, legacy_before DATETIME)"))
+            conn.execute(text("INSERT INTO audit_chain_cutover VALUES (1, :at)"), {"at": START + timedelta(minutes=30)})
+        recorded = make_verifier(engine, pool).verify(incremental=False)
+
+    assert not without_cutover.ok
+    assert with_cutover.ok and with_cutover.rows_verified == 50
+    assert recorded.ok
+
+
+def test_legacy_hash_after_cutover_is_rejected(engine):
+    append_legacy_rows(engine, 10)
+
+    with ThreadPoolExecutor(2) as pool:
+        result = make_verifier(engine, pool, legacy_cutover=START + timedelta(seconds=5)).verify()
+
+    assert not result.ok
+    assert {b.position for b in result.breaks} == {5, 6, 7, 8, 9}
+    assert {b.reason for b in result.breaks} == {"broken_link", "checksum_mismatch"}
+
+
+@pytest.fixture(scope="module")
+def postgres_dsn() -> str:
+    if shutil.which("docker") is None:
+        pytest.skip("Docker is required to run Postgres test container")
+    with PostgresContainer("postgres:15-alpine") as container:
+        yield container.get_connection_url()
+
+
+def test_concurrent_writers_keep_a_single_chain_on_postgres(postgres_dsn):
+    engine = create_engine(postgres_dsn)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS audit_logs"))
+        conn.execute(text("""
+            CREATE TABLE audit_logs (
+                id TEXT PRIMARY KEY, timestamp TIMESTAMP NOT NULL, event_type TEXT, user_id TEXT,
+                action TEXT, description TEXT, success BOOLEAN, checksum TEXT NOT NULL, previous_checksum TEXT
+            )
+        """))
+    now = datetime.utcnow()
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: append_linked(engine, 10, now), range(8)))
+        result = AuditChainVerifier(engine, chunk_size=64, executor=pool).verify()
+
+    assert result.ok and result.rows_verified == 80
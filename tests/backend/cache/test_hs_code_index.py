@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from backend.app.cache.hs_code_index import HSCodePrefixIndex, normalize_code
+
+CODES = ["8471.30.00", "8471.41.00", "8471", "8507.60.00", "0101.21.00", "8471.49.00"]
+
+
+def test_search_returns_exact_then_prefix_matches_in_code_order() -> None:
+    index = HSCodePrefixIndex(((code, code) for code in CODES), limit=3)
+
+    assert len(index) == len(CODES)
+    assert index.search("8471") == ["8471", "8471.30.00", "8471.41.00"]
+    assert index.search("8471.4") == ["8471.41.00", "8471.49.00"]
+    assert index.search("847141") == ["8471.41.00"]
+    assert index.search("85", limit=1) == ["8507.60.00"]
+    assert index.search("") == ["0101.21.00", "8471", "8471.30.00"]
+    assert index.search("9999") == []
+
+
+def test_normalize_code_strips_separators() -> None:
+    assert normalize_code("8471.30 00") == "84713000"
+    assert normalize_code("0101-21") == "010121"
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+
+from backend.app.cache.hs_code_tree_snapshot import HSCodeTreeSnapshot, snapshot_version
+
+ROWS = [
+    ("8471", "84", "Computers", 2),
+    ("84", None, "Machinery", 1),
+    ("847130", "8471", "Portable", 3),
+    ("01", None, "Live animals", 1),
+    ("0101", "01", "Horses", 2),
+    ("9999", "99", "Orphan", 2),
+]
+
+
+def test_render_matches_nested_shape_at_each_depth() -> None:
+    snapshot = HSCodeTreeSnapshot(ROWS, max_depth=3)
+
+    assert json.loads(snapshot.render(1)) == {
+        "01": {"description": "Live animals", "count": 0, "children": {}},
+        "84": {"description": "Machinery", "count": 0, "children": {}},
+    }
+    tree = json.loads(snapshot.render(3))
+    assert list(tree) == ["01", "84"]
+    assert tree["84"]["count"] == 1
+    assert tree["84"]["children"]["8471"]["children"]["847130"] == {
+        "description": "Portable",
+        "count": 0,
+        "children": {},
+    }
+    assert "9999" not in snapshot
+
+
+def test_subtrees_are_slices_of_the_full_render() -> None:
+    snapshot = HSCodeTreeSnapshot(ROWS, max_depth=3)
+    full = json.loads(snapshot.render(3))
+
+    assert json.loads(snapshot.render(3, "8471")) == {"8471": full["84"]["children"]["8471"]}
+    assert json.loads(snapshot.render(2, "84")) == {
+        "84": {
+            "description": "Machinery",
+            "count": 1,
+            "children": {"8471": {"description": "Computers", "count": 0, "children": {}}},
+        }
+    }
+    assert snapshot.render(1, "8471") is None
+    assert snapshot.render(3, "0000") is None
+
+
+def test_version_and_etag_follow_content() -> None:
+    snapshot = HSCodeTreeSnapshot(ROWS, max_depth=3)
+
+    assert snapshot.version == snapshot_version(list(reversed(ROWS)))
+    assert snapshot.version != snapshot_version(ROWS[:-1])
+    assert snapshot.etag(2, "84") != snapshot.etag(3, "84") != snapshot.etag(3)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from backend.app.compliance import pattern_matcher
+from backend.app.compliance.pattern_matcher import CompiledPatternSet, KeywordMatcher
+from backend.app.compliance.schema_sampler import list_tables, scan_tables
+
+
+@pytest.fixture(params=["c", "python"])
+def keyword_backend(request, monkeypatch):
+    if request.param == "c":
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(pattern_matcher, "AHOCORASICK_AVAILABLE", False)
+    return request.param
+
+
+def test_keyword_matcher_finds_overlapping_keywords(keyword_backend):
+    matcher = KeywordMatcher({"he": "a", "she": "b", "hers": "c", "his": "d"})
+
+    assert sorted(matcher.iter_matches("uSHErs this")) == [
+        (1, "she", "b"), (2, "he", "a"), (2, "hers", "c"), (8, "his", "d")
+    ]
+    assert matcher.found("email_address") == set()
+    assert len(KeywordMatcher({})) == 0
+    assert list(KeywordMatcher({}).iter_matches("anything")) == []
+
+
+def test_keyword_matcher_whole_words(keyword_backend):
+    matcher = KeywordMatcher({"court": "legal", "payment": "financial", "account": "financial"}, whole_words=True)
+
+    counts = matcher.label_counts("The Court ordered payment;\naccountant, account_id, court.")
+    assert counts == {"legal": 2, "financial": 1}
+
+
+def test_compiled_pattern_set_prefers_earlier_patterns():
+    patterns = CompiledPatternSet(
+        {
+            "credit_card": r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b",
+            "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
+            "phone": r"(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}",
+        },
+        re.IGNORECASE,
+    )
+
+    counts = patterns.counts("4111111111111111 a@b.NL 555-123-4567 555.123.4567")
+    assert counts == {"credit_card": 1, "email": 1, "phone": 2}
+    assert CompiledPatternSet({}).counts("x") == {}
+
+
+def test_document_numbers_are_reported_alongside_overlapping_pii():
+    data_classification = pytest.importorskip("backend.app.compliance.data_classification")
+    classifier = data_classification.DataClassifier()
+
+    reasons = classifier._analyze_sample_data("AB1234567@corp.com")["reasons"]
+
+    assert reasons == [
+        "Detected email pattern in sample data (1 matches)",
+        "Detected passport pattern in sample data (1 matches)",
+        "Detected driver_license pattern in sample data (1 matches)",
+    ]
+
+
+def test_scan_tables_samples_text_columns_in_parallel(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'scan.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE customers (id INTEGER PRIMARY KEY, email VARCHAR(100), note TEXT)"))
+        conn.execute(text("CREATE TABLE payments (id INTEGER PRIMARY KEY, amount NUMERIC)"))
+        conn.execute(text("CREATE TABLE \"odd name\" (\"select\" TEXT)"))
+        for i in range(50):
+            conn.execute(text("INSERT INTO customers (email, note) VALUES (:e, NULL)"), {"e": f"u{i}@example.com"})
+        conn.execute(text("INSERT INTO \"odd name\" VALUES ('x')"))
+
+    tables = list_tables(engine)
+    assert [t.name for t in tables] == ["customers", "odd name", "payments"]
+    assert tables[0].text_columns == ["email", "note"]
+
+    results = scan_tables(engine, tables, lambda info, samples: (info.name, samples), max_workers=2, sample_rows=10)
+
+    assert results[0][0] == "customers"
+    assert len(results[0][1]["email"]) == 10 and results[0][1]["note"] == []
+    assert results[1] == ("odd name", {"select": ["x"]})
+    assert results[2] == ("payments", {})
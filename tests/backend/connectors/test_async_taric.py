@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+from backend.connectors.base import TTLCache
+from backend.connectors.taric import AsyncTARICConnector
+
+
+class FixtureTaric(ThreadingHTTPServer):
+    """Local TARIC stand-in serving duty rates with ETags and a little latency."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FixtureTaricHandler)
+        self.hits: Counter = Counter()
+        self.not_modified = 0
+        self.version = 1
+        self.delay = 0.02
+        self.failing: set[str] = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FixtureTaricHandler(BaseHTTPRequestHandler):
+    server: FixtureTaric
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        taric = self.server
+        url = urlparse(self.path)
+        _, _, code, kind = url.path.split("/")
+        with taric.lock:
+            taric.hits[code] += 1
+            taric.in_flight += 1
+            taric.max_in_flight = max(taric.max_in_flight, taric.in_flight)
+        try:
+            time.sleep(taric.delay)
+            etag = f'"{code}-v{taric.version}"'
+            if code in taric.failing:
+                self._send(503, b"{}")
+            elif self.headers.get("If-None-Match") == etag:
+                taric.not_modified += 1
+                self._send(304, b"", etag)
+            else:
+                query = {name: values[0] for name, values in parse_qs(url.query).items()}
+                body = {"code": code, "kind": kind, "version": taric.version, **query}
+                self._send(200, json.dumps(body).encode(), etag)
+        finally:
+            with taric.lock:
+                taric.in_flight -= 1
+
+    def _send(self, status: int, body: bytes, etag: str | None = None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def taric():
+    server = FixtureTaric()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def run(taric: FixtureTaric, cache_path, coro_factory, **kwargs):
+    async def main():
+        async with AsyncTARICConnector(base_url=taric.url, cache_path=cache_path, **kwargs) as connector:
+            return await coro_factory(connector)
+
+    return asyncio.run(main())
+
+
+def test_batched_lookup_dedupes_bounds_concurrency_and_survives_restart(taric, tmp_path):
+    cache_path = tmp_path / "taric.sqlite"
+    codes = [f"{3901 + i % 100:04d}10" for i in range(400)]  # 100 distinct codes
+
+    rates = run(taric, cache_path, lambda c: c.fetch_duty_rates_many(codes, country="CN"), max_concurrency=8)
+
+    assert len(rates) == 100 and rates["390110"] == {"code": "390110", "kind": "duty-rates", "version": 1, "country": "CN"}
+    assert sum(taric.hits.values()) == 100
+    assert taric.max_in_flight <= 8
+
+    # New process, same cache file: no requests at all
+    again = run(taric, cache_path, lambda c: c.fetch_duty_rates_many(codes, country="CN"))
+    assert again == rates and sum(taric.hits.values()) == 100
+
+    # Country and date are part of the key
+    dated = run(taric, cache_path, lambda c: c.fetch_duty_rates("390110", country="CN", on_date="2026-01-01"))
+    assert dated["date"] == "2026-01-01" and taric.hits["390110"] == 2
+
+
+def test_expired_entries_are_revalidated_and_failures_omitted(taric, tmp_path):
+    cache_path = tmp_path / "taric.sqlite"
+    codes = ["390110", "390120", "390130"]
+    run(taric, cache_path, lambda c: c.fetch_duty_rates_many(codes), cache_ttl_seconds=0)
+
+    # Unchanged upstream: conditional requests come back 304 and keep the body
+    taric.failing = {"390130", "999999"}
+    rates = run(taric, cache_path, lambda c: c.fetch_duty_rates_many(codes + ["999999"]), cache_ttl_seconds=0)
+    assert taric.not_modified == 2
+    # Upstream error with a stored copy serves it; with none the code is left out
+    assert set(rates) == {"390110", "390120", "390130"}
+
+    taric.failing = set()
+    taric.version = 2
+    assert run(taric, cache_path, lambda c: c.fetch_duty_rates("390110"), cache_ttl_seconds=0)["version"] == 2
+
+    taric.failing = {"999999"}
+    with pytest.raises(httpx.HTTPStatusError):
+        run(taric, cache_path, lambda c: c.fetch_duty_rates("999999"))
+
+
+def test_ttl_cache_evicts_stalest_entry():
+    cache = TTLCache(ttl_seconds=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 3)
+    cache.set("c", 4)
+
+    assert cache.get("a") == 3 and cache.get("c") == 4
+    with pytest.raises(KeyError):
+        cache.get("b")
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import sys
+import types
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, String, Uuid
+from sqlalchemy.orm import declarative_base
+
+import backend.app.events.local_pubsub as local_pubsub_module
+
+pytest.importorskip("jose")
+pytest.importorskip("cachetools")
+
+# tenant_context imports settings and models from ``app.core``/``app.models``,
+# which need the full app; a minimal Tenant table is enough to build its queries.
+Base = declarative_base()
+
+
+class Tenant(Base):
+    __tablename__ = "tenants"
+    id = Column(Uuid, primary_key=True)
+    subdomain = Column(String, unique=True, nullable=False)
+    status = Column(String, nullable=False)
+
+
+@pytest.fixture(scope="module")
+def module():
+    aliases = {
+        "app": {},
+        "app.core": {},
+        "app.core.config": {"settings": SimpleNamespace(SECRET_KEY="test", ALGORITHM="HS256")},
+        "app.events": {},
+        "app.events.local_pubsub": vars(local_pubsub_module),
+        "app.models": {},
+        "app.models.tenant": {"Tenant": Tenant, "TenantQuota": object, "TenantUsage": object},
+    }
+    with pytest.MonkeyPatch.context() as patch:
+        for name, attributes in aliases.items():
+            stub = types.ModuleType(name)
+            stub.__dict__.update(attributes)
+            patch.setitem(sys.modules, name, stub)
+        patch.delitem(sys.modules, "backend.app.core.tenant_context", raising=False)
+        yield importlib.import_module("backend.app.core.tenant_context")
+        sys.modules.pop("backend.app.core.tenant_context", None)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeDatabase:
+    """Session factory over in-memory tenants; counts sessions and statements."""
+
+    def __init__(self, *tenants: Tenant) -> None:
+        self.tenants = {tenant.id: tenant for tenant in tenants}
+        self.sessions = 0
+        self.lookups = 0
+
+    def add(self, tenant: Tenant) -> None:
+        self.tenants[tenant.id] = tenant
+
+    async def open_session(self):
+        self.sessions += 1
+        yield self
+
+    async def execute(self, statement):
+        self.lookups += 1
+        wanted = set()
+        for value in statement.compile().params.values():
+            wanted.update(value if isinstance(value, (list, tuple)) else [value])
+        matches = [t for t in self.tenants.values() if t.id in wanted or t.subdomain in wanted]
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: matches))
+
+
+def _tenant(subdomain: str, status: str = "active") -> Tenant:
+    return Tenant(id=uuid.uuid4(), subdomain=subdomain, status=status)
+
+
+def _resolve(context, db: FakeDatabase, *candidates):
+    return asyncio.run(context.resolve_tenant(candidates, db.open_session))
+
+
+def test_resolves_highest_priority_candidate_in_one_lookup(module) -> None:
+    acme, globex = _tenant("acme"), _tenant("globex")
+    db = FakeDatabase(acme, globex)
+    context = module.TenantContext(timer=FakeClock())
+
+    tenant = _resolve(context, db, ("id", uuid.uuid4()), ("subdomain", "globex"), ("id", acme.id))
+
+    assert tenant is globex
+    assert (db.sessions, db.lookups) == (1, 1)
+
+
+def test_cached_tenant_skips_the_session_entirely(module) -> None:
+    acme = _tenant("acme")
+    db = FakeDatabase(acme)
+    context = module.TenantContext(timer=FakeClock())
+
+    _resolve(context, db, ("subdomain", "acme"))
+    for _ in range(5):
+        assert _resolve(context, db, ("subdomain", "acme")) is acme
+        assert _resolve(context, db, ("id", acme.id), ("subdomain", "other")) is acme
+
+    assert (db.sessions, db.lookups) == (1, 1)
+
+
+def test_missing_keys_are_negatively_cached_for_negative_ttl(module) -> None:
+    clock = FakeClock()
+    db = FakeDatabase()
+    context = module.TenantContext(ttl=60, negative_ttl=5, timer=clock)
+
+    assert _resolve(context, db, ("subdomain", "nope")) is None
+    assert _resolve(context, db, ("subdomain", "nope")) is None
+    assert db.lookups == 1
+
+    db.add(_tenant("nope"))
+    clock.now = 6
+    assert _resolve(context, db, ("subdomain", "nope")).subdomain == "nope"
+    assert db.lookups == 2
+
+
+def test_positive_entries_expire_after_ttl(module) -> None:
+    clock = FakeClock()
+    acme = _tenant("acme")
+    db = FakeDatabase(acme)
+    context = module.TenantContext(ttl=15, timer=clock)
+
+    _resolve(context, db, ("id", acme.id))
+    # Suspended by another worker: this process hears nothing until the entry expires
+    db.add(Tenant(id=acme.id, subdomain="acme", status="suspended"))
+    clock.now = 14
+    assert _resolve(context, db, ("id", acme.id)).status == "active"
+    clock.now = 16
+    assert _resolve(context, db, ("id", acme.id)).status == "suspended"
+    assert db.lookups == 2
+
+
+def test_cache_is_lru_bounded(module) -> None:
+    tenants = [_tenant(f"t{i}") for i in range(3)]
+    db = FakeDatabase(*tenants)
+    context = module.TenantContext(max_size=4, timer=FakeClock())
+
+    for tenant in tenants:
+        _resolve(context, db, ("id", tenant.id))
+    assert len(context._tenant_cache) == 4
+
+    # t0 (id and subdomain) was evicted by t2
+    _resolve(context, db, ("id", tenants[2].id))
+    assert db.lookups == 3
+    _resolve(context, db, ("id", tenants[0].id))
+    assert db.lookups == 4
+
+
+def test_tenant_changed_drops_positive_and_negative_entries(module) -> None:
+    acme = _tenant("acme")
+    db = FakeDatabase(acme)
+    context = module.TenantContext(timer=FakeClock())
+
+    _resolve(context, db, ("id", acme.id))
+    assert _resolve(context, db, ("subdomain", "acme-eu")) is None
+
+    renamed = Tenant(id=acme.id, subdomain="acme-eu", status="suspended")
+    db.tenants = {acme.id: renamed}
+    module.notify_tenant_changed(acme.id, "acme-eu")
+
+    assert _resolve(context, db, ("subdomain", "acme")) is None
+    assert _resolve(context, db, ("id", acme.id)) is renamed
+    # The id lookup re-cached the new subdomain as well
+    assert _resolve(context, db, ("subdomain", "acme-eu")) is renamed
+    assert db.lookups == 4
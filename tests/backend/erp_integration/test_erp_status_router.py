@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import re
+import shutil
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from testcontainers.postgres import PostgresContainer
+
+from backend.api.erp_status_router import ERPMonitoringService
+from backend.app.dal.models import ERPOutboxRecord
+from backend.app.db.base import Base
+from backend.app.db.session import build_engine, create_session_factory, session_scope
+from backend.erp_integration import OutboxStatus
+
+
+class RecordingSession:
+    """Captures statements and answers them with a canned row."""
+
+    def __init__(self, row=None, rows=()):
+        self.statements = []
+        self.row = row
+        self.rows = list(rows)
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(one=lambda: self.row, all=lambda: self.rows)
+
+
+def compiled(stmt) -> str:
+    """Postgres SQL on one line, without the bind parameter casts."""
+    sql = " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
+    return re.sub(r"::[A-Z]+( WITH TIME ZONE)?", "", sql)
+
+
+def test_metrics_is_one_filtered_aggregate_statement() -> None:
+    row = SimpleNamespace(
+        total=4, succeeded=3, failed=1, avg_latency=2.5, p50=2.0, p95=4.5, p99=4.9,
+        retries=3, sagas_with_retries=2, max_attempts=3, max_retry_saga_id=uuid4(), dead_count=1,
+    )
+    session = RecordingSession(row=row)
+
+    metrics = ERPMonitoringService(session).get_metrics(hours=6)
+
+    (stmt,) = session.statements
+    sql = compiled(stmt)
+    latency_filter = "FILTER (WHERE erp_outbox.status = %(status_1)s AND erp_outbox.processed_at IS NOT NULL)"
+    assert "count(erp_outbox.id) FILTER (WHERE erp_outbox.status = %(status_1)s) AS succeeded" in sql
+    for index, name in enumerate(("p50", "p95", "p99"), start=1):
+        assert (
+            f"percentile_cont(%(percentile_cont_{index})s) WITHIN GROUP "
+            f"(ORDER BY EXTRACT(epoch FROM erp_outbox.processed_at - erp_outbox.created_at)) "
+            f"{latency_filter} AS {name}"
+        ) in sql
+    assert stmt.compile(dialect=postgresql.dialect()).params["percentile_cont_2"] == 0.95
+    assert "(SELECT count(erp_outbox.id) AS count_1 FROM erp_outbox WHERE erp_outbox.status = " in sql
+    assert sql.endswith("WHERE erp_outbox.created_at >= %(created_at_1)s")
+    assert metrics.success_rate == 75.0 and metrics.retry_metrics.avg_retries_per_saga == 0.75
+    assert metrics.p95_latency_seconds == 4.5 and metrics.dead_letter_queue_size == 1
+
+
+def test_queue_status_groups_by_status_once() -> None:
+    oldest, newest = datetime(2026, 1, 1, 8), datetime(2026, 1, 1, 9)
+    session = RecordingSession(rows=[("pending", 2, oldest, newest), ("dead", 1, oldest, oldest)])
+
+    queue = ERPMonitoringService(session).get_queue_status()
+
+    (stmt,) = session.statements
+    assert compiled(stmt).endswith("FROM erp_outbox GROUP BY erp_outbox.status")
+    assert (queue.pending_count, queue.in_progress_count, queue.dead_count) == (2, 0, 1)
+    assert (queue.oldest_pending_at, queue.newest_pending_at) == (oldest, newest)
+    assert queue.total_queue_size == 2 and queue.backlog_hours > 0
+
+
+@pytest.fixture(scope="module")
+def postgres_dsn() -> str:
+    if shutil.which("docker") is None:
+        pytest.skip("Docker is required to run Postgres test container")
+    with PostgresContainer("postgres:15-alpine") as container:
+        yield container.get_connection_url()
+
+
+@pytest.fixture()
+def session_factory(postgres_dsn: str):
+    engine = build_engine(postgres_dsn)
+    Base.metadata.create_all(engine)
+    try:
+        yield create_session_factory(engine)
+    finally:
+        Base.metadata.drop_all(engine)
+
+
+def _record(status: OutboxStatus, attempts: int, created_at: datetime, latency: float | None = None):
+    return ERPOutboxRecord(
+        tenant_id=uuid4(),
+        idempotency_key=uuid4().hex,
+        event_type="recipe.sync",
+        payload={},
+        status=status.value,
+        attempts=attempts,
+        next_run_at=created_at,
+        created_at=created_at,
+        processed_at=created_at + timedelta(seconds=latency) if latency is not None else None,
+    )
+
+
+def test_aggregates_execute_on_postgres(session_factory) -> None:
+    now = datetime.utcnow()
+    records = [_record(OutboxStatus.COMPLETED, 1, now - timedelta(minutes=10), latency) for latency in (1, 2, 3, 4)]
+    records += [
+        _record(OutboxStatus.COMPLETED, 3, now - timedelta(minutes=5), 10),
+        _record(OutboxStatus.PENDING, 2, now - timedelta(minutes=30)),
+        _record(OutboxStatus.DEAD, 5, now - timedelta(minutes=20)),
+        _record(OutboxStatus.COMPLETED, 1, now - timedelta(days=3), 100),  # outside the window
+    ]
+    with session_scope(session_factory) as session:
+        session.add_all(records)
+
+    with session_scope(session_factory) as session:
+        service = ERPMonitoringService(session)
+        metrics = service.get_metrics(hours=24)
+        queue = service.get_queue_status()
+
+    assert (metrics.total_processed, metrics.total_succeeded, metrics.total_failed) == (7, 5, 2)
+    assert metrics.avg_latency_seconds == pytest.approx(4.0)
+    assert metrics.p50_latency_seconds == pytest.approx(3.0)
+    assert metrics.p99_latency_seconds == pytest.approx(9.76)
+    assert metrics.retry_metrics.total_retries == 2 + 1 + 4
+    assert metrics.retry_metrics.sagas_with_retries == 3
+    assert metrics.retry_metrics.max_retries_count == 5
+    assert metrics.retry_metrics.max_retries_saga_id == records[6].saga_id
+    assert metrics.dead_letter_queue_size == 1
+    assert (queue.pending_count, queue.completed_count, queue.dead_count) == (1, 6, 1)
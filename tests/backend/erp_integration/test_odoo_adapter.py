@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any
+
+from backend.erp_integration.adapters.odoo_adapter import OdooAdapter, OdooConfig
+
+
+class FakeOdooConnection:
+    """In-memory stand-in that evaluates the simple domains the adapter uses."""
+
+    def __init__(self) -> None:
+        self.records: dict[str, list[dict[str, Any]]] = {
+            "product.product": [],
+            "stock.production.lot": [],
+            "stock.quant": [],
+            "mrp.bom": [],
+        }
+        self.calls: list[tuple[str, str]] = []
+        self._next_id = 100
+
+    def seed(self, model: str, **values: Any) -> int:
+        self._next_id += 1
+        self.records[model].append({"id": self._next_id, **values})
+        return self._next_id
+
+    @staticmethod
+    def _field(record: dict[str, Any], name: str) -> Any:
+        value = record.get(name, False)
+        return value[0] if isinstance(value, list) else value
+
+    def _matches(self, record: dict[str, Any], domain: list) -> bool:
+        for name, operator, expected in domain:
+            value = self._field(record, name)
+            if operator == "=" and value != expected:
+                return False
+            if operator == "in" and value not in expected:
+                return False
+        return True
+
+    def search_read(self, model: str, domain: list, fields: list[str]) -> list[dict[str, Any]]:
+        self.calls.append(("search_read", model))
+        return [
+            {name: record.get(name, False) for name in ["id", *fields]}
+            for record in self.records[model]
+            if self._matches(record, domain)
+        ]
+
+    def create(self, model: str, values: dict[str, Any]) -> int:
+        self.calls.append(("create", model))
+        return self.seed(model, **values)
+
+    def create_many(self, model: str, values_list: list[dict[str, Any]]) -> list[int]:
+        if not values_list:
+            return []
+        self.calls.append(("create", model))
+        return [self.seed(model, **values) for values in values_list]
+
+    def write(self, model: str, record_ids: list[int], values: dict[str, Any]) -> bool:
+        self.calls.append(("write", model))
+        for record in self.records[model]:
+            if record["id"] in record_ids:
+                record.update(values)
+        return True
+
+
+def _adapter(conn: FakeOdooConnection) -> OdooAdapter:
+    adapter = OdooAdapter(OdooConfig(url="https://odoo.test", database="db", username="u", password="p"))
+
+    @contextmanager
+    def connect():
+        yield conn
+
+    adapter.connect = connect  # type: ignore[method-assign]
+    return adapter
+
+
+def test_sync_inventory_resolves_in_bulk_with_constant_round_trips() -> None:
+    conn = FakeOdooConnection()
+    product_ids = {
+        code: conn.seed("product.product", default_code=code, product_tmpl_id=[1, code])
+        for code in (f"P-{i}" for i in range(200))
+    }
+    existing_lot = conn.seed("stock.production.lot", product_id=[product_ids["P-0"], "P-0"], name="LOT-A")
+    existing_quant = conn.seed(
+        "stock.quant", product_id=[product_ids["P-0"], "P-0"], location_id=8, lot_id=[existing_lot, "LOT-A"], quantity=1.0
+    )
+
+    items = [{"product_code": f"P-{i}", "quantity": 5.0} for i in range(1, 200)]
+    items.append({"product_code": "P-0", "quantity": 7.0, "lot_number": "LOT-A"})
+    items.append({"product_code": "P-1", "quantity": 3.0, "lot_number": "LOT-NEW"})
+    items.append({"product_code": "UNKNOWN", "quantity": 1.0})
+
+    result = _adapter(conn).sync_inventory(items, location_id=8, create_missing_products=True)
+
+    assert len(conn.calls) <= 8
+    assert result.items_processed == 202
+    assert result.items_updated == 1
+    # 1 missing product + 199 plain quants + 1 lot quant + the UNKNOWN quant
+    assert result.items_created == 202
+    assert next(q for q in conn.records["stock.quant"] if q["id"] == existing_quant)["quantity"] == 7.0
+    assert any(lot["name"] == "LOT-NEW" for lot in conn.records["stock.production.lot"])
+    assert any(p["default_code"] == "UNKNOWN" for p in conn.records["product.product"])
+
+
+def test_sync_bom_resolves_components_in_one_search() -> None:
+    conn = FakeOdooConnection()
+    conn.seed("product.product", default_code="FG-1", product_tmpl_id=[55, "FG-1"])
+    for code in ("RM-1", "RM-2"):
+        conn.seed("product.product", default_code=code, product_tmpl_id=[1, code])
+
+    result = _adapter(conn).sync_bom(
+        "FG-1",
+        [
+            {"product_code": "RM-1", "quantity": 2.0},
+            {"product_code": "RM-2", "quantity": 1.0},
+            {"product_code": "RM-MISSING", "quantity": 1.0},
+        ],
+    )
+
+    assert conn.calls == [("search_read", "product.product"), ("create", "mrp.bom")]
+    assert result["product_tmpl_id"] == 55
+    assert result["components_synced"] == 2
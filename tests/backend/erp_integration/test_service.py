@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
 from uuid import UUID, uuid4
 
 import pytest
 import shutil
-from sqlalchemy import select
+from sqlalchemy import select, update
 from testcontainers.postgres import PostgresContainer
 
 from backend.app.contracts import inventory, psra
@@ -14,8 +17,10 @@ from backend.app.db.session import build_engine, create_session_factory, session
 from backend.erp_integration import (
     ERPIntegrationService,
     FatalERPIntegrationError,
+    OutboxDispatcher,
     OutboxStatus,
 )
+from backend.erp_integration.service import _ClaimedEntry
 from backend.app.dal.models import ERPOutboxRecord
 
 
@@ -153,3 +158,183 @@ def test_process_retry_then_success(service) -> None:
     assert result is not None
     assert result.attempts == 2
 
+
+
+class BulkDummyGateway(DummyGateway):
+    def __init__(self) -> None:
+        super().__init__()
+        self.bulk_calls: list[tuple[UUID, list[str]]] = []
+        self.reject_codes: set[str] = set()
+
+    def upsert_recipes(
+        self, *, tenant_id: UUID, commands: list[inventory.RecipeSyncCommand]
+    ) -> list[str | None | Exception]:
+        self.bulk_calls.append((tenant_id, [c.recipe.recipe_code for c in commands]))
+        return [
+            FatalERPIntegrationError("rejected")
+            if command.recipe.recipe_code in self.reject_codes
+            else f"ERP-{command.recipe.recipe_code}"
+            for command in commands
+        ]
+
+
+def _make_tenant_command(tenant_id: UUID, recipe_code: str) -> inventory.RecipeSyncCommand:
+    command = _make_command()
+    recipe = command.recipe.model_copy(update={"recipe_code": recipe_code})
+    return command.model_copy(
+        update={"tenant_id": tenant_id, "idempotency_key": f"sync-{recipe_code}", "recipe": recipe}
+    )
+
+
+def test_process_pending_uses_bulk_gateway_per_tenant(postgres_dsn: str) -> None:
+    engine = build_engine(postgres_dsn)
+    Base.metadata.create_all(engine)
+    session_factory = create_session_factory(engine)
+    gateway = BulkDummyGateway()
+    gateway.reject_codes = {"RCP-B-1"}
+    svc = ERPIntegrationService(session_factory, gateway, bulk_size=2)
+    try:
+        tenant_a, tenant_b = uuid4(), uuid4()
+        entries = [
+            svc.enqueue_recipe_sync(_make_tenant_command(tenant_a, f"RCP-A-{i}"))
+            for i in range(3)
+        ] + [svc.enqueue_recipe_sync(_make_tenant_command(tenant_b, "RCP-B-1"))]
+
+        summary = svc.process_pending(limit=10)
+
+        assert summary.processed == 3
+        assert summary.failed == 1
+        assert gateway.calls == []
+        assert sorted(len(codes) for _, codes in gateway.bulk_calls) == [1, 1, 2]
+        assert {tenant for tenant, _ in gateway.bulk_calls} == {tenant_a, tenant_b}
+
+        assert svc.get_entry(entries[0].saga_id).status is OutboxStatus.COMPLETED
+        assert svc.get_result(entries[2].saga_id).external_recipe_id == "ERP-RCP-A-2"
+        dead = svc.get_entry(entries[3].saga_id)
+        assert dead.status is OutboxStatus.DEAD
+        assert dead.attempts == 1
+        assert dead.last_error == "rejected"
+    finally:
+        Base.metadata.drop_all(engine)
+
+
+def test_dispatcher_wakes_on_enqueue_notify(postgres_dsn: str) -> None:
+    engine = build_engine(postgres_dsn)
+    Base.metadata.create_all(engine)
+    gateway = DummyGateway()
+    svc = ERPIntegrationService(create_session_factory(engine), gateway)
+    dispatcher = OutboxDispatcher(svc, engine, max_idle_seconds=30)
+    dispatcher._listen()
+    try:
+        assert dispatcher.seconds_until_due() == 30
+        assert dispatcher.wait(0.2) is False
+
+        entry = svc.enqueue_recipe_sync(_make_command())
+
+        assert dispatcher.wait(5) is True
+        assert dispatcher.seconds_until_due() == 0
+        assert dispatcher.drain() == 1
+        assert svc.get_entry(entry.saga_id).status is OutboxStatus.COMPLETED
+        assert svc.next_due_at() is None
+    finally:
+        dispatcher._close()
+        Base.metadata.drop_all(engine)
+
+
+def test_stale_worker_outcome_does_not_overwrite_reclaimed_row(service) -> None:
+    svc, gateway, session_factory = service
+    entry = svc.enqueue_recipe_sync(_make_command())
+    stale_claim = svc._claim_batch(limit=5)
+
+    # The first worker stalls past the claim timeout; a second one reclaims and completes the row
+    with session_scope(session_factory) as session:
+        session.execute(
+            update(ERPOutboxRecord).values(
+                processing_started_at=datetime.utcnow() - timedelta(seconds=svc.CLAIM_TIMEOUT_SECONDS + 1)
+            )
+        )
+    assert svc.process_pending(limit=5).processed == 1
+
+    late = svc._record_outcomes(stale_claim, {entry.saga_id: RuntimeError("late failure")})
+
+    assert (late.processed, late.failed, late.superseded) == (0, 0, 1)
+    stored = svc.get_entry(entry.saga_id)
+    assert stored.status is OutboxStatus.COMPLETED
+    assert stored.last_error is None
+
+
+class SlowGateway:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.running: Counter[UUID] = Counter()
+        self.peak_total = 0
+        self.peak_by_tenant: Counter[UUID] = Counter()
+
+    def upsert_recipe(self, *, tenant_id: UUID, command: inventory.RecipeSyncCommand) -> str:
+        with self._lock:
+            self.running[tenant_id] += 1
+            self.peak_total = max(self.peak_total, sum(self.running.values()))
+            self.peak_by_tenant[tenant_id] = max(self.peak_by_tenant[tenant_id], self.running[tenant_id])
+        time.sleep(0.05)
+        with self._lock:
+            self.running[tenant_id] -= 1
+        return f"ERP-{command.recipe.recipe_code}"
+
+
+def test_busy_tenant_does_not_block_the_dispatch_pool() -> None:
+    gateway = SlowGateway()
+    svc = ERPIntegrationService(None, gateway, max_concurrency=8, per_tenant_concurrency=2)
+    busy = uuid4()
+    tenants = [busy] * 6 + [uuid4() for _ in range(6)]
+    claimed = [
+        _ClaimedEntry(
+            record_id=uuid4(),
+            saga_id=uuid4(),
+            tenant_id=tenant_id,
+            attempts=1,
+            claimed_at=datetime.utcnow(),
+            command=_make_tenant_command(tenant_id, f"RCP-{i}"),
+            recipe_code=f"RCP-{i}",
+        )
+        for i, tenant_id in enumerate(tenants)
+    ]
+
+    outcomes = svc._dispatch(claimed)
+
+    assert len(outcomes) == 12
+    assert gateway.peak_by_tenant[busy] == 2
+    # Two lanes for the busy tenant plus one per other tenant fill the pool
+    assert gateway.peak_total == 8
+
+
+def test_dispatcher_reconnects_after_listen_connection_drops(postgres_dsn: str) -> None:
+    engine = build_engine(postgres_dsn)
+    Base.metadata.create_all(engine)
+    gateway = DummyGateway()
+    svc = ERPIntegrationService(create_session_factory(engine), gateway)
+    dispatcher = OutboxDispatcher(svc, engine, max_idle_seconds=30)
+    dispatcher.RECONNECT_BACKOFF_SECONDS = 0.05
+    thread = dispatcher.start_in_thread()
+    try:
+        deadline = time.monotonic() + 5
+        while dispatcher._connection is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        dropped = dispatcher._connection
+        with engine.connect() as conn:
+            conn.exec_driver_sql("SELECT pg_terminate_backend(%s)", (dropped.get_backend_pid(),))
+
+        deadline = time.monotonic() + 5
+        while dispatcher._connection in (None, dropped) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert thread.is_alive()
+        assert dispatcher._connection not in (None, dropped)
+
+        entry = svc.enqueue_recipe_sync(_make_command())
+        deadline = time.monotonic() + 5
+        while svc.get_entry(entry.saga_id).status is not OutboxStatus.COMPLETED:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+    finally:
+        dispatcher.stop()
+        thread.join(timeout=5)
+        Base.metadata.drop_all(engine)
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+
+import pika
+import pytest
+
+from backend.app.events.event_bus import EventBus, EventPublishError, PikaChannel
+from backend.app.events.event_log import EventLog
+from backend.app.events.memory_broker import InMemoryBroker
+
+QUEUE = "psra_certificatecreated_queue"
+
+
+@pytest.fixture()
+def broker() -> InMemoryBroker:
+    return InMemoryBroker()
+
+
+@pytest.fixture(autouse=True)
+def _event_log_dir(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+
+
+def _bus(broker: InMemoryBroker, **kwargs) -> EventBus:
+    kwargs.setdefault("retry_backoff", 0)
+    kwargs.setdefault("event_log", EventLog("events"))
+    return EventBus(transport=broker, **kwargs)
+
+
+def test_publish_reuses_connection_and_declares_topology_once(broker) -> None:
+    bus = _bus(broker)
+    for i in range(50):
+        bus.publish("CertificateCreated", {"certificate_id": str(i)})
+    declarations = broker.declarations
+
+    bus.publish("CertificateCreated", {"certificate_id": "last"})
+
+    assert broker.connections == 1
+    assert broker.declarations == declarations
+    assert [m["data"]["certificate_id"] for m in broker.messages(QUEUE)][-1] == "last"
+    assert len(broker.messages(QUEUE)) == 51
+
+
+def test_publish_many_waits_for_confirms_once_per_batch(broker) -> None:
+    bus = _bus(broker, confirm_batch_size=100)
+
+    event_ids = bus.publish_many(
+        ("CertificateCreated", {"certificate_id": str(i)}) for i in range(250)
+    )
+
+    assert len(event_ids) == 250
+    assert broker.confirm_waits == 3
+    assert [m["event_id"] for m in broker.messages(QUEUE)] == event_ids
+
+
+def test_publish_reconnects_and_redeclares_after_connection_drop(broker) -> None:
+    bus = _bus(broker)
+    bus.publish("CertificateCreated", {"certificate_id": "1"})
+    declarations = broker.declarations
+
+    broker.fail_next()
+    bus.publish("CertificateCreated", {"certificate_id": "2"})
+    broker.drop_connections()
+    bus.publish("CertificateCreated", {"certificate_id": "3"})
+
+    assert broker.connections == 3
+    assert broker.declarations == 3 * declarations
+    assert [m["data"]["certificate_id"] for m in broker.messages(QUEUE)] == ["1", "2", "3"]
+
+
+def test_nacked_batches_are_retried_then_reported(broker) -> None:
+    bus = _bus(broker, max_retries=2)
+
+    broker.nack_next(2)
+    bus.publish("CertificateCreated", {"certificate_id": "1"})
+    assert len(broker.messages(QUEUE)) == 1
+
+    broker.nack_next(3)
+    with pytest.raises(EventPublishError):
+        bus.publish("CertificateCreated", {"certificate_id": "2"})
+
+
+def test_concurrent_publishers_share_bounded_pool(broker) -> None:
+    bus = _bus(broker, pool_size=3)
+
+    def worker(n: int) -> None:
+        for i in range(100):
+            bus.publish("ValidationCompleted", {"validation_id": f"{n}-{i}"})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert broker.connections <= 3
+    assert len(broker.messages("psra_validationcompleted_queue")) == 800
+
+
+def test_replay_streams_logged_events_with_original_ids(broker) -> None:
+    bus = _bus(broker, confirm_batch_size=10)
+    event_ids = bus.publish_many(
+        ("CertificateCreated", {"certificate_id": str(i)}) for i in range(25)
+    )
+    bus.publish("ValidationCompleted", {"validation_id": "v1"})
+
+    assert bus.replay_events(start_seq=5, end_seq=14) == 10
+    assert [m["event_id"] for m in broker.messages(QUEUE)][25:] == event_ids[5:15]
+
+    assert bus.replay_events(event_ids=[event_ids[0]]) == 1
+    assert bus.replay_events(event_ids=[event_ids[3], event_ids[3], "missing"]) == 1
+    assert len(bus.replay_store) == 26
+
+
+class _FakeImplChannel:
+    def confirm_delivery(self, ack_nack_callback) -> None:
+        self.on_confirm = ack_nack_callback
+
+
+class _FakeBlockingChannel:
+    is_open = True
+
+    def __init__(self, nack: bool = False, fail_publish: bool = False) -> None:
+        self._impl = _FakeImplChannel()
+        self.published: list = []
+        self._nack = nack
+        self._fail_publish = fail_publish
+
+    def exchange_declare(self, **kwargs) -> None:
+        pass
+
+    queue_declare = queue_bind = exchange_declare
+
+    def basic_publish(self, **kwargs) -> None:
+        if self._fail_publish:
+            raise RuntimeError("encoder blew up")
+        self.published.append(kwargs["body"])
+
+
+class _FakeConnection:
+    is_open = True
+
+    def __init__(self, channel: _FakeBlockingChannel) -> None:
+        self._channel = channel
+        self.drains = 0
+
+    def channel(self) -> _FakeBlockingChannel:
+        return self._channel
+
+    def process_data_events(self, time_limit: float) -> None:
+        # The broker settles everything published so far with one multiple=True frame
+        self.drains += 1
+        method = pika.spec.Basic.Nack if self._channel._nack else pika.spec.Basic.Ack
+        tag = len(self._channel.published)
+        self._channel._impl.on_confirm(SimpleNamespace(method=method(delivery_tag=tag, multiple=True)))
+
+    def close(self) -> None:
+        self.is_open = False
+
+
+def _pika_bus(*channels: _FakeBlockingChannel, **kwargs):
+    pending = list(channels)
+    connections: list = []
+
+    class Transport:
+        def connect(self) -> PikaChannel:
+            connections.append(_FakeConnection(pending.pop(0)))
+            return PikaChannel(connections[-1])
+
+    kwargs.setdefault("retry_backoff", 0)
+    return EventBus(transport=Transport(), event_log=EventLog("events"), **kwargs), connections
+
+
+def test_pika_channel_settles_confirms_once_per_batch() -> None:
+    channel = _FakeBlockingChannel()
+    bus, connections = _pika_bus(channel, confirm_batch_size=100)
+
+    bus.publish_many(("CertificateCreated", {"certificate_id": str(i)}) for i in range(250))
+
+    assert len(channel.published) == 250
+    # Publishes never waited; each batch was settled by a single drain
+    assert connections[0].drains == 3
+
+
+def test_pika_channel_nack_retries_batch_on_fresh_connection() -> None:
+    first, second = _FakeBlockingChannel(nack=True), _FakeBlockingChannel()
+    bus, connections = _pika_bus(first, second)
+
+    bus.publish("CertificateCreated", {"certificate_id": "1"})
+
+    assert not connections[0].is_open
+    assert len(second.published) == 1
+
+
+def test_non_amqp_publish_error_gives_back_the_pool_slot() -> None:
+    bus, connections = _pika_bus(
+        _FakeBlockingChannel(fail_publish=True), _FakeBlockingChannel(), pool_size=1, confirm_timeout=0.1
+    )
+
+    with pytest.raises(RuntimeError):
+        bus.publish("CertificateCreated", {"certificate_id": "1"})
+    bus.publish("CertificateCreated", {"certificate_id": "2"})
+
+    assert not connections[0].is_open
+    assert len(connections) == 2
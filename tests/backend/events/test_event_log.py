@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import multiprocessing
+
+from backend.app.events.event_log import EventLog
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _payload(i: int) -> bytes:
+    return f'{{"n": {i}}}'.encode() + b" " * 90
+
+
+def _fill(log: EventLog, clock: FakeClock, count: int) -> None:
+    for i in range(count):
+        clock.now = 1_000.0 + i
+        log.append(_payload(i))
+
+
+def test_range_reads_by_sequence_and_time_across_segments(tmp_path) -> None:
+    clock = FakeClock()
+    log = EventLog(tmp_path, segment_bytes=2_000, index_interval_bytes=300, clock=clock)
+    _fill(log, clock, 200)
+
+    assert len(list(tmp_path.glob("*.log"))) > 5
+    assert [r.seq for r in log.read(start_seq=37, end_seq=41)] == [37, 38, 39, 40, 41]
+    assert [r.payload for r in log.read(start_seq=199)] == [_payload(199)]
+    assert [r.seq for r in log.read(since=1_150.0, until=1_152.5)] == [150, 151, 152]
+    assert sum(1 for _ in log.read()) == len(log) == 200
+
+
+def test_retention_drops_oldest_segments_by_size_and_age(tmp_path) -> None:
+    clock = FakeClock()
+    log = EventLog(tmp_path, segment_bytes=2_000, retention_bytes=6_000, clock=clock)
+    _fill(log, clock, 200)
+
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.log")) <= 6_000 + 2_000
+    assert log.first_seq > 0
+    assert next(log.read()).seq == log.first_seq
+
+    log.retention_seconds = 10
+    clock.now += 100
+    log.enforce_retention()
+    assert len(list(tmp_path.glob("*.log"))) == 1
+    assert log.next_seq == 200
+
+
+def test_reopen_truncates_torn_tail_and_continues_sequence(tmp_path) -> None:
+    clock = FakeClock()
+    log = EventLog(tmp_path, segment_bytes=2_000, clock=clock)
+    _fill(log, clock, 30)
+    log.close()
+
+    active = max(tmp_path.glob("*.log"))
+    with active.open("ab") as handle:
+        handle.write(b"\x00\x00\x00\x00\x00\x00\x00\x1e partial")
+
+    reopened = EventLog(tmp_path, segment_bytes=2_000, clock=clock)
+    assert reopened.next_seq == 30
+    assert reopened.append(b"after-crash") == 30
+    assert [r.payload for r in reopened.read(start_seq=29)] == [_payload(29), b"after-crash"]
+
+
+def test_instances_sharing_a_directory_allocate_distinct_sequences(tmp_path) -> None:
+    first = EventLog(tmp_path, segment_bytes=2_000)
+    second = EventLog(tmp_path, segment_bytes=2_000)
+
+    seqs = []
+    for i in range(60):
+        seqs.append((first if i % 3 else second).append(_payload(i)))
+
+    assert seqs == list(range(60))
+    assert [r.payload for r in second.read()] == [_payload(i) for i in range(60)]
+    assert len(first) == len(second) == 60
+
+
+def test_interleaved_instances_catch_up_without_reloading_every_segment(tmp_path, monkeypatch) -> None:
+    clock = FakeClock()
+    first = EventLog(tmp_path, segment_bytes=2_000, retention_bytes=60_000, index_interval_bytes=300, clock=clock)
+    second = EventLog(tmp_path, segment_bytes=2_000, retention_bytes=60_000, index_interval_bytes=300, clock=clock)
+    _fill(first, clock, 400)
+    second.append(_payload(400))
+    assert len(second._segments) > 20
+
+    opens = []
+    original_open = EventLog._open
+    monkeypatch.setattr(EventLog, "_open", lambda self: (opens.append(self), original_open(self)))
+    seqs = [(first if i % 2 else second).append(_payload(i)) for i in range(401, 1001)]
+
+    # Rolls and retention by one instance are picked up by the other without a rebuild
+    assert opens == []
+    assert seqs == list(range(401, 1001))
+    assert [s.base_seq for s in first._segments] == [s.base_seq for s in second._segments]
+    on_disk = sorted(int(path.stem) for path in tmp_path.glob("*.log"))
+    assert on_disk[0] > 0
+    assert [s.base_seq for s in second._segments] == on_disk
+    assert [r.seq for r in first.read(start_seq=990)] == list(range(990, 1001))
+    assert [r.payload for r in second.read(start_seq=995)] == [_payload(i) for i in range(995, 1001)]
+
+
+def _append_from_child(log: EventLog, worker: int) -> None:
+    for i in range(100):
+        log.append(f"{worker}-{i}".encode())
+
+
+def test_forked_workers_append_to_one_log_without_collisions(tmp_path) -> None:
+    log = EventLog(tmp_path, segment_bytes=1_000)
+    log.append(b"parent")
+
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_append_from_child, args=(log, n)) for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    records = list(log.read())
+    assert [r.seq for r in records] == list(range(401))
+    assert sorted(r.payload for r in records[1:]) == sorted(
+        f"{n}-{i}".encode() for n in range(4) for i in range(100)
+    )
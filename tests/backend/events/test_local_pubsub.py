@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from backend.app.events.local_pubsub import LocalPubSub
+
+
+def test_publish_reaches_subscribers_until_they_unsubscribe() -> None:
+    pubsub = LocalPubSub()
+    received: list[tuple[str, object]] = []
+
+    def failing(message: object) -> None:
+        raise RuntimeError("boom")
+
+    pubsub.subscribe("tenants.changed", failing)
+    unsubscribe = pubsub.subscribe("tenants.changed", lambda message: received.append(("a", message)))
+    pubsub.subscribe("other", lambda message: received.append(("other", message)))
+
+    assert pubsub.publish("tenants.changed", {"tenant_id": 1}) == 2
+    unsubscribe()
+    assert pubsub.publish("tenants.changed", {"tenant_id": 2}) == 1
+    assert pubsub.publish("unknown") == 0
+
+    assert received == [("a", {"tenant_id": 1})]
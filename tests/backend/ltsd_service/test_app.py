@@ -29,6 +29,7 @@ from backend.ltsd_service.app import (
     Party,
     create_app,
 )
+from backend.services.certificate_store import CertificateStore
 
 
 FIXTURE_RULE = Path("psr/rules/hs39/ceta_polymer_rule.yaml")
@@ -40,15 +41,27 @@ class FakeDAL:
     def __init__(self, rule: PSRARule) -> None:
         self._rule = rule
         self.persisted: Dict[UUID, EvaluationOutput] = {}
+        self.calls: List[str] = []
 
     def get_rule(self, rule_id: str) -> PSRARule:
+        self.calls.append("get_rule")
         if rule_id != self._rule.metadata.rule_id:
             raise NoResultFound(rule_id)
         return self._rule
 
+    def get_rules(self, rule_ids) -> Dict[str, PSRARule]:
+        self.calls.append("get_rules")
+        return {rule_id: self._rule for rule_id in rule_ids if rule_id == self._rule.metadata.rule_id}
+
     def persist_verdict(self, evaluation: EvaluationOutput) -> None:
+        self.calls.append("persist_verdict")
         self.persisted[evaluation.verdict.evaluation_id] = evaluation
 
+    def persist_verdicts(self, evaluations: List[EvaluationOutput]) -> None:
+        self.calls.append("persist_verdicts")
+        for evaluation in evaluations:
+            self.persisted[evaluation.verdict.evaluation_id] = evaluation
+
     def fetch_verdict(self, evaluation_id: str) -> EvaluationOutput:
         identifier = UUID(evaluation_id)
         try:
@@ -73,8 +86,13 @@ def ledger() -> InMemoryLedger:
 
 
 @pytest.fixture()
-def app(dal: FakeDAL, ledger: InMemoryLedger):
-    return create_app(dal=dal, ledger=ledger)
+def certificate_store(tmp_path: Path) -> CertificateStore:
+    return CertificateStore(tmp_path / "certificates")
+
+
+@pytest.fixture()
+def app(dal: FakeDAL, ledger: InMemoryLedger, certificate_store: CertificateStore):
+    return create_app(dal=dal, ledger=ledger, certificate_store=certificate_store)
 
 
 @pytest.fixture()
@@ -218,6 +236,49 @@ def test_evaluate_endpoint_returns_404_for_unknown_rule(
     assert response.json()["detail"] == "rule_not_found"
 
 
+def test_evaluate_batch_resolves_ledgers_and_persists_in_bulk(
+    client: TestClient,
+    dal: FakeDAL,
+    ledger: InMemoryLedger,
+    base_context: EvaluationContext,
+    rule: PSRARule,
+) -> None:
+    missing_rule = rule.metadata.rule_id[:-3] + "999"
+    items = [
+        {
+            "rule_id": rule.metadata.rule_id,
+            "evaluation_input": _serialize_input(_qualified_input(base_context)),
+        },
+        {
+            "rule_id": missing_rule,
+            "evaluation_input": _serialize_input(_qualified_input(base_context)),
+        },
+        {
+            "rule_id": rule.metadata.rule_id,
+            "evaluation_input": _serialize_input(_disqualified_input(base_context)),
+        },
+    ]
+
+    response = client.post("/evaluate:batch", json={"items": items})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert [r["status_code"] for r in results] == [200, 404, 200]
+    assert results[1]["detail"] == "rule_not_found"
+    assert results[0]["evaluation"]["verdict"]["status"] == VerdictStatus.QUALIFIED.value
+    assert results[2]["evaluation"]["verdict"]["status"] == VerdictStatus.DISQUALIFIED.value
+
+    assert dal.calls == ["get_rules", "persist_verdicts"]
+    assert [ref for ref, _ in ledger.evaluations] == [
+        results[0]["ledger_reference"],
+        results[2]["ledger_reference"],
+    ]
+    for result in (results[0], results[2]):
+        persisted = dal.persisted[UUID(result["evaluation"]["verdict"]["evaluation_id"])]
+        assert persisted.verdict.ledger_reference == result["ledger_reference"]
+
+
 def test_generate_certificate_streams_pdf_with_hash_headers(
     client: TestClient,
     dal: FakeDAL,
@@ -275,6 +336,79 @@ def test_generate_certificate_streams_pdf_with_hash_headers(
     assert record.evaluation_id == request.evaluation_id
 
 
+def _certificate_request(evaluation_id: str) -> Dict:
+    return GenerateCertificateRequest(
+        evaluation_id=UUID(evaluation_id),
+        certificate_code="EUR-MED",
+        supplier=Party(
+            name="Acme Polymers",
+            street="Industrial Way 12",
+            city="Rotterdam",
+            postal_code="3011",
+            country="NL",
+        ),
+        customer=Party(
+            name="Northern Plastics",
+            street="80 Maple Street",
+            city="Toronto",
+            postal_code="M5H",
+            country="CA",
+        ),
+        valid_from=date(2025, 1, 1),
+        valid_to=date(2025, 12, 31),
+        signatory_name="Sanne de Vries",
+        signatory_title="Head of Compliance",
+        issue_location="Rotterdam",
+    ).model_dump(mode="json")
+
+
+def test_generate_certificate_renders_once_and_serves_from_store(
+    client: TestClient,
+    ledger: InMemoryLedger,
+    base_context: EvaluationContext,
+    rule: PSRARule,
+) -> None:
+    eval_response = client.post(
+        "/evaluate",
+        json={
+            "rule_id": rule.metadata.rule_id,
+            "evaluation_input": _serialize_input(_qualified_input(base_context)),
+        },
+    )
+    evaluation_id = eval_response.json()["evaluation"]["verdict"]["evaluation_id"]
+    payload = _certificate_request(evaluation_id)
+
+    first = client.post("/generate", json=payload)
+    second = client.post("/generate", json=payload)
+
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["x-ledger-reference"] == first.headers["x-ledger-reference"]
+    assert len(ledger.certificates) == 1
+
+    etag = first.headers["etag"]
+    assert etag == f'"{first.headers["x-notary-hash"]}"'
+    download_url = f"/certificates/{first.headers['x-certificate-key']}"
+
+    download = client.get(download_url)
+    assert download.status_code == 200
+    assert download.content == first.content
+
+    not_modified = client.get(download_url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    partial = client.get(download_url, headers={"Range": "bytes=0-7"})
+    assert partial.status_code == 206
+    assert partial.content == first.content[:8]
+    assert partial.headers["content-range"] == f"bytes 0-7/{len(first.content)}"
+
+    unsatisfiable = client.get(download_url, headers={"Range": f"bytes={len(first.content)}-"})
+    assert unsatisfiable.status_code == 416
+
+    assert client.get(f"/certificates/{'0' * 64}").status_code == 404
+
+
 def test_generate_certificate_rejects_disqualified_verdict(
     client: TestClient,
     dal: FakeDAL,
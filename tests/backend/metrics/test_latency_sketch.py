@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+
+from prometheus_client import CollectorRegistry, generate_latest
+
+from backend.app.metrics.performance import LatencySketchCollector
+from backend.app.metrics.sketch import DDSketch, WindowedSketch
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _exact(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_stay_within_relative_accuracy_and_merge_losslessly() -> None:
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-3, 1.2) for _ in range(20_000)] + [0.0] * 50
+    whole, left, right = DDSketch(0.01), DDSketch(0.01), DDSketch(0.01)
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+    left.merge(right)
+
+    for q in (0.5, 0.95, 0.99, 0.999):
+        exact = _exact(values, q)
+        assert abs(whole.quantile(q) - exact) <= 0.01 * exact + 1e-12
+        assert left.quantile(q) == whole.quantile(q)
+    assert whole.quantile(0.001) == 0.0
+    assert left.count == whole.count and left.max == whole.max
+
+    restored = DDSketch.from_dict(json.loads(json.dumps(whole.to_dict())))
+    assert restored.quantile(0.99) == whole.quantile(0.99)
+    assert len(whole.to_dict()["bins"]) < 1000
+
+
+def test_windowed_sketch_drops_expired_slices() -> None:
+    clock = FakeClock()
+    window = WindowedSketch(window_seconds=60, slices=3, clock=clock)
+
+    window.add(1.0)
+    clock.now += 20
+    window.add(2.0)
+    assert window.merged().count == 2
+
+    clock.now += 45
+    window.add(3.0)
+    merged = window.merged()
+    assert merged.count == 2
+    assert merged.min == 2.0
+
+
+def test_collector_exports_summary_and_merges_peer_snapshots(tmp_path) -> None:
+    peer = LatencySketchCollector(window_seconds=60, slices=3)
+    for _ in range(100):
+        peer.observe("/api/a", 2.0)
+    (tmp_path / "999999.json").write_text(json.dumps(peer.snapshot()))
+
+    collector = LatencySketchCollector(window_seconds=60, slices=3, share_dir=str(tmp_path))
+    for _ in range(100):
+        collector.observe("/api/a", 0.01)
+    registry = CollectorRegistry()
+    registry.register(collector)
+
+    output = generate_latest(registry).decode()
+    samples = {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in output.splitlines()
+        if line and not line.startswith("#")
+    }
+
+    # Window-scoped values are gauges; no summary _count/_sum that would read as cumulative
+    assert "# TYPE http_request_duration_window_seconds gauge" in output
+    assert "_count{" not in output and "summary" not in output
+    assert samples['http_request_duration_window_observations{endpoint="/api/a"}'] == 200
+    assert abs(samples['http_request_duration_window_total_seconds{endpoint="/api/a"}'] - 201.0) < 1e-6
+    assert abs(samples['http_request_duration_window_seconds{endpoint="/api/a",quantile="0.99"}'] - 2.0) < 0.02
+    assert abs(samples['http_response_time_metrics_ms{endpoint="/api/a",metric="p50"}'] - 10.0) < 0.1
+
+
+def test_high_p95_alert_is_logged_once_per_interval(caplog) -> None:
+    clock = FakeClock()
+    collector = LatencySketchCollector(window_seconds=600, slices=3, alert_interval=300, clock=clock)
+    for _ in range(20):
+        collector.observe("/api/slow", 2.5)
+        collector.observe("/api/fast", 0.01)
+    registry = CollectorRegistry()
+    registry.register(collector)
+
+    def alerts() -> list:
+        return [r.endpoint for r in caplog.records if r.getMessage() == "ALERT: High p95 latency"]
+
+    with caplog.at_level(logging.ERROR, logger="backend.app.metrics.performance"):
+        for _ in range(10):
+            generate_latest(registry)
+            clock.now += 15
+        assert alerts() == ["/api/slow"]
+
+        clock.now += 300
+        generate_latest(registry)
+        assert alerts() == ["/api/slow", "/api/slow"]
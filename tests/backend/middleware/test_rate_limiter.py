@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+pytest.importorskip("lupa")  # fakeredis needs it to run Lua scripts
+import fakeredis
+
+from backend.app.core.rate_limit_config import RateLimitConfig
+from backend.app.middleware.rate_limiter import (
+    LocalBuckets,
+    RateLimiter,
+    RateLimitingMiddleware,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_redis_gcra_allows_burst_then_paces_requests() -> None:
+    limiter = RateLimiter(fakeredis.FakeAsyncRedis())
+
+    async def run():
+        decisions = [await limiter.hit("ratelimit:t:ip:1:default", 3, 60) for _ in range(4)]
+        other = await limiter.hit("ratelimit:t:ip:2:default", 3, 60)
+        return decisions, other
+
+    decisions, other = asyncio.run(run())
+
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert [d.remaining for d in decisions] == [2, 1, 0, 0]
+    assert 19 < decisions[-1].retry_after <= 20
+    assert 59 < decisions[-1].reset_after <= 60
+    assert decisions[-1].headers()["Retry-After"] == "20"
+    assert other.allowed and other.remaining == 2
+
+
+def test_falls_back_to_local_buckets_while_redis_is_down() -> None:
+    server = fakeredis.FakeServer()
+    server.connected = False
+    clock = FakeClock()
+    limiter = RateLimiter(
+        fakeredis.FakeAsyncRedis(server=server),
+        fallback=LocalBuckets(clock=clock),
+        retry_interval=5,
+        clock=clock,
+    )
+
+    async def hits(count):
+        return [await limiter.hit("k", 2, 1) for _ in range(count)]
+
+    assert [d.allowed for d in asyncio.run(hits(3))] == [True, True, False]
+
+    # Tokens refill at limit/period on the local bucket too
+    clock.now += 0.5
+    assert [d.allowed for d in asyncio.run(hits(2))] == [True, False]
+
+    # Redis is retried once the retry interval has passed
+    server.connected = True
+    clock.now += 5
+    decision = asyncio.run(hits(1))[0]
+    assert decision.allowed and decision.remaining == 1
+
+
+def _limited_app(monkeypatch, authenticate=None) -> FastAPI:
+    monkeypatch.setattr(RateLimitConfig, "INTERNAL_IPS", [])
+    monkeypatch.setattr(RateLimitConfig, "CUSTOM_ENDPOINT_LIMITS", {"/limited": "2/minute"})
+    app = FastAPI()
+
+    @app.get("/limited")
+    async def limited():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitingMiddleware, limiter=RateLimiter(fakeredis.FakeAsyncRedis()))
+    if authenticate is not None:
+        # Added last, so it runs first, like the real auth middleware
+        @app.middleware("http")
+        async def auth(request, call_next):
+            authenticate(request)
+            return await call_next(request)
+
+    return app
+
+
+def test_middleware_sets_headers_and_ignores_unauthenticated_identity_headers(monkeypatch) -> None:
+    app = _limited_app(monkeypatch)
+
+    with TestClient(app) as client:
+        first = client.get("/limited", headers={"X-API-Key": "a"})
+        client.get("/limited", headers={"X-API-Key": "a"})
+        rejected = client.get("/limited", headers={"X-API-Key": "a"})
+        # Same client IP: rotating unverified key or tenant headers must not reset the bucket
+        other_key = client.get("/limited", headers={"X-API-Key": "b"})
+        other_tenant = client.get("/limited", headers={"X-Tenant-ID": "t2"})
+        bypass = client.get(
+            "/limited",
+            headers={"X-API-Key": "a", RateLimitConfig.ADMIN_BYPASS_HEADER: RateLimitConfig.ADMIN_BYPASS_SECRET},
+        )
+
+    assert first.status_code == 200
+    assert first.headers["RateLimit-Limit"] == "2"
+    assert first.headers["RateLimit-Remaining"] == "1"
+    assert first.headers["RateLimit-Policy"] == "2;w=60"
+    assert rejected.status_code == 429
+    assert rejected.headers["Retry-After"] == "30"
+    assert other_key.status_code == 429
+    assert other_tenant.status_code == 429
+    assert bypass.status_code == 200
+
+
+def test_middleware_limits_per_authenticated_api_key_and_tenant(monkeypatch) -> None:
+    def authenticate(request) -> None:
+        # Stand-in for auth/tenant middleware that verified the key
+        key = request.headers.get("X-API-Key")
+        if key in {"a", "b"}:
+            request.state.api_key_id = f"id-{key}"
+            request.state.tenant_id = "t1"
+
+    app = _limited_app(monkeypatch, authenticate)
+
+    with TestClient(app) as client:
+        key_a = [client.get("/limited", headers={"X-API-Key": "a"}).status_code for _ in range(3)]
+        key_b = client.get("/limited", headers={"X-API-Key": "b"})
+        anonymous = client.get("/limited", headers={"X-API-Key": "forged"})
+
+    assert key_a == [200, 200, 429]
+    assert key_b.status_code == 200
+    assert anonymous.status_code == 200
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.services.certificate_store import CertificateStore
+
+KEY = CertificateStore.key_for({"certificate": "ltsd-1"})
+
+
+def test_first_stored_render_wins_and_losing_blob_is_removed(tmp_path) -> None:
+    # Separate instances share no locks, like two workers on one volume
+    first, second = CertificateStore(tmp_path), CertificateStore(tmp_path)
+
+    winner = first.put(KEY, b"%PDF-render-a", {"ledger_reference": "ref-a"})
+    loser = second.put(KEY, b"%PDF-render-b", {"ledger_reference": "ref-b"})
+
+    assert loser == winner
+    assert loser.read() == b"%PDF-render-a"
+    assert loser.metadata == {"ledger_reference": "ref-a"}
+    assert [path.name for path in (tmp_path / KEY[:2]).glob("*.pdf")] == [winner.path.name]
+
+
+def test_concurrent_renders_across_stores_agree_on_bytes_and_sha(tmp_path) -> None:
+    workers = 8
+    barrier = threading.Barrier(workers)
+
+    def render_in_own_store(n: int):
+        def render():
+            barrier.wait()
+            return f"%PDF-render-{n}".encode(), {"ledger_reference": f"ref-{n}"}
+
+        return CertificateStore(tmp_path).get_or_create(KEY, render)
+
+    with ThreadPoolExecutor(workers) as pool:
+        results = list(pool.map(render_in_own_store, range(workers)))
+
+    certificate = results[0][0]
+    assert all(stored == certificate for stored, _ in results)
+    assert sum(created for _, created in results) == 1
+    assert hashlib.sha256(certificate.read()).hexdigest() == certificate.sha256
+    assert certificate.read().decode().split("-")[-1] == certificate.metadata["ledger_reference"].split("-")[-1]
+    assert CertificateStore(tmp_path).get(KEY) == certificate
+
+
+def test_reads_certificates_stored_before_blobs_were_named_by_sha(tmp_path) -> None:
+    directory = tmp_path / KEY[:2]
+    directory.mkdir()
+    (directory / f"{KEY}.pdf").write_bytes(b"%PDF-legacy")
+    (directory / f"{KEY}.json").write_text(json.dumps({
+        "sha256": hashlib.sha256(b"%PDF-legacy").hexdigest(), "size": 11, "metadata": {},
+    }))
+
+    assert CertificateStore(tmp_path).get(KEY).read() == b"%PDF-legacy"
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import shutil
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from testcontainers.postgres import PostgresContainer
+
+from backend.app.dal.models import LTSDRecord
+from backend.app.db.base import Base
+from backend.app.db.session import build_engine, create_session_factory
+from backend.models.ltsd_models import (
+    LTSDDeclaration,
+    LTSDListParams,
+    LTSDStatus,
+    LTSDType,
+    OriginAssessment,
+    OriginVerdict,
+    Party,
+    Product,
+)
+from backend.services.ltsd_management_service import LTSDManagementService
+
+TODAY = date(2026, 1, 10)
+
+
+@pytest.fixture(scope="module")
+def postgres_dsn() -> str:
+    if shutil.which("docker") is None:
+        pytest.skip("Docker is required to run Postgres test container")
+    with PostgresContainer("postgres:15-alpine") as container:
+        yield container.get_connection_url()
+
+
+@pytest.fixture()
+def session(postgres_dsn: str):
+    engine = build_engine(postgres_dsn)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with create_session_factory(engine)() as session:
+        yield session
+
+
+class RecordingService(LTSDManagementService):
+    def __init__(self, db_session) -> None:
+        super().__init__(db_session, webhook_service=object())
+        self.events: list[tuple[str, str, str]] = []
+
+    def _trigger_webhook(self, event_type, declaration, partner_id):
+        self.events.append((event_type, declaration.status.value, partner_id))
+
+
+def _declaration(status: LTSDStatus, valid_to: date, qualified: bool) -> LTSDDeclaration:
+    party = Party(name="Acme BV", street="Main 1", city="Rotterdam", postal_code="3011", country="NL")
+    assessment = None
+    if qualified:
+        assessment = OriginAssessment(
+            verdict=OriginVerdict.QUALIFIED,
+            confidence=0.9,
+            trade_agreements=["CETA"],
+            qualified_agreements=["CETA"],
+            explanation="qualified",
+        )
+    return LTSDDeclaration(
+        document_ref="LTSD-TEST-000001",
+        status=status,
+        ltsd_type=LTSDType.PREFERENTIAL,
+        supplier=party,
+        customer=party,
+        products=[Product(code="P1", description="Widget", hs_code="854140")],
+        assessment=assessment,
+        valid_from=valid_to - timedelta(days=365),
+        valid_to=valid_to,
+        signatory_name="Jan Jansen",
+        signatory_title="Director",
+        issue_location="Rotterdam",
+    )
+
+
+def _seed(service: LTSDManagementService) -> None:
+    for i in range(40):
+        status = LTSDStatus.REVOKED if i % 5 == 0 else LTSDStatus.ACTIVE
+        valid_to = TODAY + timedelta(days=(i % 7) - 3)
+        service._stage(_declaration(status, valid_to, qualified=i % 2 == 1), f"partner-{i % 3}")
+    service.db.commit()
+
+
+def test_check_expiry_sweeps_in_chunks_and_moves_counters(session) -> None:
+    service = RecordingService(session)
+    _seed(service)
+    due = session.scalar(
+        select(func.count())
+        .select_from(LTSDRecord)
+        .where(LTSDRecord.status == "active", LTSDRecord.valid_to <= TODAY)
+    )
+
+    chunks: list[list[LTSDDeclaration]] = []
+    count = service.check_expiry(today=TODAY, chunk_size=4, on_expired=chunks.append)
+    expired = [declaration for chunk in chunks for declaration in chunk]
+
+    assert count == len(expired) == due > 4
+    assert max(len(chunk) for chunk in chunks) == 4
+    assert len({declaration.id for declaration in expired}) == due
+    assert all(d.status == LTSDStatus.EXPIRED and d.valid_to <= TODAY for d in expired)
+    assert [d.valid_to for d in expired] == sorted(d.valid_to for d in expired)
+    assert len(service.events) == due
+    assert {event[:2] for event in service.events} == {("ltsd.expired", "expired")}
+    assert service.check_expiry(today=TODAY) == 0
+    assert session.scalar(
+        select(func.count()).where(LTSDRecord.status == "active", LTSDRecord.valid_to <= TODAY)
+    ) == 0
+
+    for partner_id in ("partner-0", "partner-1", "partner-2"):
+        stats = service.get_statistics(partner_id)
+        by_status = dict(
+            session.execute(
+                select(LTSDRecord.status, func.count())
+                .where(LTSDRecord.partner_id == partner_id)
+                .group_by(LTSDRecord.status)
+            ).all()
+        )
+        qualified = session.scalar(
+            select(func.count()).where(
+                LTSDRecord.partner_id == partner_id, LTSDRecord.agreements.any("CETA")
+            )
+        )
+        assert stats.by_status == by_status
+        assert stats.total_declarations == sum(by_status.values())
+        assert stats.by_agreement.get("CETA", 0) == qualified
+        assert stats.average_validity_days == 365.0
+
+
+def test_list_ltsd_reads_totals_from_counters(session) -> None:
+    service = LTSDManagementService(session)
+    _seed(service)
+    service.check_expiry(today=TODAY)
+
+    declarations, total = service.list_ltsd(
+        LTSDListParams(status=LTSDStatus.EXPIRED, limit=2), "partner-1"
+    )
+    expected = session.scalar(
+        select(func.count()).where(
+            LTSDRecord.partner_id == "partner-1", LTSDRecord.status == "expired"
+        )
+    )
+
+    assert total == expected > 2
+    assert len(declarations) == 2
+    assert all(declaration.status == LTSDStatus.EXPIRED for declaration in declarations)
+    assert service.get_ltsd(declarations[0].id, "partner-1").status == LTSDStatus.EXPIRED
+
+
+def test_declaration_read_for_update_is_not_expired_underneath_the_writer(postgres_dsn, session) -> None:
+    service = LTSDManagementService(session)
+    declaration = _declaration(LTSDStatus.ACTIVE, TODAY - timedelta(days=1), qualified=True)
+    service._stage(declaration, "partner-0")
+    session.commit()
+
+    held = service.get_ltsd(declaration.id, "partner-0", for_update=True)
+    with create_session_factory(build_engine(postgres_dsn))() as other:
+        # The sweep skips the locked row instead of expiring it mid-update
+        assert LTSDManagementService(other).check_expiry(today=TODAY) == 0
+    held.notes = "edited"
+    service._stage(held, "partner-0")
+    session.commit()
+
+    assert service.check_expiry(today=TODAY) == 1
+    stored = service.get_ltsd(declaration.id, "partner-0")
+    assert (stored.status, stored.notes) == (LTSDStatus.EXPIRED, "edited")
+    assert service.get_statistics("partner-0").by_status == {"expired": 1}
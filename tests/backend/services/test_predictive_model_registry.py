@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("sklearn")
+
+from backend.services.predictive_analytics_service import PredictiveAnalyticsService
+from backend.services.predictive_model_registry import (
+    ARTIFACT_FILE,
+    ModelArtifactError,
+    ModelRegistry,
+)
+
+
+def _assessment() -> dict:
+    return {
+        "products": [],
+        "materials": [
+            {"hs_code": "854140", "origin_country": "CN", "value": 200.0},
+            {"hs_code": "392690", "origin_country": "DE", "value": 50.0},
+        ],
+        "supplier_info": {"reliability_score": 0.55},
+        "documentation_quality": 0.6,
+    }
+
+
+def test_publish_and_load_verifies_checksum(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    version = registry.train_and_publish()
+
+    assert registry.current_version() == version
+    artifact = registry.load()
+    assert artifact.version == version
+    assert artifact.risk_model.predict_proba([[5, 80.0, 0.3, 0.9, 0.9]]).shape == (1, 2)
+
+    with (tmp_path / version / ARTIFACT_FILE).open("ab") as handle:
+        handle.write(b"tampered")
+    with pytest.raises(ModelArtifactError):
+        registry.load(version)
+
+
+def test_service_lazily_loads_and_hot_swaps(tmp_path):
+    registry = ModelRegistry(tmp_path, refresh_interval=0)
+    first = registry.train_and_publish()
+    service = PredictiveAnalyticsService(registry=registry)
+
+    assert registry._artifact is None  # nothing loaded at construction
+    assert service.calculate_risk_score(_assessment()).model_version == first
+
+    second = ModelRegistry(tmp_path).train_and_publish()
+    score = service.calculate_risk_score(_assessment())
+    assert score.model_version == second != first
+
+
+def test_failed_swap_keeps_serving_loaded_version(tmp_path):
+    registry = ModelRegistry(tmp_path, refresh_interval=0)
+    first = registry.train_and_publish()
+    assert registry.get().version == first
+
+    (tmp_path / "CURRENT").write_text("missing-version\n")
+    assert registry.get().version == first
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("hvac")
+
+from backend.services.vault_client import VaultClient, VaultClientError
+
+
+class FakeVault(ThreadingHTTPServer):
+    """Just enough of the Vault HTTP API for KV v2 reads/writes and database creds."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeVaultHandler)
+        self.secrets: dict[str, list[dict]] = {}
+        self.hits: Counter = Counter()
+        self.down = False
+        self.delay = 0.0
+        self.lease_duration = 3600
+        self.revoked: list[str] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeVaultHandler(BaseHTTPRequestHandler):
+    server: FakeVault
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: dict | None = None):
+        payload = json.dumps(body or {"errors": []}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        vault = self.server
+        path = self.path.split("?")[0]
+        if path == "/v1/auth/token/lookup-self":
+            return self._reply(200, {"data": {"ttl": 0, "renewable": False}})
+        vault.hits[path] += 1
+        time.sleep(vault.delay)
+        if vault.down:
+            return self._reply(503)
+        if path.startswith("/v1/secret/data/"):
+            versions = vault.secrets.get(path[len("/v1/secret/data/"):])
+            if not versions:
+                return self._reply(404)
+            return self._reply(200, {"data": {"data": versions[-1], "metadata": {"version": len(versions)}}})
+        if path.startswith("/v1/database/creds/"):
+            n = vault.hits[path]
+            return self._reply(200, {
+                "lease_id": f"database/creds/app/{n}",
+                "lease_duration": vault.lease_duration,
+                "data": {"username": f"user-{n}", "password": "pw"},
+            })
+        return self._reply(404)
+
+    def do_PUT(self):
+        vault = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path == "/v1/sys/leases/revoke":
+            vault.revoked.append(body["lease_id"])
+            return self._reply(204)
+        self._reply(404)
+
+    def do_POST(self):
+        vault = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        name = self.path[len("/v1/secret/data/"):]
+        vault.secrets.setdefault(name, []).append(body["data"])
+        self._reply(200, {"data": {"version": len(vault.secrets[name])}})
+
+
+@pytest.fixture()
+def fake_vault():
+    vault = FakeVault()
+    thread = threading.Thread(target=vault.serve_forever, daemon=True)
+    thread.start()
+    yield vault
+    vault.shutdown()
+    vault.server_close()
+
+
+@pytest.fixture()
+def make_client(fake_vault, monkeypatch):
+    clients = []
+
+    def make(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, str(value))
+        client = VaultClient(vault_addr=fake_vault.url, token="test-token", auto_renew=False)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def test_reads_are_cached_and_writes_invalidate(fake_vault, make_client):
+    fake_vault.secrets["api-keys/openai"] = [{"key": "v1"}]
+    client = make_client()
+
+    assert [client.get_api_key("openai") for _ in range(50)] == ["v1"] * 50
+    assert fake_vault.hits["/v1/secret/data/api-keys/openai"] == 1
+
+    client.write_secret("api-keys/openai", {"key": "v2"})
+    assert client.get_api_key("openai") == "v2"
+    assert fake_vault.hits["/v1/secret/data/api-keys/openai"] == 2
+
+
+def test_concurrent_misses_share_one_fetch(fake_vault, make_client):
+    fake_vault.secrets["app/db"] = [{"password": "s3cret"}]
+    fake_vault.delay = 0.2
+    client = make_client()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.read_secret("app/db"))) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{"password": "s3cret"}] * 20
+    assert fake_vault.hits["/v1/secret/data/app/db"] == 1
+
+
+def test_refreshes_in_background_and_serves_stale_while_vault_is_down(fake_vault, make_client):
+    fake_vault.secrets["app/db"] = [{"password": "one"}]
+    client = make_client(
+        VAULT_SECRET_CACHE_TTL=0.4, VAULT_SECRET_REFRESH_RATIO=0.5, VAULT_SECRET_STALE_GRACE=0.6
+    )
+    assert client.read_secret("app/db") == {"password": "one"}
+
+    # Refreshed ahead of expiry without any reader waiting on it
+    fake_vault.secrets["app/db"].append({"password": "two"})
+    time.sleep(0.35)
+    assert fake_vault.hits["/v1/secret/data/app/db"] == 2
+    assert client.read_secret("app/db") == {"password": "two"}
+
+    # Vault outage: past the TTL the last value is still served within the grace period
+    fake_vault.down = True
+    time.sleep(0.5)
+    assert client.read_secret("app/db") == {"password": "two"}
+
+    time.sleep(0.6)
+    with pytest.raises(VaultClientError):
+        client.read_secret("app/db")
+
+
+def test_database_credentials_are_reused_for_their_lease(fake_vault, make_client):
+    client = make_client()
+
+    first = client.get_database_credentials("app")
+    assert client.get_database_credentials("app") == first
+    assert first["username"] == "user-1"
+    assert fake_vault.hits["/v1/database/creds/app"] == 1
+
+
+def test_replaced_database_credentials_are_left_to_expire(fake_vault, make_client):
+    fake_vault.lease_duration = 1
+    client = make_client(VAULT_SECRET_REFRESH_RATIO=0.3)
+
+    first = client.get_database_credentials("app")
+    time.sleep(0.2)
+    assert client.get_database_credentials("app") == first
+    time.sleep(0.3)
+
+    assert client.get_database_credentials("app")["username"] == "user-2"
+    # Holders of the first set keep using it until its lease ends
+    assert fake_vault.revoked == []
+
+
+def test_secrets_not_read_since_their_refresh_are_dropped(fake_vault, make_client):
+    fake_vault.secrets["app/db"] = [{"password": "one"}]
+    client = make_client(VAULT_SECRET_CACHE_TTL=0.4, VAULT_SECRET_REFRESH_RATIO=0.25)
+    client.read_secret("app/db")
+
+    # The load counted as a read, so the first refresh (at 0.1s) runs; the
+    # refreshed value is never read, so the next one drops it instead
+    time.sleep(0.5)
+    assert fake_vault.hits["/v1/secret/data/app/db"] == 2
+    assert client._secret_cache.peek("kv:app/db") is None
+
+    assert client.read_secret("app/db") == {"password": "one"}
+    assert fake_vault.hits["/v1/secret/data/app/db"] == 3
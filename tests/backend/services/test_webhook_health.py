@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+
+from backend.app.resilience.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_OPEN,
+    get_endpoint_breaker,
+)
+from backend.models.webhook_models import (
+    WebhookConfig,
+    WebhookDelivery,
+    WebhookDeliveryStatus,
+    WebhookEvent,
+    WebhookEventType,
+    WebhookStatus,
+)
+from backend.services.webhook_health import DEFER_SPREAD_SECONDS, MAX_DEFERRALS, WebhookHealthTracker
+from backend.services.webhook_service import MAX_RETRY_ATTEMPTS, WebhookService
+
+
+def _webhook_id() -> str:
+    return f"wh_test_{uuid4().hex[:8]}"
+
+
+def _expire_open_circuit(webhook_id: str) -> None:
+    breaker = get_endpoint_breaker("webhook", webhook_id)
+    breaker._opened_at -= breaker.recovery_timeout + 1
+
+
+def test_breaker_opens_after_consecutive_failures_and_isolates_endpoints():
+    tracker = WebhookHealthTracker()
+    failing, healthy = _webhook_id(), _webhook_id()
+
+    for _ in range(5):
+        assert tracker.allow_delivery(failing)
+        tracker.record_result(failing, success=False, duration_ms=30000)
+
+    assert tracker.breaker_for(failing).state == STATE_OPEN
+    assert not tracker.allow_delivery(failing)
+    assert tracker.allow_delivery(healthy)
+    assert tracker.breaker_for(healthy).state == STATE_CLOSED
+
+
+def test_defer_delay_waits_for_recovery_and_gives_up_eventually():
+    tracker = WebhookHealthTracker()
+    webhook_id = _webhook_id()
+    for _ in range(5):
+        tracker.record_result(webhook_id, success=False)
+    recovery = tracker.breaker_for(webhook_id).recovery_timeout
+
+    first = tracker.defer_delay(webhook_id, deferrals=1)
+    assert recovery - 1 <= first <= recovery + DEFER_SPREAD_SECONDS
+    later = [tracker.defer_delay(webhook_id, deferrals=MAX_DEFERRALS) for _ in range(20)]
+    assert max(later) > recovery + DEFER_SPREAD_SECONDS
+    assert tracker.defer_delay(webhook_id, deferrals=MAX_DEFERRALS + 1) is None
+    assert tracker.get_endpoint_stats(webhook_id)["deferred_deliveries"] == 21
+
+
+def test_retry_delay_adapts_to_error_rate_and_histograms_are_cumulative():
+    tracker = WebhookHealthTracker()
+    healthy, flaky = _webhook_id(), _webhook_id()
+    for _ in range(10):
+        tracker.record_result(healthy, success=True, duration_ms=40)
+    tracker.record_result(flaky, success=True, duration_ms=120)
+    for _ in range(3):
+        tracker.record_result(flaky, success=False, duration_ms=6000)
+
+    assert tracker.retry_delay(healthy, 2, 60, 3600) == 120
+    assert tracker.retry_delay(flaky, 2, 60, 3600) > 120
+
+    stats = tracker.get_endpoint_stats(flaky)
+    assert stats["error_rate"] == 0.75
+    assert stats["latency_ms_histogram"]["250"] == 1
+    assert stats["latency_ms_histogram"]["10000"] == 4
+    assert stats["latency_ms_histogram"]["+Inf"] == 4
+
+
+def test_deliver_event_reschedules_open_endpoint_and_probes_when_half_open():
+    tracker = WebhookHealthTracker()
+    webhook_id = _webhook_id()
+    for _ in range(5):
+        tracker.record_result(webhook_id, success=False)
+    scheduled = []
+
+    class StubService(WebhookService):
+        sent = 0
+
+        async def get_webhook(self, webhook_id, partner_id):
+            now = datetime.utcnow()
+            return WebhookConfig(
+                id=webhook_id,
+                partner_id=partner_id,
+                url="https://partner.example/hook",
+                events=[WebhookEventType.ORIGIN_CHECKED.value],
+                secret="s" * 32,
+                status=WebhookStatus.ACTIVE,
+                created_at=now,
+                updated_at=now,
+            )
+
+        async def _send_webhook(self, webhook, event):
+            StubService.sent += 1
+            return {"success": True, "status_code": 200, "duration_ms": 5}
+
+    event = WebhookEvent.model_construct(
+        event=WebhookEventType.ORIGIN_CHECKED,
+        timestamp=datetime.utcnow(),
+        data={"id": 1},
+        partner_id="partner-1",
+        correlation_id=None,
+    )
+    service = StubService(
+        db_session=None,
+        health_tracker=tracker,
+        defer_scheduler=lambda *args: scheduled.append(args),
+    )
+
+    delivery = asyncio.run(service.deliver_event(webhook_id, event))
+
+    assert delivery.status == WebhookDeliveryStatus.DEFERRED
+    assert delivery.next_retry_at is not None
+    assert StubService.sent == 0
+    ((scheduled_id, event_data, countdown, deferrals, attempt),) = scheduled
+    assert (scheduled_id, event_data["data"], deferrals, attempt) == (webhook_id, {"id": 1}, 1, 1)
+    assert countdown > 0
+
+    # When the rescheduled tasks come due, the half-open budget admits one probe
+    # and the next delivery is pushed back again until that probe succeeds
+    _expire_open_circuit(webhook_id)
+    tracker.allow_delivery(webhook_id)  # Probe slot taken by another worker's delivery
+    again = asyncio.run(service.deliver_event(webhook_id, event, deferrals=1))
+    assert again.status == WebhookDeliveryStatus.DEFERRED and scheduled[-1][3] == 2
+
+    tracker.record_result(webhook_id, success=True)
+    done = asyncio.run(service.deliver_event(webhook_id, event, deferrals=2))
+    assert done.status == WebhookDeliveryStatus.SUCCESS and StubService.sent == 1
+
+
+def test_deliver_event_fails_after_max_deferrals():
+    tracker = WebhookHealthTracker()
+    webhook_id = _webhook_id()
+    for _ in range(5):
+        tracker.record_result(webhook_id, success=False)
+    delivery = WebhookDelivery(
+        id="del_1",
+        webhook_id=webhook_id,
+        event_type=WebhookEventType.ORIGIN_CHECKED.value,
+        payload={},
+        created_at=datetime.utcnow(),
+    )
+    scheduled = []
+    service = WebhookService(None, health_tracker=tracker, defer_scheduler=lambda *args: scheduled.append(args))
+
+    service._defer_delivery(delivery, WebhookEvent.model_construct(), MAX_DEFERRALS + 1)
+
+    assert delivery.status == WebhookDeliveryStatus.FAILED and scheduled == []
+
+
+def test_failed_attempt_is_rescheduled_with_backoff_instead_of_sleeping(monkeypatch):
+    tracker = WebhookHealthTracker()
+    webhook_id = _webhook_id()
+    scheduled = []
+
+    async def no_sleep(delay):
+        raise AssertionError("delivery worker slept")
+
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+
+    class FailingService(WebhookService):
+        async def get_webhook(self, webhook_id, partner_id):
+            now = datetime.utcnow()
+            return WebhookConfig(
+                id=webhook_id,
+                partner_id=partner_id,
+                url="https://partner.example/hook",
+                events=[WebhookEventType.ORIGIN_CHECKED.value],
+                secret="s" * 32,
+                status=WebhookStatus.ACTIVE,
+                created_at=now,
+                updated_at=now,
+            )
+
+        async def _send_webhook(self, webhook, event):
+            return {"success": False, "status_code": 503, "error": "unavailable", "duration_ms": 5}
+
+    event = WebhookEvent.model_construct(
+        event=WebhookEventType.ORIGIN_CHECKED,
+        timestamp=datetime.utcnow(),
+        data={"id": 1},
+        partner_id="partner-1",
+        correlation_id=None,
+    )
+    service = FailingService(None, health_tracker=tracker, defer_scheduler=lambda *args: scheduled.append(args))
+
+    first = asyncio.run(service.deliver_event(webhook_id, event))
+
+    assert first.status == WebhookDeliveryStatus.RETRY and first.attempt == 1
+    ((_, _, countdown, deferrals, attempt),) = scheduled
+    assert countdown == tracker.retry_delay(webhook_id, 1, 60, 3600) and countdown > 60
+    assert (deferrals, attempt) == (0, 2)
+
+    last = asyncio.run(service.deliver_event(webhook_id, event, attempt=MAX_RETRY_ATTEMPTS))
+    assert last.status == WebhookDeliveryStatus.FAILED and len(scheduled) == 1
@@ -5,7 +5,12 @@ from pathlib import Path
 
 import pytest
 
-from psr.validator import validate_directory, validate_rule_text
+from psr.validator import (
+    validate_directory,
+    validate_directory_incremental,
+    validate_rule_text,
+    watch_directory,
+)
 
 SCHEMA_PATH = Path("psr/schema/psr_rule.schema.v2.json").resolve()
 RULES_DIR = Path("psr/rules").resolve()
@@ -97,3 +102,36 @@ def test_cli_runner_reports_success(tmp_path: Path) -> None:
     )
     assert result.returncode == 0, result.stderr
     assert "[SUCCESS]" in result.stdout
+
+
+def test_incremental_validation_reuses_manifest(tmp_path: Path) -> None:
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    sample_rule = RULES_DIR / "hs39" / "ceta_polymer_rule.yaml"
+    valid = rules_dir / "valid.yaml"
+    valid.write_text(sample_rule.read_text(encoding="utf-8"), encoding="utf-8")
+    manifest = tmp_path / "manifest.json"
+
+    first = validate_directory_incremental(SCHEMA_PATH, rules_dir, manifest)
+    assert first == [(str(valid), [])] and manifest.exists()
+    assert validate_directory_incremental(SCHEMA_PATH, rules_dir, manifest) == first
+
+    valid.write_text("version: [", encoding="utf-8")
+    (errors,) = [errs for _, errs in validate_directory_incremental(SCHEMA_PATH, rules_dir, manifest)]
+    assert errors and "failed to parse YAML" in errors[0]
+
+
+def test_watch_reports_initial_state_and_stops_on_false(tmp_path: Path) -> None:
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    (rules_dir / "broken.yaml").write_text("version: [", encoding="utf-8")
+    calls: list[tuple[list[tuple[str, list[str]]], list[str]]] = []
+
+    def callback(changed: list[tuple[str, list[str]]], removed: list[str]) -> bool:
+        calls.append((changed, removed))
+        return False
+
+    watch_directory(SCHEMA_PATH, rules_dir, callback, interval_ms=10)
+    assert len(calls) == 1
+    (changed, removed), = calls
+    assert [path for path, _ in changed] == [str(rules_dir / "broken.yaml")] and removed == []